@@ -39,7 +39,7 @@ class BusinessAnalytics:
             # Settled Bets (User Only)
             query_settled = """
                 SELECT outcome, user_stake, user_odds, event_id 
-                FROM intelligence_log 
+                FROM intelligence_log_all 
                 WHERE user_bet = TRUE 
                 AND outcome IN ('WON', 'LOST', 'PUSH')
             """
@@ -81,7 +81,7 @@ class BusinessAnalytics:
             # Assumption: Business started Jan 1, 2026 (or simply count months active in DB?)
             # Let's count distinct months in the log to estimate duration
             cur = conn.cursor()
-            cur.execute("SELECT MIN(timestamp), MAX(timestamp) FROM intelligence_log")
+            cur.execute("SELECT MIN(timestamp), MAX(timestamp) FROM intelligence_log_all")
             min_ts, max_ts = cur.fetchone()
             
             months_active = 1
@@ -139,7 +139,7 @@ class BusinessAnalytics:
         # We need bets that are SETTLED or have STARTED (so closing line is set)
         query = """
             SELECT sport, user_odds, closing_odds, outcome 
-            FROM intelligence_log 
+            FROM intelligence_log_all 
             WHERE user_bet = TRUE 
             AND closing_odds IS NOT NULL 
             AND closing_odds > 1.0
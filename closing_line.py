@@ -5,10 +5,11 @@ This module fetches closing odds before games start and calculates CLV,
 which is a key metric for measuring betting skill over time.
 """
 
-import requests
 from datetime import datetime, timezone, timedelta
 from config import Config
+from data.clients.base import http_get
 from db.connection import get_db, safe_execute
+from db.queries import PENDING_NEAR_KICKOFF
 from utils import log
 
 def fetch_closing_odds():
@@ -31,12 +32,7 @@ def fetch_closing_odds():
         # OPTIMIZATION: Only fetch if kickoff is IMMINENT (Next 70 mins)
         # This prevents wasting API credits checking lines 6 hours away.
         # Assumes Hourly Scheduler.
-        cur.execute("""
-            SELECT event_id, sport, teams, selection, odds, kickoff
-            FROM intelligence_log
-            WHERE outcome = 'PENDING'
-            AND kickoff BETWEEN NOW() AND NOW() + INTERVAL '70 minutes'
-        """)
+        cur.execute(PENDING_NEAR_KICKOFF, {'window': '70 minutes'})
 
         pending = cur.fetchall()
 
@@ -67,7 +63,7 @@ def fetch_closing_odds():
             try:
                 # Fetch current odds for this event
                 url = f"https://api.the-odds-api.com/v4/sports/{league}/events/{base_event_id}/odds?apiKey={Config.ODDS_API_KEY}&regions=us,us2&markets={Config.MAIN_MARKETS},{Config.EXOTIC_MARKETS}"
-                res = requests.get(url, timeout=10).json()
+                res = http_get(url, timeout=10).json()
 
                 if not isinstance(res, dict) or 'bookmakers' not in res:
                     continue
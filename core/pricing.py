@@ -0,0 +1,152 @@
+"""
+Distribution pricing for prop and totals markets.
+
+One place for P(over) / P(under) under the count and score models the engines
+use. Every function is vectorized: mu/line/params may be scalars or arrays and
+broadcast like NumPy, so a whole slate prices in one call. Special functions
+come from scipy.special (no per-call scipy.stats distribution objects).
+
+Line convention for count distributions (Poisson, NB, Skellam):
+    over  = P(X > line)   -> X >= floor(line) + 1
+    under = P(X < line)   -> X <= ceil(line) - 1
+Integer lines therefore exclude the push from both sides.
+
+Scalar helpers (`*_over_cached`) memoize full CDF tables per (mu, params) for
+the common small integer lines, so per-offer loops reduce to a lookup.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import gammaincc, betainc, ndtr
+
+TABLE_KMAX = 15  # Largest integer cutoff kept in memoized tables
+
+
+def _over_k(line):
+    return np.floor(np.asarray(line, dtype=np.float64))
+
+
+def _under_k(line):
+    return np.ceil(np.asarray(line, dtype=np.float64)) - 1
+
+
+def _scalar(x):
+    return float(x) if np.ndim(x) == 0 else x
+
+
+# ---------------------------------------------------------------------------
+# CDFs  P(X <= k)
+# ---------------------------------------------------------------------------
+
+def poisson_cdf(k, mu):
+    k = np.asarray(k, dtype=np.float64)
+    mu = np.maximum(np.asarray(mu, dtype=np.float64), 0.0)
+    with np.errstate(invalid='ignore'):
+        out = np.where(mu > 0, gammaincc(np.maximum(k, 0) + 1, mu), 1.0)
+    return np.where(k < 0, 0.0, out)
+
+
+def nbinom_cdf(k, mu, alpha):
+    """NB2 with mean mu and Var = mu + alpha*mu^2."""
+    k = np.asarray(k, dtype=np.float64)
+    mu = np.maximum(np.asarray(mu, dtype=np.float64), 0.0)
+    n = 1.0 / np.asarray(alpha, dtype=np.float64)
+    p = n / (n + mu)
+    out = betainc(n, np.maximum(k, 0) + 1, p)
+    return np.where(k < 0, 0.0, out)
+
+
+def normal_cdf(x, mu, sigma):
+    return ndtr((np.asarray(x, dtype=np.float64) - mu) / sigma)
+
+
+def skellam_cdf(k, mu1, mu2):
+    """P(X1 - X2 <= k) for independent Poissons (goal / run differentials)."""
+    from scipy.stats import skellam
+    return skellam.cdf(k, np.maximum(mu1, 1e-12), np.maximum(mu2, 1e-12))
+
+
+# ---------------------------------------------------------------------------
+# Over / Under
+# ---------------------------------------------------------------------------
+
+def poisson_over(mu, line):
+    return _scalar(np.clip(1.0 - poisson_cdf(_over_k(line), mu), 0.0, 1.0))
+
+
+def poisson_under(mu, line):
+    return _scalar(np.clip(poisson_cdf(_under_k(line), mu), 0.0, 1.0))
+
+
+def nbinom_over(mu, alpha, line):
+    return _scalar(np.clip(1.0 - nbinom_cdf(_over_k(line), mu, alpha), 0.0, 1.0))
+
+
+def nbinom_under(mu, alpha, line):
+    return _scalar(np.clip(nbinom_cdf(_under_k(line), mu, alpha), 0.0, 1.0))
+
+
+def normal_over(mu, sigma, line):
+    return _scalar(1.0 - normal_cdf(line, mu, sigma))
+
+
+def normal_under(mu, sigma, line):
+    return _scalar(normal_cdf(line, mu, sigma))
+
+
+def skellam_over(mu1, mu2, line):
+    """P(X1 - X2 > line), e.g. home covers -1.5 -> skellam_over(mu_h, mu_a, 1.5)."""
+    return _scalar(1.0 - skellam_cdf(_over_k(line), mu1, mu2))
+
+
+def skellam_under(mu1, mu2, line):
+    return _scalar(skellam_cdf(_under_k(line), mu1, mu2))
+
+
+PRICERS = {
+    'poisson': (poisson_over, poisson_under),
+    'nbinom': (nbinom_over, nbinom_under),
+    'normal': (normal_over, normal_under),
+    'skellam': (skellam_over, skellam_under),
+}
+
+
+def price(dist, side, *args):
+    """
+    Dispatch by name: price('nbinom', 'over', mu, alpha, line).
+    Args are the distribution parameters followed by the line (arrays allowed).
+    """
+    over, under = PRICERS[dist]
+    return over(*args) if side.lower() == 'over' else under(*args)
+
+
+# ---------------------------------------------------------------------------
+# Memoized scalar tables
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=8192)
+def _poisson_table(mu):
+    return poisson_cdf(np.arange(TABLE_KMAX + 1), mu)
+
+
+@lru_cache(maxsize=8192)
+def _nbinom_table(mu, alpha):
+    return nbinom_cdf(np.arange(TABLE_KMAX + 1), mu, alpha)
+
+
+def _table_over(table, line, fallback):
+    k = int(np.floor(line))
+    if 0 <= k <= TABLE_KMAX:
+        return float(min(1.0, max(0.0, 1.0 - table[k])))
+    return fallback()
+
+
+def poisson_over_cached(mu, line):
+    mu = round(float(mu), 6)
+    return _table_over(_poisson_table(mu), line, lambda: poisson_over(mu, line))
+
+
+def nbinom_over_cached(mu, alpha, line):
+    mu, alpha = round(float(mu), 6), float(alpha)
+    return _table_over(_nbinom_table(mu, alpha), line, lambda: nbinom_over(mu, alpha, line))
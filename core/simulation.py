@@ -0,0 +1,138 @@
+"""
+Monte Carlo engine for NHL skater points.
+
+Frozen Phase 1-4 structure:
+    SOG     ~ NB2(mu_sog, alpha_sog)
+    Goals   ~ Binomial(SOG, p_goal)      (correlated with SOG by construction)
+    Assists ~ NB2(mu_ast, alpha_ast)
+    Points  = Goals + Assists
+
+Sims are drawn in fixed-size chunks and folded into per-player count histograms,
+so memory is O(chunk_size) per player instead of a (rows x sims) matrix. Every
+player gets its own RNG stream derived from (seed, player key): re-pricing a
+player on demand reproduces the same draws as the batch run.
+"""
+
+import zlib
+
+import numpy as np
+
+MARKETS = ('sog', 'goals', 'assists', 'points')
+
+
+def _finite(x):
+    """float(x); missing projections (None / NaN / inf) become 0.0, as in simulate_frame."""
+    x = 0.0 if x is None else float(x)
+    return x if np.isfinite(x) else 0.0
+
+
+def _nb2_params(mu, alpha):
+    """NB2 (mean mu, Var = mu + alpha*mu^2) -> numpy (n, p)."""
+    n = 1.0 / alpha
+    return n, n / (n + max(_finite(mu), 0.0))
+
+
+class SimResult:
+    """Count histograms for one player; prices any line without the raw sims."""
+
+    def __init__(self, hists, n_sims):
+        self.hists = hists
+        self.n_sims = n_sims
+
+    def pmf(self, market):
+        return self.hists[market] / self.n_sims
+
+    def mean(self, market):
+        h = self.hists[market]
+        return float(np.dot(np.arange(len(h)), h) / self.n_sims)
+
+    def prob_over(self, market, line):
+        """P(X > line). Lines are usually X.5; integer lines exclude the push."""
+        h = self.hists[market]
+        k = int(np.floor(line)) + 1
+        return float(h[k:].sum() / self.n_sims) if k < len(h) else 0.0
+
+    def prob_under(self, market, line):
+        h = self.hists[market]
+        k = int(np.ceil(line))
+        return float(h[:min(k, len(h))].sum() / self.n_sims)
+
+
+class PointsSimulator:
+    def __init__(self, alpha_sog, alpha_ast, n_sims=10000, chunk_size=2500, max_count=25, seed=2026):
+        self.alpha_sog = alpha_sog
+        self.alpha_ast = alpha_ast
+        self.n_sims = int(n_sims)
+        self.chunk_size = int(chunk_size)
+        self.max_count = int(max_count)  # Histogram tail bucket (counts above are clipped)
+        self.seed = int(seed)
+        self._cache = {}
+
+    def player_rng(self, key):
+        """Independent, reproducible stream per player."""
+        ss = np.random.SeedSequence(entropy=self.seed, spawn_key=(zlib.crc32(str(key).encode()),))
+        return np.random.default_rng(ss)
+
+    def simulate(self, key, mu_sog, p_goal, mu_ast):
+        """Simulate one player (memoized on key + inputs). Missing inputs count as 0."""
+        mu_sog, p_goal, mu_ast = _finite(mu_sog), _finite(p_goal), _finite(mu_ast)
+        cache_key = (key, mu_sog, p_goal, mu_ast)
+        hit = self._cache.get(cache_key)
+        if hit is not None:
+            return hit
+
+        rng = self.player_rng(key)
+        n_s, p_s = _nb2_params(mu_sog, self.alpha_sog)
+        n_a, p_a = _nb2_params(mu_ast, self.alpha_ast)
+        p_goal = min(max(p_goal, 0.0), 1.0)
+        width = self.max_count + 1
+        hists = {m: np.zeros(width, dtype=np.int64) for m in MARKETS}
+
+        remaining = self.n_sims
+        while remaining > 0:
+            size = min(self.chunk_size, remaining)
+            sog = rng.negative_binomial(n_s, p_s, size=size)
+            goals = rng.binomial(sog, p_goal)
+            assists = rng.negative_binomial(n_a, p_a, size=size)
+            for market, draws in (('sog', sog), ('goals', goals), ('assists', assists),
+                                  ('points', goals + assists)):
+                hists[market] += np.bincount(np.minimum(draws, self.max_count), minlength=width)
+            remaining -= size
+
+        result = SimResult(hists, self.n_sims)
+        self._cache[cache_key] = result
+        return result
+
+    def simulate_frame(self, df, key_col='player_name', mu_sog_col='mu_sog',
+                       p_goal_col='p_goal', mu_ast_col='mu_ast', date_col='game_date'):
+        """
+        Simulate every row of a projections frame.
+
+        Returns (summary DataFrame aligned to df.index, {row_key: SimResult}).
+        Row keys combine player and game date so each game gets its own stream.
+        """
+        import pandas as pd
+
+        results = {}
+        rows = []
+        for idx, r in df.iterrows():
+            key = self.row_key(r, key_col, date_col)
+            res = self.simulate(
+                key,
+                0.0 if pd.isna(r[mu_sog_col]) else r[mu_sog_col],
+                0.0 if pd.isna(r[p_goal_col]) else r[p_goal_col],
+                0.0 if pd.isna(r[mu_ast_col]) else r[mu_ast_col],
+            )
+            results[key] = res
+            rows.append({
+                'proj_points_mean': res.mean('points'),
+                'prob_points_1plus': res.prob_over('points', 0.5),
+                'prob_points_2plus': res.prob_over('points', 1.5),
+            })
+
+        return pd.DataFrame(rows, index=df.index), results
+
+    @staticmethod
+    def row_key(row, key_col='player_name', date_col='game_date'):
+        date = row.get(date_col) if hasattr(row, 'get') else None
+        return f"{row[key_col]}|{date}" if date is not None else str(row[key_col])
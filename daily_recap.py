@@ -40,17 +40,16 @@ def generate_daily_recap():
     
     # Query bets where kickoff::date = yesterday
     # And outcome is settled (WON/LOST/PUSH)
-    # We filter by user_bet=True (Actual user action) OR all? 
-    # User said "yesterdays results" implying model performance? 
-    # But usually P/L assumes money.
-    # Let's count "Active" bets (stake > 0 or user_bet = True)
-    # Querying ALL settled bets for coverage.
+    # Querying ALL settled bets for coverage, pre-aggregated in the perf_daily
+    # rollup (db/rollups.py): one row per sport/outcome instead of one per bet.
+    # recap_stake/recap_pnl default a missing stake to 100 and odds to 1.91.
     
     query = """
-        SELECT sport, outcome, user_stake, user_odds 
-        FROM intelligence_log 
-        WHERE date(kickoff) = %s 
+        SELECT sport, outcome, SUM(bets), SUM(recap_stake), SUM(recap_pnl)
+        FROM perf_daily 
+        WHERE kickoff_day = %s 
         AND outcome IN ('WON', 'LOST', 'PUSH', 'HALF_WIN', 'HALF_LOSS')
+        GROUP BY sport, outcome
     """
     
     cur.execute(query, (yesterday,))
@@ -69,9 +68,8 @@ def generate_daily_recap():
     total_pnl = 0.0
     total_stake = 0.0
     
-    for sport, outcome, stake, odds in rows:
-        if not stake: stake = 100.0 # Default unit if missing? Or 0?
-        if not odds: odds = 1.91
+    for sport, outcome, bets, stake, pnl in rows:
+        bets, stake, pnl = int(bets), float(stake), float(pnl)
         
         # Clean sport name
         sport_name = sport.replace('basketball_', '').replace('americanfootball_', '').replace('icehockey_', '').replace('soccer_', '').upper()
@@ -83,17 +81,13 @@ def generate_daily_recap():
         rec['Stake'] += stake
         total_stake += stake
         
-        pnl = 0.0
         if outcome == 'WON':
-            rec['W'] += 1
-            pnl = stake * (odds - 1)
+            rec['W'] += bets
         elif outcome == 'LOST':
-            rec['L'] += 1
-            pnl = -stake
+            rec['L'] += bets
         elif outcome == 'PUSH':
-            rec['P'] += 1
-            pnl = 0.0
-        # Handle halves if present (rare)
+            rec['P'] += bets
+        # Halves count toward stake only (rare)
         
         rec['PnL'] += pnl
         total_pnl += pnl
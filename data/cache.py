@@ -42,11 +42,12 @@ def cache_set(key, value):
         os.makedirs(CACHE_DIR, exist_ok=True)
         path = _get_cache_path(key)
         
-        # Atomic Write pattern (write to temp then rename) prevents partial reads
-        # But for this scale, direct write is acceptable if simple.
-        # We will do direct write for simplicity as per user request.
-        with open(path, 'w') as f:
+        # Atomic Write pattern (write to temp then rename) prevents partial reads;
+        # background pollers (data/live_scores.py) write while other processes read.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(value, f)
+        os.replace(tmp_path, path)
             
     except Exception as e:
         log("WARN", f"Cache Write Error ({key}): {e}")
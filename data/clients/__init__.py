@@ -3,7 +3,7 @@ from .espn import fetch_espn_scores
 from .football_api import get_soccer_predictions
 from .nhl_api import get_nhl_player_stats
 from .nba_api import get_nba_refs
-from .odds_api import fetch_prop_odds
+from .odds_api import fetch_prop_odds, fetch_prop_offers
 # ratings is also here but imported separately usually? 
 # Or we can expose it:
 # from .ratings import get_team_ratings
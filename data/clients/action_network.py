@@ -1,10 +1,10 @@
-import requests
 import re
 from config.settings import Config
 from utils.logging import log
 from utils.team_names import normalize_team_name
 from data.cache import cache_get, cache_set
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from data.clients.base import http_get
 
 def validate_action_network_auth():
     """
@@ -23,7 +23,7 @@ def validate_action_network_auth():
     
     # 1. Get Build ID (Connectivity Check)
     try:
-        home_res = requests.get('https://www.actionnetwork.com/', headers=headers, timeout=10)
+        home_res = http_get('https://www.actionnetwork.com/', headers=headers, timeout=10)
         match = re.search(r'"buildId":"(.*?)"', home_res.text)
         if not match:
              raise ConnectionError("Could not retrieve buildId from Action Network homepage.")
@@ -34,7 +34,7 @@ def validate_action_network_auth():
     # 2. Test Protected Endpoint
     test_url = f"https://www.actionnetwork.com/_next/data/{build_id}/nba/public-betting.json"
     
-    res = requests.get(test_url, headers=headers, timeout=10)
+    res = http_get(test_url, headers=headers, timeout=10)
     
     if res.status_code == 401 or res.status_code == 403:
         raise PermissionError("ACTION_COOKIE is Expired. Please update .env")
@@ -71,7 +71,7 @@ def get_action_network_data():
     # Step 1: Get buildId
     build_id = None
     try:
-        home_res = requests.get('https://www.actionnetwork.com/', headers=headers, timeout=10)
+        home_res = http_get('https://www.actionnetwork.com/', headers=headers, timeout=10)
         match = re.search(r'"buildId":"(.*?)"', home_res.text)
         if match:
             build_id = match.group(1)
@@ -100,7 +100,7 @@ def get_action_network_data():
         target_url = f"https://www.actionnetwork.com/_next/data/{b_id}/{suffix}"
         
         try:
-            res = requests.get(target_url, headers=hdrs, timeout=8)
+            res = http_get(target_url, headers=hdrs, timeout=8)
             if res.status_code != 200:
                 return []
                 
@@ -1,18 +1,261 @@
-"""Base HTTP client with retry and error handling."""
+"""
+Shared HTTP layer for every data client.
 
+One pooled requests.Session per host (keep-alive instead of a TCP/TLS
+handshake per call), a token-bucket rate limit per host, retries with
+jittered exponential backoff on timeouts / 429 / 5xx, conditional GETs
+(ETag / Last-Modified revalidation served from an in-memory LRU) and
+per-host latency metrics. Module-level scrapers use http_get(); API
+wrappers subclass BaseAPIClient.
+
+Shared sessions never store cookies: callers that need them pass cookies=
+per request, so one caller's login state never leaks into another's calls.
+"""
+
+import hashlib
+import random
 import requests
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
 from typing import Optional, Dict, Any
+from urllib.parse import urlencode, urlsplit
 import time
+from requests.adapters import HTTPAdapter
 from utils.logging import log
 
+# host -> (sustained requests/sec, burst). Scraped HTML sites get polite limits.
+HOST_RATE_LIMITS = {
+    'www.teamrankings.com': (1.0, 2),
+    'www.actionnetwork.com': (1.0, 2),
+    'official.nba.com': (1.0, 2),
+    'leftwinglock.com': (0.5, 1),
+    'api-web.nhle.com': (2.0, 4),
+    'kenpom.com': (2.0, 4),
+    'understat.com': (2.0, 1),
+    'v3.football.api-sports.io': (5.0, 5),
+    'v1.hockey.api-sports.io': (5.0, 5),
+}
+DEFAULT_RATE_LIMIT = (10.0, 10)
+POOL_SIZE = 16               # Keep-alive connections per host
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5           # Seconds; doubled per attempt, x0.5-1.5 jitter
+BACKOFF_CAP = 30
+MAX_RETRY_AFTER = 60
+CONDITIONAL_CACHE_SIZE = 256
+# Header names (lowercase fragments) that identify the caller; they are part of the
+# conditional-cache key so a 304 never hands one caller another's cached response.
+CREDENTIAL_HEADER_HINTS = ('auth', 'cookie', 'key', 'token', 'session')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: sustained `rate` requests/sec with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """Per-host pooled sessions, rate limits, retries, conditional GET and metrics."""
+
+    def __init__(self, rate_limits=None, pool_size=POOL_SIZE, conditional_cache_size=CONDITIONAL_CACHE_SIZE):
+        self.rate_limits = dict(HOST_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.pool_size = pool_size
+        self.conditional_cache_size = conditional_cache_size
+        self.sessions = {}
+        self.buckets = {}
+        self.validators = OrderedDict()  # (url, params, credentials) -> (etag, last_modified, response)
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def set_rate_limit(self, host, rate, burst=None):
+        """Override one host's limit (e.g. a scraper's configured requests/sec)."""
+        with self.lock:
+            self.rate_limits[host] = (rate, burst or max(1.0, rate))
+            self.buckets.pop(host, None)
+
+    def _host_state(self, host):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))  # Reject all Set-Cookie
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.sessions[host] = session
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(*self.rate_limits.get(host, DEFAULT_RATE_LIMIT))
+            if host not in self.stats:
+                self.stats[host] = {'requests': 0, 'errors': 0, 'retries': 0, 'throttled': 0,
+                                    'not_modified': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            return self.sessions[host], self.buckets[host], self.stats[host]
+
+    def _record(self, stats, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                if name == 'ms':
+                    stats['total_ms'] += value
+                    stats['max_ms'] = max(stats['max_ms'], value)
+                else:
+                    stats[name] += value
+
+    def _conditional_key(self, url, params, headers):
+        key = f"{url}?{urlencode(sorted(params.items()), doseq=True)}" if params else url
+        credentials = sorted((name.lower(), str(value)) for name, value in headers.items()
+                             if any(hint in name.lower() for hint in CREDENTIAL_HEADER_HINTS))
+        if credentials:
+            key += "#" + hashlib.sha256(repr(credentials).encode()).hexdigest()
+        return key
+
+    def _validators_for(self, key):
+        with self.lock:
+            entry = self.validators.get(key)
+            if entry:
+                self.validators.move_to_end(key)
+            return entry
+
+    def _remember(self, key, response):
+        etag = response.headers.get('ETag')
+        modified = response.headers.get('Last-Modified')
+        if not (etag or modified):
+            return
+        with self.lock:
+            self.validators[key] = (etag, modified, response)
+            self.validators.move_to_end(key)
+            while len(self.validators) > self.conditional_cache_size:
+                self.validators.popitem(last=False)
+
+    def _backoff(self, attempt, response=None):
+        """Honour a numeric Retry-After (capped); otherwise jittered exponential backoff."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(MAX_RETRY_AFTER, max(0, int(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form: fall back to exponential backoff
+        return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def request(self, method, url, params=None, headers=None, timeout=10, retries=2, conditional=True, **kwargs):
+        """
+        Send a request through the host's pooled session.
+
+        Retries timeouts, connection errors and RETRY_STATUSES. After the last
+        attempt the final response is returned (callers check status as before),
+        or the last exception is re-raised. A 304 to a conditional GET returns
+        the previously cached 200 response; the cache is keyed by URL, params
+        and credential headers, and is skipped for requests with auth= or cookies=.
+        """
+        host = urlsplit(url).netloc
+        session, bucket, stats = self._host_state(host)
+        headers = dict(headers or {})
+
+        key = None
+        if method == 'GET' and conditional and not (kwargs.get('stream') or kwargs.get('auth') or kwargs.get('cookies')):
+            key = self._conditional_key(url, params, headers)
+            cached = self._validators_for(key)
+            if cached:
+                etag, modified, _ = cached
+                if etag:
+                    headers.setdefault('If-None-Match', etag)
+                if modified:
+                    headers.setdefault('If-Modified-Since', modified)
+
+        for attempt in range(retries + 1):
+            bucket.acquire()
+            start = time.monotonic()
+            try:
+                response = session.request(method, url, params=params, headers=headers, timeout=timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._record(stats, requests=1, errors=1, ms=(time.monotonic() - start) * 1000)
+                if attempt >= retries:
+                    raise
+                self._record(stats, retries=1)
+                delay = self._backoff(attempt)
+                log("WARN", f"{type(e).__name__} on {host} (attempt {attempt + 1}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self._record(stats, requests=1, ms=(time.monotonic() - start) * 1000)
+            if response.status_code in RETRY_STATUSES:
+                if response.status_code == 429:
+                    self._record(stats, throttled=1)
+                if attempt >= retries:
+                    self._record(stats, errors=1)
+                    return response
+                self._record(stats, retries=1)
+                delay = self._backoff(attempt, response)
+                log("WARN", f"{host} returned {response.status_code} (attempt {attempt + 1}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            if key and response.status_code == 304:
+                cached = self._validators_for(key)
+                if cached:
+                    self._record(stats, not_modified=1)
+                    return cached[2]
+            if key and response.status_code == 200:
+                self._remember(key, response)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def metrics(self):
+        """{host: {'requests', 'errors', 'retries', 'throttled', 'not_modified', 'avg_ms', 'max_ms'}}"""
+        with self.lock:
+            return {
+                host: {
+                    'requests': s['requests'], 'errors': s['errors'], 'retries': s['retries'],
+                    'throttled': s['throttled'], 'not_modified': s['not_modified'],
+                    'avg_ms': round(s['total_ms'] / s['requests'], 1) if s['requests'] else 0.0,
+                    'max_ms': round(s['max_ms'], 1),
+                }
+                for host, s in self.stats.items()
+            }
+
+
+_default_client = HttpClient()
+
+def get_http_client() -> HttpClient:
+    """Process-wide HttpClient shared by every data client."""
+    return _default_client
+
+def http_get(url, **kwargs):
+    """Drop-in for requests.get() on the shared client (returns a requests.Response)."""
+    return _default_client.get(url, **kwargs)
+
+def http_metrics():
+    """Per-host request metrics for the shared client."""
+    return _default_client.metrics()
+
+
 class BaseAPIClient:
     """Base class for API clients with retry logic."""
-    
-    def __init__(self, base_url: str, default_timeout: int = 10):
+
+    def __init__(self, base_url: str, default_timeout: int = 10, http: HttpClient = None):
         self.base_url = base_url
         self.default_timeout = default_timeout
-        self.session = requests.Session()
-    
+        self.http = http or get_http_client()
+
     def get(
         self,
         endpoint: str,
@@ -24,7 +267,7 @@ class BaseAPIClient:
     ) -> Optional[Dict[str, Any]]:
         """
         Make GET request with retry logic.
-        
+
         Args:
             endpoint: API endpoint path (appended to base_url)
             params: Query parameters
@@ -32,7 +275,7 @@ class BaseAPIClient:
             timeout: Request timeout in seconds
             retries: Number of retry attempts
             url_override: Full URL to use instead of base_url + endpoint
-            
+
         Returns:
             JSON response as dict, or None on failure.
         """
@@ -43,39 +286,24 @@ class BaseAPIClient:
             base = self.base_url.rstrip('/')
             path = endpoint.lstrip('/')
             url = f"{base}/{path}"
-            
+
         timeout = timeout or self.default_timeout
-        
-        for attempt in range(retries + 1):
-            try:
-                response = self.session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=timeout
-                )
-                
-                if response.status_code == 429:
-                    # Rate limited - wait and retry
-                    wait_time = int(response.headers.get('Retry-After', 60))
-                    log("WARN", f"Rate limited, waiting {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-                
-                if response.status_code != 200:
-                    log("WARN", f"API returned {response.status_code}: {url}")
-                    return None
-                
-                return response.json()
-                
-            except requests.exceptions.Timeout:
-                log("WARN", f"Timeout on attempt {attempt + 1}: {url}")
-                if attempt < retries:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                continue
-                
-            except Exception as e:
-                log("ERROR", f"Request failed: {url} - {e}")
-                return None
-        
-        return None
+
+        try:
+            response = self.http.get(url, params=params, headers=headers, timeout=timeout, retries=retries)
+        except requests.exceptions.Timeout:
+            log("WARN", f"Timeout after {retries + 1} attempts: {url}")
+            return None
+        except Exception as e:
+            log("ERROR", f"Request failed: {url} - {e}")
+            return None
+
+        if response.status_code != 200:
+            log("WARN", f"API returned {response.status_code}: {url}")
+            return None
+
+        try:
+            return response.json()
+        except ValueError as e:
+            log("ERROR", f"Invalid JSON from {url} - {e}")
+            return None
@@ -1,9 +1,44 @@
-import requests
 import pytz
 from datetime import datetime, timedelta
 from utils.logging import log
 from data.cache import cache_get, cache_set
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from data.clients.base import http_get
+
+# Map internal keys to ESPN API paths (support list of paths)
+ESPN_PATHS = {
+    'basketball_nba': ['basketball/nba'],
+    'NBA': ['basketball/nba'],
+    'basketball_ncaab': ['basketball/mens-college-basketball'],
+    'NCAAB': ['basketball/mens-college-basketball'],
+    'icehockey_nhl': ['hockey/nhl'],
+    'NHL': ['hockey/nhl'],
+    'americanfootball_nfl': ['football/nfl'],
+    'NFL': ['football/nfl'],
+    'baseball_mlb': ['baseball/mlb'],
+    'MLB': ['baseball/mlb'],
+    'soccer_epl': ['soccer/eng.1'],
+    'SOCCER': [
+        'soccer/eng.1',
+        'soccer/esp.1',
+        'soccer/ger.1',
+        'soccer/ita.1',
+        'soccer/fra.1',
+        'soccer/ned.1',
+        'soccer/por.1',
+        'soccer/uefa.champions',
+        'soccer/uefa.europa',
+        'soccer/eng.2',
+        'soccer/usa.1',
+        'soccer/fifa.friendly'
+    ],
+    'CHAMPIONS': ['soccer/uefa.champions'],
+    'LALIGA': ['soccer/esp.1'],
+    'BUNDESLIGA': ['soccer/ger.1'],
+    'SERIEA': ['soccer/ita.1'],
+    'LIGUE1': ['soccer/fra.1']
+}
+
 
 def _fetch_single_espn_path(espn_path, date_str):
     """
@@ -23,7 +58,7 @@ def _fetch_single_espn_path(espn_path, date_str):
     }
     
     try:
-        r = requests.get(url, headers=headers, timeout=8)
+        r = http_get(url, headers=headers, timeout=8)
         if r.status_code == 200:
             res = r.json()
             events = res.get('events', [])
@@ -51,40 +86,6 @@ def fetch_espn_scores(sport_keys, specific_date=None):
     games = []
     unique_sports = set(sport_keys)
     
-    # Map internal keys to ESPN API paths (support list of paths)
-    ESPN_MAP = {
-        'basketball_nba': ['basketball/nba'],
-        'NBA': ['basketball/nba'],
-        'basketball_ncaab': ['basketball/mens-college-basketball'],
-        'NCAAB': ['basketball/mens-college-basketball'],
-        'icehockey_nhl': ['hockey/nhl'],
-        'NHL': ['hockey/nhl'],
-        'americanfootball_nfl': ['football/nfl'],
-        'NFL': ['football/nfl'],
-        'baseball_mlb': ['baseball/mlb'],
-        'MLB': ['baseball/mlb'],
-        'soccer_epl': ['soccer/eng.1'],
-        'SOCCER': [
-            'soccer/eng.1',
-            'soccer/esp.1',
-            'soccer/ger.1',
-            'soccer/ita.1',
-            'soccer/fra.1',
-            'soccer/ned.1',
-            'soccer/por.1',
-            'soccer/uefa.champions',
-            'soccer/uefa.europa',
-            'soccer/eng.2',
-            'soccer/usa.1',
-            'soccer/fifa.friendly'
-        ],
-        'CHAMPIONS': ['soccer/uefa.champions'],
-        'LALIGA': ['soccer/esp.1'],
-        'BUNDESLIGA': ['soccer/ger.1'],
-        'SERIEA': ['soccer/ita.1'],
-        'LIGUE1': ['soccer/fra.1']
-    }
-
     processed_paths = set()
     tasks = [] # List of (espn_path, date_str, sport_keys_that_use_this_path)
 
@@ -106,7 +107,7 @@ def fetch_espn_scores(sport_keys, specific_date=None):
     path_to_sport_map = {} # path -> list of sport_keys
     
     for sport_key in unique_sports:
-        paths = ESPN_MAP.get(sport_key, [])
+        paths = ESPN_PATHS.get(sport_key, [])
         if isinstance(paths, str): paths = [paths]
         
         for p in paths:
@@ -191,6 +192,7 @@ def fetch_espn_scores(sport_keys, specific_date=None):
                     'id': event['id'],
                     'sport_key': primary_sport, # Assign primary
                     'sport': primary_sport,
+                    'espn_path': path,
                     'home': h_name,
                     'away': a_name,
                     'home_score': h_score,
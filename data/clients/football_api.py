@@ -1,7 +1,7 @@
-import requests
 from datetime import datetime, timedelta
 from config.settings import Config
 from utils.logging import log
+from data.clients.base import http_get
 
 # Will be moved later, but validating import works
 # from models.soccer import SoccerModelV2 # Anticipating move
@@ -32,7 +32,7 @@ def get_soccer_predictions(league_key):
                 headers = {'x-apisports-key': Config.FOOTBALL_API_KEY}
 
                 try:
-                    res = requests.get(url, headers=headers, timeout=10).json()
+                    res = http_get(url, headers=headers, timeout=10).json()
                     if res.get('results', 0) == 0:
                         continue
 
@@ -87,7 +87,7 @@ def get_soccer_predictions(league_key):
                                  continue
                         
                         # Fallback to API
-                        p_res = requests.get(
+                        p_res = http_get(
                             f"https://v3.football.api-sports.io/predictions?fixture={f['fixture']['id']}",
                             headers=headers,
                             timeout=10
@@ -1,6 +1,6 @@
-import requests
 from bs4 import BeautifulSoup
 from utils.logging import log
+from data.clients.base import http_get
 
 def get_nba_refs():
     """
@@ -18,7 +18,7 @@ def get_nba_refs():
     log("REFS", f"Fetching NBA Referee Data from {url}...")
     
     try:
-        res = requests.get(url, headers=headers, timeout=15)
+        res = http_get(url, headers=headers, timeout=15)
         if res.status_code != 200:
             log("WARN", f"Failed to fetch refs: {res.status_code}")
             return []
@@ -1,5 +1,5 @@
-import requests
 from utils.logging import log
+from data.clients.base import http_get
 
 def get_nhl_player_stats(season=20242025):
     """
@@ -13,7 +13,7 @@ def get_nhl_player_stats(season=20242025):
     url = f"https://api.nhle.com/stats/rest/en/skater/summary?isAggregate=false&isGame=false&sort=[{{%22property%22:%22points%22,%22direction%22:%22DESC%22}}]&start=0&limit=-1&cayenneExp=seasonId={season}%20and%20gameTypeId=2"
     
     try:
-        res = requests.get(url, timeout=15).json()
+        res = http_get(url, timeout=15).json()
         if 'data' not in res:
             log("ERROR", "NHL API returned unexpected format")
             return {}
@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from config.settings import Config
 from utils.logging import log
 from data.cache import cache_get, cache_set
 from data.clients.base import BaseAPIClient
 
+PROP_BOOKS = ('draftkings', 'fanduel', 'betmgm', 'caesars')
+PROP_FETCH_WORKERS = 8  # Concurrent event-odds requests per slate
+
 class OddsAPIClient(BaseAPIClient):
     def __init__(self):
         super().__init__("https://api.the-odds-api.com/v4")
@@ -31,94 +35,176 @@ class OddsAPIClient(BaseAPIClient):
         }
         return self.get(f"sports/{sport_key}/events/{event_id}/odds", params=params)
 
-def fetch_prop_odds(sport_key, markets="player_goal_scorer_anytime"):
+class PropOfferTable:
     """
-    Fetch player prop odds from The-Odds-API (Paid Tier).
-    Wrapper to maintain backward compatibility using OddsAPIClient.
+    Columnar store of player prop offers: one row per bookmaker outcome.
+
+    Columns: player, market, book, side, line, price, event. Matchup and
+    commence time are kept once per event. Rows are indexed by
+    (player, market) so consumers query offers directly instead of walking a
+    nested dict.
+    """
+    COLUMNS = ('player', 'market', 'book', 'side', 'line', 'price', 'event')
+
+    def __init__(self):
+        self.columns = {c: [] for c in self.COLUMNS}
+        self.events = {}   # event_id -> {'matchup', 'commence_time'}
+        self._index = {}   # (player, market) -> [row, ...]
+        self._players = {} # player -> [market, ...] (insertion ordered)
+
+    def __len__(self):
+        return len(self.columns['player'])
+
+    def add_event(self, event_id, matchup, commence_time):
+        self.events[event_id] = {'matchup': matchup, 'commence_time': commence_time}
+
+    def append(self, player, market, book, side, line, price, event):
+        row = len(self)
+        for col, val in zip(self.COLUMNS, (player, market, book, side, line, price, event)):
+            self.columns[col].append(val)
+        key = (player, market)
+        if key not in self._index:
+            self._index[key] = []
+            self._players.setdefault(player, []).append(market)
+        self._index[key].append(row)
+
+    def players(self):
+        return list(self._players)
+
+    def markets(self, player):
+        return list(self._players.get(player, ()))
+
+    def offers(self, player, market, side=None):
+        """Offers for one player/market as dicts (book, price, line, side, matchup, commence_time)."""
+        out = []
+        cols = self.columns
+        for row in self._index.get((player, market), ()):
+            if side is not None and cols['side'][row] != side:
+                continue
+            event = self.events.get(cols['event'][row], {})
+            out.append({
+                'book': cols['book'][row],
+                'price': cols['price'][row],
+                'line': cols['line'][row],
+                'matchup': event.get('matchup'),
+                'commence_time': event.get('commence_time'),
+                'side': cols['side'][row],
+                'event_id': cols['event'][row],
+            })
+        return out
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns, columns=list(self.COLUMNS))
+
+    def to_nested(self):
+        """Legacy shape: {player: {market: [offer, ...]}}."""
+        return {p: {m: self.offers(p, m) for m in ms} for p, ms in self._players.items()}
+
+    def to_dict(self):
+        return {'columns': self.columns, 'events': self.events}
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls()
+        table.events = data.get('events', {})
+        cols = data.get('columns', {})
+        for values in zip(*(cols.get(c, []) for c in cls.COLUMNS)):
+            table.append(*values)
+        return table
+
+    def add_event_odds(self, odds_res, books=PROP_BOOKS):
+        """Stream one event-odds response into the table."""
+        event_id = odds_res.get('id')
+        for book in odds_res.get('bookmakers', []):
+            book_id = book['key']
+            if book_id not in books:
+                continue # Filter for main books
+
+            for market in book.get('markets', []):
+                m_key = market['key']
+                for outcome in market.get('outcomes', []):
+                    side_label = outcome.get('name') # Over/Under or Player Name
+                    # Fallback if description is empty (keeps anytime markets alive)
+                    p_name = outcome.get('description') or side_label
+                    self.append(p_name, m_key, book_id, side_label, outcome.get('point'), outcome['price'], event_id)
+
+
+def _upcoming_events(events):
+    """Drop events that have already started (API window is the primary filter)."""
+    upcoming = []
+    now = datetime.now(timezone.utc)
+    for event in events:
+        teams = f"{event['home_team']} vs {event['away_team']}"
+        try:
+            dt_commence = datetime.strptime(event.get('commence_time'), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            if dt_commence < now:
+                log("WARN", f"Skipping Started Game during Props Fetch: {teams}")
+                continue
+        except Exception:
+            pass # Use API filter as primary if parse fails, but proceed
+        upcoming.append(event)
+    return upcoming
+
+
+def fetch_prop_offers(sport_key, markets="player_goal_scorer_anytime", max_workers=PROP_FETCH_WORKERS):
+    """
+    Fetch player prop odds from The-Odds-API (Paid Tier) into a PropOfferTable.
+    Event odds are requested concurrently on the shared per-host connection pool and
+    streamed into the table in slate order as they complete.
     """
+    table = PropOfferTable()
     if not Config.ODDS_API_KEY:
         log("WARN", "No ODDS_API_KEY found.")
-        return {}
-        
+        return table
+
     # Cache Check (2 Mins)
-    cache_key = f"prop_odds_{sport_key}_{markets}"
+    cache_key = f"prop_offers_{sport_key}_{markets}"
     cached = cache_get(cache_key, ttl_seconds=120)
     if cached:
         log("PROPS", f"Using Cached Props for {sport_key}")
-        return cached
-        
+        return PropOfferTable.from_dict(cached)
+
     client = OddsAPIClient()
-    
+
     # 1. Get Events
     try:
         events = client.get_events(sport_key)
     except Exception as e:
         log("ERROR", f"Events API Failed: {e}")
-        return {}
+        return table
 
     if not events or not isinstance(events, list):
         log("ERROR", f"Odds API Events Error: {events}")
-        return {}
-        
-    prop_data = {}
-    
+        return table
+
+    events = _upcoming_events(events)
     for event in events:
-        event_id = event['id']
-        teams = f"{event['home_team']} vs {event['away_team']}"
-        commence_time = event.get('commence_time')
-        
-        # ----------------------------------------------------------------
-        # FILTER: Skip Started Games (Double-Check)
-        # ----------------------------------------------------------------
-        try:
-            dt_commence = datetime.strptime(commence_time, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-            if dt_commence < datetime.now(timezone.utc):
-                log("WARN", f"Skipping Started Game during Props Fetch: {teams}")
+        table.add_event(event['id'], f"{event['home_team']} vs {event['away_team']}", event.get('commence_time'))
+
+    # 2. Fan out event odds (bounded workers, shared connection pool)
+    def _fetch(event):
+        return client.get_event_odds(sport_key, event['id'], markets)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(events)))) as pool:
+        for event, odds_res in zip(events, pool.map(_fetch, events)):
+            if not odds_res:
                 continue
-        except Exception:
-            pass # Use API filter as primary if parse fails, but proceed
-        # ----------------------------------------------------------------
-        
-        # 2. Get Odds per Event
-        odds_res = client.get_event_odds(sport_key, event_id, markets)
-        if not odds_res:
-            continue
-            
-        bookmakers = odds_res.get('bookmakers', [])
-        
-        for book in bookmakers:
-            book_id = book['key']
-            if book_id not in ['draftkings', 'fanduel', 'betmgm', 'caesars']:
-                continue # Filter for main books
-                
-            for market in book.get('markets', []):
-                m_key = market['key']
-                for outcome in market.get('outcomes', []):
-                    p_name = outcome.get('description') # Player Name
-                    side_label = outcome.get('name') # Over/Under or Player Name
-                    
-                    # Fallback if description is empty (sometimes happens in ML, but should vary for props)
-                    if not p_name: 
-                        p_name = side_label # Suspicious fallback but keeps logic alive
-                    
-                    price = outcome['price']
-                    point = outcome.get('point')
-                    
-                    if p_name not in prop_data: prop_data[p_name] = {}
-                    if m_key not in prop_data[p_name]: prop_data[p_name][m_key] = []
-                    
-                    prop_data[p_name][m_key].append({
-                        'book': book_id,
-                        'price': price,
-                        'line': point,
-                        'matchup': teams,
-                        'commence_time': commence_time,
-                        'side': side_label
-                    })
-                    
-    log("PROPS", f"Fetched live odds for {len(prop_data)} players in {sport_key}")
-    
-    if prop_data:
-        cache_set(cache_key, prop_data)
-        
-    return prop_data
+            odds_res.setdefault('id', event['id'])
+            table.add_event_odds(odds_res)
+
+    log("PROPS", f"Fetched {len(table)} live prop offers for {len(table.players())} players in {sport_key}")
+
+    if len(table):
+        cache_set(cache_key, table.to_dict())
+
+    return table
+
+
+def fetch_prop_odds(sport_key, markets="player_goal_scorer_anytime"):
+    """
+    Fetch player prop odds from The-Odds-API (Paid Tier).
+    Backward-compatible nested view over fetch_prop_offers:
+    {player: {market: [offer, ...]}}.
+    """
+    return fetch_prop_offers(sport_key, markets=markets).to_nested()
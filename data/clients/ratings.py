@@ -1,11 +1,14 @@
-import requests
+import difflib
+import threading
+import time
 import pandas as pd
 from io import StringIO
 from datetime import datetime
 from config.settings import Config
 from utils.logging import log
 from utils.math import _num
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait
+from data.clients.base import http_get
 
 def get_current_seasons():
     """Dynamically determine current season years based on date."""
@@ -34,7 +37,7 @@ def _fetch_nfl_ratings(year, headers):
         # Helper inner function for sequential fetches within NFL thread
         def fetch_tr(metric, stat_name):
             try:
-                res = requests.get(f"{base_url}/{metric}", headers=headers, timeout=5)
+                res = http_get(f"{base_url}/{metric}", headers=headers, timeout=5)
                 df = pd.read_html(StringIO(res.text))[0]
                 col = next((c for c in df.columns if year in str(c)), 'Last 3')
                 
@@ -64,11 +67,11 @@ def _fetch_nhl_ratings(year, headers):
         nhl_season = int(year) 
         
         url = f"https://v1.hockey.api-sports.io/standings?league={nhl_id}&season={nhl_season}"
-        res = requests.get(url, headers=nhl_headers, timeout=10).json()
+        res = http_get(url, headers=nhl_headers, timeout=10).json()
 
         if res.get('results', 0) == 0:
             # Fallback
-            res = requests.get(f"https://v1.hockey.api-sports.io/standings?league={nhl_id}&season={nhl_season-1}", headers=nhl_headers, timeout=10).json()
+            res = http_get(f"https://v1.hockey.api-sports.io/standings?league={nhl_id}&season={nhl_season-1}", headers=nhl_headers, timeout=10).json()
 
         if res.get('results', 0) > 0:
             flattened = [item for sublist in res['response'] for item in sublist]
@@ -110,7 +113,7 @@ def _fetch_ncaab_ratings(year, headers):
         kp_headers = {'Authorization': f'Bearer {Config.KENPOM_API_KEY}'}
         url = f"https://kenpom.com/api.php?endpoint=ratings&y={year}"
         
-        res = requests.get(url, headers=kp_headers, timeout=10)
+        res = http_get(url, headers=kp_headers, timeout=10)
         if res.status_code == 200:
             raw_ratings = res.json()
             for t in raw_ratings:
@@ -131,7 +134,7 @@ def _fetch_nba_ratings(year, headers):
     try:
         def fetch_nba_stat(metric, key_name):
             try:
-                r_nba = requests.get(f"https://www.teamrankings.com/nba/stat/{metric}", headers=headers, timeout=10)
+                r_nba = http_get(f"https://www.teamrankings.com/nba/stat/{metric}", headers=headers, timeout=10)
                 df_nba = pd.read_html(StringIO(r_nba.text))[0]
                 # Try finding current year or next year (season logic varies)
                 col_nba = next((c for c in df_nba.columns if year in str(c) or str(int(year)+1) in str(c)), 'Last 3')
@@ -165,56 +168,143 @@ def _fetch_nba_ratings(year, headers):
 
 from data.cache import cache_get, cache_set
 
-def get_team_ratings():
+# Per-source snapshots ('team_ratings_<SPORT>' -> {'fetched_at', 'ratings'}).
+# Each source has its own TTL; past it, the last good copy is still served
+# while a background refresh replaces it.
+RATINGS_KEY = 'team_ratings_{sport}'
+SOURCE_TTLS = {
+    'NFL': 6 * 3600,    # Weekly games; TeamRankings updates after each slate
+    'NHL': 3600,
+    'NCAAB': 3600,
+    'NBA': 3600,
+}
+COLD_START_TIMEOUT = 60  # Max wait for sources with no snapshot on disk at all
+
+_SOURCES = {
+    'NFL': (_fetch_nfl_ratings, 'nfl'),
+    'NHL': (_fetch_nhl_ratings, 'nfl'), # Uses same base year logic usually
+    'NCAAB': (_fetch_ncaab_ratings, 'kenpom'),
+    'NBA': (_fetch_nba_ratings, 'nfl'),
+}
+_refresh_pool = ThreadPoolExecutor(max_workers=len(_SOURCES))
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _refresh_source(sport):
+    """Scrape one source and persist it; a failed or empty scrape leaves the last snapshot in place."""
+    fetch, season = _SOURCES[sport]
+    nfl_year, kenpom_year = get_current_seasons()
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    try:
+        data = fetch(kenpom_year if season == 'kenpom' else nfl_year, headers)
+    except Exception as e:
+        log("ERROR", f"{sport} fetch crashed: {e}")
+        data = None
+    if not data:
+        log("ERROR", f"{sport} ratings returned empty data")
+        return None
+    snapshot = {'fetched_at': time.time(), 'ratings': data}
+    cache_set(RATINGS_KEY.format(sport=sport), snapshot)
+    log("RATINGS", f"✅ Loaded {len(data)} {sport} ratings")
+    return snapshot
+
+def _schedule_refresh(sport):
+    """Future for a refresh of one source (at most one in flight per source)."""
+    with _inflight_lock:
+        future = _inflight.get(sport)
+        if future is None or future.done():
+            future = _refresh_pool.submit(_refresh_source, sport)
+            _inflight[sport] = future
+        return future
+
+def get_team_ratings(freshness=None):
     """
-    Fetch team ratings from multiple sources in parallel.
+    Merged team ratings for all sources, served stale-while-revalidate.
+
+    Fresh snapshots are used as-is; stale ones are returned immediately and
+    refreshed in the background. Only sources with no snapshot at all are
+    fetched inline (in parallel, up to COLD_START_TIMEOUT).
+
+    Args:
+        freshness: Optional dict filled with {sport: {'status', 'fetched_at', 'age_s', 'teams'}}
     RETURNS:
         dict: Merged dictionary of all ratings.
     """
-    # Cache Check (1 Hour TTL)
-    cached = cache_get('team_ratings', ttl_seconds=3600)
-    if cached:
-        log("RATINGS", "✅ Using Cached Ratings")
-        return cached
+    now = time.time()
+    snapshots = {}
+    status = {}
+    missing = {}
+
+    for sport, ttl in SOURCE_TTLS.items():
+        snapshot = cache_get(RATINGS_KEY.format(sport=sport), ttl_seconds=float('inf'))
+        if snapshot and snapshot.get('ratings'):
+            snapshots[sport] = snapshot
+            if now - snapshot['fetched_at'] < ttl:
+                status[sport] = 'fresh'
+            else:
+                status[sport] = 'stale'
+                _schedule_refresh(sport)
+        else:
+            missing[sport] = _schedule_refresh(sport)
+
+    if missing:
+        log("RATINGS", f"No cached ratings for {sorted(missing)}; fetching...")
+        wait(list(missing.values()), timeout=COLD_START_TIMEOUT)
+        for sport, future in missing.items():
+            snapshot = future.result() if future.done() else None
+            if snapshot:
+                snapshots[sport] = snapshot
+                status[sport] = 'fetched'
+            else:
+                status[sport] = 'failed' if future.done() else 'pending'
+
+    stale = [sport for sport, st in status.items() if st == 'stale']
+    if stale:
+        log("RATINGS", f"Serving stale {stale} ratings; refreshing in background")
+    unavailable = [sport for sport, st in status.items() if st in ('failed', 'pending')]
+    if unavailable:
+        log("WARN", f"No ratings available for: {unavailable}")
 
-    log("RATINGS", "Fetching KenPom, NBA, NHL, and NFL data (Parallel)...")
-    
-    nfl_year, kenpom_year = get_current_seasons()
-    # Headers for TeamRankings/general use
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    
     combined_ratings = {}
-    
-    expected_sports = {'NFL', 'NHL', 'NCAAB', 'NBA'} # ideally dynamic from Config
-    failed_sports = []
-    
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        # Submit tasks
-        futures = {
-            executor.submit(_fetch_nfl_ratings, nfl_year, headers): "NFL",
-            executor.submit(_fetch_nhl_ratings, nfl_year, headers): "NHL", # Uses same base year logic usually
-            executor.submit(_fetch_ncaab_ratings, kenpom_year, headers): "NCAAB",
-            executor.submit(_fetch_nba_ratings, nfl_year, headers): "NBA"
-        }
-        
-        for future in as_completed(futures):
-            sport = futures[future]
-            try:
-                data = future.result()
-                if data:
-                    combined_ratings.update(data)
-                    log("RATINGS", f"✅ Loaded {len(data)} {sport} ratings")
-                else:
-                    log("ERROR", f"{sport} ratings returned empty data")
-                    failed_sports.append(sport)
-            except Exception as e:
-                log("ERROR", f"{sport} fetch crashed: {e}")
-                failed_sports.append(sport)
-                
-    # Cache Set ONLY if No Failures
-    if not failed_sports and combined_ratings:
-        cache_set('team_ratings', combined_ratings)
-    elif failed_sports:
-        log("WARN", f"Skipping Cache Update due to failures in: {failed_sports}")
-        
+    for sport in SOURCE_TTLS:
+        if sport in snapshots:
+            combined_ratings.update(snapshots[sport]['ratings'])
+
+    if freshness is not None:
+        for sport, st in status.items():
+            snapshot = snapshots.get(sport)
+            freshness[sport] = {
+                'status': st,
+                'fetched_at': datetime.fromtimestamp(snapshot['fetched_at']).isoformat() if snapshot else None,
+                'age_s': int(now - snapshot['fetched_at']) if snapshot else None,
+                'teams': len(snapshot['ratings']) if snapshot else 0,
+            }
     return combined_ratings
+
+def build_rating_index(ratings, names_by_sport, cutoff=0.75):
+    """
+    Per-sport rating lookup for a slate.
+
+    Args:
+        ratings: Merged ratings from get_team_ratings()
+        names_by_sport: {sport: iterable of team names seen in the odds feed}
+        cutoff: difflib cutoff for names without an exact rating key
+
+    RETURNS:
+        dict: {sport: {team name: rating dict or None}}. Every rating key of the
+        sport is present, plus each slate name resolved once against that
+        sport only; None records a name with no match.
+    """
+    index = {}
+    for name, rating in ratings.items():
+        index.setdefault(rating.get('sport'), {})[name] = rating
+
+    for sport, names in names_by_sport.items():
+        sport_ratings = index.setdefault(sport, {})
+        keys = list(sport_ratings)
+        for name in names:
+            if not name or name in sport_ratings:
+                continue
+            m = difflib.get_close_matches(name, keys, n=1, cutoff=cutoff)
+            sport_ratings[name] = sport_ratings[m[0]] if m else None
+    return index
@@ -0,0 +1,151 @@
+"""
+Shared Live Scores Store
+
+One poller per server refreshes ESPN scoreboards on an interval and publishes
+per-date snapshots to the file cache (data/cache.py). Dashboard sessions and
+the grading job read those snapshots, so ESPN request volume no longer scales
+with the number of viewers.
+
+The dashboard starts the poller in its own process (web/dashboard.py). Run it
+standalone as a background process when the dashboard is not up:
+    python -m data.live_scores
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from data.cache import cache_get, cache_set
+from data.clients.espn import ESPN_PATHS, fetch_espn_scores
+from utils.logging import log
+
+# Sport groups the grader settles against, plus MLB for the dashboard
+LIVE_SCORE_SPORTS = ('NBA', 'NCAAB', 'NHL', 'NFL', 'MLB', 'SOCCER')
+POLL_SECONDS = 45
+HISTORY_POLL_SECONDS = 600  # Earlier dates only change on late finishes/corrections
+HISTORY_DAYS = 4
+
+
+def _cache_key(date_str):
+    return f"live_scores_{date_str}"
+
+
+def recent_dates(days_back=HISTORY_DAYS):
+    """ESPN date strings (US/Eastern) for today and the previous `days_back` days."""
+    now_et = datetime.now(pytz.timezone('US/Eastern'))
+    return [(now_et - timedelta(days=i)).strftime('%Y%m%d') for i in range(days_back + 1)]
+
+
+def _filter_games(games, sport_keys):
+    if not sport_keys: return list(games)
+    paths = {p for k in sport_keys for p in ESPN_PATHS.get(k, [])}
+    return [g for g in games if g.get('espn_path') in paths or g.get('sport_key') in sport_keys]
+
+
+class LiveScoresPoller:
+    """
+    Background thread that keeps the live-scores store warm.
+
+    Today's scoreboard is refreshed every `interval` seconds; the previous
+    `days_back` days every `history_interval` seconds.
+    """
+
+    def __init__(self, sport_keys=LIVE_SCORE_SPORTS, interval=POLL_SECONDS,
+                 history_interval=HISTORY_POLL_SECONDS, days_back=HISTORY_DAYS):
+        self.sport_keys = list(sport_keys)
+        self.interval = interval
+        self.history_interval = history_interval
+        self.days_back = days_back
+        self.updated_at = {}  # date_str -> epoch seconds of last publish
+        self._games = {}      # date_str -> games
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self, now=None):
+        """Refresh every date that is due. Returns the number of dates refreshed."""
+        now = now if now is not None else time.time()
+        dates = recent_dates(self.days_back)
+        refreshed = 0
+        for i, date_str in enumerate(dates):
+            max_age = self.interval if i == 0 else self.history_interval
+            if now - self.updated_at.get(date_str, 0) < max_age:
+                continue
+            games = fetch_espn_scores(self.sport_keys, specific_date=date_str)
+            cache_set(_cache_key(date_str), games)
+            with self._lock:
+                self._games[date_str] = games
+                self.updated_at[date_str] = now
+            refreshed += 1
+
+        # Drop dates that rolled out of the window
+        with self._lock:
+            for stale in set(self._games) - set(dates):
+                self._games.pop(stale, None)
+                self.updated_at.pop(stale, None)
+        return refreshed
+
+    def games(self, sport_keys=None, date_str=None):
+        """Latest in-memory snapshot for one date (default: today ET)."""
+        date_str = date_str or recent_dates(0)[0]
+        with self._lock:
+            games = self._games.get(date_str, [])
+        return _filter_games(games, sport_keys)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                log("WARN", f"Live scores poll failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="live-scores", daemon=True)
+        self._thread.start()
+        log("ESPN", f"📡 Live scores poller started ({self.interval}s)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_live_scores_poller():
+    """Process-wide poller, started on first use."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = LiveScoresPoller().start()
+    return _poller
+
+
+def get_scores(sport_keys, specific_date=None, max_age=HISTORY_POLL_SECONDS * 2):
+    """
+    Scores for `sport_keys` on `specific_date` (default today ET) from the shared
+    store; falls back to a direct ESPN fetch when no poller has published recently.
+    """
+    date_str = specific_date or recent_dates(0)[0]
+    games = cache_get(_cache_key(date_str), ttl_seconds=max_age)
+    if games is None:
+        return fetch_espn_scores(sport_keys, specific_date=date_str)
+    return _filter_games(games, sport_keys)
+
+
+if __name__ == "__main__":
+    poller = LiveScoresPoller()
+    log("ESPN", f"📡 Live scores poller running ({poller.interval}s)")
+    try:
+        poller._run()
+    except KeyboardInterrupt:
+        pass
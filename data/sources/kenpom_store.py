@@ -0,0 +1,111 @@
+"""
+Shared KenPom ratings store.
+
+One name-resolved view of the KenPom efficiency table for every NCAAB
+consumer (processing.markets' V2 features, the H1 feature engine). Ratings
+refresh at most daily and persist through data.cache, so a pipeline run
+starts from disk instead of the API. Fuzzy team-name resolutions are
+memoised (misses included) and persisted alongside, keyed to the ratings
+snapshot they were resolved against; resolve_aliases() warms them for a
+whole slate up front.
+"""
+
+import threading
+import time
+
+from data.cache import cache_get, cache_set
+from data.sources.ncaab_kenpom import KenPomClient
+from utils.logging import log
+from utils.team_names import robust_match_team
+
+RATINGS_KEY = 'kenpom_ratings'
+ALIASES_KEY = 'kenpom_aliases'
+REFRESH_SECONDS = 86400
+MATCH_THRESHOLD = 0.85
+
+
+class KenPomStore:
+    """{Team: {'Team', 'AdjEM', 'AdjO', 'AdjD', 'AdjT'}} plus an alias -> Team memo."""
+
+    def __init__(self, client=None, ttl=REFRESH_SECONDS):
+        self.client = client or KenPomClient()
+        self.ttl = ttl
+        self.teams = {}
+        self.aliases = {}
+        self.version = None  # fetched_at of the loaded snapshot
+        self.loaded_at = 0
+        self.lock = threading.Lock()
+
+    def _load(self):
+        """Fresh disk snapshot, else the API, else a stale disk snapshot."""
+        snapshot = cache_get(RATINGS_KEY, ttl_seconds=self.ttl)
+        if snapshot is None:
+            try:
+                df = self.client.get_efficiency_stats()
+            except Exception as e:
+                log("WARN", f"KenPom fetch failed: {e}")
+                df = None
+            if df is not None and not df.empty:
+                snapshot = {'fetched_at': time.time(), 'teams': df.to_dict('records')}
+                cache_set(RATINGS_KEY, snapshot)
+            else:
+                snapshot = cache_get(RATINGS_KEY, ttl_seconds=float('inf'))
+        if not snapshot:
+            return False
+
+        self.teams = {row['Team']: row for row in snapshot['teams']}
+        self.version = snapshot['fetched_at']
+        saved = cache_get(ALIASES_KEY, ttl_seconds=float('inf')) or {}
+        self.aliases = saved.get('aliases', {}) if saved.get('version') == self.version else {}
+        return True
+
+    def ensure_loaded(self):
+        with self.lock:
+            if self.teams and time.time() - self.loaded_at < self.ttl:
+                return True
+            if self._load():
+                self.loaded_at = time.time()
+                log("KENPOM", f"Loaded {len(self.teams)} teams ({len(self.aliases)} aliases)")
+            return bool(self.teams)
+
+    def _resolve(self, name):
+        if name in self.teams:
+            return name
+        if name not in self.aliases:
+            self.aliases[name] = robust_match_team(name, self.teams, threshold=MATCH_THRESHOLD)
+        return self.aliases[name]
+
+    def resolve(self, name):
+        """KenPom team name for an odds-feed name, or None."""
+        if not name or not self.ensure_loaded():
+            return None
+        return self._resolve(name)
+
+    def get(self, name):
+        """KenPom row for an odds-feed name, or None."""
+        team = self.resolve(name)
+        return self.teams.get(team) if team else None
+
+    def resolve_aliases(self, names):
+        """Resolve every unseen alias in `names` once and persist the memo. Returns the count added."""
+        if not self.ensure_loaded():
+            return 0
+        new = {n for n in names if n and n not in self.teams and n not in self.aliases}
+        for name in new:
+            self._resolve(name)
+        if new:
+            cache_set(ALIASES_KEY, {'version': self.version, 'aliases': self.aliases})
+        return len(new)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_kenpom_store():
+    """Process-wide KenPomStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = KenPomStore()
+        return _store
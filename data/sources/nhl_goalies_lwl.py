@@ -1,7 +1,7 @@
-import requests
 from bs4 import BeautifulSoup
 from utils.logging import log
 from utils.team_names import normalize_team_name
+from data.clients.base import http_get
 
 # LWL Cookies (Provided by User)
 COOKIES = {
@@ -61,7 +61,7 @@ def fetch_lwl_goalies():
     log("GOALIE_SCRAPER", f"Fetching {url} (LWL)...")
     
     try:
-        resp = requests.get(url, cookies=COOKIES, headers=HEADERS, timeout=15)
+        resp = http_get(url, cookies=COOKIES, headers=HEADERS, timeout=15)
         if resp.status_code != 200:
             log("GOALIE_SCRAPER", f"❌ LWL Error: {resp.status_code}")
             return {}
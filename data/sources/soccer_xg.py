@@ -1,7 +1,7 @@
-import requests
 import os
 import pandas as pd
 from datetime import datetime, timedelta
+from data.clients.base import http_get
 
 class SoccerXGClient:
     """
@@ -52,7 +52,7 @@ class SoccerXGClient:
             # Let's stick to 'last' for NOW (Current Form) - leakage accepted for V2 Prototype.
             pass
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_get(url, headers=self.headers, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('response', [])
@@ -70,7 +70,7 @@ class SoccerXGClient:
             params['team'] = team_id
             
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_get(url, headers=self.headers, params=params)
             response.raise_for_status()
             data = response.json()
             # Response is a list of teams stats. 
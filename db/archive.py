@@ -0,0 +1,191 @@
+"""
+intelligence_log archival.
+
+The live table keeps pending bets plus the most recent ARCHIVE_AFTER_MONTHS of
+settled history, so hot-path queries stay small. (Writers upsert with
+ON CONFLICT (event_id), which a partitioned table cannot enforce unless the
+partition key is part of the unique key, so the live table itself stays a
+plain heap.)
+
+Older settled rows move to intelligence_log_history, range-partitioned by
+kickoff month, and each archived month is also written to zstd-compressed
+Parquet under data/archive/intelligence_log/. The intelligence_log_all view
+(live UNION ALL history) keeps analytics and the performance rollups whole.
+
+    python -m db.archive [--months 3] [--no-export] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+from db.connection import get_db
+from utils.logging import log
+
+ARCHIVE_AFTER_MONTHS = 3
+ARCHIVE_DIR = os.path.join('data', 'archive', 'intelligence_log')
+HISTORY_TABLE = 'intelligence_log_history'
+UNION_VIEW = 'intelligence_log_all'
+SETTLED_OUTCOMES = ('WON', 'LOST', 'PUSH', 'HALF_WIN', 'HALF_LOSS')
+
+
+def _columns(cur, table):
+    """[(name, sql_type)] in column order."""
+    cur.execute("""
+        SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+        FROM pg_attribute a
+        WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum
+    """, (table,))
+    return cur.fetchall()
+
+
+def _column_list(cols):
+    return ", ".join(f'"{name}"' for name, _ in cols)
+
+
+def partition_name(month):
+    return f"{HISTORY_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def month_bounds(month):
+    start = date(month.year, month.month, 1)
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, end
+
+
+def archive_cutoff(today=None, months=ARCHIVE_AFTER_MONTHS):
+    """First day of the oldest month that stays live."""
+    today = today or date.today()
+    index = today.year * 12 + (today.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_archive_schema(cur):
+    """
+    History table, default partition, column parity with the live table, and the
+    union view (idempotent; called from init_db and before each archive run).
+    """
+    cur.execute(f"""CREATE TABLE IF NOT EXISTS {HISTORY_TABLE}
+                    (LIKE intelligence_log INCLUDING DEFAULTS) PARTITION BY RANGE (kickoff)""")
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {HISTORY_TABLE}_default PARTITION OF {HISTORY_TABLE} DEFAULT")
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_intel_history_event ON {HISTORY_TABLE} (event_id)")
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_intel_history_settled_at ON {HISTORY_TABLE} (settled_at)")
+
+    # Columns added to the live table since the history table was created
+    live = _columns(cur, 'intelligence_log')
+    have = {name for name, _ in _columns(cur, HISTORY_TABLE)}
+    for name, sql_type in live:
+        if name not in have:
+            cur.execute(f'ALTER TABLE {HISTORY_TABLE} ADD COLUMN IF NOT EXISTS "{name}" {sql_type}')
+    # H2H / recent-form readers (ml_features) filter archived rows by team
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_intel_history_teams ON {HISTORY_TABLE} (sport, home_team, away_team)")
+
+    # Live column order, so new columns append and CREATE OR REPLACE stays valid
+    cols = _column_list(live)
+    cur.execute(f"""CREATE OR REPLACE VIEW {UNION_VIEW} AS
+                    SELECT {cols} FROM intelligence_log
+                    UNION ALL
+                    SELECT {cols} FROM {HISTORY_TABLE}""")
+
+
+def _ensure_month_partition(cur, month):
+    start, end = month_bounds(month)
+    cur.execute(f"""CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {HISTORY_TABLE}
+                    FOR VALUES FROM ('{start}') TO ('{end}')""")
+
+
+def _jsonable(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def export_month(conn, month, archive_dir=ARCHIVE_DIR):
+    """Write one archived month to <archive_dir>/YYYY-MM.parquet. Returns the path (None if empty)."""
+    start, end = month_bounds(month)
+    df = pd.read_sql(f"SELECT * FROM {HISTORY_TABLE} WHERE kickoff >= %s AND kickoff < %s ORDER BY kickoff",
+                     conn, params=(start, end))
+    if df.empty: return None
+
+    # JSON columns (metadata) come back as dicts; store them as JSON text
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(_jsonable)
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{start:%Y-%m}.parquet")
+    df.to_parquet(path, compression='zstd', index=False)
+    return path
+
+
+def archive_settled(conn, months=ARCHIVE_AFTER_MONTHS, export=True, dry_run=False, today=None):
+    """
+    Move settled rows with kickoff before the cutoff month into history, one
+    month per transaction, then export each month to Parquet.
+    Returns {month: rows_moved}.
+    """
+    cutoff = archive_cutoff(today, months)
+    cur = conn.cursor()
+    ensure_archive_schema(cur)
+    conn.commit()
+
+    cur.execute("""
+        SELECT date_trunc('month', kickoff)::date AS month, COUNT(*)
+        FROM intelligence_log
+        WHERE outcome = ANY(%s) AND kickoff < %s
+        GROUP BY 1 ORDER BY 1
+    """, (list(SETTLED_OUTCOMES), cutoff))
+    pending_months = cur.fetchall()
+    if dry_run:
+        for month, n in pending_months:
+            log("ARCHIVE", f"Would archive {n} rows from {month:%Y-%m}")
+        return {month: n for month, n in pending_months}
+
+    cols = _column_list(_columns(cur, 'intelligence_log'))
+    moved = {}
+    for month, _ in pending_months:
+        start, end = month_bounds(month)
+        window = (list(SETTLED_OUTCOMES), start, end)
+        try:
+            _ensure_month_partition(cur, start)
+            # One statement, one snapshot: only rows actually deleted are copied
+            cur.execute(f"""WITH moved AS (
+                                DELETE FROM intelligence_log
+                                WHERE outcome = ANY(%s) AND kickoff >= %s AND kickoff < %s
+                                RETURNING {cols})
+                            INSERT INTO {HISTORY_TABLE} ({cols}) SELECT {cols} FROM moved""", window)
+            moved[start] = cur.rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            log("ERROR", f"Archive of {start:%Y-%m} failed: {e}")
+            continue
+
+        log("ARCHIVE", f"📦 Moved {moved[start]} settled rows from {start:%Y-%m} to {partition_name(start)}")
+        if export:
+            path = export_month(conn, start)
+            if path:
+                log("ARCHIVE", f"🗜️ Wrote {path}")
+
+    cur.close()
+    return moved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive settled intelligence_log history")
+    parser.add_argument('--months', type=int, default=ARCHIVE_AFTER_MONTHS, help="Settled months to keep live")
+    parser.add_argument('--no-export', action='store_true', help="Skip the Parquet export")
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    conn = get_db()
+    if not conn:
+        sys.exit(1)
+    try:
+        archive_settled(conn, months=args.months, export=not args.no_export, dry_run=args.dry_run)
+    finally:
+        conn.close()
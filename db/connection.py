@@ -180,6 +180,30 @@ def init_db():
             cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS ref_2 TEXT")
             cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS ref_3 TEXT")
 
+        # Normalized team columns ("Away @ Home" split) for indexed H2H / recent-form lookups
+        cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS home_team TEXT")
+        cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS away_team TEXT")
+        cur.execute("SELECT 1 FROM pg_indexes WHERE tablename='intelligence_log' AND indexname='idx_intel_sport_home_kickoff'")
+        if not cur.fetchone():
+            # One-time backfill; new rows are populated by PERSIST
+            cur.execute("""
+                UPDATE intelligence_log
+                SET away_team = split_part(teams, ' @ ', 1), home_team = split_part(teams, ' @ ', 2)
+                WHERE home_team IS NULL AND teams LIKE '% @ %'
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_intel_sport_home_kickoff ON intelligence_log (sport, home_team, kickoff)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_intel_sport_away_kickoff ON intelligence_log (sport, away_team, kickoff)")
+
+        # Settlement watermark for incremental dashboard refreshes
+        cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS settled_at TIMESTAMP")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_intel_settled_at ON intelligence_log (settled_at)")
+        cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS net_units FLOAT DEFAULT 0.0")
+        cur.execute("ALTER TABLE intelligence_log ADD COLUMN IF NOT EXISTS accepted BOOLEAN DEFAULT TRUE")
+
+        # Partial/composite indexes for the hot outcome + kickoff queries (db/indexes.py)
+        from db.indexes import ensure_indexes
+        ensure_indexes(cur)
+
         # Player Stats Table (Understat)
         cur.execute('''CREATE TABLE IF NOT EXISTS player_stats (
             id SERIAL PRIMARY KEY,
@@ -221,6 +245,16 @@ def init_db():
             scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )''')
 
+        # Team Defense Ratings (xGA/90 per league, refreshed after Understat sync)
+        cur.execute('''CREATE TABLE IF NOT EXISTS team_defense_ratings (
+            league TEXT,
+            season TEXT,
+            team_name TEXT,
+            xga_per90 REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (league, season, team_name)
+        )''')
+
         # Posted Tweets Table (For Recap)
         cur.execute('''CREATE TABLE IF NOT EXISTS posted_tweets (
             id SERIAL PRIMARY KEY,
@@ -330,6 +364,22 @@ def init_db():
             git_sha TEXT
         )''')
 
+        # Understat scraped-match tracking for the bulk loader (db/player_stats.py)
+        from db.player_stats import ensure_scraped_matches_table
+        ensure_scraped_matches_table(cur)
+
+        # Opportunity metadata side table (db/metadata.py)
+        from db.metadata import ensure_metadata_table
+        ensure_metadata_table(cur)
+
+        # Archived history + intelligence_log_all union view (db/archive.py)
+        from db.archive import ensure_archive_schema
+        ensure_archive_schema(cur)
+
+        # Performance rollups (rebuilt when a definition changes; refreshed after settlement)
+        from db.rollups import create_performance_views
+        create_performance_views(cur)
+
         conn.commit()
     except Exception as e:
         print(f"❌ [DB INIT] {e}")
@@ -386,7 +436,7 @@ def get_calibration(sport):
     try:
         cur = conn.cursor()
         cur.execute(
-            "SELECT true_prob, outcome FROM intelligence_log WHERE sport = %s AND outcome IN ('WON', 'LOST')",
+            "SELECT true_prob, outcome FROM intelligence_log_all WHERE sport = %s AND outcome IN ('WON', 'LOST')",
             (sport,)
         )
         rows = cur.fetchall()
@@ -493,7 +543,7 @@ def get_dynamic_bankroll():
                 when outcome='WON' then (user_stake * (user_odds - 1)) 
                 when outcome='LOST' then -user_stake 
                 else 0 end) 
-            FROM intelligence_log 
+            FROM intelligence_log_all 
             WHERE outcome IN ('WON', 'LOST', 'PUSH') 
             AND user_bet = TRUE
         """)
@@ -0,0 +1,99 @@
+"""
+intelligence_log index management.
+
+Partial and composite indexes matched to the hot queries:
+
+    idx_intel_pending_kickoff   outcome='PENDING' by kickoff (FETCH dedupe, dashboard
+                                pending list, grading's due bets, CLV's kickoff window)
+    idx_intel_settled_kickoff   settled rows by kickoff (dashboard ledger, smart-staking
+                                window, backtests)
+    idx_intel_sport_kickoff     sport + kickoff (per-sport lookups and slates)
+
+`ensure_indexes(cur)` runs from init_db. On a live database use
+    python -m db.indexes --concurrently
+to build without locking writes, and `--usage` to check scan counts.
+"""
+
+import argparse
+import sys
+
+from db.connection import get_db
+from utils.logging import log
+
+SETTLED_OUTCOMES_SQL = "('WON', 'LOST', 'PUSH')"
+
+# name -> index definition (everything after "ON")
+INTELLIGENCE_LOG_INDEXES = {
+    'idx_intel_pending_kickoff': "intelligence_log (kickoff) WHERE outcome = 'PENDING'",
+    'idx_intel_settled_kickoff': f"intelligence_log (kickoff) WHERE outcome IN {SETTLED_OUTCOMES_SQL}",
+    'idx_intel_sport_kickoff': "intelligence_log (sport, kickoff)",
+}
+
+
+def index_ddl(name, concurrently=False):
+    mode = "CONCURRENTLY " if concurrently else ""
+    return f"CREATE INDEX {mode}IF NOT EXISTS {name} ON {INTELLIGENCE_LOG_INDEXES[name]}"
+
+
+def ensure_indexes(cur):
+    """Create any missing intelligence_log indexes (idempotent; runs inside init_db)."""
+    for name in INTELLIGENCE_LOG_INDEXES:
+        cur.execute(index_ddl(name))
+
+
+def missing_indexes(cur):
+    cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'intelligence_log'")
+    present = {row[0] for row in cur.fetchall()}
+    return [name for name in INTELLIGENCE_LOG_INDEXES if name not in present]
+
+
+def build_concurrently(conn):
+    """
+    Build missing indexes with CREATE INDEX CONCURRENTLY (no write lock).
+    Needs autocommit: concurrent builds cannot run inside a transaction.
+    """
+    conn.rollback()  # set_session refuses to run mid-transaction
+    conn.set_session(autocommit=True)  # Method call reaches the pooled connection
+    try:
+        cur = conn.cursor()
+        for name in missing_indexes(cur):
+            log("DB", f"🔨 Building {name} concurrently...")
+            cur.execute(index_ddl(name, concurrently=True))
+        cur.close()
+    finally:
+        conn.set_session(autocommit=False)
+
+
+def index_usage(cur):
+    """(index, scans, size) for intelligence_log indexes, most-used first."""
+    cur.execute("""
+        SELECT indexrelname, idx_scan, pg_size_pretty(pg_relation_size(indexrelid))
+        FROM pg_stat_user_indexes
+        WHERE relname = 'intelligence_log'
+        ORDER BY idx_scan DESC
+    """)
+    return cur.fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage intelligence_log indexes")
+    parser.add_argument('--concurrently', action='store_true', help="Build missing indexes without locking writes")
+    parser.add_argument('--usage', action='store_true', help="Print index scan counts")
+    args = parser.parse_args()
+
+    conn = get_db()
+    if not conn:
+        sys.exit(1)
+    try:
+        if args.concurrently:
+            build_concurrently(conn)
+        else:
+            cur = conn.cursor()
+            ensure_indexes(cur)
+            conn.commit()
+        if args.usage:
+            cur = conn.cursor()
+            for name, scans, size in index_usage(cur):
+                print(f"{name:<36} {scans:>10} scans  {size}")
+    finally:
+        conn.close()
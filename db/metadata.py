@@ -0,0 +1,83 @@
+"""
+Opportunity metadata side table.
+
+Model payloads (feature snapshots, expected totals, ...) live in
+opportunity_metadata (JSONB, keyed by event_id) instead of a wide column on
+intelligence_log, so routine reads of the ledger never detoast them. Rows
+are written in bulk by the persist stage and loaded only on demand.
+"""
+
+from psycopg2.extras import execute_values
+
+from utils.json_codec import dumps
+
+CREATE_OPPORTUNITY_METADATA = """
+    CREATE TABLE IF NOT EXISTS opportunity_metadata (
+        event_id TEXT PRIMARY KEY,
+        metadata JSONB,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+"""
+
+UPSERT_METADATA = """
+    INSERT INTO opportunity_metadata (event_id, metadata, updated_at)
+    VALUES %s
+    ON CONFLICT (event_id) DO UPDATE SET metadata = EXCLUDED.metadata, updated_at = EXCLUDED.updated_at
+"""
+
+# One-time move of legacy intelligence_log.metadata into the side table
+BACKFILL_METADATA = """
+    INSERT INTO opportunity_metadata (event_id, metadata)
+    SELECT event_id, metadata::text::jsonb FROM intelligence_log WHERE metadata IS NOT NULL
+    ON CONFLICT (event_id) DO NOTHING
+"""
+
+
+def ensure_metadata_table(cur):
+    """
+    Create opportunity_metadata; on first creation, move any legacy
+    intelligence_log.metadata payloads across and clear them from the ledger.
+    """
+    cur.execute("SELECT to_regclass('opportunity_metadata')")
+    exists = cur.fetchone()[0] is not None
+    cur.execute(CREATE_OPPORTUNITY_METADATA)
+    if exists:
+        return
+
+    cur.execute("""SELECT 1 FROM information_schema.columns
+                   WHERE table_name = 'intelligence_log' AND column_name = 'metadata'""")
+    if cur.fetchone():
+        cur.execute("SAVEPOINT metadata_backfill")
+        try:
+            cur.execute(BACKFILL_METADATA)
+            cur.execute("UPDATE intelligence_log SET metadata = NULL WHERE metadata IS NOT NULL")
+            cur.execute("RELEASE SAVEPOINT metadata_backfill")
+        except Exception:
+            # Unparseable legacy payloads stay where they are
+            cur.execute("ROLLBACK TO SAVEPOINT metadata_backfill")
+
+
+def upsert_metadata(cur, items, page_size=500):
+    """
+    Bulk upsert. `items` is an iterable of (event_id, metadata_dict); later
+    entries for the same event win. Returns the number of rows written.
+    """
+    rows = {}
+    for event_id, metadata in items:
+        rows[event_id] = dumps(metadata or {})
+    if not rows: return 0
+    execute_values(cur, UPSERT_METADATA, list(rows.items()),
+                   template="(%s, %s::jsonb, NOW())", page_size=page_size)
+    return len(rows)
+
+
+def load_metadata(conn, event_ids):
+    """{event_id: metadata dict} for the given events (missing ids are omitted)."""
+    event_ids = list(event_ids)
+    if not conn or not event_ids: return {}
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT event_id, metadata FROM opportunity_metadata WHERE event_id = ANY(%s)", (event_ids,))
+        return dict(cur.fetchall())
+    finally:
+        cur.close()
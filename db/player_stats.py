@@ -0,0 +1,233 @@
+"""
+Bulk loader for Understat player_stats / matches.
+
+The sync stages a batch of scraped matches (up to a league-season), builds
+the row tuples in Python and upserts each table with one execute_values
+call per page, in a single transaction. Scraped match ids are tracked in
+understat_scraped_matches (keyed by match_id, indexed by league/season) so
+the sync no longer scans player_stats for DISTINCT match_id.
+"""
+
+import logging
+
+from psycopg2.extras import execute_values
+
+from utils.math import _to_python_scalar
+
+logger = logging.getLogger("UnderstatLoader")
+
+CREATE_SCRAPED_MATCHES = """
+    CREATE TABLE IF NOT EXISTS understat_scraped_matches (
+        match_id TEXT PRIMARY KEY,
+        league TEXT,
+        season TEXT,
+        scraped_at TIMESTAMP DEFAULT NOW()
+    )
+"""
+
+# One-time seed from matches already loaded before the tracking table existed
+BACKFILL_SCRAPED_MATCHES = """
+    INSERT INTO understat_scraped_matches (match_id, league, season)
+    SELECT match_id, MAX(league), MAX(season) FROM player_stats GROUP BY match_id
+    ON CONFLICT (match_id) DO NOTHING
+"""
+
+UPSERT_PLAYER_STATS = """
+    INSERT INTO player_stats (
+        match_id, player_id, team_id, team_name, player_name, position,
+        minutes, shots, goals, assists, xg, xa,
+        xg_chain, xg_buildup, season, league
+    ) VALUES %s
+    ON CONFLICT (match_id, player_id) DO UPDATE SET
+        team_name = EXCLUDED.team_name,
+        season = EXCLUDED.season, -- Ensure season is filled
+        league = EXCLUDED.league
+"""
+
+UPSERT_MATCHES = """
+    INSERT INTO matches (
+        match_id, league, season, date,
+        home_team, away_team,
+        home_goals, away_goals,
+        home_xg, away_xg,
+        forecast_w, forecast_d, forecast_l
+    ) VALUES %s
+    ON CONFLICT (match_id) DO UPDATE SET
+        league = EXCLUDED.league,
+        season = EXCLUDED.season,
+        date = EXCLUDED.date,
+        home_team = EXCLUDED.home_team,
+        away_team = EXCLUDED.away_team,
+        home_goals = EXCLUDED.home_goals,
+        away_goals = EXCLUDED.away_goals,
+        home_xg = EXCLUDED.home_xg,
+        away_xg = EXCLUDED.away_xg,
+        forecast_w = EXCLUDED.forecast_w,
+        forecast_d = EXCLUDED.forecast_d,
+        forecast_l = EXCLUDED.forecast_l
+"""
+
+MARK_SCRAPED = """
+    INSERT INTO understat_scraped_matches (match_id, league, season, scraped_at)
+    VALUES %s
+    ON CONFLICT (match_id) DO UPDATE SET scraped_at = EXCLUDED.scraped_at
+"""
+
+
+def ensure_scraped_matches_table(cur):
+    """Create the tracking table (seeding it from player_stats on first creation)."""
+    cur.execute("SELECT to_regclass('understat_scraped_matches')")
+    exists = cur.fetchone()[0] is not None
+    cur.execute(CREATE_SCRAPED_MATCHES)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_understat_scraped_league_season "
+                "ON understat_scraped_matches (league, season)")
+    if not exists:
+        cur.execute(BACKFILL_SCRAPED_MATCHES)
+
+
+def get_scraped_match_ids(conn, league=None, season=None):
+    """Set of scraped match ids (optionally for one league/season)."""
+    cur = conn.cursor()
+    try:
+        if league is None:
+            cur.execute("SELECT match_id FROM understat_scraped_matches")
+        else:
+            cur.execute("SELECT match_id FROM understat_scraped_matches WHERE league = %s AND season = %s",
+                        (league, str(season)))
+        return {row[0] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def player_rows(match_data, league, season):
+    """player_stats tuples for one scraped match."""
+    match_id = str(match_data['match_id'])
+    return [(
+        match_id,
+        p.get('id'),
+        p.get('team_id'),
+        p.get('team_name'),
+        p.get('player'),
+        p.get('position'),
+        int(p.get('time', 0)),
+        int(p.get('shots', 0)),
+        int(p.get('goals', 0)),
+        int(p.get('assists', 0)),
+        float(p.get('xG', 0)),
+        float(p.get('xA', 0)),
+        float(p.get('xGChain', 0)),
+        float(p.get('xGBuildup', 0)),
+        season,
+        league
+    ) for p in match_data.get('players', [])]
+
+
+def match_row(match_data, league, season):
+    """
+    matches tuple for one scraped match, or None when the payload looks empty
+    (goals and xG all zero - not a played match).
+    """
+    match_id = match_data['match_id']
+
+    # Check for flat match_info structure (Selenium)
+    match_info = match_data.get('match_info')
+
+    if match_info:
+        # Flat Structure
+        h_title = match_info.get('team_h')
+        a_title = match_info.get('team_a')
+        h_goals = int(match_info.get('h_goals', 0))
+        a_goals = int(match_info.get('a_goals', 0))
+        h_xg = float(match_info.get('h_xg', 0))
+        a_xg = float(match_info.get('a_xg', 0))
+
+        # Forecast (h_w = Home Win Prob)
+        f_w = float(match_info.get('h_w', 0))
+        f_d = float(match_info.get('h_d', 0))
+        f_l = float(match_info.get('h_l', 0))
+
+        date_val = match_info.get('date')
+    else:
+        # Fallback to Nested Structure (Legacy/Requests)
+        h = match_data.get('h', {})
+        a = match_data.get('a', {})
+        forecast = match_data.get('forecast', {})
+
+        h_title = h.get('title')
+        a_title = a.get('title')
+        h_goals = int(h.get('goals', match_data.get('goals', {}).get('h', 0)))
+        a_goals = int(a.get('goals', match_data.get('goals', {}).get('a', 0)))
+        h_xg = float(h.get('xG', 0))
+        a_xg = float(a.get('xG', 0))
+
+        f_w = float(forecast.get('w', 0))
+        f_d = float(forecast.get('d', 0))
+        f_l = float(forecast.get('l', 0))
+        date_val = match_data.get('date')
+
+    # VALIDATION: Reject suspicious zeros (both goals AND xG are 0)
+    # Exact 0.0 xG is extremely rare for a played match.
+    if h_goals == 0 and a_goals == 0 and h_xg == 0.0 and a_xg == 0.0:
+        return None
+
+    return (
+        str(match_id), league, str(season), date_val,
+        h_title, a_title,
+        h_goals, a_goals,
+        h_xg, a_xg,
+        f_w, f_d, f_l
+    )
+
+
+def stage_matches(matches, league, season):
+    """
+    Build (player_rows, match_rows, saved_ids, skipped_ids) for a batch of
+    scraped matches. Later duplicates of a (match_id, player_id) key win, since
+    one upsert statement cannot touch the same row twice.
+    """
+    players, match_rows, saved, skipped = {}, {}, [], []
+    for data in matches:
+        match_id = str(data['match_id'])
+        try:
+            row = match_row(data, league, season)
+            rows = player_rows(data, league, season)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Unparseable payload for {match_id}: {e}")
+            skipped.append(match_id)
+            continue
+        if row is None:
+            logger.warning(f"⚠️ SUSPICIOUS DATA for {match_id}: Goals=0, xG=0. Skipping save.")
+            skipped.append(match_id)
+            continue
+        for r in rows:
+            players[(r[0], r[1])] = tuple(_to_python_scalar(v) for v in r)
+        if match_id not in match_rows:
+            saved.append(match_id)
+        match_rows[match_id] = row
+    return list(players.values()), list(match_rows.values()), saved, skipped
+
+
+def bulk_save_matches(conn, matches, league, season, page_size=1000):
+    """
+    Upsert a batch of scraped matches in one transaction.
+    Returns (saved_ids, skipped_ids); raises (after rollback) on DB errors.
+    """
+    players, match_rows, saved, skipped = stage_matches(matches, league, season)
+    if not saved:
+        return saved, skipped
+
+    cur = conn.cursor()
+    try:
+        execute_values(cur, UPSERT_PLAYER_STATS, players, page_size=page_size)
+        execute_values(cur, UPSERT_MATCHES, match_rows, page_size=page_size)
+        execute_values(cur, MARK_SCRAPED, [(mid, league, str(season)) for mid in saved],
+                       template="(%s, %s, %s, NOW())", page_size=page_size)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    logger.info(f"Saved {len(saved)} matches / {len(players)} player rows for {league} {season}")
+    return saved, skipped
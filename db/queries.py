@@ -1,7 +1,10 @@
 """Named database queries and data access layer."""
 
+import threading
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from db.rollups import fetch_performance, refresh_performance_views, SETTLED_OUTCOMES
 
 # --- SQL Template Constants ---
 
@@ -17,25 +20,69 @@ PENDING_OPPORTUNITIES = """
     LIMIT %(limit)s
 """
 
+# Settled history reads the live + archived union (db/archive.py)
 SETTLED_BETS = """
     SELECT 
         event_id, timestamp, kickoff, sport, teams, selection,
         odds, true_prob, edge, stake, outcome, user_bet, user_odds, user_stake,
-        sharp_score, ticket_pct, money_pct, trigger_type
-    FROM intelligence_log 
+        sharp_score, ticket_pct, money_pct, trigger_type, settled_at
+    FROM intelligence_log_all 
     WHERE outcome IN ('WON', 'LOST', 'PUSH') 
     ORDER BY kickoff DESC
 """
 
+# Incremental pull: rows (re)settled at or after the watermark
+SETTLED_BETS_SINCE = """
+    SELECT 
+        event_id, timestamp, kickoff, sport, teams, selection,
+        odds, true_prob, edge, stake, outcome, user_bet, user_odds, user_stake,
+        sharp_score, ticket_pct, money_pct, trigger_type, settled_at
+    FROM intelligence_log_all 
+    WHERE outcome IN ('WON', 'LOST', 'PUSH') 
+    AND settled_at >= %(since)s
+"""
+
+# Grading: pending bets whose game has started
+PENDING_TO_GRADE = """
+    SELECT event_id, sport, selection, teams, odds, stake 
+    FROM intelligence_log 
+    WHERE outcome = 'PENDING' AND kickoff < NOW()
+"""
+
+# CLV: pending bets kicking off within the closing-line window
+PENDING_NEAR_KICKOFF = """
+    SELECT event_id, sport, teams, selection, odds, kickoff
+    FROM intelligence_log
+    WHERE outcome = 'PENDING'
+    AND kickoff BETWEEN NOW() AND NOW() + %(window)s::interval
+"""
+
 DISTINCT_SPORTS = "SELECT DISTINCT sport FROM intelligence_log"
 
+# Settlement: outcome plus authoritative net_units / settled_at, with the same
+# defaults as processing/grading.py (1u stake, 2.0 odds when missing).
+# SettledLedger and the rollups pick rows up by settled_at.
+NET_UNITS_SQL = """CASE {outcome}
+            WHEN 'WON' THEN COALESCE(NULLIF({t}stake, 0), 1.0) * (COALESCE(NULLIF({t}odds, 0), 2.0) - 1.0)
+            WHEN 'LOST' THEN -COALESCE(NULLIF({t}stake, 0), 1.0)
+            ELSE 0.0 END"""
+
+SETTLE_OUTCOME = f"""
+    UPDATE intelligence_log 
+    SET outcome = %(outcome)s, 
+        net_units = {NET_UNITS_SQL.format(outcome='%(outcome)s', t='')}, 
+        settled_at = NOW() 
+    WHERE event_id = %(event_id)s
+"""
+
 UPDATE_USER_BET = """
     UPDATE intelligence_log 
     SET user_bet = TRUE, user_odds = %s, user_stake = %s 
     WHERE event_id = %s
+    RETURNING outcome
 """
 
-CANCEL_USER_BET = "UPDATE intelligence_log SET user_bet = FALSE WHERE event_id = %s"
+CANCEL_USER_BET = "UPDATE intelligence_log SET user_bet = FALSE WHERE event_id = %s RETURNING outcome"
 
 CHECK_EVENT_EXISTS = "SELECT event_id FROM intelligence_log WHERE event_id = %s"
 
@@ -58,6 +105,78 @@ def fetch_settled_bets(conn) -> pd.DataFrame:
     if not conn: return pd.DataFrame()
     return pd.read_sql(SETTLED_BETS, conn)
 
+def fetch_settled_since(conn, since) -> pd.DataFrame:
+    """Fetch settled bets whose settled_at is at or after `since`."""
+    if not conn: return pd.DataFrame()
+    return pd.read_sql(SETTLED_BETS_SINCE, conn, params={'since': since})
+
+def fetch_settled_rollup(conn, since=None) -> pd.DataFrame:
+    """
+    Per-sport totals (bets, wins, stake, profit, odds_sum) for tracked settled bets,
+    optionally limited to kickoff days on/after `since`. Read from the perf_daily
+    rollup (see db/rollups.py), so cost scales with days, not bets.
+    """
+    cols = ['sport', 'bets', 'wins', 'stake', 'profit', 'odds_sum']
+    if not conn: return pd.DataFrame(columns=cols)
+    if since is not None:
+        # kickoff is stored as naive UTC
+        since = pd.Timestamp(since)
+        if since.tzinfo is not None:
+            since = since.tz_convert('UTC').tz_localize(None)
+        since = since.date()
+    df = fetch_performance(conn, by=('sport',), user_bet=True, kickoff_since=since)
+    df = df.rename(columns={'dash_stake': 'stake', 'dash_profit': 'profit', 'dash_odds_sum': 'odds_sum'})
+    return df.reindex(columns=cols)
+
+
+class SettledLedger:
+    """
+    In-process cache of the settled ledger.
+
+    The first refresh pulls full history; later refreshes fetch only rows with
+    settled_at at/after the high-water mark, less `overlap`, and upsert them by
+    event_id (regrades replace the old row). settled_at is NOW(), the grading
+    transaction's start time, so a transaction that commits after a pull can
+    stamp rows below that pull's watermark; the overlap re-reads them. A
+    periodic full reload picks up deletes and rows settled without a timestamp.
+    Shared across dashboard sessions, so refresh() is serialized.
+    """
+
+    def __init__(self, full_reload_seconds=3600, overlap=timedelta(minutes=5)):
+        self.full_reload_seconds = full_reload_seconds
+        self.overlap = overlap
+        self.frame = pd.DataFrame()
+        self.watermark = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _full_reload_due(self):
+        if self._loaded_at is None or self.watermark is None:
+            return True
+        return (datetime.now() - self._loaded_at).total_seconds() > self.full_reload_seconds
+
+    def refresh(self, conn) -> pd.DataFrame:
+        if not conn: return self.frame
+        with self._lock:
+            return self._refresh(conn)
+
+    def _refresh(self, conn) -> pd.DataFrame:
+        if self._full_reload_due():
+            self.frame = fetch_settled_bets(conn).reset_index(drop=True)
+            self._loaded_at = datetime.now()
+        else:
+            new = fetch_settled_since(conn, self.watermark - self.overlap)
+            if not new.empty:
+                kept = self.frame[~self.frame['event_id'].isin(new['event_id'])]
+                self.frame = pd.concat([new, kept], ignore_index=True) \
+                    .sort_values('kickoff', ascending=False, kind='stable').reset_index(drop=True)
+
+        if 'settled_at' in self.frame.columns and self.frame['settled_at'].notna().any():
+            # Inclusive watermark (>=) so rows committed in the same instant are not missed
+            self.watermark = self.frame['settled_at'].max()
+        return self.frame
+
+
 def fetch_distinct_sports(conn) -> list:
     """Fetch list of unique sports found in the logs."""
     if not conn: return []
@@ -77,8 +196,11 @@ def update_user_bet(conn, event_id: str, odds: float, stake: float) -> int:
         cur = conn.cursor()
         cur.execute(UPDATE_USER_BET, (odds, stake, str(event_id)))
         rows = cur.rowcount
+        settled = any(r[0] in SETTLED_OUTCOMES for r in cur.fetchall())
         conn.commit()
         cur.close()
+        if settled:  # Tracked settled bets feed the perf_daily rollup
+            refresh_performance_views(conn)
         return rows
     except Exception as e:
         print(f"❌ DB Update Error: {e}")
@@ -95,8 +217,11 @@ def cancel_user_bet(conn, event_id: str) -> int:
         cur = conn.cursor()
         cur.execute(CANCEL_USER_BET, (str(event_id),))
         rows = cur.rowcount
+        settled = any(r[0] in SETTLED_OUTCOMES for r in cur.fetchall())
         conn.commit()
         cur.close()
+        if settled:
+            refresh_performance_views(conn)
         return rows
     except Exception as e:
         print(f"❌ DB Cancel Error: {e}")
@@ -0,0 +1,301 @@
+"""
+Performance rollups (Postgres materialized views).
+
+Settled history (live + archived, via intelligence_log_all) is summarized
+once per settlement run into small O(days) tables; the dashboard and recap
+jobs read these instead of raw bets.
+
+    perf_daily        kickoff/settle day x sport x market x edge/odds bucket x outcome
+    perf_clv_daily    kickoff day x sport x CLV sign
+    perf_calibration  calibration bucket
+
+`refresh_performance_views()` is called by every settler after it grades
+bets and by the dashboard when a settled bet's tracking changes. Each view
+carries a signature of its definition; create_performance_views() drops and
+rebuilds any view whose definition changed.
+"""
+
+import hashlib
+
+import pandas as pd
+
+from db.connection import get_db
+from utils.logging import log
+
+SETTLED_OUTCOMES = ('WON', 'LOST', 'PUSH')
+
+# Mirrors scripts/daily_email_recap.categorize_market
+MARKET_TYPE_SQL = """
+    CASE
+        WHEN lower(selection) LIKE '%over%' OR lower(selection) LIKE '%under%' THEN 'Total'
+        WHEN lower(selection) LIKE '% ml%' OR lower(selection) LIKE '%moneyline%' THEN 'Moneyline'
+        WHEN selection LIKE '%+%' OR selection LIKE '%-%' THEN 'Spread'
+        ELSE 'Prop/Other'
+    END
+"""
+
+# Mirrors processing/backtesting.analyze_by_edge_bucket bins (right-inclusive)
+EDGE_BUCKET_SQL = """
+    CASE
+        WHEN edge IS NULL THEN 'Unknown'
+        WHEN edge <= 0 THEN '<0%'
+        WHEN edge <= 0.03 THEN '0-3%'
+        WHEN edge <= 0.06 THEN '3-6%'
+        WHEN edge <= 0.10 THEN '6-10%'
+        ELSE '10%+'
+    END
+"""
+
+# Mirrors scripts/daily_email_recap.categorize_odds
+ODDS_BUCKET_SQL = """
+    CASE
+        WHEN odds IS NULL THEN 'Unknown'
+        WHEN odds < 1.50 THEN 'Heavy Favorites (<1.50)'
+        WHEN odds <= 2.20 THEN 'Coin Flip (1.50-2.20)'
+        WHEN odds <= 3.00 THEN 'Small Dogs (2.20-3.00)'
+        ELSE 'Longshots (>3.00)'
+    END
+"""
+
+EDGE_BUCKET_ORDER = ['<0%', '0-3%', '3-6%', '6-10%', '10%+']
+
+CREATE_PERF_DAILY = f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS perf_daily AS
+    WITH b AS (
+        SELECT
+            date(kickoff) AS kickoff_day,
+            date(timezone('US/Eastern', timezone('UTC', settled_at))) AS settle_day,
+            sport,
+            {MARKET_TYPE_SQL} AS market_type,
+            {EDGE_BUCKET_SQL} AS edge_bucket,
+            {ODDS_BUCKET_SQL} AS odds_bucket,
+            outcome,
+            COALESCE(user_bet, FALSE) AS user_bet,
+            COALESCE(accepted, TRUE) AS accepted,
+            edge, odds, stake, net_units,
+            -- Dashboard convention: user values first, stake floored at $1
+            GREATEST(1.0, COALESCE(user_stake, stake, 0)) AS dash_stake,
+            COALESCE(user_odds, odds, 0) AS dash_odds,
+            -- daily_recap convention: missing user stake = 100, odds = 1.91
+            COALESCE(NULLIF(user_stake, 0), 100.0) AS recap_stake,
+            COALESCE(NULLIF(user_odds, 0), 1.91) AS recap_odds
+        FROM intelligence_log_all
+        WHERE outcome IN ('WON', 'LOST', 'PUSH', 'HALF_WIN', 'HALF_LOSS')
+    )
+    SELECT
+        kickoff_day, settle_day, sport, market_type, edge_bucket, odds_bucket,
+        outcome, user_bet, accepted,
+        COUNT(*) AS bets,
+        SUM(edge) AS edge_sum,
+        COUNT(edge) AS edge_n,
+        SUM(COALESCE(stake, 1.0)) AS stake_sum,
+        SUM(stake) AS model_stake,
+        SUM(CASE outcome WHEN 'WON' THEN stake * (odds - 1) WHEN 'LOST' THEN -stake ELSE 0 END) AS model_profit,
+        SUM(net_units) AS net_units,
+        COUNT(*) FILTER (WHERE net_units IS NULL) AS null_net_units,
+        SUM(dash_stake) AS dash_stake,
+        SUM(CASE outcome WHEN 'WON' THEN dash_stake * (dash_odds - 1) WHEN 'LOST' THEN -dash_stake ELSE 0 END) AS dash_profit,
+        SUM(dash_odds) AS dash_odds_sum,
+        SUM(recap_stake) AS recap_stake,
+        SUM(CASE outcome WHEN 'WON' THEN recap_stake * (recap_odds - 1) WHEN 'LOST' THEN -recap_stake ELSE 0 END) AS recap_pnl
+    FROM b
+    GROUP BY kickoff_day, settle_day, sport, market_type, edge_bucket, odds_bucket, outcome, user_bet, accepted
+"""
+
+# Mirrors processing/backtesting.analyze_clv
+CREATE_PERF_CLV = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS perf_clv_daily AS
+    WITH b AS (
+        SELECT
+            date(kickoff) AS kickoff_day,
+            sport, outcome, odds, stake,
+            (odds - closing_odds) / NULLIF(odds, 0) * 100 AS clv
+        FROM intelligence_log_all
+        WHERE outcome IN ('WON', 'LOST', 'PUSH')
+        AND closing_odds IS NOT NULL AND closing_odds <> odds
+    )
+    SELECT
+        kickoff_day, sport,
+        CASE WHEN clv > 0 THEN 'positive' WHEN clv < 0 THEN 'negative' ELSE 'zero' END AS clv_sign,
+        COUNT(*) AS bets,
+        SUM(clv) AS clv_sum,
+        SUM(stake) AS model_stake,
+        SUM(CASE outcome WHEN 'WON' THEN stake * (odds - 1) WHEN 'LOST' THEN -stake ELSE 0 END) AS model_profit
+    FROM b
+    GROUP BY kickoff_day, sport, clv_sign
+"""
+
+CREATE_PERF_CALIBRATION = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS perf_calibration AS
+    SELECT
+        c.bucket,
+        COUNT(*) AS bets,
+        COUNT(*) FILTER (WHERE i.outcome = 'WON') AS wins
+    FROM calibration_log c
+    JOIN intelligence_log_all i ON c.event_id = i.event_id
+    WHERE i.outcome IN ('WON', 'LOST')
+    GROUP BY c.bucket
+"""
+
+# DDL runs without bind params, so % is literal above.
+# Unique indexes allow REFRESH ... CONCURRENTLY (readers are never blocked)
+VIEW_INDEXES = [
+    """CREATE UNIQUE INDEX IF NOT EXISTS uq_perf_daily ON perf_daily
+       (kickoff_day, settle_day, sport, market_type, edge_bucket, odds_bucket, outcome, user_bet, accepted)""",
+    "CREATE INDEX IF NOT EXISTS idx_perf_daily_settle ON perf_daily (settle_day)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_perf_clv_daily ON perf_clv_daily (kickoff_day, sport, clv_sign)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_perf_calibration ON perf_calibration (bucket)",
+]
+
+VIEW_DEFINITIONS = {
+    'perf_daily': CREATE_PERF_DAILY,
+    'perf_clv_daily': CREATE_PERF_CLV,
+    'perf_calibration': CREATE_PERF_CALIBRATION,
+}
+PERFORMANCE_VIEWS = tuple(VIEW_DEFINITIONS)
+
+
+def view_signature(ddl):
+    """Stored as the view's comment; changes whenever the definition does."""
+    return "rollup:" + hashlib.sha1(" ".join(ddl.split()).encode()).hexdigest()[:12]
+
+
+def create_performance_views(cur):
+    """
+    Create the rollup views and their indexes (idempotent; called from init_db).
+    A view whose stored signature differs from its current definition is
+    dropped and rebuilt, so edited definitions take effect on the next init_db.
+    """
+    for view, ddl in VIEW_DEFINITIONS.items():
+        signature = view_signature(ddl)
+        cur.execute("SELECT obj_description(to_regclass(%s), 'pg_class')", (view,))
+        row = cur.fetchone()
+        if row and row[0] == signature:
+            continue
+        log("ROLLUP", f"Building {view} ({signature})")
+        cur.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view} CASCADE")
+        cur.execute(ddl)
+        cur.execute(f"COMMENT ON MATERIALIZED VIEW {view} IS %s", (signature,))
+    for ddl in VIEW_INDEXES:
+        cur.execute(ddl)
+
+
+def refresh_performance_views(conn=None):
+    """Refresh all rollups after settlement. Returns True on success."""
+    own = conn is None
+    conn = conn or get_db()
+    if not conn: return False
+    try:
+        cur = conn.cursor()
+        for view in PERFORMANCE_VIEWS:
+            cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+        conn.commit()
+        log("ROLLUP", f"♻️ Refreshed {len(PERFORMANCE_VIEWS)} performance views")
+        return True
+    except Exception as e:
+        conn.rollback()
+        log("ERROR", f"Performance view refresh failed: {e}")
+        return False
+    finally:
+        if own:
+            conn.close()
+
+
+# --- Readers ---
+
+def fetch_performance(conn, by=('sport',), outcomes=SETTLED_OUTCOMES, kickoff_since=None,
+                      kickoff_day=None, settle_day=None, user_bet=None, accepted=None, positive_edge=False):
+    """
+    Sum perf_daily measures grouped by `by` (any perf_daily dimension).
+    Adds a `wins`/`losses`/`pushes` breakdown from the outcome dimension.
+    """
+    if not conn: return pd.DataFrame()
+    dims = list(by)
+    where = ["outcome = ANY(%(outcomes)s)"]
+    params = {'outcomes': list(outcomes)}
+    if kickoff_since is not None:
+        where.append("kickoff_day >= %(kickoff_since)s"); params['kickoff_since'] = kickoff_since
+    if kickoff_day is not None:
+        where.append("kickoff_day = %(kickoff_day)s"); params['kickoff_day'] = kickoff_day
+    if settle_day is not None:
+        where.append("settle_day = %(settle_day)s"); params['settle_day'] = settle_day
+    if user_bet is not None:
+        where.append("user_bet = %(user_bet)s"); params['user_bet'] = user_bet
+    if accepted is not None:
+        where.append("accepted = %(accepted)s"); params['accepted'] = accepted
+    if positive_edge:
+        where.append("edge_bucket NOT IN ('<0%%', 'Unknown')")
+
+    measures = ['bets', 'edge_sum', 'edge_n', 'stake_sum', 'model_stake', 'model_profit', 'net_units',
+                'null_net_units', 'dash_stake', 'dash_profit', 'dash_odds_sum', 'recap_stake', 'recap_pnl']
+    select = ", ".join(dims + [f"SUM({m}) AS {m}" for m in measures] + [
+        "SUM(bets) FILTER (WHERE outcome = 'WON') AS wins",
+        "SUM(bets) FILTER (WHERE outcome = 'LOST') AS losses",
+        "SUM(bets) FILTER (WHERE outcome = 'PUSH') AS pushes",
+    ])
+    sql = f"SELECT {select} FROM perf_daily WHERE {' AND '.join(where)}"
+    if dims:
+        sql += f" GROUP BY {', '.join(dims)}"
+
+    df = pd.read_sql(sql, conn, params=params)
+    for c in df.columns:
+        if c not in dims:
+            df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+    return df
+
+
+def fetch_edge_bucket_summary(conn, **filters):
+    """Same shape as processing.backtesting.analyze_by_edge_bucket, from perf_daily."""
+    df = fetch_performance(conn, by=('edge_bucket',), **filters)
+    out = []
+    for _, r in df[df['edge_bucket'].isin(EDGE_BUCKET_ORDER)].iterrows():
+        decided = r['wins'] + r['losses']
+        out.append({
+            'edge_bucket': r['edge_bucket'],
+            'count': int(r['bets']),
+            'win_rate': round(r['wins'] / decided * 100, 2) if decided > 0 else 0,
+            'profit': round(r['model_profit'], 2),
+            'roi': round(r['model_profit'] / r['model_stake'] * 100, 2) if r['model_stake'] > 0 else 0,
+            'avg_edge': round(r['edge_sum'] / r['edge_n'] * 100, 2) if r['edge_n'] > 0 else 0,
+        })
+    return sorted(out, key=lambda x: x['avg_edge'])
+
+
+def fetch_clv_summary(conn, kickoff_since=None):
+    """Same shape as processing.backtesting.analyze_clv, from perf_clv_daily."""
+    if not conn: return {}
+    sql = "SELECT clv_sign, SUM(bets) AS bets, SUM(clv_sum) AS clv_sum, " \
+          "SUM(model_stake) AS model_stake, SUM(model_profit) AS model_profit FROM perf_clv_daily"
+    params = {}
+    if kickoff_since is not None:
+        sql += " WHERE kickoff_day >= %(since)s"; params['since'] = kickoff_since
+    df = pd.read_sql(sql + " GROUP BY clv_sign", conn, params=params).set_index('clv_sign')
+    df = df.apply(pd.to_numeric, errors='coerce').fillna(0)
+    total = int(df['bets'].sum())
+    if total == 0:
+        return {}
+
+    def side(sign, col):
+        return float(df.loc[sign, col]) if sign in df.index else 0.0
+
+    def roi(sign):
+        stake = side(sign, 'model_stake')
+        return side(sign, 'model_profit') / stake * 100 if stake > 0 else 0
+
+    positive = int(side('positive', 'bets'))
+    return {
+        'total_with_clv': total,
+        'avg_clv': round(df['clv_sum'].sum() / total, 2),
+        'positive_clv_count': positive,
+        'positive_clv_pct': round(positive / total * 100, 2),
+        'positive_clv_roi': round(roi('positive'), 2),
+        'negative_clv_roi': round(roi('negative'), 2),
+    }
+
+
+def fetch_calibration_summary(conn):
+    """Calibration buckets with bets/wins (perf_calibration)."""
+    if not conn: return pd.DataFrame(columns=['bucket', 'bets', 'wins'])
+    df = pd.read_sql("SELECT bucket, bets, wins FROM perf_calibration ORDER BY bucket", conn)
+    df[['bets', 'wins']] = df[['bets', 'wins']].apply(pd.to_numeric, errors='coerce').fillna(0).astype(int)
+    return df
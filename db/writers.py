@@ -0,0 +1,118 @@
+"""Buffered bulk writers for intelligence_log."""
+
+from psycopg2.extras import execute_values
+
+from db.connection import get_db
+from utils.errors import PersistenceError
+from utils.logging import log
+
+INSERT_OPPORTUNITIES = """
+    INSERT INTO intelligence_log
+    (event_id, timestamp, kickoff, sport, teams, selection, odds, true_prob, edge, book, outcome, user_bet)
+    VALUES %s
+    ON CONFLICT (event_id) {action}
+    RETURNING {returning}
+"""
+
+OPPORTUNITY_TEMPLATE = "(%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, 'PENDING', FALSE)"
+
+
+class OpportunityWriter:
+    """
+    Accumulates intelligence_log rows during a run and writes them with
+    multi-row inserts (one statement + one commit per flush).
+
+    Duplicates (existing event_ids, or repeats within the buffer) are skipped
+    with ON CONFLICT DO NOTHING. Pass `update_cols` to refresh those columns on
+    conflict instead; updated rows are then counted as duplicates.
+
+    Usage:
+        writer = OpportunityWriter()
+        writer.add(event_id=..., kickoff=..., ...)
+        inserted, duplicates = writer.close()  # PersistenceError if rows were not written
+    """
+
+    def __init__(self, flush_every=500, update_cols=None, conn=None, tag="DB"):
+        self.flush_every = flush_every
+        self.update_cols = tuple(update_cols or ())
+        self.tag = tag
+        self.inserted = 0
+        self.duplicates = 0
+        self.inserted_ids = []
+        self._conn = conn   # Caller-owned connection (not closed here)
+        self._buffer = {}   # event_id -> row tuple
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+    def add(self, event_id, kickoff, sport, teams, selection, odds, true_prob, edge, book):
+        row = (event_id, kickoff, sport, teams, selection, odds, true_prob, edge, book)
+        if event_id in self._buffer:
+            self.duplicates += 1
+            if not self.update_cols:
+                return
+        self._buffer[event_id] = row
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def _sql(self):
+        if self.update_cols:
+            sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in self.update_cols)
+            # xmax = 0 only for freshly inserted tuples
+            return INSERT_OPPORTUNITIES.format(action=f"DO UPDATE SET {sets}",
+                                               returning="event_id, (xmax = 0) AS inserted")
+        return INSERT_OPPORTUNITIES.format(action="DO NOTHING", returning="event_id")
+
+    def flush(self):
+        """Write buffered rows. Returns (inserted, duplicates) for this flush."""
+        if not self._buffer:
+            return 0, 0
+
+        rows = list(self._buffer.values())
+        conn = self._conn or get_db()
+        if not conn:
+            log("ERROR", f"[{self.tag}] No DB connection; {len(rows)} opportunities kept in buffer")
+            return 0, 0
+
+        try:
+            with conn.cursor() as cur:
+                returned = execute_values(cur, self._sql(), rows, template=OPPORTUNITY_TEMPLATE,
+                                          page_size=len(rows), fetch=True)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            log("ERROR", f"[{self.tag}] Bulk opportunity insert failed ({len(rows)} rows): {e}")
+            return 0, 0
+        finally:
+            if self._conn is None:
+                conn.close()
+
+        if self.update_cols:
+            new_ids = [r[0] for r in returned if r[1]]
+        else:
+            new_ids = [r[0] for r in returned]
+        inserted, duplicates = len(new_ids), len(rows) - len(new_ids)
+
+        self.inserted += inserted
+        self.duplicates += duplicates
+        self.inserted_ids.extend(new_ids)
+        self._buffer.clear()
+        return inserted, duplicates
+
+    def close(self):
+        """
+        Flush remaining rows. Returns run totals (inserted, duplicates).
+        Raises PersistenceError if rows are still buffered (the final flush failed).
+        """
+        self.flush()
+        if self._buffer:
+            raise PersistenceError(f"[{self.tag}] {len(self._buffer)} opportunities not written "
+                                   f"({self.inserted} inserted earlier this run)")
+        return self.inserted, self.duplicates
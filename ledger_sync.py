@@ -53,7 +53,7 @@ def sync_ledger(days_back=1):
         
         query = """
             SELECT kickoff, sport, teams, selection, odds, edge
-            FROM intelligence_log
+            FROM intelligence_log_all
             WHERE edge >= 0.03 
               AND edge <= 0.15
               AND kickoff >= NOW() - INTERVAL '24 HOURS'
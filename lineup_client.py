@@ -1,8 +1,8 @@
-import requests
 import logging
 import unicodedata
 from datetime import datetime
 from config import Config
+from data.clients.base import http_get
 from utils import match_team
 
 # Setup Logger
@@ -70,7 +70,7 @@ def get_confirmed_lineup(league_key, home_team, away_team):
         # DEBUG: Print Search Info
         print(f"DEBUG_LC: Searching LeagueID={lid} for '{home_team}' vs '{away_team}'", flush=True)
 
-        r = requests.get(url_fixtures, headers=headers, timeout=10)
+        r = http_get(url_fixtures, headers=headers, timeout=10)
         data = r.json()
         
         items = data.get('response', [])
@@ -110,7 +110,7 @@ def get_confirmed_lineup(league_key, home_team, away_team):
         # 3. Get Lineups
         print(f"DEBUG_LC: Fetching Lineups for Fixture {fixture_id}", flush=True)
         url_lineups = f"https://v3.football.api-sports.io/fixtures/lineups?fixture={fixture_id}"
-        r_l = requests.get(url_lineups, headers=headers, timeout=10)
+        r_l = http_get(url_lineups, headers=headers, timeout=10)
         l_data = r_l.json()
         
         if l_data.get('results', 0) == 0:
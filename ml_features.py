@@ -7,7 +7,7 @@ Creates features for ML models to predict betting outcomes more accurately.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from database import get_db
+from db.connection import get_db
 from utils import log
 
 def extract_features_for_match(home, away, sport, ratings, market_type, line=None):
@@ -118,15 +118,15 @@ def get_head_to_head_features(home, away, sport, lookback_days=365):
     try:
         cur = conn.cursor()
 
-        # Look for past matchups
+        # Look for past matchups (either venue) on the indexed team columns
         cur.execute("""
             SELECT teams, outcome, selection
-            FROM intelligence_log
+            FROM intelligence_log_all
             WHERE sport = %s
             AND outcome IN ('WON', 'LOST', 'PUSH')
-            AND (teams LIKE %s OR teams LIKE %s)
+            AND ((home_team = %s AND away_team = %s) OR (home_team = %s AND away_team = %s))
             AND kickoff > NOW() - INTERVAL '%s days'
-        """, (sport, f'%{home}%{away}%', f'%{away}%{home}%', lookback_days))
+        """, (sport, home, away, away, home, lookback_days))
 
         rows = cur.fetchall()
 
@@ -138,7 +138,7 @@ def get_head_to_head_features(home, away, sport, lookback_days=365):
             }
 
         # Count home wins
-        home_wins = sum(1 for r in rows if home in r[0] and r[1] == 'WON')
+        home_wins = sum(1 for r in rows if r[1] == 'WON')
 
         return {
             'h2h_games': len(rows),
@@ -169,14 +169,14 @@ def get_recent_form(team, sport, num_games=5):
         # Get recent games for this team
         cur.execute("""
             SELECT selection, outcome
-            FROM intelligence_log
+            FROM intelligence_log_all
             WHERE sport = %s
             AND outcome IN ('WON', 'LOST', 'PUSH')
-            AND teams LIKE %s
+            AND (home_team = %s OR away_team = %s)
             AND kickoff > NOW() - INTERVAL '30 days'
             ORDER BY kickoff DESC
             LIMIT %s
-        """, (sport, f'%{team}%', num_games))
+        """, (sport, team, team, num_games))
 
         rows = cur.fetchall()
 
@@ -198,7 +198,110 @@ def get_recent_form(team, sport, num_games=5):
         cur.close()
         conn.close()
 
-def prepare_training_data(start_date=None, end_date=None, sport=None):
+HISTORY_FEATURE_DEFAULTS = {
+    'h2h_games': 0,
+    'h2h_home_wins': 0,
+    'h2h_avg_total': 0,
+    'home_recent_win_pct': 0.5,
+    'home_recent_cover_pct': 0.5,
+    'away_recent_win_pct': 0.5,
+    'away_recent_cover_pct': 0.5,
+}
+
+def load_settled_history(cur, start_date, end_date, sport=None):
+    """
+    Load every settled game row in [start_date, end_date] with normalized team
+    columns in a single query (feeds build_history_features).
+    """
+    query = """
+        SELECT sport, home_team, away_team, kickoff, outcome
+        FROM intelligence_log_all
+        WHERE outcome IN ('WON', 'LOST', 'PUSH')
+        AND home_team IS NOT NULL AND away_team IS NOT NULL
+        AND kickoff BETWEEN %s AND %s
+    """
+    params = [start_date, end_date]
+    if sport:
+        query += " AND sport = %s"
+        params.append(sport)
+
+    cur.execute(query, params)
+    return pd.DataFrame(cur.fetchall(), columns=['sport', 'home_team', 'away_team', 'kickoff', 'outcome'])
+
+def build_history_features(matches, history, h2h_lookback_days=365, form_days=30, num_games=5):
+    """
+    Set-based H2H and recent-form features for many matches at once.
+
+    Same definitions as get_head_to_head_features / get_recent_form, but each
+    match is evaluated as of its own kickoff (only strictly earlier history
+    counts) and everything is computed with merges/group-bys over one history
+    frame instead of two queries per match.
+
+    Args:
+        matches: DataFrame with sport, home_team, away_team, kickoff
+        history: DataFrame from load_settled_history
+
+    Returns:
+        DataFrame indexed like `matches` with HISTORY_FEATURE_DEFAULTS columns
+    """
+    out = pd.DataFrame(index=matches.index, columns=list(HISTORY_FEATURE_DEFAULTS), dtype=float)
+    for col, default in HISTORY_FEATURE_DEFAULTS.items():
+        out[col] = float(default)
+
+    if matches.empty or history is None or history.empty:
+        return out
+
+    m = matches[['sport', 'home_team', 'away_team', 'kickoff']].copy()
+    m['kickoff'] = pd.to_datetime(m['kickoff'])
+    m['_row'] = m.index
+
+    h = history[['sport', 'home_team', 'away_team', 'kickoff', 'outcome']].copy()
+    h['kickoff'] = pd.to_datetime(h['kickoff'])
+    h['won'] = (h['outcome'] == 'WON').astype(int)
+
+    # --- Head-to-head: unordered team pair within lookback window ---
+    def pair_key(df):
+        a, b = df['home_team'].astype(str), df['away_team'].astype(str)
+        return np.where(a < b, a + '|' + b, b + '|' + a)
+
+    m['_pair'] = pair_key(m)
+    h['_pair'] = pair_key(h)
+    h2h = m[['_row', 'sport', '_pair', 'kickoff']].merge(
+        h[['sport', '_pair', 'kickoff', 'won']], on=['sport', '_pair'], suffixes=('', '_hist')
+    )
+    h2h = h2h[
+        (h2h['kickoff_hist'] < h2h['kickoff']) &
+        (h2h['kickoff_hist'] > h2h['kickoff'] - pd.Timedelta(days=h2h_lookback_days))
+    ]
+    if not h2h.empty:
+        agg = h2h.groupby('_row')['won'].agg(['size', 'sum'])
+        out.loc[agg.index, 'h2h_games'] = agg['size'].astype(float)
+        out.loc[agg.index, 'h2h_home_wins'] = agg['sum'].astype(float)
+
+    # --- Recent form: last N settled rows per team within form window ---
+    appearances = pd.concat([
+        h[['sport', 'home_team', 'kickoff', 'won']].rename(columns={'home_team': 'team'}),
+        h[['sport', 'away_team', 'kickoff', 'won']].rename(columns={'away_team': 'team'}),
+    ], ignore_index=True)
+
+    for side in ('home', 'away'):
+        q = m[['_row', 'sport', f'{side}_team', 'kickoff']].rename(columns={f'{side}_team': 'team'})
+        form = q.merge(appearances, on=['sport', 'team'], suffixes=('', '_hist'))
+        form = form[
+            (form['kickoff_hist'] < form['kickoff']) &
+            (form['kickoff_hist'] > form['kickoff'] - pd.Timedelta(days=form_days))
+        ]
+        if form.empty:
+            continue
+        form = form.sort_values('kickoff_hist', ascending=False).groupby('_row').head(num_games)
+        win_pct = form.groupby('_row')['won'].mean()
+        out.loc[win_pct.index, f'{side}_recent_win_pct'] = win_pct
+        # Simplified - actual cover logic would check spreads
+        out.loc[win_pct.index, f'{side}_recent_cover_pct'] = win_pct
+
+    return out
+
+def prepare_training_data(start_date=None, end_date=None, sport=None, include_history=False):
     """
     Prepare training dataset from historical bets.
 
@@ -206,6 +309,9 @@ def prepare_training_data(start_date=None, end_date=None, sport=None):
         start_date: Start date for training data
         end_date: End date for training data
         sport: Filter by sport (optional)
+        include_history: Also add the HISTORY_FEATURE_DEFAULTS (H2H / recent form)
+            columns. Off by default: it changes the feature schema, so models
+            trained with it are not interchangeable with saved BettingMLModels.
 
     Returns:
         tuple: (X, y, feature_names) - features, labels, feature names
@@ -229,8 +335,9 @@ def prepare_training_data(start_date=None, end_date=None, sport=None):
         query = """
             SELECT
                 teams, sport, selection, outcome, odds, edge, true_prob,
-                sharp_score, ticket_pct, money_pct, closing_odds
-            FROM intelligence_log
+                sharp_score, ticket_pct, money_pct, closing_odds,
+                home_team, away_team, kickoff
+            FROM intelligence_log_all
             WHERE outcome IN ('WON', 'LOST')
             AND kickoff BETWEEN %s AND %s
         """
@@ -253,77 +360,67 @@ def prepare_training_data(start_date=None, end_date=None, sport=None):
         # Convert to DataFrame for easier processing
         df = pd.DataFrame(rows, columns=[
             'teams', 'sport', 'selection', 'outcome', 'odds', 'edge',
-            'true_prob', 'sharp_score', 'ticket_pct', 'money_pct', 'closing_odds'
+            'true_prob', 'sharp_score', 'ticket_pct', 'money_pct', 'closing_odds',
+            'home_team', 'away_team', 'kickoff'
         ])
 
-        # Create features
-        features_list = []
-        labels = []
-
-        for _, row in df.iterrows():
-            # Parse teams
-            teams_parts = row['teams'].split(' @ ')
-            if len(teams_parts) != 2:
-                continue
-
-            away, home = teams_parts
-
-            # Determine market type and line
-            selection = row['selection']
-            if ' ML' in selection:
-                market_type = 'ml'
-                line = None
-            elif 'Over' in selection or 'Under' in selection:
-                market_type = 'total'
-                try:
-                    line = float(selection.split()[-1])
-                except:
-                    line = None
-            else:
-                market_type = 'spread'
-                try:
-                    line = float(selection.split()[-1])
-                except:
-                    line = None
-
-            # Create feature dict
-            features = {
-                'odds': row['odds'],
-                'edge': row['edge'],
-                'true_prob': row['true_prob'],
-                'sharp_score': row['sharp_score'] if pd.notna(row['sharp_score']) else 50,
-                'ticket_pct': row['ticket_pct'] if pd.notna(row['ticket_pct']) else 50,
-                'money_pct': row['money_pct'] if pd.notna(row['money_pct']) else 50,
-                'market_type_ml': 1 if market_type == 'ml' else 0,
-                'market_type_spread': 1 if market_type == 'spread' else 0,
-                'market_type_total': 1 if market_type == 'total' else 0,
-                'line': line if line is not None else 0,
-                'abs_line': abs(line) if line is not None else 0,
-                'sport_nba': 1 if row['sport'] == 'NBA' else 0,
-                'sport_ncaab': 1 if row['sport'] == 'NCAAB' else 0,
-                'sport_nfl': 1 if row['sport'] == 'NFL' else 0,
-                'sport_nhl': 1 if row['sport'] == 'NHL' else 0,
-            }
-
+        # Parse teams ("Away @ Home"); rows from before the normalized columns existed
+        # fall back to splitting the raw string.
+        parts = df['teams'].astype(str).str.split(' @ ')
+        valid = parts.str.len() == 2
+        df = df[valid].copy()
+        if df.empty:
+            log("ML", "No training data found")
+            return None, None, None
+        parts = parts[valid]
+        df['away_team'] = df['away_team'].fillna(parts.str[0])
+        df['home_team'] = df['home_team'].fillna(parts.str[1])
+
+        # Determine market type and line
+        selection = df['selection'].astype(str)
+        is_ml = selection.str.contains(' ML', regex=False)
+        is_total = ~is_ml & (selection.str.contains('Over', regex=False) | selection.str.contains('Under', regex=False))
+        is_spread = ~is_ml & ~is_total
+        line = pd.to_numeric(selection.str.split().str[-1], errors='coerce').where(~is_ml)
+
+        odds = df['odds'].astype(float)
+        closing = df['closing_odds'].astype(float)
+        has_clv = closing.notna() & (closing != odds)
+        has_split = df['money_pct'].notna() & df['ticket_pct'].notna()
+
+        features = pd.DataFrame({
+            'odds': df['odds'],
+            'edge': df['edge'],
+            'true_prob': df['true_prob'],
+            'sharp_score': df['sharp_score'].fillna(50),
+            'ticket_pct': df['ticket_pct'].fillna(50),
+            'money_pct': df['money_pct'].fillna(50),
+            'market_type_ml': is_ml.astype(int),
+            'market_type_spread': is_spread.astype(int),
+            'market_type_total': is_total.astype(int),
+            'line': line.fillna(0),
+            'abs_line': line.abs().fillna(0),
+            'sport_nba': (df['sport'] == 'NBA').astype(int),
+            'sport_ncaab': (df['sport'] == 'NCAAB').astype(int),
+            'sport_nfl': (df['sport'] == 'NFL').astype(int),
+            'sport_nhl': (df['sport'] == 'NHL').astype(int),
             # Add CLV if available
-            if pd.notna(row['closing_odds']) and row['closing_odds'] != row['odds']:
-                features['clv'] = ((row['odds'] - row['closing_odds']) / row['odds']) * 100
-            else:
-                features['clv'] = 0
-
+            'clv': np.where(has_clv, (odds - closing) / odds * 100, 0),
             # Add sharp indicator
-            if pd.notna(row['money_pct']) and pd.notna(row['ticket_pct']):
-                features['sharp_indicator'] = row['money_pct'] - row['ticket_pct']
-            else:
-                features['sharp_indicator'] = 0
+            'sharp_indicator': np.where(has_split, df['money_pct'].astype(float) - df['ticket_pct'].astype(float), 0),
+        }, index=df.index)
 
-            features_list.append(features)
-            labels.append(1 if row['outcome'] == 'WON' else 0)
+        # Historical H2H / recent form, set-based over one history pull (opt-in)
+        if include_history:
+            history = load_settled_history(
+                cur, start_date - timedelta(days=365), end_date, sport
+            )
+            features = features.join(build_history_features(df, history))
 
         # Convert to numpy arrays
-        feature_names = list(features_list[0].keys())
-        X = np.array([[f[name] for name in feature_names] for f in features_list])
-        y = np.array(labels)
+        feature_names = list(features.columns)
+        X = features.to_numpy(dtype=float)
+        y = (df['outcome'] == 'WON').astype(int).to_numpy()
 
         log("ML", f"Prepared {len(X)} samples with {len(feature_names)} features")
 
@@ -37,6 +37,7 @@ class BettingMLModel:
         self.feature_names = None
         self.is_trained = False
         self.performance_metrics = {}
+        self.compiled = None
 
     def train(self, start_date=None, end_date=None, sport=None):
         """
@@ -194,6 +195,10 @@ class BettingMLModel:
         else:
             feature_array = np.array([features])
 
+        # Compiled NumPy path (scaler + ensemble average) when exported
+        if self.compiled is not None:
+            return float(self.compiled.predict_proba(feature_array)[0, 1])
+
         # Scale features
         feature_array_scaled = self.scaler.transform(feature_array)
 
@@ -225,6 +230,22 @@ class BettingMLModel:
 
         log("ML", f"Model saved to {filepath}")
 
+        self.export_compiled(filepath)
+
+    def export_compiled(self, filepath='models/betting_model.pkl'):
+        """Write the NumPy-compiled sibling of a saved model (see models/compiled.py)."""
+        from models.compiled import export_model, export_ensemble, save_compiled, compiled_path_for
+
+        try:
+            spec = {'kind': 'pipeline', 'steps': [
+                export_model(self.scaler),
+                export_ensemble(list(self.models.values())),
+            ]}
+            save_compiled(spec, compiled_path_for(filepath), source_path=filepath)
+            log("ML", f"Compiled model written to {compiled_path_for(filepath)}")
+        except ValueError as e:
+            log("WARNING", f"Model not compiled: {e}")
+
     @classmethod
     def load(cls, filepath='models/betting_model.pkl'):
         """Load model from disk."""
@@ -242,6 +263,9 @@ class BettingMLModel:
         model.is_trained = model_data['is_trained']
         model.performance_metrics = model_data.get('performance_metrics', {})
 
+        from models.compiled import compiled_path_for, load_compiled
+        model.compiled = load_compiled(compiled_path_for(filepath), source_path=filepath)
+
         log("ML", f"Model loaded from {filepath} (trained at {model_data.get('trained_at')})")
 
         return model
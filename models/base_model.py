@@ -36,7 +36,7 @@ class BaseModel:
             home_adj_d, away_adj_d,
             home_tempo, away_tempo,
             outcome
-        FROM intelligence_log
+        FROM intelligence_log_all
         WHERE outcome IN ('WON', 'LOST')
         """
         try:
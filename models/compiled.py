@@ -0,0 +1,482 @@
+"""
+Compiled Model Runtime
+
+Exports fitted sklearn / XGBoost artifacts to flat NumPy arrays and evaluates
+them without importing sklearn, xgboost or joblib. Single-row inference through
+the full estimator API is dominated by call overhead (input validation, thread
+pools, DMatrix construction); the compiled form is a handful of array ops.
+
+Supported:
+    - StandardScaler                          -> 'scaler'
+    - Linear regressors (ElasticNet, Ridge..) -> 'linear'
+    - Binary LogisticRegression               -> 'linear' (logit link)
+    - RandomForest / GradientBoosting / XGBoost (gbtree) -> 'trees'
+      (XGBoost objectives listed in XGB_OBJECTIVE_LINKS only)
+    - Pipeline of the above                   -> 'pipeline'
+    - Probability-averaging ensembles         -> 'ensemble' (see export_ensemble)
+
+Export happens once (scripts/export_compiled_models.py); runtime loads .npz.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.logging import log
+
+COMPILED_SUFFIX = ".compiled.npz"
+# XGBoost objective -> link on the summed margin. Log-link objectives
+# (reg:gamma, reg:tweedie, count:poisson, ...) and hinge/raw outputs are rejected.
+XGB_OBJECTIVE_LINKS = {
+    'binary:logistic': 'logit',
+    'reg:squarederror': 'identity',
+    'reg:absoluteerror': 'identity',
+}
+
+
+def compiled_path_for(model_path):
+    """models/foo.joblib -> models/foo.compiled.npz"""
+    root, _ = os.path.splitext(model_path)
+    return root + COMPILED_SUFFIX
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _as_matrix(X, feature_names=None):
+    """Coerce DataFrame / list / 1-D row into a 2-D float64 matrix in model column order."""
+    if feature_names is not None and hasattr(X, 'columns'):
+        X = X[list(feature_names)]
+    arr = np.asarray(X, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    return arr
+
+
+# ---------------------------------------------------------------------------
+# Runtime
+# ---------------------------------------------------------------------------
+
+class CompiledScaler:
+    def __init__(self, mean, scale, feature_names=None):
+        self.mean = mean
+        self.scale = scale
+        self.feature_names = feature_names
+
+    def transform(self, X):
+        return (_as_matrix(X, self.feature_names) - self.mean) / self.scale
+
+
+class CompiledLinear:
+    def __init__(self, coef, intercept, link='identity', feature_names=None):
+        self.coef = coef
+        self.intercept = intercept
+        self.link = link
+        self.feature_names = feature_names
+
+    def decision_function(self, X):
+        return _as_matrix(X, self.feature_names) @ self.coef + self.intercept
+
+    def predict(self, X):
+        raw = self.decision_function(X)
+        if self.link == 'logit':
+            return (raw > 0).astype(np.int64)
+        return raw
+
+    def predict_proba(self, X):
+        p = _sigmoid(self.decision_function(X))
+        return np.column_stack([1.0 - p, p])
+
+
+class CompiledTrees:
+    """
+    Tree ensemble stored as concatenated node arrays.
+
+    Node i is a leaf when left[i] == -1; its output is value[i]. Otherwise rows go
+    left when x[feature[i]] is below threshold[i] (strict '<' for XGBoost, '<='
+    for sklearn) and follow default_left[i] when the feature is NaN. Tree outputs
+    are combined as `base + scale * reduce(outputs)` with reduce = sum or mean.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots,
+                 base=0.0, scale=1.0, reduce='sum', strict=True, link='identity',
+                 feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base = float(base)
+        self.scale = float(scale)
+        self.reduce = reduce
+        self.strict = bool(strict)
+        self.link = link
+        self.feature_names = feature_names
+
+        # Evaluation form: leaves point at themselves so every row can take
+        # exactly `depth` steps without per-step leaf checks.
+        idx = np.arange(len(left))
+        leaf = left == -1
+        self._left = np.where(leaf, idx, left)
+        self._right = np.where(leaf, idx, right)
+        self._threshold = np.where(leaf, np.inf, threshold)
+        self.depth = self._max_depth()
+
+    def _max_depth(self):
+        depth = 0
+        node = self.roots
+        while True:
+            internal = self.left[node] != -1
+            if not internal.any():
+                return depth
+            node = np.concatenate([self.left[node[internal]], self.right[node[internal]]])
+            depth += 1
+
+    def _leaf_values(self, X):
+        # Split thresholds were learned on float32 inputs in both libraries.
+        X = _as_matrix(X, self.feature_names).astype(np.float32).astype(np.float64)
+        has_nan = np.isnan(X).any()
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+
+        for _ in range(self.depth):
+            x = X[rows, self.feature[node]]
+            thr = self._threshold[node]
+            go_left = (x < thr) if self.strict else (x <= thr)
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.default_left[node], go_left)
+            node = np.where(go_left, self._left[node], self._right[node])
+
+        return self.value[node]
+
+    def decision_function(self, X):
+        leaves = self._leaf_values(X)
+        agg = leaves.mean(axis=1) if self.reduce == 'mean' else leaves.sum(axis=1)
+        return self.base + self.scale * agg
+
+    def predict(self, X):
+        raw = self.decision_function(X)
+        if self.link == 'logit':
+            return (raw > 0).astype(np.int64)
+        if self.link == 'proba':
+            return (raw > 0.5).astype(np.int64)
+        return raw
+
+    def predict_proba(self, X):
+        raw = self.decision_function(X)
+        p = _sigmoid(raw) if self.link == 'logit' else raw
+        return np.column_stack([1.0 - p, p])
+
+
+class CompiledPipeline:
+    def __init__(self, steps):
+        self.steps = steps
+        self.feature_names = getattr(steps[0], 'feature_names', None)
+
+    def _pre(self, X):
+        X = _as_matrix(X, self.feature_names)
+        for step in self.steps[:-1]:
+            X = step.transform(X)
+        return X
+
+    def predict(self, X):
+        return self.steps[-1].predict(self._pre(X))
+
+    def predict_proba(self, X):
+        return self.steps[-1].predict_proba(self._pre(X))
+
+    def transform(self, X):
+        return self.steps[-1].transform(self._pre(X))
+
+
+class CompiledEnsemble:
+    """Mean of member predict_proba (mirrors BettingMLModel's ensemble average)."""
+
+    def __init__(self, members):
+        self.members = members
+
+    def predict_proba(self, X):
+        return np.mean([m.predict_proba(X) for m in self.members], axis=0)
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Export (imports the heavy libraries lazily)
+# ---------------------------------------------------------------------------
+
+def _feature_names(model):
+    names = getattr(model, 'feature_names_in_', None)
+    return [str(n) for n in names] if names is not None else None
+
+
+def _export_scaler(model):
+    n = model.n_features_in_
+    mean = model.mean_ if getattr(model, 'with_mean', True) and model.mean_ is not None else np.zeros(n)
+    scale = model.scale_ if getattr(model, 'with_std', True) and model.scale_ is not None else np.ones(n)
+    return {'kind': 'scaler', 'mean': np.asarray(mean, dtype=np.float64),
+            'scale': np.asarray(scale, dtype=np.float64)}
+
+
+def _export_linear(model, link):
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    if coef.ndim > 1:
+        if coef.shape[0] != 1:
+            raise ValueError(f"Only single-output linear models are supported (got {coef.shape})")
+        coef = coef[0]
+    return {'kind': 'linear', 'coef': coef, 'intercept': float(intercept.reshape(-1)[0]),
+            'link': link}
+
+
+def _flatten_sklearn_trees(trees, leaf_fn):
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset = 0
+    for t in trees:
+        tree = t.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        value.append(leaf_fn(tree.value))
+        offset += n
+    left_arr = np.concatenate(left)
+    return {
+        'feature': np.concatenate(feature).astype(np.int64),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'left': left_arr.astype(np.int64),
+        'right': np.concatenate(right).astype(np.int64),
+        # sklearn trees never see NaN at split time in this repo; route left.
+        'default_left': np.ones(len(left_arr), dtype=bool),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.int64),
+    }
+
+
+def _export_random_forest(model):
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary RandomForestClassifier is supported")
+
+    def positive_fraction(values):
+        v = values[:, 0, :]
+        return v[:, 1] / v.sum(axis=1)
+
+    out = _flatten_sklearn_trees(model.estimators_, positive_fraction)
+    out.update({'kind': 'trees', 'base': 0.0, 'scale': 1.0, 'reduce': 'mean',
+                'strict': False, 'link': 'proba'})
+    return out
+
+
+def _export_gradient_boosting(model):
+    if model.estimators_.shape[1] != 1:
+        raise ValueError("Only binary GradientBoostingClassifier is supported")
+    base = float(model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0])
+    out = _flatten_sklearn_trees(model.estimators_[:, 0], lambda v: v[:, 0, 0])
+    out.update({'kind': 'trees', 'base': base, 'scale': float(model.learning_rate),
+                'reduce': 'sum', 'strict': False, 'link': 'logit'})
+    return out
+
+
+def _export_xgboost(model):
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    raw = json.loads(booster.save_raw(raw_format='json'))
+    learner = raw['learner']
+    gb = learner['gradient_booster']
+    if gb['name'] != 'gbtree':
+        raise ValueError(f"Unsupported XGBoost booster: {gb['name']}")
+    if int(learner['learner_model_param'].get('num_class', '0')) > 1:
+        raise ValueError("Multiclass XGBoost models are not supported")
+
+    objective = learner['objective']['name']
+    link = XGB_OBJECTIVE_LINKS.get(objective)
+    if link is None:
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    base = float(np.log(base_score / (1.0 - base_score))) if link == 'logit' else base_score
+
+    feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+    offset = 0
+    for tree in gb['model']['trees']:
+        lc = np.asarray(tree['left_children'], dtype=np.int64)
+        rc = np.asarray(tree['right_children'], dtype=np.int64)
+        cond = np.asarray(tree['split_conditions'], dtype=np.float32).astype(np.float64)
+        is_leaf = lc == -1
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, np.asarray(tree['split_indices'], dtype=np.int64)))
+        threshold.append(cond)
+        left.append(np.where(is_leaf, -1, lc + offset))
+        right.append(np.where(is_leaf, -1, rc + offset))
+        default_left.append(np.asarray(tree['default_left'], dtype=bool))
+        # Leaf weights live in split_conditions for leaf nodes.
+        value.append(np.where(is_leaf, cond, 0.0))
+        offset += len(lc)
+
+    names = booster.feature_names
+    return {
+        'kind': 'trees',
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left),
+        'right': np.concatenate(right),
+        'default_left': np.concatenate(default_left),
+        'value': np.concatenate(value),
+        'roots': np.asarray(roots, dtype=np.int64),
+        'base': base, 'scale': 1.0, 'reduce': 'sum', 'strict': True, 'link': link,
+        'feature_names': list(names) if names else None,
+    }
+
+
+def export_model(model):
+    """
+    Convert a fitted estimator into a plain dict of arrays/scalars.
+    Raises ValueError for unsupported estimators.
+    """
+    cls = type(model).__name__
+    module = type(model).__module__
+
+    if cls == 'Pipeline':
+        steps = [export_model(step) for _, step in model.steps]
+        out = {'kind': 'pipeline', 'steps': steps}
+    elif cls == 'StandardScaler':
+        out = _export_scaler(model)
+    elif cls == 'LogisticRegression':
+        out = _export_linear(model, 'logit')
+    elif module.startswith('sklearn.linear_model') and hasattr(model, 'coef_'):
+        out = _export_linear(model, 'identity')
+    elif cls == 'RandomForestClassifier':
+        out = _export_random_forest(model)
+    elif cls == 'GradientBoostingClassifier':
+        out = _export_gradient_boosting(model)
+    elif module.startswith('xgboost'):
+        out = _export_xgboost(model)
+    else:
+        raise ValueError(f"Unsupported model type for compilation: {module}.{cls}")
+
+    if out.get('feature_names') is None:
+        out['feature_names'] = _feature_names(model)
+    return out
+
+
+def export_ensemble(models):
+    """Export a list of classifiers whose probabilities are averaged."""
+    return {'kind': 'ensemble', 'steps': [export_model(m) for m in models]}
+
+
+def build_runtime(spec):
+    """Instantiate the NumPy runtime object for an exported spec."""
+    kind = spec['kind']
+    names = spec.get('feature_names')
+    if kind == 'pipeline':
+        return CompiledPipeline([build_runtime(s) for s in spec['steps']])
+    if kind == 'ensemble':
+        return CompiledEnsemble([build_runtime(s) for s in spec['steps']])
+    if kind == 'scaler':
+        return CompiledScaler(spec['mean'], spec['scale'], names)
+    if kind == 'linear':
+        return CompiledLinear(spec['coef'], spec['intercept'], spec['link'], names)
+    if kind == 'trees':
+        return CompiledTrees(
+            spec['feature'], spec['threshold'], spec['left'], spec['right'],
+            spec['default_left'], spec['value'], spec['roots'],
+            base=spec['base'], scale=spec['scale'], reduce=spec['reduce'],
+            strict=spec['strict'], link=spec['link'], feature_names=names,
+        )
+    raise ValueError(f"Unknown compiled model kind: {kind}")
+
+
+def compile_model(model):
+    """Export + build in one step (used by parity checks)."""
+    return build_runtime(export_model(model))
+
+
+# ---------------------------------------------------------------------------
+# Persistence (.npz: arrays stored natively, scalars/structure as JSON header)
+# ---------------------------------------------------------------------------
+
+def _split_spec(spec, prefix, arrays):
+    meta = {}
+    for key, val in spec.items():
+        if key == 'steps':
+            meta['steps'] = [_split_spec(s, f"{prefix}{i}.", arrays) for i, s in enumerate(val)]
+        elif isinstance(val, np.ndarray):
+            arrays[prefix + key] = val
+            meta[key] = {'__array__': prefix + key}
+        else:
+            meta[key] = val
+    return meta
+
+
+def _join_spec(meta, arrays):
+    spec = {}
+    for key, val in meta.items():
+        if key == 'steps':
+            spec['steps'] = [_join_spec(s, arrays) for s in val]
+        elif isinstance(val, dict) and '__array__' in val:
+            spec[key] = arrays[val['__array__']]
+        else:
+            spec[key] = val
+    return spec
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_compiled(spec, path, source_path=None):
+    """
+    Write an exported spec to .npz. When `source_path` is given its hash is
+    recorded so a retrained source artifact invalidates the export.
+    """
+    arrays = {}
+    meta = _split_spec(spec, "", arrays)
+    header = {'spec': meta, 'source_sha256': _file_sha256(source_path) if source_path else None}
+    np.savez_compressed(path, __meta__=np.asarray(json.dumps(header)), **arrays)
+
+
+def load_compiled(path, source_path=None):
+    """
+    Load an exported .npz and return the runtime object.
+    Returns None if missing, unreadable, or stale relative to `source_path`.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['__meta__']))
+            recorded = header.get('source_sha256')
+            if source_path and recorded and os.path.exists(source_path):
+                if recorded != _file_sha256(source_path):
+                    log("COMPILED", f"⚠️ Stale compiled model {path} (source changed); ignoring")
+                    return None
+            arrays = {k: data[k] for k in data.files if k != '__meta__'}
+        return build_runtime(_join_spec(header['spec'], arrays))
+    except Exception as e:
+        log("COMPILED", f"⚠️ Failed to load compiled model {path}: {e}")
+        return None
+
+
+def load_model(model_path):
+    """
+    Prefer the compiled sibling of `model_path`; fall back to joblib.
+    Keeps sklearn/xgboost off the import path whenever an export exists.
+    """
+    compiled = load_compiled(compiled_path_for(model_path), source_path=model_path)
+    if compiled is not None:
+        return compiled
+    if not os.path.exists(model_path):
+        return None
+    import joblib
+    return joblib.load(model_path)
@@ -29,7 +29,7 @@ class LogisticModelV2:
         
     def load_data(self):
         """
-        Load training data from intelligence_log.
+        Load training data from intelligence_log_all (live + archived).
         """
         conn = get_db()
         if not conn:
@@ -42,7 +42,7 @@ class LogisticModelV2:
             EXTRACT(EPOCH FROM (kickoff - timestamp))/60 as minutes_to_kickoff,
             home_xg, away_xg, dvp_rank,
             outcome
-        FROM intelligence_log
+        FROM intelligence_log_all
         WHERE outcome IN ('WON', 'LOST')
         """
         try:
@@ -1,10 +1,10 @@
 import pandas as pd
 import numpy as np
-import joblib
 import json
 import os
 from datetime import datetime
 from db.connection import get_db
+from models.compiled import load_model as load_model_artifact
 
 MODEL_PATH_ML = "models/nba_model_ml_v2.joblib"
 MODEL_PATH_TOT = "models/nba_model_total_v2.joblib"
@@ -43,7 +43,7 @@ class NBAModel:
         path_resid = self.registry.get('nba_total', {}).get('sigma_path', "models/nba_total_residuals.json")
         
         if os.path.exists(path_ml):
-            self.model = joblib.load(path_ml)
+            self.model = load_model_artifact(path_ml)
             print(f"✅ Loaded NBA ML Model: {path_ml}")
         else:
             print(f"❌ NBA Model not found: {path_ml}")
@@ -55,7 +55,7 @@ class NBAModel:
             print(f"❌ NBA Features not found: {path_feat}")
 
         if os.path.exists(path_tot):
-            self.model_tot = joblib.load(path_tot)
+            self.model_tot = load_model_artifact(path_tot)
             print(f"✅ Loaded NBA Totals Model: {path_tot}")
             
         if os.path.exists(path_resid):
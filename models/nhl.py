@@ -1,10 +1,10 @@
-import joblib
 import pandas as pd
 import numpy as np
 import os
 import sys
 from utils.logging import log
 from features_nhl import GoalieGameMap
+from models.compiled import load_model
 
 # Paths
 MODEL_PATH = "models/nhl_v2.pkl"
@@ -27,7 +27,7 @@ class NHLModelV2:
         try:
             # 1. Load XGBoost Model
             if os.path.exists(MODEL_PATH):
-                self.model = joblib.load(MODEL_PATH)
+                self.model = load_model(MODEL_PATH)
                 log("NHL_V2", "✅ Loaded XGBoost Model V2")
             else:
                 log("NHL_V2", "❌ Model file not found")
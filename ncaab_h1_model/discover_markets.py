@@ -1,16 +1,77 @@
-import requests
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 API_KEY = os.getenv('ODDS_API_KEY')
 SPORT = 'basketball_ncaab'
+BASE_URL = f"https://api.the-odds-api.com/v4/sports/{SPORT}"
+
+# Market availability map: {event_id: {'keys': [...], 'checked_at': ts}}, built
+# from odds responses the scan already fetched (no extra API calls)
+MARKET_MAP_CACHE_KEY = 'ncaab_market_map'
+MARKET_MAP_TTL = 1800  # Re-check events without the market this often (lines get posted late)
+REQUEST_TIMEOUT = 10
+
+
+def fetch_event_markets(event_id, api_key=API_KEY):
+    """Set of market keys any US book has posted for an event, or None on failure (costs one request)."""
+    from data.clients.base import http_get
+
+    try:
+        res = http_get(f"{BASE_URL}/events/{event_id}/markets",
+                       params={'apiKey': api_key, 'regions': 'us'}, timeout=REQUEST_TIMEOUT)
+        if res.status_code != 200:
+            return None
+        return {market['key'] for book in res.json().get('bookmakers', []) for market in book.get('markets', [])}
+    except Exception:
+        return None
+
+
+def get_market_map(event_ids, market, ttl=MARKET_MAP_TTL, now=None):
+    """
+    {event_id: bool} - False only for events whose last odds response lacked
+    `market` less than `ttl` seconds ago; unknown and expired events map to
+    True so they are fetched. Reads the cache only (see record_markets).
+    """
+    from data.cache import cache_get
+
+    now = now if now is not None else time.time()
+    entries = cache_get(MARKET_MAP_CACHE_KEY, ttl_seconds=float('inf')) or {}
+
+    def posted(eid):
+        entry = entries.get(eid)
+        return entry is None or market in entry['keys'] or now - entry['checked_at'] > ttl
+
+    return {eid: posted(eid) for eid in event_ids}
+
+
+def record_markets(event_ids, responses, now=None):
+    """
+    Update the map from event-odds payloads ({event_id: payload or None}).
+    Failed fetches (None) are not recorded; only `event_ids` (the current
+    slate) are kept.
+    """
+    from data.cache import cache_get, cache_set
+
+    now = now if now is not None else time.time()
+    cached = cache_get(MARKET_MAP_CACHE_KEY, ttl_seconds=float('inf')) or {}
+    entries = {eid: cached[eid] for eid in event_ids if eid in cached}
+    for eid, payload in responses.items():
+        if payload is None:
+            continue
+        keys = {m['key'] for book in payload.get('bookmakers', []) for m in book.get('markets', [])}
+        entries[eid] = {'keys': sorted(keys), 'checked_at': now}
+    cache_set(MARKET_MAP_CACHE_KEY, entries)
+
 
 def discover():
     # 1. Get Events
     print(f"Fetching events for {SPORT}...")
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/events"
-    res = requests.get(url, params={'apiKey': API_KEY, 'regions': 'us'})
+    from data.clients.base import http_get
+
+    url = f"{BASE_URL}/events"
+    res = http_get(url, params={'apiKey': API_KEY, 'regions': 'us'}, timeout=REQUEST_TIMEOUT)
     
     if res.status_code != 200:
         print(f"Failed to get events: {res.status_code}")
@@ -37,27 +98,15 @@ def discover():
     
     # 2. Discover Available Markets
     print(f"Discovering market keys for game: {game_id}")
-    url_markets = f"https://api.the-odds-api.com/v4/sports/{SPORT}/events/{game_id}/markets"
-    params = {'apiKey': API_KEY, 'regions': 'us'}
-    
-    res = requests.get(url_markets, params=params)
-    
-    if res.status_code == 200:
-        data = res.json()
+    found_keys = fetch_event_markets(game_id)
+
+    if found_keys is not None:
         print(f"\n✅ Success! Found the following market keys for {game['home_team']} vs {game['away_team']}:")
-        
-        # Aggregate keys across bookmakers
-        found_keys = set()
-        for book in data.get('bookmakers', []):
-            for market in book.get('markets', []):
-                found_keys.add(market['key'])
-        
         for k in sorted(found_keys):
             print(f"- {k}")
             
     else:
-        print(f"\n❌ Failed: {res.status_code}")
-        print(res.text)
+        print(f"\n❌ Failed to fetch markets for {game_id}")
 
 if __name__ == "__main__":
     discover()
@@ -3,15 +3,17 @@ NCAAB H1 Edge Finder
 Scans upcoming games and finds H1 total betting edges.
 """
 
-import requests
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Enable importing from parent directory (for database.py)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from data.clients.base import get_http_client
+
 try:
     from database import get_db, safe_execute
     from utils import log
@@ -22,8 +24,14 @@ except ImportError:
 # Handle sibling imports whether run as script or module
 try:
     from .ncaab_h1_predict import H1_Predictor
+    from .discover_markets import get_market_map, record_markets
 except ImportError:
     from ncaab_h1_predict import H1_Predictor
+    from discover_markets import get_market_map, record_markets
+
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+H1_MARKET = 'totals_h1'
 
 class H1_EdgeFinder:
     def __init__(self, odds_api_key):
@@ -31,6 +39,7 @@ class H1_EdgeFinder:
         self.api_key = odds_api_key
         self.predictor = H1_Predictor()
         self.base_url = "https://api.the-odds-api.com/v4/sports"
+        self.http = get_http_client()
 
     def fetch_upcoming_events(self):
         """Fetch list of upcoming NCAAB event IDs."""
@@ -40,7 +49,7 @@ class H1_EdgeFinder:
             'regions': 'us',
         }
         try:
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params, timeout=REQUEST_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
             return []
@@ -53,11 +62,11 @@ class H1_EdgeFinder:
         params = {
             'apiKey': self.api_key,
             'regions': 'us',
-            'markets': 'totals_h1', # Specific H1 market
+            'markets': H1_MARKET, # Specific H1 market
             'oddsFormat': 'american'
         }
         try:
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params, timeout=REQUEST_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
             # print(f"Error fetching odds for {event_id}: {response.text}")
@@ -92,26 +101,31 @@ class H1_EdgeFinder:
             'no_data': 0
         }
 
+        # 1. Skip events whose recent odds response had no H1 market (map is
+        #    built from earlier scans' odds payloads; no discovery calls)
+        slate = [e['id'] for e in events]
+        posted = get_market_map(slate, H1_MARKET)
+        stats['scanned'] = len(events)
+        stats['no_market'] = sum(1 for eid in slate if not posted[eid])
+        todo = [eid for eid in slate if posted[eid]]
+        print(f"   {len(todo)} events to price ({len(slate) - len(todo)} without {H1_MARKET} recently)")
+
+        # 2. Fetch ODDS for those events concurrently, then remember which carried the market
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            responses = dict(zip(todo, pool.map(self.fetch_event_odds, todo)))
+        record_markets(slate, responses)
+        games = [g for g in responses.values() if g]
+
+        # 3. Score every game in one model call
+        predictions = self.predictor.predict_batch([(g['home_team'], g['away_team']) for g in games])
+
         print(f"\n🔍 Scanning for H1 edges (Adaptive Thresholds)...")
         print("=" * 80)
 
-        for i, event in enumerate(events):
-            stats['scanned'] += 1
-            
-            # 1. Fetch ODDS for this specific event
-            game = self.fetch_event_odds(event['id'])
-            if not game: 
-                continue
-
+        for game, prediction in zip(games, predictions):
             home_team = game['home_team']
             away_team = game['away_team']
-            
-            # Progress indicator for large lists
-            if i % 10 == 0: print(f"   Scanning {i}/{len(events)}: {home_team} vs {away_team}...")
 
-            # Get model prediction
-            prediction = self.predictor.predict(home_team, away_team, verbose=False)
-            
             # --- DYNAMIC THRESHOLD LOGIC ---
             # Instead of skipping, we raise the bar.
             current_req_edge = min_edge
@@ -159,7 +173,7 @@ class H1_EdgeFinder:
                 book_name = bookmaker['title']
 
                 for market in bookmaker.get('markets', []):
-                    if market['key'] != 'totals_h1': # basketball_ncaab_h1_totals? 
+                    if market['key'] != H1_MARKET: # basketball_ncaab_h1_totals? 
                         # Use loose check if exact key fails: 'h1' in market['key']
                         continue
                         
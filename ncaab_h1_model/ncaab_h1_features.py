@@ -15,13 +15,9 @@ sys.path.append(curr_dir) # For sibling imports (team_name_mapper)
 sys.path.append(os.path.dirname(curr_dir)) # For parent imports (data_sources)
 
 try:
-    from ncaab_kenpom import KenPomClient
+    from data.sources.kenpom_store import get_kenpom_store
 except ImportError:
-    # Fallback if running from different context
-    try:
-        from data_sources.ncaab_kenpom import KenPomClient
-    except ImportError:
-        KenPomClient = None
+    get_kenpom_store = None
 
 from team_name_mapper import normalize_team_name
 
@@ -35,22 +31,14 @@ class H1_FeatureEngine:
         with open(profiles_path, 'r') as f:
             self.profiles = json.load(f)
 
-        # Load KenPom tempo data (cached)
-        self.kenpom_data = {}
-        if KenPomClient:
+        # Shared KenPom store (daily refresh, persisted, memoised name resolution)
+        self.kenpom = None
+        if get_kenpom_store:
             try:
-                kp_client = KenPomClient()
-                df = kp_client.get_efficiency_stats()
-                if not df.empty:
-                    # Convert to dict for fast lookup
-                    for _, row in df.iterrows():
-                        self.kenpom_data[row['Team']] = {
-                            'tempo': row['AdjT'],
-                            'adj_em': row['AdjEM'],
-                            'adj_o': row['AdjO'],
-                            'adj_d': row['AdjD']
-                        }
-                    print(f"✓ Loaded KenPom data for {len(self.kenpom_data)} teams")
+                store = get_kenpom_store()
+                if store.ensure_loaded():
+                    self.kenpom = store
+                    print(f"✓ Loaded KenPom data for {len(store.teams)} teams")
             except Exception as e:
                 print(f"⚠️ Could not load KenPom data: {e}")
                 print("   Continuing without tempo features...")
@@ -111,17 +99,14 @@ class H1_FeatureEngine:
 
     def _get_kenpom_stats(self, team_name: str) -> Dict:
         """Get KenPom stats (Tempo, AdjO, AdjD) for a team."""
-        # Try exact match first
-        if team_name in self.kenpom_data:
-            return self.kenpom_data[team_name]
-
-        # Try fuzzy match
-        import difflib
-        kp_teams = list(self.kenpom_data.keys())
-        matches = difflib.get_close_matches(team_name, kp_teams, n=1, cutoff=0.7)
-
-        if matches:
-            return self.kenpom_data[matches[0]]
+        row = self.kenpom.get(team_name) if self.kenpom else None
+        if row:
+            return {
+                'tempo': row['AdjT'],
+                'adj_em': row['AdjEM'],
+                'adj_o': row['AdjO'],
+                'adj_d': row['AdjD']
+            }
 
         # Default values
         return {'tempo': 68.0, 'adj_o': 105.0, 'adj_d': 105.0}
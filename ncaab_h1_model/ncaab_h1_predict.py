@@ -8,6 +8,17 @@ import numpy as np
 from ncaab_h1_features import H1_FeatureEngine
 
 class H1_Predictor:
+    # Model input columns (same order as training)
+    FEATURE_ORDER = [
+        'home_h1_avg', 'away_h1_avg', 'home_h1_ratio', 'away_h1_ratio',
+        'home_h1_std', 'away_h1_std', 'home_consistency', 'away_consistency',
+        'home_tempo', 'away_tempo', 'avg_h1_ratio', 'h1_ratio_diff',
+        'combined_std', 'avg_consistency', 'consistency_diff', 'avg_tempo',
+        'tempo_diff', 'pace_multiplier', 'experience_weight', 'pace_adjusted_total',
+        'home_adj_o', 'home_adj_d', 'away_adj_o', 'away_adj_d',
+        'avg_efficiency_mismatch'
+    ]
+
     def __init__(self, model_path=None):
         """Load trained model."""
         import os
@@ -28,66 +39,49 @@ class H1_Predictor:
         Returns:
             dict with prediction, confidence, breakdown, and matchup-specific std
         """
+        return self.predict_batch([(home_team, away_team)], verbose=verbose)[0]
+
+    def predict_batch(self, matchups, verbose=False):
+        """Predict H1 totals for [(home_team, away_team), ...] with one model call."""
+        if not matchups:
+            return []
+
         # Get features
-        features = self.feature_engine.build_match_features(home_team, away_team)
-        confidence = self.feature_engine.get_confidence_score(features)
+        all_features = [self.feature_engine.build_match_features(home, away) for home, away in matchups]
 
-        # Build feature vector (same order as training)
+        # Build feature matrix
         # UPDATED: Added 4 new tempo features (19 total, up from 15)
-        X = np.array([[
-            features['home_h1_avg'],
-            features['away_h1_avg'],
-            features['home_h1_ratio'],
-            features['away_h1_ratio'],
-            features['home_h1_std'],
-            features['away_h1_std'],
-            features['home_consistency'],
-            features['away_consistency'],
-            features['home_tempo'],
-            features['away_tempo'],
-            features['avg_h1_ratio'],
-            features['h1_ratio_diff'],
-            features['combined_std'],
-            features['avg_consistency'],
-            features['consistency_diff'],
-            features['avg_tempo'],
-            features['tempo_diff'],
-            features['pace_multiplier'],
-            features['experience_weight'],
-            features['pace_adjusted_total'],
-            features['home_adj_o'],
-            features['home_adj_d'],
-            features['away_adj_o'],
-            features['away_adj_d'],
-            features['avg_efficiency_mismatch']
-        ]])
+        X = np.array([[features[name] for name in self.FEATURE_ORDER] for features in all_features])
 
         # Predict RESIDUAL (Actual - Pace_Adjusted_Total)
-        predicted_residual = self.model.predict(X)[0]
-        
-        # Final Prediction = Baseline + Residual
-        baseline = features['pace_adjusted_total']
-        predicted_total = baseline + predicted_residual
-
-        # Use matchup-specific std (not hardcoded 7.5)
-        # combined_std accounts for both teams' variance
-        expected_std = features['combined_std']
-
-        result = {
-            'home_team': home_team,
-            'away_team': away_team,
-            'predicted_h1_total': round(predicted_total, 1),
-            'confidence': confidence,
-            'expected_std': round(expected_std, 1),
-            'home_h1_avg': round(features['home_h1_avg'], 1),
-            'away_h1_avg': round(features['away_h1_avg'], 1),
-            'breakdown': features
-        }
+        residuals = self.model.predict(X)
+
+        results = []
+        for (home_team, away_team), features, predicted_residual in zip(matchups, all_features, residuals):
+            # Final Prediction = Baseline + Residual
+            baseline = features['pace_adjusted_total']
+            predicted_total = baseline + predicted_residual
+
+            # Use matchup-specific std (not hardcoded 7.5)
+            # combined_std accounts for both teams' variance
+            expected_std = features['combined_std']
+
+            result = {
+                'home_team': home_team,
+                'away_team': away_team,
+                'predicted_h1_total': round(predicted_total, 1),
+                'confidence': self.feature_engine.get_confidence_score(features),
+                'expected_std': round(expected_std, 1),
+                'home_h1_avg': round(features['home_h1_avg'], 1),
+                'away_h1_avg': round(features['away_h1_avg'], 1),
+                'breakdown': features
+            }
 
-        if verbose:
-            self._print_prediction(result)
+            if verbose:
+                self._print_prediction(result)
+            results.append(result)
 
-        return result
+        return results
 
     def _print_prediction(self, result):
         """Pretty print prediction."""
@@ -3,24 +3,126 @@ NCAAB H1/H2 Data Scraper
 Fetches play-by-play data from ESPN to build team first-half profiles.
 """
 
-import requests
 import json
-import time
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from collections import defaultdict
+from urllib.parse import urlsplit
 import statistics
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.clients.base import get_http_client
+
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 8.0
+
+# Incremental state (under save_path)
+GAME_CACHE_FILE = 'game_cache.jsonl'            # One line per scraped ESPN game id
+SCHEDULE_CHECKPOINT_FILE = 'schedule_checkpoint.json'  # Finished days -> game ids
+TEAM_STATE_FILE = 'team_h1_state.json'          # Per-team accumulators + folded game ids
+
+
+class GameCache:
+    """
+    Append-only JSONL cache of game summaries keyed by ESPN game id. Each
+    fetched game is flushed immediately, so an interrupted run resumes where
+    it stopped. Games without H1/H2 linescores are cached as {'skip': True}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.games = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from an interrupted write
+                    self.games[str(rec['game_id'])] = rec
+
+    def __contains__(self, game_id):
+        return str(game_id) in self.games
+
+    def get(self, game_id):
+        return self.games.get(str(game_id))
+
+    def put(self, record):
+        line = json.dumps(record, separators=(',', ':'))
+        with self.lock:
+            self.games[str(record['game_id'])] = record
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
+
+    def seed(self, records):
+        """Import already-scraped games (e.g. a legacy historical_games.json)."""
+        new = [r for r in records if r and str(r['game_id']) not in self.games]
+        for rec in new:
+            self.put(rec)
+        return len(new)
+
+
+def _new_team_stats():
+    return {
+        'h1_scores': [], 'h2_scores': [],
+        'h1_possessions': [], 'h2_possessions': [],
+        'h1_tempo': [], 'h2_tempo': [],
+        'games_played': 0
+    }
+
+
 class NCAAB_H1_Scraper:
-    def __init__(self):
+    def __init__(self, max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND):
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball"
-        self.team_stats = defaultdict(lambda: {
-            'h1_scores': [], 'h2_scores': [],
-            'h1_possessions': [], 'h2_possessions': [],
-            'h1_tempo': [], 'h2_tempo': [],
-            'games_played': 0
-        })
-
-    def fetch_schedule(self, date_range_days=None, season_start_date=None):
+        self.team_stats = defaultdict(_new_team_stats)
+        self.seen_games = set()  # Game ids already folded into team_stats
+        self.max_workers = max_workers
+        # Shared pooled session; ESPN is throttled to this scraper's rate
+        self.http = get_http_client()
+        self.http.set_rate_limit(urlsplit(self.base_url).netloc, requests_per_second)
+
+    def _get(self, url):
+        return self.http.get(url, timeout=10)
+
+    def season_start(self, date_range_days=None, season_start_date=None, end_date=None):
+        """Start date of the scrape window (defaults to Nov 1 of the current season)."""
+        end_date = end_date or datetime.now()
+        if season_start_date:
+            # Use provided season start date
+            return datetime.strptime(season_start_date, '%Y-%m-%d')
+        if date_range_days:
+            # Use date range
+            return end_date - timedelta(days=date_range_days)
+        # Default: Start of current NCAAB season (November 1st)
+        # If we're in Jan-July, season started previous year; otherwise this year
+        season_year = end_date.year - 1 if end_date.month <= 7 else end_date.year
+        return datetime(season_year, 11, 1)
+
+    def _fetch_day(self, date_str):
+        """Scoreboard for one day: list of {id, date, status}, or None on failure."""
+        url = f"{self.base_url}/scoreboard?dates={date_str}&groups=50&limit=1000"
+        try:
+            response = self._get(url)
+            if response.status_code != 200:
+                print(f"✗ Failed {date_str}: HTTP {response.status_code}")
+                return None
+            data = response.json()
+            games = [{'id': event['id'], 'date': date_str, 'status': event['status']['type']['state']}
+                     for event in data.get('events', [])]
+            print(f"✓ Fetched {date_str}: {len(games)} games")
+            return games
+        except Exception as e:
+            print(f"✗ Error fetching {date_str}: {e}")
+            return None
+
+    def fetch_schedule(self, date_range_days=None, season_start_date=None, checkpoint=None):
         """
         Fetch games for all teams.
 
@@ -28,121 +130,139 @@ class NCAAB_H1_Scraper:
             date_range_days: Number of days back from today (if specified)
             season_start_date: Specific start date (YYYY-MM-DD format)
             If both None: defaults to full season starting Nov 1
+            checkpoint: Optional dict {date_str: games} of finished days. Days in it
+                are not refetched; newly finished past days are added to it.
         """
-        games = []
         end_date = datetime.now()
+        start_date = self.season_start(date_range_days, season_start_date, end_date)
+        today = end_date.strftime('%Y%m%d')
+        checkpoint = checkpoint if checkpoint is not None else {}
 
-        if season_start_date:
-            # Use provided season start date
-            start_date = datetime.strptime(season_start_date, '%Y-%m-%d')
-        elif date_range_days:
-            # Use date range
-            start_date = end_date - timedelta(days=date_range_days)
-        else:
-            # Default: Start of current NCAAB season (November 1st)
-            current_year = end_date.year
-            # If we're in Jan-July, season started previous year; otherwise this year
-            season_year = current_year - 1 if end_date.month <= 7 else current_year
-            start_date = datetime(season_year, 11, 1)
-
+        days = []
         current = start_date
         while current <= end_date:
-            date_str = current.strftime('%Y%m%d')
-            url = f"{self.base_url}/scoreboard?dates={date_str}&groups=50&limit=1000"
-
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-
-                    if 'events' in data:
-                        for event in data['events']:
-                            game_id = event['id']
-                            games.append({
-                                'id': game_id,
-                                'date': date_str,
-                                'status': event['status']['type']['state']
-                            })
-
-                    print(f"✓ Fetched {date_str}: {len(data.get('events', []))} games")
-                else:
-                    print(f"✗ Failed {date_str}: HTTP {response.status_code}")
-
-            except Exception as e:
-                print(f"✗ Error fetching {date_str}: {e}")
-
+            days.append(current.strftime('%Y%m%d'))
             current += timedelta(days=1)
-            time.sleep(0.5)  # Rate limiting
 
-        return games
+        todo = [d for d in days if d not in checkpoint]
+        if len(todo) < len(days):
+            print(f"   Schedule checkpoint: {len(days) - len(todo)} days cached, {len(todo)} to fetch")
+
+        by_day = {d: checkpoint[d] for d in days if d in checkpoint}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for date_str, games in zip(todo, pool.map(self._fetch_day, todo)):
+                if games is None:
+                    continue
+                by_day[date_str] = games
+                # Past days with every game final never change again
+                if date_str < today and all(g['status'] == 'post' for g in games):
+                    checkpoint[date_str] = games
+
+        return [g for d in days for g in by_day.get(d, [])]
 
     def fetch_game_details(self, game_id, game_date=None):
         """Fetch detailed stats including H1/H2 splits for a specific game."""
         url = f"{self.base_url}/summary?event={game_id}"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = self._get(url)
             if response.status_code != 200:
                 return None
+            return self.parse_game_summary(response.json(), game_id, game_date)
 
-            data = response.json()
-
-            # Extract from header -> competitions -> competitors
-            if 'header' not in data or 'competitions' not in data['header']:
-                return None
+        except Exception as e:
+            print(f"Error fetching game {game_id}: {e}")
+            return None
 
-            competitions = data['header']['competitions']
-            if not competitions or 'competitors' not in competitions[0]:
-                return None
+    def parse_game_summary(self, data, game_id, game_date=None):
+        """H1/H2 game record from an ESPN summary payload (None if splits are missing)."""
+        # Extract from header -> competitions -> competitors
+        if 'header' not in data or 'competitions' not in data['header']:
+            return None
 
-            competitors = competitions[0]['competitors']
-            if len(competitors) != 2:
-                return None
+        competitions = data['header']['competitions']
+        if not competitions or 'competitors' not in competitions[0]:
+            return None
 
-            # Determine home/away (homeAway field)
-            home_competitor = None
-            away_competitor = None
+        competitors = competitions[0]['competitors']
+        if len(competitors) != 2:
+            return None
 
-            for comp in competitors:
-                if comp.get('homeAway') == 'home':
-                    home_competitor = comp
-                elif comp.get('homeAway') == 'away':
-                    away_competitor = comp
+        # Determine home/away (homeAway field)
+        home_competitor = None
+        away_competitor = None
 
-            if not home_competitor or not away_competitor:
-                # Fallback: first is home, second is away
-                home_competitor = competitors[0]
-                away_competitor = competitors[1]
+        for comp in competitors:
+            if comp.get('homeAway') == 'home':
+                home_competitor = comp
+            elif comp.get('homeAway') == 'away':
+                away_competitor = comp
 
-            home_team = home_competitor['team']['displayName']
-            away_team = away_competitor['team']['displayName']
+        if not home_competitor or not away_competitor:
+            # Fallback: first is home, second is away
+            home_competitor = competitors[0]
+            away_competitor = competitors[1]
 
-            # Extract linescores (H1, H2, OT...)
-            home_h1, home_h2 = self._extract_half_scores(home_competitor)
-            away_h1, away_h2 = self._extract_half_scores(away_competitor)
+        home_team = home_competitor['team']['displayName']
+        away_team = away_competitor['team']['displayName']
 
-            if home_h1 is None or away_h1 is None:
-                return None
+        # Extract linescores (H1, H2, OT...)
+        home_h1, home_h2 = self._extract_half_scores(home_competitor)
+        away_h1, away_h2 = self._extract_half_scores(away_competitor)
 
-            return {
-                'game_id': game_id,
-                'date': game_date, # Persist the date
-                'home_team': home_team,
-                'away_team': away_team,
-                'home_h1': home_h1,
-                'home_h2': home_h2,
-                'home_full': home_h1 + home_h2,
-                'away_h1': away_h1,
-                'away_h2': away_h2,
-                'away_full': away_h1 + away_h2,
-                'h1_total': home_h1 + away_h1,
-                'h2_total': home_h2 + away_h2,
-                'full_total': home_h1 + home_h2 + away_h1 + away_h2
-            }
+        if home_h1 is None or away_h1 is None:
+            return None
 
+        return {
+            'game_id': game_id,
+            'date': game_date, # Persist the date
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_h1': home_h1,
+            'home_h2': home_h2,
+            'home_full': home_h1 + home_h2,
+            'away_h1': away_h1,
+            'away_h2': away_h2,
+            'away_full': away_h1 + away_h2,
+            'h1_total': home_h1 + away_h1,
+            'h2_total': home_h2 + away_h2,
+            'full_total': home_h1 + home_h2 + away_h1 + away_h2
+        }
+
+    def _scrape_game(self, game):
+        """
+        Cache record for one completed game: the H1/H2 record, {'skip': True} when
+        ESPN has no usable splits, or None on a transient failure (retried next run).
+        """
+        url = f"{self.base_url}/summary?event={game['id']}"
+        try:
+            response = self._get(url)
+            if response.status_code != 200:
+                return None
+            record = self.parse_game_summary(response.json(), game['id'], game['date'])
         except Exception as e:
-            print(f"Error fetching game {game_id}: {e}")
+            print(f"Error fetching game {game['id']}: {e}")
             return None
+        return record or {'game_id': game['id'], 'date': game['date'], 'skip': True}
+
+    def fetch_missing_games(self, completed_games, cache):
+        """Fetch summaries for completed games not yet in `cache` (bounded concurrency)."""
+        todo = [g for g in completed_games if g['id'] not in cache]
+        if not todo:
+            return 0
+        print(f"   {len(todo)} new games to fetch ({len(completed_games) - len(todo)} cached)")
+
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._scrape_game, g) for g in todo]
+            for i, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                if record is not None:
+                    cache.put(record)
+                    fetched += 1
+                if i % 100 == 0 or i == len(todo):
+                    print(f"   Progress: {i}/{len(todo)} ({i/len(todo)*100:.1f}%)")
+        return fetched
 
     def _extract_half_scores(self, competitor_data):
         """Extract H1 and H2 scores from competitor linescore."""
@@ -168,14 +288,27 @@ class NCAAB_H1_Scraper:
 
         return h1, h2
 
-    def build_team_profiles(self, games_data):
-        """Build H1/H2 statistical profiles for each team."""
+    def build_team_profiles(self, games_data, profiles=None):
+        """
+        Build H1/H2 statistical profiles for each team.
+
+        Games already folded into team_stats (by game_id) are skipped. With
+        `profiles` (the previous output), only teams that played in the new
+        games are recomputed; otherwise every team is.
+        """
+        touched = set()
         for game in games_data:
-            if game is None:
+            if game is None or game.get('skip'):
                 continue
+            game_id = game.get('game_id')
+            if game_id is not None:
+                if str(game_id) in self.seen_games:
+                    continue
+                self.seen_games.add(str(game_id))
 
             home = game['home_team']
             away = game['away_team']
+            touched.update((home, away))
 
             # Home team H1/H2 stats
             self.team_stats[home]['h1_scores'].append(game['home_h1'])
@@ -187,10 +320,16 @@ class NCAAB_H1_Scraper:
             self.team_stats[away]['h2_scores'].append(game['away_h2'])
             self.team_stats[away]['games_played'] += 1
 
+        if profiles is None:
+            profiles, teams = {}, list(self.team_stats)
+        else:
+            profiles, teams = dict(profiles), touched
+
         # Calculate averages and ratios
-        profiles = {}
-        for team, stats in self.team_stats.items():
+        for team in teams:
+            stats = self.team_stats[team]
             if stats['games_played'] < 3:  # Minimum sample size (reduced from 5 for faster testing)
+                profiles.pop(team, None)
                 continue
 
             h1_avg = statistics.mean(stats['h1_scores'])
@@ -211,6 +350,38 @@ class NCAAB_H1_Scraper:
 
         return profiles
 
+    def save_state(self, path, season):
+        """Persist team accumulators and folded game ids for the next incremental run."""
+        state = {
+            'season': season,
+            'seen_games': sorted(self.seen_games),
+            'team_stats': {team: {'h1_scores': s['h1_scores'], 'h2_scores': s['h2_scores'],
+                                  'games_played': s['games_played']}
+                           for team, s in self.team_stats.items()},
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def load_state(self, path, season):
+        """Restore saved accumulators. Returns False (fresh state) if missing or from another season."""
+        self.team_stats = defaultdict(_new_team_stats)
+        self.seen_games = set()
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except ValueError:
+            return False
+        if state.get('season') != season:
+            return False
+        for team, saved in state['team_stats'].items():
+            self.team_stats[team].update(saved)
+        self.seen_games = set(state['seen_games'])
+        return True
+
     def _calculate_consistency(self, h1_scores, h2_scores):
         """
         Calculate how consistent a team's H1/H2 split is.
@@ -236,50 +407,68 @@ class NCAAB_H1_Scraper:
         return round(consistency, 2)
 
     def run(self, save_path='data/'):
-        """Full pipeline: fetch games, build profiles, save."""
+        """
+        Full pipeline: fetch games, build profiles, save.
+
+        Incremental: finished schedule days, scraped games and team
+        accumulators are kept under save_path, so a nightly run only fetches
+        and folds in games that completed since the last one.
+        """
         print("🏀 Starting NCAAB H1/H2 Data Collection...")
         print("=" * 60)
+        os.makedirs(save_path, exist_ok=True)
+        season = self.season_start().strftime('%Y%m%d')
+
+        cache_path = os.path.join(save_path, GAME_CACHE_FILE)
+        fresh_cache = not os.path.exists(cache_path)
+        cache = GameCache(cache_path)
+        legacy_path = os.path.join(save_path, 'historical_games.json')
+        if fresh_cache and os.path.exists(legacy_path):
+            with open(legacy_path) as f:
+                seeded = cache.seed(json.load(f))
+            print(f"   Seeded game cache with {seeded} games from historical_games.json")
 
         # Step 1: Fetch entire season schedule
         print("\n1️⃣ Fetching schedule (entire season since Nov 1)...")
-        games = self.fetch_schedule()  # Defaults to full season
+        checkpoint_path = os.path.join(save_path, SCHEDULE_CHECKPOINT_FILE)
+        checkpoint = {}
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+        games = self.fetch_schedule(checkpoint=checkpoint)  # Defaults to full season
+        with open(checkpoint_path, 'w') as f:
+            json.dump(checkpoint, f, separators=(',', ':'))
         completed_games = [g for g in games if g['status'] == 'post']
         print(f"   Found {len(completed_games)} completed games this season")
 
-        # Step 2: Fetch game details for ALL completed games
-        print("\n2️⃣ Fetching game details for all games...")
-        print(f"   This will take approximately {len(completed_games) * 0.15 / 60:.0f}-{len(completed_games) * 0.15 / 60 + 5:.0f} minutes")
-        games_data = []
-
-        for i, game in enumerate(completed_games, 1):
-            if i % 100 == 0 or i == len(completed_games):
-                print(f"   Progress: {i}/{len(completed_games)} ({i/len(completed_games)*100:.1f}%)")
-
-            # Pass the date!
-            game_details = self.fetch_game_details(game['id'], game['date'])
-            if game_details:
-                games_data.append(game_details)
-
-            time.sleep(0.15)  # Rate limiting (0.15s = ~400 games/min)
-
-        print(f"   ✓ Successfully fetched {len(games_data)} games with H1/H2 data")
+        # Step 2: Fetch game details for games not already cached
+        print("\n2️⃣ Fetching game details for new games...")
+        fetched = self.fetch_missing_games(completed_games, cache)
+        games_data = [cache.get(g['id']) for g in completed_games if g['id'] in cache]
+        games_data = [g for g in games_data if not g.get('skip')]
+        print(f"   ✓ Fetched {fetched} new games; {len(games_data)} games with H1/H2 data")
 
         # Step 3: Build team profiles
         print("\n3️⃣ Building team H1/H2 profiles...")
-        profiles = self.build_team_profiles(games_data)
-        print(f"   ✓ Built profiles for {len(profiles)} teams")
+        profiles_path = os.path.join(save_path, 'team_h1_profiles.json')
+        state_path = os.path.join(save_path, TEAM_STATE_FILE)
+        previous = None
+        if self.load_state(state_path, season) and os.path.exists(profiles_path):
+            with open(profiles_path) as f:
+                previous = json.load(f)
+        folded = len(self.seen_games)
+        profiles = self.build_team_profiles(games_data, previous)
+        print(f"   ✓ Built profiles for {len(profiles)} teams ({len(self.seen_games) - folded} new games folded in)")
 
         # Step 4: Save data
         print("\n4️⃣ Saving data...")
-        import os
-        os.makedirs(save_path, exist_ok=True)
-
-        with open(f'{save_path}team_h1_profiles.json', 'w') as f:
+        with open(profiles_path, 'w') as f:
             json.dump(profiles, f, indent=2)
 
-        with open(f'{save_path}historical_games.json', 'w') as f:
-            json.dump(games_data, f, indent=2)
+        with open(legacy_path, 'w') as f:
+            json.dump(games_data, f, separators=(',', ':'))
 
+        self.save_state(state_path, season)
         print(f"   ✓ Saved to {save_path}")
 
         # Step 5: Summary stats
@@ -25,7 +25,7 @@ class KenPomClient:
             return pd.DataFrame()
 
         try:
-            import requests
+            from data.clients.base import http_get
             
             # Default to current year logic if needed, or hardcode/pass from arg
             # season year is the ending year (e.g., 2026)
@@ -40,7 +40,7 @@ class KenPomClient:
                 "y": year
             }
             
-            response = requests.get(self.base_url, headers=headers, params=params)
+            response = http_get(self.base_url, headers=headers, params=params)
             
             if response.status_code != 200:
                 print(f"❌ KenPom API Error: {response.status_code} - {response.text}")
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Run the NCAAB H1 scraper to collect full season data.
-This will take 15-20 hours to complete.
+First run fetches the whole season; later runs only fetch new games
+(state is kept in data/game_cache.jsonl and friends).
 """
 
 from ncaab_h1_scraper import NCAAB_H1_Scraper
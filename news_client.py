@@ -1,7 +1,7 @@
-import requests
 import re
 from datetime import datetime
 import pandas as pd
+from data.clients.base import http_get
 from star_players import STAR_PLAYERS
 
 class SentimentEngine:
@@ -74,7 +74,7 @@ class NewsClient:
             return []
 
         try:
-            resp = requests.get(url, params={'limit': limit}, timeout=5)
+            resp = http_get(url, params={'limit': limit}, timeout=5)
             resp.raise_for_status()
             data = resp.json()
             
@@ -1,8 +1,7 @@
-import requests
 import pandas as pd
-import time
 from datetime import datetime, timedelta
 import os
+from data.clients.base import http_get
 
 class NHLRefClient:
     def __init__(self):
@@ -31,7 +30,7 @@ class NHLRefClient:
             # Fetch Weekly Schedule
             url = f"{self.base_url}/schedule/{date_str}"
             try:
-                r = requests.get(url, headers=self.headers)
+                r = http_get(url, headers=self.headers)
                 if r.status_code == 200:
                     data = r.json()
                     
@@ -65,8 +64,7 @@ class NHLRefClient:
                 print(f"❌ Error fetching schedule: {e}")
             
             # Jump 7 days
-            current_date += timedelta(days=7)
-            time.sleep(1) # Be polite
+            current_date += timedelta(days=7)  # api-web.nhle.com is rate limited in data.clients.base
 
         # Convert to DataFrame
         df = pd.DataFrame(all_logs)
@@ -80,7 +78,7 @@ class NHLRefClient:
     def fetch_game_boxscore(self, game_id):
         url = f"{self.base_url}/game/{game_id}/boxscore"
         try:
-            r = requests.get(url, headers=self.headers)
+            r = http_get(url, headers=self.headers)
             if r.status_code != 200:
                 return None
                 
@@ -115,7 +113,7 @@ class NHLRefClient:
         """
         url = f"{self.base_url}/game/{game_id}/landing"
         try:
-            r = requests.get(url, headers=self.headers)
+            r = http_get(url, headers=self.headers)
             if r.status_code != 200: return None
             data = r.json()
             
@@ -176,7 +174,7 @@ class NHLRefClient:
     def fetch_game_landing(self, game_id):
         url = f"{self.base_url}/game/{game_id}/landing"
         try:
-            r = requests.get(url, headers=self.headers)
+            r = http_get(url, headers=self.headers)
             if r.status_code != 200: 
                 print(f"❌ Landing Fetch Failed for {game_id}: Status {r.status_code} | URL: {url}")
                 return None
@@ -20,6 +20,7 @@ class PipelineContext:
     games_map: Dict[str, Any] = field(default_factory=dict) # MatchID -> MatchData
     odds_data: Dict[str, Any] = field(default_factory=dict) # Sport -> Odds
     ratings: Dict[str, Any] = field(default_factory=dict)
+    rating_index: Dict[str, Any] = field(default_factory=dict) # Sport -> {Team Name -> Rating}
     sharp_data: Dict[str, Any] = field(default_factory=dict)
     pro_systems: Dict[str, Any] = field(default_factory=dict)
     
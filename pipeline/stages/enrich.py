@@ -1,7 +1,7 @@
 from pipeline.orchestrator import PipelineContext
-from data.clients.ratings import get_team_ratings
+from data.clients.ratings import get_team_ratings, build_rating_index
 from utils.logging import log
-from nba_refs import get_nba_refs
+from data.clients.nba_api import get_nba_refs
 from nhl_assignments import get_nhl_assignments
 from utils.ref_mapping import build_ref_map
 
@@ -15,10 +15,22 @@ def execute(context: PipelineContext) -> bool:
     try:
         # 1. Team Ratings
         log("ENRICH", "Fetching Team Ratings...")
-        ratings = get_team_ratings()
+        freshness = {}
+        ratings = get_team_ratings(freshness=freshness)
+        context.metadata['ratings_freshness'] = freshness
         if ratings:
             context.ratings = ratings
             log("ENRICH", f"✅ Loaded Ratings for {len(ratings)} teams")
+
+            # Resolve every slate team name against its own sport once, so
+            # PROCESS does exact lookups instead of fuzzy scans per game
+            names_by_sport = {
+                sport: {g.get(side) for g in games for side in ('home_team', 'away_team')}
+                for sport, games in context.odds_data.items()
+            }
+            context.rating_index = build_rating_index(ratings, names_by_sport)
+            unresolved = sum(1 for teams in context.rating_index.values() for r in teams.values() if r is None)
+            log("ENRICH", f"✅ Indexed ratings for {len(context.rating_index)} sports ({unresolved} unmatched slate teams)")
         else:
             log("WARN", "Ratings Fetch Failed or Empty")
             # We don't abort, but downstream might skip games
@@ -1,7 +1,7 @@
 from pipeline.orchestrator import PipelineContext
 from config.settings import Config
 from utils.logging import log
-import requests
+from data.clients.base import http_get
 from datetime import datetime, timedelta, timezone
 from data.clients.action_network import get_action_network_data
 from data.sources.nhl_goalies_lwl import fetch_lwl_goalies
@@ -107,7 +107,7 @@ def execute(context: PipelineContext) -> bool:
             iso_start = now_utc.strftime('%Y-%m-%dT%H:%M:%SZ')
             
             url = f"https://api.the-odds-api.com/v4/sports/{league_key}/odds/?apiKey={Config.ODDS_API_KEY}&regions=us,us2&markets=h2h,spreads,totals&oddsFormat=decimal&commenceTimeFrom={iso_start}&commenceTimeTo={iso_limit}"
-            res = requests.get(url, timeout=15)
+            res = http_get(url, timeout=15)
             
             if res.status_code == 200:
                 data = res.json()
@@ -147,7 +147,7 @@ def execute(context: PipelineContext) -> bool:
                             evt_id = g['id']
                             # Request alternate_totals
                             d_url = f"https://api.the-odds-api.com/v4/sports/{league_key}/events/{evt_id}/odds?apiKey={Config.ODDS_API_KEY}&regions=us&markets=alternate_totals&oddsFormat=decimal"
-                            d_res = requests.get(d_url, timeout=5)
+                            d_res = http_get(d_url, timeout=5)
                             if d_res.status_code == 200:
                                 d_data = d_res.json()
                                 details_count += 1
@@ -1,7 +1,8 @@
 from pipeline.orchestrator import PipelineContext
 from utils.logging import log
 from datetime import datetime
-import json
+from db.metadata import upsert_metadata
+from utils.json_codec import dumps
 
 def execute(context: PipelineContext) -> bool:
     """
@@ -11,33 +12,6 @@ def execute(context: PipelineContext) -> bool:
     - Batch Execute Operations
     """
     
-    # Helper for JSON cleaning (Nan -> Null)
-    def clean_nan(obj):
-        if isinstance(obj, float):
-            if obj != obj: # NaN check
-                return None
-            if obj == float('inf') or obj == float('-inf'):
-                return None
-        return obj
-
-    def safe_json_serializer(obj):
-        """Handle numpy types and NaNs"""
-        import numpy as np
-        if isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                            np.int16, np.int32, np.int64, np.uint8,
-                            np.uint16, np.uint32, np.uint64)):
-            return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
-            if np.isnan(obj) or np.isinf(obj):
-                return None
-            return float(obj)
-        elif isinstance(obj, (np.ndarray,)):
-            return [clean_nan(x) for x in obj.tolist()]
-        elif isinstance(obj, dict):
-             return {k: (clean_nan(v) if not isinstance(v, (dict, list)) else v) for k, v in obj.items()}
-             
-        return clean_nan(obj)
-
     try:
         if not context.db_conn or not context.db_cursor:
             log("WARN", "No active DB connection to commit.")
@@ -54,6 +28,7 @@ def execute(context: PipelineContext) -> bool:
         
         insert_count = 0
         delete_count = 0
+        metadata_rows = []
         
         for op in opps:
             op_type = op.get('op_type', 'INSERT')
@@ -63,13 +38,20 @@ def execute(context: PipelineContext) -> bool:
                 eid = op.get('event_id')
                 cur.execute("DELETE FROM intelligence_log WHERE event_id = %s", (eid,))
                 cur.execute("DELETE FROM calibration_log WHERE event_id = %s", (eid,))
+                cur.execute("DELETE FROM opportunity_metadata WHERE event_id = %s", (eid,))
                 delete_count += 1
                 
             elif op_type == 'INSERT':
                 # Insert / Upsert
+                # Normalized team columns ("Away @ Home") for indexed lookups
+                away_team, sep, home_team = str(op['Event']).partition(' @ ')
+                if not sep:
+                    away_team, home_team = None, None
+
                 # Extract Params
                 params = (
                     op['unique_id'], datetime.now(), op['Kickoff'], op['Sport'], op['Event'],
+                    home_team, away_team,
                     op['Selection'], float(op['Dec_Odds']), float(op['True_Prob']),
                     float(op['Edge_Val']), float(op['raw_stake']), op.get('trigger_type', 'model'),
                     float(op['Dec_Odds']), # closing_odds init
@@ -79,15 +61,14 @@ def execute(context: PipelineContext) -> bool:
                     op.get('home_adj_em', 0), op.get('away_adj_em', 0),
                     op.get('home_adj_o', 0), op.get('away_adj_o', 0),
                     op.get('home_adj_d', 0), op.get('away_adj_d', 0),
-                    op.get('home_tempo', 0), op.get('away_tempo', 0),
-                    json.dumps(op.get('metadata', {}), default=safe_json_serializer).replace('NaN', 'null')
+                    op.get('home_tempo', 0), op.get('away_tempo', 0)
                 )
                 
                 sql = """
                     INSERT INTO intelligence_log
-                    (event_id, timestamp, kickoff, sport, teams, selection, odds, true_prob, edge, stake, trigger_type, closing_odds, ticket_pct, money_pct, sharp_score, home_rest, away_rest, ref_1, ref_2, ref_3, 
-                    home_adj_em, away_adj_em, home_adj_o, away_adj_o, home_adj_d, away_adj_d, home_tempo, away_tempo, metadata)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                    (event_id, timestamp, kickoff, sport, teams, home_team, away_team, selection, odds, true_prob, edge, stake, trigger_type, closing_odds, ticket_pct, money_pct, sharp_score, home_rest, away_rest, ref_1, ref_2, ref_3, 
+                    home_adj_em, away_adj_em, home_adj_o, away_adj_o, home_adj_d, away_adj_d, home_tempo, away_tempo)
+                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
                     ON CONFLICT (event_id) DO UPDATE SET
                         odds=EXCLUDED.odds, true_prob=EXCLUDED.true_prob, edge=EXCLUDED.edge,
                         stake=EXCLUDED.stake, selection=EXCLUDED.selection, timestamp=EXCLUDED.timestamp,
@@ -105,6 +86,8 @@ def execute(context: PipelineContext) -> bool:
                 """
                 cur.execute(sql, params)
                 insert_count += 1
+                # Model payload goes to opportunity_metadata (bulk-written below)
+                metadata_rows.append((op['unique_id'], op.get('metadata')))
                 
                 # Calibration Log
                 # Calibration Log
@@ -120,6 +103,9 @@ def execute(context: PipelineContext) -> bool:
                     cur.execute("ROLLBACK TO SAVEPOINT calib_pt")
                     log("WARN", f"Calibration Log Failed for {op.get('unique_id')}: {e}")
 
+        if metadata_rows:
+            upsert_metadata(cur, metadata_rows)
+
         # Phase 8: Persist ALL NBA Predictions (Audit Log)
         if hasattr(context, 'nba_predictions') and context.nba_predictions:
             log("PERSIST", f"Logging {len(context.nba_predictions)} NBA Model Predictions...")
@@ -161,7 +147,7 @@ def execute(context: PipelineContext) -> bool:
                     """, (
                         p['run_id'], p['game_id'], p['game_date_est'], p['home_team'], p['away_team'], 
                         p['book'], float(p['odds_home']), float(p['odds_away']), float(p['prob_home']), float(p['prob_away']), 
-                        json.dumps(p['features_snapshot'], default=safe_json_serializer).replace('NaN', 'null')
+                        dumps(p['features_snapshot'])
                     ))
                     
                     # Insert Totals (if available)
@@ -9,6 +9,7 @@ from models.soccer import SoccerModelV2
 from models.nba import NBAModel
 from models.nhl import NHLModelV2
 from processing.sharp_scoring import calculate_sharp_score
+from data.sources.kenpom_store import get_kenpom_store
 from utils.team_names import normalize_team_name
 import difflib
 
@@ -73,6 +74,13 @@ def execute(context: PipelineContext) -> bool:
             is_soccer = sport in ['EPL', 'LaLiga', 'Bundesliga', 'SerieA', 'Ligue1', 'ChampionsLeague', 'EuropaLeague']
 
             seen_matches = set()
+
+            if sport == 'NCAAB':
+                # Resolve the slate's team names against KenPom once, not per market
+                names = {g.get(side) for g in games for side in ('home_team', 'away_team')}
+                added = get_kenpom_store().resolve_aliases(names)
+                if added:
+                    log("PROCESS", f"Resolved {added} new KenPom aliases")
             
             for game in games:
                 try:
@@ -318,7 +326,8 @@ def execute(context: PipelineContext) -> bool:
                         existing_bets_map=context.existing_bets,
                         is_soccer=is_soccer,
                         predictions=combined_preds,
-                        seen_bet_signatures=context.seen_bet_signatures
+                        seen_bet_signatures=context.seen_bet_signatures,
+                        rating_index=context.rating_index or None
                     ))
                     
                     # 2. NHL Props Processing
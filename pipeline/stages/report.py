@@ -1,6 +1,7 @@
 from pipeline.orchestrator import PipelineContext
 from config.settings import Config
 from utils.logging import log
+from data.clients.base import http_metrics
 import pandas as pd
 import os
 from datetime import datetime
@@ -11,6 +12,13 @@ def execute(context: PipelineContext) -> bool:
     Generates CSV artifacts for debugging and KPI tracking.
     Triggered only if 'report_csv' is set in context or config.
     """
+    # Per-host HTTP metrics for the whole run (always recorded)
+    metrics = http_metrics()
+    context.metadata['http_metrics'] = metrics
+    for host, m in sorted(metrics.items()):
+        log("REPORT", f"HTTP {host}: {m['requests']} req, avg {m['avg_ms']}ms, max {m['max_ms']}ms, "
+                      f"{m['retries']} retries, {m['errors']} errors, {m['not_modified']} not modified")
+
     # Check flag
     if not getattr(context, 'report_csv', False):
         return True
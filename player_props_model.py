@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from db.connection import get_db
 from utils import log
+from core.pricing import poisson_over_cached
 
 class PlayerPropsPredictor:
     """
@@ -13,6 +14,10 @@ class PlayerPropsPredictor:
         self.league = league
         self.season = season
         self.data = self._load_data()
+        self._player_rows = None   # player_name -> row positions in self.data
+        self._player_frames = {}   # player_name -> per-player frame (league or cross-league)
+        self._stats_cache = {}     # (player, span, opponent) -> rolling stats dict
+        self._stats_ratings = None # defense_ratings the memo was built against
         
     def get_player_stats_any_league(self, player_name):
         """
@@ -94,77 +99,68 @@ class PlayerPropsPredictor:
         Calculate xGoals Allowed (xGA) per 90 for every team in the league.
         Returns: dict { 'TeamName': xGA_per_90_float }
         """
-        if self.data.empty: return {}
-
-        # 1. Identify Opponents per Match
-        # Group by match_id to find the two teams
-        match_teams = self.data.groupby('match_id')['team_name'].unique()
-        
-        # 2. Calculate Total xG Conceded by each team
-        team_xga = {} # {Team: Total_xG_Conceded}
-        team_mins = {} # {Team: Total_Mins_Played} -> Approx (Matches * 90)
+        ratings = compute_team_defense_ratings(self.data)
+        self.avg_league_xga = sum(ratings.values()) / max(1, len(ratings))
+        return ratings
 
-        # Pre-calc xG total per match per team
-        # For each match, we sum the xG of Team A to get Team B's xGA
-        match_xg = self.data.groupby(['match_id', 'team_name'])['xg'].sum().reset_index()
-        
-        for mid, teams in match_teams.items():
-            if len(teams) != 2: continue # Skip data incomplete matches
-            t1, t2 = teams[0], teams[1]
-            
-            # Get xG created BY t1 (which is xGA for t2)
-            t1_xg = match_xg[(match_xg['match_id'] == mid) & (match_xg['team_name'] == t1)]['xg'].sum()
-            # Get xG created BY t2 (which is xGA for t1)
-            t2_xg = match_xg[(match_xg['match_id'] == mid) & (match_xg['team_name'] == t2)]['xg'].sum()
-            
-            team_xga[t1] = team_xga.get(t1, 0) + t2_xg
-            team_xga[t2] = team_xga.get(t2, 0) + t1_xg
-            
-            # Count match as 1 game (90 mins)
-            team_mins[t1] = team_mins.get(t1, 0) + 90
-            team_mins[t2] = team_mins.get(t2, 0) + 90
-            
-        # 3. Normalize to xGA/90
-        ratings = {}
-        league_xga_sum = 0
-        league_teams = 0
-        
-        for team, xga in team_xga.items():
-            mins = team_mins.get(team, 90)
-            if mins == 0: continue
-            rating = (xga / mins) * 90
-            ratings[team] = rating
-            league_xga_sum += rating
-            league_teams += 1
-            
-        self.avg_league_xga = league_xga_sum / max(1, league_teams)
+    def load_defense_ratings(self):
+        """
+        Ratings from the persisted `team_defense_ratings` table (refreshed after
+        each Understat sync). Falls back to computing from the loaded season data.
+        """
+        ratings = load_team_defense_ratings(self.league, self.season)
+        if not ratings:
+            return self.get_team_defense_ratings()
+        self.avg_league_xga = sum(ratings.values()) / max(1, len(ratings))
         return ratings
 
-    def get_player_rolling_stats(self, player_name, span=5, upcoming_opponent=None):
+    def _player_frame(self, player_name):
         """
-        Calculate stats and apply MATCHUP ADJUSTMENT if opponent is provided.
+        Per-player rows, memoized. League data is sliced from a grouped index
+        built once; Champions_League players come from the cross-league lookup.
         """
+        if player_name in self._player_frames:
+            return self._player_frames[player_name]
+
         # --- CROSS-REFERENCE CHECK (UCL) ---
         if self.league == "Champions_League":
-             # Special Mode: Lookup Player in ANY DB (Domestic League Data)
-             player_df = self.get_player_stats_any_league(player_name)
-             if player_df is None or player_df.empty: return None
+            # Special Mode: Lookup Player in ANY DB (Domestic League Data)
+            player_df = self.get_player_stats_any_league(player_name)
         else:
-             player_df = self.data[self.data['player_name'] == player_name].copy()
-        
-        if player_df.empty: return None
+            if self._player_rows is None:
+                self._player_rows = self.data.groupby('player_name').indices if not self.data.empty else {}
+            rows = self._player_rows.get(player_name)
+            player_df = self.data.iloc[rows] if rows is not None else None
+
+        self._player_frames[player_name] = player_df
+        return player_df
+
+    def get_player_rolling_stats(self, player_name, span=5, upcoming_opponent=None):
+        """
+        Calculate stats and apply MATCHUP ADJUSTMENT if opponent is provided.
+        Memoized per (player, span, opponent); reset when defense_ratings is replaced.
+        """
+        ratings = getattr(self, 'defense_ratings', None)
+        if ratings is not self._stats_ratings:
+            self._stats_cache.clear()
+            self._stats_ratings = ratings
+
+        key = (player_name, span, upcoming_opponent)
+        if key not in self._stats_cache:
+            self._stats_cache[key] = self._compute_rolling_stats(player_name, span, upcoming_opponent)
+        return self._stats_cache[key]
+
+    def _compute_rolling_stats(self, player_name, span, upcoming_opponent):
+        player_df = self._player_frame(player_name)
+        if player_df is None or player_df.empty: return None
         
         # --- ROLLING STATS ---
-        player_df['rolling_minutes'] = player_df['minutes'].rolling(window=span, min_periods=1).sum()
-        player_df['rolling_shots'] = player_df['shots'].rolling(window=span, min_periods=1).sum()
-        player_df['rolling_xg'] = player_df['xg'].rolling(window=span, min_periods=1).sum()
-        player_df['rolling_xa'] = player_df['xa'].rolling(window=span, min_periods=1).sum()
-        player_df['rolling_xg_chain'] = player_df['xg_chain'].rolling(window=span, min_periods=1).sum()
-        
-        # Take the most recent row AFTER rolling stats are added
+        # Only the latest window is used: sum of the last `span` rows
+        # (min_count=1 mirrors rolling(min_periods=1))
+        rolling = player_df[['minutes', 'shots', 'xg', 'xa', 'xg_chain']].iloc[-span:].sum(min_count=1)
         last_row = player_df.iloc[-1]
         
-        if last_row['rolling_minutes'] < 90:
+        if rolling['minutes'] < 90:
             total_mins = player_df['minutes'].sum()
             if total_mins < 45: return None
             norm_mins = total_mins
@@ -173,11 +169,11 @@ class PlayerPropsPredictor:
             raw_xa = player_df['xa'].sum()
             raw_chain = player_df['xg_chain'].sum()
         else:
-            norm_mins = last_row['rolling_minutes']
-            raw_shots = last_row['rolling_shots']
-            raw_xg = last_row['rolling_xg']
-            raw_xa = last_row['rolling_xa']
-            raw_chain = last_row['rolling_xg_chain']
+            norm_mins = rolling['minutes']
+            raw_shots = rolling['shots']
+            raw_xg = rolling['xg']
+            raw_xa = rolling['xa']
+            raw_chain = rolling['xg_chain']
 
         # Rate Per 90 (Pace)
         proj_shots_p90 = (raw_shots / norm_mins) * 90
@@ -209,22 +205,14 @@ class PlayerPropsPredictor:
         proj_xg_game = final_xg_p90 * (exp_mins / 90.0)
 
         # --- PROBABILITY (POISSON) ---
-        import math
-        def poisson_prob_over(lam, line):
-            target_k = int(line)
-            cumulative_prob = 0.0
-            for k in range(target_k + 1):
-                cumulative_prob += (math.exp(-lam) * (lam**k)) / math.factorial(k)
-            return max(0.0, min(1.0, 1.0 - cumulative_prob))
-
         # 1. Anytime Goal Probability (Line 0.5) using GAME xG
-        prob_goal = poisson_prob_over(proj_xg_game, 0.5) * 100
+        prob_goal = poisson_over_cached(proj_xg_game, 0.5) * 100
         
         # 2. 2+ Shots Probability (Line 1.5) using GAME Shots
-        prob_2_shots = poisson_prob_over(proj_shots_game, 1.5) * 100
+        prob_2_shots = poisson_over_cached(proj_shots_game, 1.5) * 100
         
         # --- VARIANCE & RELIABILITY ---
-        shots_std = player_df['shots'].rolling(window=span, min_periods=1).std().iloc[-1]
+        shots_std = player_df['shots'].iloc[-span:].std()
         if pd.isna(shots_std): shots_std = 0.0
         
         def get_american_odds(prob_pct):
@@ -275,14 +263,14 @@ class PlayerPropsPredictor:
         NOTE: Without a schedule of UPCOMING matches, we cannot apply opponent adjustments automatically here.
         This scan assumes 'Neutral' matchup (1.0x) unless updated to take a schedule dict.
         """
-        # Calc Ratings First
-        self.defense_ratings = self.get_team_defense_ratings()
+        # Ratings First (persisted table, computed if missing)
+        self.defense_ratings = self.load_defense_ratings()
         
         unique_players = self.data['player_name'].unique()
         projections = []
         
         for p_name in unique_players:
-            p_mins = self.data[self.data['player_name'] == p_name]['minutes'].sum()
+            p_mins = self._player_frame(p_name)['minutes'].sum()
             if p_mins < min_minutes: continue
             
             # Base Projection (No Opponent known in generic scan)
@@ -293,6 +281,79 @@ class PlayerPropsPredictor:
         if not projections: return pd.DataFrame()
         return pd.DataFrame(projections)
 
+
+def compute_team_defense_ratings(data):
+    """
+    xGA/90 per team from player-match rows (match_id, team_name, xg).
+    A team's xGA in a match is the opponent's summed xG; only matches with
+    exactly two teams count, each as 90 minutes.
+    """
+    if data.empty: return {}
+
+    team_xg = data.groupby(['match_id', 'team_name'])['xg'].sum().reset_index()
+    n_teams = data.groupby('match_id')['team_name'].nunique(dropna=False)
+    team_xg = team_xg[team_xg['match_id'].isin(n_teams.index[n_teams == 2])]
+    if team_xg.empty: return {}
+
+    # Opponent xG = match total - own xG
+    team_xg['xga'] = team_xg.groupby('match_id')['xg'].transform('sum') - team_xg['xg']
+    agg = team_xg.groupby('team_name')['xga'].agg(['sum', 'size'])
+    ratings = (agg['sum'] / (agg['size'] * 90)) * 90
+    return {team: float(r) for team, r in ratings.items()}
+
+
+def load_team_defense_ratings(league, season):
+    """Read persisted xGA/90 ratings for a league/season. Returns {} if unavailable."""
+    conn = get_db()
+    if not conn: return {}
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT team_name, xga_per90 FROM team_defense_ratings WHERE league = %s AND season = %s",
+            (league, season)
+        )
+        return {team: float(xga) for team, xga in cur.fetchall()}
+    except Exception as e:
+        log("PROPS", f"Defense table unavailable for {league}: {e}")
+        conn.rollback()
+        return {}
+    finally:
+        conn.close()
+
+
+def refresh_team_defense_ratings(league, season):
+    """Recompute a league's ratings from player_stats and persist them."""
+    conn = get_db()
+    if not conn: return 0
+    try:
+        import warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            data = pd.read_sql(
+                "SELECT match_id, team_name, xg FROM player_stats WHERE league = %s AND season = %s",
+                conn, params=(league, season)
+            )
+        ratings = compute_team_defense_ratings(data)
+        if not ratings: return 0
+
+        from psycopg2.extras import execute_values
+        cur = conn.cursor()
+        cur.execute("DELETE FROM team_defense_ratings WHERE league = %s AND season = %s", (league, season))
+        execute_values(
+            cur,
+            "INSERT INTO team_defense_ratings (league, season, team_name, xga_per90) VALUES %s",
+            [(league, season, team, xga) for team, xga in ratings.items()]
+        )
+        conn.commit()
+        log("PROPS", f"🛡️ Stored defense ratings for {len(ratings)} {league} teams")
+        return len(ratings)
+    except Exception as e:
+        log("ERROR", f"Defense ratings refresh failed for {league}: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
 if __name__ == "__main__":
     print("🧪 Testing Matchup Adjuster...")
     predictor = PlayerPropsPredictor(league="EPL", season="2025")
@@ -47,7 +47,7 @@ def run_backtest(start_date=None, end_date=None, sport=None, min_edge=None):
                 odds, true_prob, edge, stake, outcome, closing_odds,
                 user_bet, user_odds, user_stake, sharp_score,
                 ticket_pct, money_pct
-            FROM intelligence_log
+            FROM intelligence_log_all
             WHERE outcome IN ('WON', 'LOST', 'PUSH')
             AND kickoff BETWEEN %s AND %s
         """
@@ -0,0 +1,100 @@
+"""
+Dashboard Frame Transforms
+
+Column-wise preparation of intelligence_log frames for the Streamlit
+dashboard (display columns, stake/odds resolution, time-window filter),
+plus matching of tracked bets to live scores.
+"""
+
+import difflib
+import re
+
+import numpy as np
+import pandas as pd
+
+FEED_WINDOW_HOURS = 36
+
+
+def _resolve(df, col_base):
+    """User-entered value when present, else the model value, else 0."""
+    base = pd.to_numeric(df[col_base], errors='coerce')
+    user_col = f"user_{col_base}"
+    if user_col in df.columns:
+        user = pd.to_numeric(df[user_col], errors='coerce')
+        base = user.where(user.notna(), base)
+    return base.fillna(0.0).astype(float)
+
+
+def _format_kickoff(kickoff):
+    """
+    ('%Y-%m-%d', '%m-%d %H:%M') strings for a tz-aware series. Formats once via
+    numpy ISO strings and slices, instead of per-element strftime.
+    """
+    local = kickoff.dt.tz_localize(None).values.astype('datetime64[m]')
+    iso = pd.Series(np.datetime_as_string(local, unit='m'), index=kickoff.index)  # YYYY-MM-DDTHH:MM
+    date = iso.str.slice(0, 10)
+    clock = iso.str.slice(5, 10) + ' ' + iso.str.slice(11, 16)
+    missing = kickoff.isna()
+    return date.mask(missing), clock.mask(missing)
+
+
+def clean_dashboard_frame(df, now=None):
+    """
+    Add display columns and keep rows that are either tracked user bets or
+    kick off within the next FEED_WINDOW_HOURS (US/Eastern).
+
+    Args:
+        df: intelligence_log rows (pending or settled)
+        now: tz-aware 'now' (defaults to current US/Eastern time)
+    """
+    if df.empty: return df
+    df = df.copy()
+
+    df['kickoff'] = pd.to_datetime(df['kickoff']).dt.tz_localize('UTC', ambiguous='infer').dt.tz_convert('US/Eastern')
+    df['Date'], df['Kickoff'] = _format_kickoff(df['kickoff'])
+
+    sport = df['sport'].astype(str)
+    df['Sport'] = sport.where(~sport.str.contains('_', regex=False), sport.str.rsplit('_', n=1).str[-1].str.upper())
+    df['Event'] = df['teams']
+    df['Selection'] = df['selection']
+
+    df['Stake_Val'] = np.maximum(1.00, _resolve(df, 'stake'))
+    df['Stake'] = df['Stake_Val'].map('${:.2f}'.format)
+    df['Dec_Odds'] = _resolve(df, 'odds')
+    df['Edge_Val'] = pd.to_numeric(df['edge'], errors='coerce').fillna(0)
+    df['Edge'] = (df['Edge_Val'] * 100).map('{:.1f}%'.format)
+
+    # --- GLOBAL TIME FILTER (ALWAYS ON) ---
+    # Feed shows future games only; tracked user bets stay visible (Portfolio).
+    now_est = now if now is not None else pd.Timestamp.now(tz='US/Eastern')
+    limit_est = now_est + pd.Timedelta(hours=FEED_WINDOW_HOURS)
+
+    mask_future = (df['kickoff'] > now_est) & (df['kickoff'] <= limit_est)
+    mask_user = (df.get('user_bet', False) == True)
+
+    return df[mask_future | mask_user].copy()
+
+
+def _same_team(a, b, cutoff):
+    a, b = a.lower().strip(), b.lower().strip()
+    return a in b or b in a or difflib.SequenceMatcher(None, a, b).ratio() >= cutoff
+
+
+def match_live_score(event, games, cutoff=0.6):
+    """
+    Score text of the live game for an "Away @ Home" / "A vs B" event string,
+    or None. Both teams must match (either orientation).
+
+    Args:
+        event: intelligence_log teams string
+        games: [{'home', 'away', 'score'}] as returned by the dashboard's fetch_live_games
+    """
+    parts = re.split(r'\s+(?:@|vs\.?|v)\s+', str(event or ''))
+    if len(parts) != 2: return None
+    first, second = parts
+    for g in games:
+        home, away = g.get('home', ''), g.get('away', '')
+        if (_same_team(first, away, cutoff) and _same_team(second, home, cutoff)) or \
+           (_same_team(first, home, cutoff) and _same_team(second, away, cutoff)):
+            return g.get('score')
+    return None
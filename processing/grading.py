@@ -1,6 +1,8 @@
 import requests
 from config.settings import Config
 from db.connection import get_db, safe_execute
+from db.queries import PENDING_TO_GRADE
+from db.rollups import refresh_performance_views
 from utils.logging import log
 
 # ---------------------------
@@ -301,12 +303,12 @@ def settle_pending_bets():
     try:
         cur = conn.cursor()
         
-        # 1. Fetch live/recent scores from ESPN (Today + Yesterday)
+        # 1. Fetch live/recent scores (Today + last 4 days) from the shared live-scores store
         keys = ['NBA', 'NCAAB', 'NHL', 'NFL', 'SOCCER'] 
         live_games = []
         
         try:
-            from data.clients.espn import fetch_espn_scores
+            from data.live_scores import get_scores
             from datetime import datetime, timedelta
             import pytz
             
@@ -324,7 +326,7 @@ def settle_pending_bets():
             
             for d in dates_to_fetch:
                 log("GRADING", f"Fetching scores for date: {d}")
-                g_day = fetch_espn_scores(keys, specific_date=d)
+                g_day = get_scores(keys, specific_date=d)
                 live_games.extend(g_day)
                 
             log("GRADING", f"Fetched {len(live_games)} games total.")
@@ -340,7 +342,7 @@ def settle_pending_bets():
         graded_count = 0
         
         # Re-query all pending bets with necessary fields for PnL
-        cur.execute("SELECT event_id, sport, selection, teams, odds, stake FROM intelligence_log WHERE outcome = 'PENDING' AND kickoff < NOW()")
+        cur.execute(PENDING_TO_GRADE)
         pending_detailed = cur.fetchall()
         
         log("GRADING", f"Checking {len(pending_detailed)} pending bets against {len(live_games)} games.")
@@ -432,6 +434,7 @@ def settle_pending_bets():
 
         if graded_count > 0:
             log("GRADING", f"✨ Successfully graded {graded_count} bets.")
+            refresh_performance_views(conn)
         else:
             log("GRADING", "No new bets graded (waiting for games to finish or fuzzy match).")
 
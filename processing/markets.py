@@ -1,5 +1,4 @@
 import difflib
-import time
 from datetime import datetime, timezone
 from scipy import stats
 from config.settings import Config
@@ -10,7 +9,7 @@ from core.probability import logit_scale, normalize_probabilities
 import numpy as np
 from db.connection import get_dynamic_bankroll
 # ... 
-from data.sources.ncaab_kenpom import KenPomClient
+from data.sources.kenpom_store import get_kenpom_store
 from core.kelly import calculate_kelly_stake
 from core.edge import calculate_edge
 from processing.sharp_scoring import calculate_sharp_score
@@ -140,70 +139,52 @@ def create_opportunity(event_id, timestamp, kickoff, sport, teams, selection, od
         metadata=kwargs.get('metadata', {})
     )
 
-# KenPom Cache
-_kp_client = KenPomClient()
-_kp_cache = None
-_kp_last_update = 0
-
 # V2 Model Instance
 _ncaab_model_v2 = NCAAB_Model()
 
 def get_kenpom_stats(team_name):
-    """Exclude strict filtering, fuzzy match against KenPom DF."""
-    global _kp_cache, _kp_last_update
-    
-    if _kp_cache is None or (time.time() - _kp_last_update > 86400): # 24h cache
-        try:
-             df = _kp_client.get_efficiency_stats()
-             if not df.empty:
-                 _kp_cache = df
-                 _kp_last_update = time.time()
-        except:
-             pass
-    
-    if _kp_cache is None: return None
-    
-    kp_teams = _kp_cache['Team'].tolist()
-    
-    # 1. Exact Match via Indexing (Best Performance)
-    row = _kp_cache[_kp_cache['Team'] == team_name]
-    if not row.empty:
-        return row.iloc[0].to_dict()
-        
-    # 2. Robust Matcher (Centralized)
-    from utils.team_names import robust_match_team
-    match_name = robust_match_team(team_name, kp_teams, threshold=0.85)
-    
-    if match_name:
-         # print(f"   ✨ [KP MATCH] Robust: {team_name} -> {match_name}") 
-         return _kp_cache[_kp_cache['Team'] == match_name].iloc[0].to_dict()
+    """KenPom row for a team via the shared store (exact, then memoised robust match)."""
+    return get_kenpom_store().get(team_name)
 
-    return None
+def _indexed_rating(name, sport_ratings):
+    """Rating for a team from a sport-scoped index; names missing from the slate index are resolved once and remembered."""
+    if name not in sport_ratings:
+        keys = [k for k, v in sport_ratings.items() if v]
+        m = difflib.get_close_matches(name, keys, n=1, cutoff=0.75)
+        sport_ratings[name] = sport_ratings[m[0]] if m else None
+    return sport_ratings[name]
 
 # One-time debug counters for calculate_match_stats TypeErrors
 _calc_stats_typeerror_count = 0
 _calc_stats_typeerror_max = 5
 
-def calculate_match_stats(home, away, ratings, target_sport, is_neutral=False):
+def calculate_match_stats(home, away, ratings, target_sport, is_neutral=False, rating_index=None):
     """
     Calculate expected margin, total, and standard deviation for a match.
 
     Args:
         home: Home team name
+        rating_index: Optional per-sport index from build_rating_index(); lookups
+            become exact hits scoped to target_sport
     """
     global _calc_stats_typeerror_count, _calc_stats_typeerror_max
 
-    home_r = ratings.get(home)
-    if not home_r:
-        m = difflib.get_close_matches(home, ratings.keys(), n=1, cutoff=0.75)
-        if m:
-            home_r = ratings[m[0]]
+    if rating_index is not None:
+        sport_ratings = rating_index.get(target_sport, {})
+        home_r = _indexed_rating(home, sport_ratings)
+        away_r = _indexed_rating(away, sport_ratings)
+    else:
+        home_r = ratings.get(home)
+        if not home_r:
+            m = difflib.get_close_matches(home, ratings.keys(), n=1, cutoff=0.75)
+            if m:
+                home_r = ratings[m[0]]
 
-    away_r = ratings.get(away)
-    if not away_r:
-        m = difflib.get_close_matches(away, ratings.keys(), n=1, cutoff=0.75)
-        if m:
-            away_r = ratings[m[0]]
+        away_r = ratings.get(away)
+        if not away_r:
+            m = difflib.get_close_matches(away, ratings.keys(), n=1, cutoff=0.75)
+            if m:
+                away_r = ratings[m[0]]
 
     # STRICT VALIDATION: Return None if ratings are missing
     # Do NOT impute average stats (110.0) as this creates fake alpha on unknown teams.
@@ -493,7 +474,7 @@ def _get_market_category(selection: str) -> str:
     # 3. Spread (Default for remaining side bets)
     return 'SPREAD'
 
-def process_match(match, ratings, calibration, target_sport, seen_matches, sharp_data, existing_bets_map=None, is_soccer=False, predictions=None, multipliers=None, seen_bet_signatures=None) -> List[Opportunity]:
+def process_match(match, ratings, calibration, target_sport, seen_matches, sharp_data, existing_bets_map=None, is_soccer=False, predictions=None, multipliers=None, seen_bet_signatures=None, rating_index=None) -> List[Opportunity]:
     """
     Process betting markets for a match and identify valuable opportunities.
 
@@ -507,6 +488,7 @@ def process_match(match, ratings, calibration, target_sport, seen_matches, sharp
         is_soccer: Boolean indicating if this is a soccer match
         predictions: Soccer predictions (if applicable)
         multipliers: Pre-calculated smart staking multipliers (optional)
+        rating_index: Per-sport rating index built in ENRICH (optional)
         
     Returns:
         List[Opportunity]: List of identified opportunities
@@ -1247,7 +1229,7 @@ def process_match(match, ratings, calibration, target_sport, seen_matches, sharp
     is_neutral = match.get('neutral_site', False)
     
     exp_margin, exp_total, margin_std, sport = calculate_match_stats(
-        home, away, ratings, target_sport, is_neutral=is_neutral
+        home, away, ratings, target_sport, is_neutral=is_neutral, rating_index=rating_index
     )
     if exp_margin is None:
         return opportunities
@@ -1,12 +1,12 @@
 from config import Config
 from utils import log
-from db.connection import get_db
-from data.clients.odds_api import fetch_prop_odds
+from db.writers import OpportunityWriter
+from data.clients.odds_api import fetch_prop_offers
 from player_props_model import PlayerPropsPredictor
 import pandas as pd
 from datetime import datetime
 import time
-import math
+from core.pricing import poisson_over_cached
 from lineup_client import get_confirmed_lineup, normalize_name
 
 class PropSniper:
@@ -37,6 +37,7 @@ class PropSniper:
         log("EDGE", "🔫 Starting Prop Edge Run...")
         
         total_found = 0
+        self.writer = OpportunityWriter(tag="PROPS")
         
         for league_name, sport_key in self.leagues:
             log("EDGE", f"Analyzing {league_name}...")
@@ -44,8 +45,8 @@ class PropSniper:
             # 1. Fetch Odds First
             # Markets: Goal Scorers AND Total Shots (Matching our Model)
             # Corrected Keys based on PDF: player_goal_scorer_anytime, player_shots
-            odds_data = fetch_prop_odds(sport_key, markets="player_goal_scorer_anytime,player_shots")
-            if not odds_data:
+            odds = fetch_prop_offers(sport_key, markets="player_goal_scorer_anytime,player_shots")
+            if not len(odds):
                 log("EDGE", f"No odds found for {league_name}. Skipping.")
                 continue
                 
@@ -53,31 +54,22 @@ class PropSniper:
             predictor = PlayerPropsPredictor(league=league_name, season="2025")
             
             # 3. Iterate through players with odds
-            for player_name, markets in odds_data.items():
+            for player_name in odds.players():
                 
                 # --- MARKET 1: ANYTIME GOAL SCORER ---
-                if 'player_goal_scorer_anytime' in markets:
-                    # New structure: List of offers
-                    goal_offers = markets['player_goal_scorer_anytime']
-                    if goal_offers and isinstance(goal_offers, list):
-                        # Iterate all offers (each book)
-                        for offer in goal_offers:
-                             if self.process_market(predictor, player_name, offer, "Anytime Goal", league_name, sport_key):
-                                total_found += 1
+                # Iterate all offers (each book)
+                for offer in odds.offers(player_name, 'player_goal_scorer_anytime'):
+                    if self.process_market(predictor, player_name, offer, "Anytime Goal", league_name, sport_key):
+                        total_found += 1
 
                 # --- MARKET 2: TOTAL SHOTS OVER ---
                 # Key changed from player_shots_total_over_under to player_shots
-                if 'player_shots' in markets:
-                    # List of offers (Over/Under mixed)
-                    shot_offers = markets['player_shots']
-                    if shot_offers and isinstance(shot_offers, list):
-                        for offer in shot_offers:
-                            # Filter for 'Over'
-                            if offer.get('side') == 'Over':
-                                if self.process_market(predictor, player_name, offer, "Total Shots", league_name, sport_key):
-                                    total_found += 1
+                for offer in odds.offers(player_name, 'player_shots', side='Over'):
+                    if self.process_market(predictor, player_name, offer, "Total Shots", league_name, sport_key):
+                        total_found += 1
 
-        log("EDGE", f"🎯 Prop Edge Run Complete. Found {total_found} opportunities.")
+        inserted, duplicates = self.writer.close()
+        log("EDGE", f"🎯 Prop Edge Run Complete. Found {total_found} opportunities ({inserted} new, {duplicates} duplicates).")
 
     def process_market(self, predictor, player_name, market_data, market_type, league_name, sport_key):
         try:
@@ -190,15 +182,7 @@ class PropSniper:
                 # Calculate Prob(Shots > line)
                 # Use Volume Projection (proj_shots_game) as Lambda
                 lambda_shots = stats['proj_shots_game']
-                
-                def poisson_prob_over(lam, target):
-                    target_k = int(target) 
-                    cumulative_prob = 0.0
-                    for k in range(target_k + 1):
-                        cumulative_prob += (math.exp(-lam) * (lam**k)) / math.factorial(k)
-                    return max(0.0, min(1.0, 1.0 - cumulative_prob))
-                
-                prob_model = poisson_prob_over(lambda_shots, line)
+                prob_model = poisson_over_cached(lambda_shots, line)
                 selection_text = f"{player_name} Over {line} Shots"
 
             # Book Implied Probability
@@ -243,44 +227,22 @@ class PropSniper:
             return False
 
     def log_opportunity(self, sport_key, player, matchup, market, selection, price, edge, book, model_prob, kickoff=None):
-        conn = get_db()
-        if not conn: return
-        
-        try:
-            with conn.cursor() as cur:
-                # Unique ID: PROP_{Player}_{MarketType}_{Date}
-                market_slug = market.replace(" ", "")
-                unique_id = f"PROP_{player}_{market_slug}_{datetime.now().strftime('%Y%m%d')}"
-                
-                cur.execute("""
-                    INSERT INTO intelligence_log 
-                    (event_id, timestamp, kickoff, sport, teams, selection, odds, true_prob, edge, book, outcome, user_bet)
-                    VALUES 
-                    (%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, 'PENDING', FALSE)
-                    ON CONFLICT (event_id) DO NOTHING
-                """, (
-                    unique_id, 
-                    kickoff if kickoff else datetime.now(),
-                    sport_key,
-                    matchup,
-                    selection,
-                    price,
-                    model_prob,
-                    edge,
-                    book
-                ))
-            
-            rows = cur.rowcount
-            conn.commit()
-            
-            if rows > 0:
-                log("EDGE", f"Logged: {selection} ({price:.2f}) [Edge: {edge*100:.1f}%]")
-            # else:
-            #     log("DEBUG", f"Skipped duplicate: {selection}")
-        except Exception as e:
-            log("ERROR", f"Failed to log prop: {e}")
-        finally:
-            conn.close()
+        # Unique ID: PROP_{Player}_{MarketType}_{Date}
+        market_slug = market.replace(" ", "")
+        unique_id = f"PROP_{player}_{market_slug}_{datetime.now().strftime('%Y%m%d')}"
+
+        # Buffered: written in bulk by run() (duplicates skipped on flush)
+        self.writer.add(
+            unique_id,
+            kickoff if kickoff else datetime.now(),
+            sport_key,
+            matchup,
+            selection,
+            price,
+            model_prob,
+            edge,
+            book
+        )
 
 if __name__ == "__main__":
     sniper = PropSniper()
@@ -23,7 +23,7 @@ def sync_daily_robust(league, season, restart_every=10):
         completed_matches = [m for m in matches if m['is_result']]
         
         # 3. Filter Existing
-        existing_ids = get_existing_match_ids()
+        existing_ids = get_existing_match_ids(league, season)
         to_scrape = [m for m in completed_matches if str(m['id']) not in existing_ids]
         
         if not to_scrape:
@@ -0,0 +1,115 @@
+"""
+Benchmark: dashboard clean_df (row-wise apply) vs clean_dashboard_frame (vectorized).
+
+Builds a synthetic intelligence_log ledger, checks the two produce identical
+frames, and reports timings.
+
+Usage:
+    python scripts/bench_dashboard_clean.py [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing.dashboard_frames import clean_dashboard_frame
+
+SPORTS = ['basketball_nba', 'icehockey_nhl', 'soccer_epl', 'basketball_ncaab', 'NCAAB', 'americanfootball_nfl']
+
+
+def legacy_clean_df(df, now):
+    """web/dashboard.clean_df as it was before vectorization (now injected)."""
+    if df.empty: return df
+    df['kickoff'] = pd.to_datetime(df['kickoff']).dt.tz_localize('UTC', ambiguous='infer').dt.tz_convert('US/Eastern')
+    df['Date'] = df['kickoff'].dt.strftime('%Y-%m-%d')
+    df['Kickoff'] = df['kickoff'].dt.strftime('%m-%d %H:%M')
+    df['Sport'] = df['sport'].apply(lambda x: x.split('_')[-1].upper() if '_' in x else x)
+    df['Event'] = df['teams']
+    df['Selection'] = df['selection']
+
+    def get_val(row, col_base):
+        user_col = f"user_{col_base}"
+        if user_col in row and pd.notnull(row[user_col]): return float(row[user_col])
+        return float(row[col_base]) if pd.notnull(row[col_base]) else 0.0
+
+    df['Stake_Val'] = df.apply(lambda row: get_val(row, 'stake'), axis=1)
+    df['Stake_Val'] = df['Stake_Val'].apply(lambda x: max(1.00, x))
+    df['Stake'] = df['Stake_Val'].apply(lambda x: f"${x:.2f}")
+    df['Dec_Odds'] = df.apply(lambda row: get_val(row, 'odds'), axis=1)
+    df['Edge_Val'] = pd.to_numeric(df['edge'], errors='coerce').fillna(0)
+    df['Edge'] = df['Edge_Val'].apply(lambda x: f"{x*100:.1f}%")
+
+    now_est = now
+    limit_est = now_est + pd.Timedelta(hours=36)
+    mask_future = (df['kickoff'] > now_est) & (df['kickoff'] <= limit_est)
+    mask_user = (df.get('user_bet', False) == True)
+    df = df[mask_future | mask_user].copy()
+    return df
+
+
+def make_ledger(n=100_000, seed=35, now=None):
+    """Synthetic ledger with NULL user/model values and a mix of past/future kickoffs (naive UTC)."""
+    rng = np.random.RandomState(seed)
+    now = now if now is not None else pd.Timestamp('2026-03-01 12:00', tz='US/Eastern')
+    base = now.tz_convert('UTC').tz_localize(None)
+    # Minute offsets from -60d to +3d
+    kickoff = base + pd.to_timedelta(rng.randint(-60 * 1440, 3 * 1440, n), unit='m')
+
+    def with_nulls(values, frac):
+        values = values.astype(object)
+        values[rng.rand(n) < frac] = None
+        return values
+
+    return pd.DataFrame({
+        'event_id': [f"EV{i}" for i in range(n)],
+        'kickoff': kickoff,
+        'sport': rng.choice(SPORTS, n),
+        'teams': [f"Team{i % 97} @ Team{i % 89}" for i in range(n)],
+        'selection': [f"Sel {i % 113}" for i in range(n)],
+        'odds': with_nulls(rng.uniform(1.3, 4.0, n).round(3), 0.02),
+        'edge': with_nulls(rng.uniform(-0.05, 0.2, n), 0.02),
+        'stake': with_nulls(rng.uniform(0.0, 40.0, n).round(2), 0.05),
+        'user_bet': rng.rand(n) < 0.3,
+        'user_odds': with_nulls(rng.uniform(1.3, 4.0, n).round(3), 0.8),
+        'user_stake': with_nulls(rng.uniform(0.0, 40.0, n).round(2), 0.8),
+        'outcome': rng.choice(['WON', 'LOST', 'PUSH', 'PENDING'], n),
+    })
+
+
+def assert_parity(df, now):
+    old = legacy_clean_df(df.copy(), now)
+    new = clean_dashboard_frame(df.copy(), now=now)
+    pd.testing.assert_frame_equal(new, old)
+    return new
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    now = pd.Timestamp('2026-03-01 12:00', tz='US/Eastern')
+    df = make_ledger(args.rows, now=now)
+    out = assert_parity(df, now)
+    print(f"✅ Parity OK on {len(df):,} rows ({len(out):,} kept)")
+
+    for name, fn in (("legacy", lambda d: legacy_clean_df(d, now)),
+                     ("vectorized", lambda d: clean_dashboard_frame(d, now=now))):
+        times = []
+        for _ in range(args.repeat):
+            d = df.copy()
+            t0 = time.perf_counter()
+            fn(d)
+            times.append(time.perf_counter() - t0)
+        print(f"{name:>10}: best {min(times) * 1000:,.0f} ms over {args.repeat} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 
+import sys
+import os
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
+
+sys.path.append(os.getcwd())
+from core.simulation import PointsSimulator
 
 # Constants from Frozen Specs
 ALPHA_SOG = 0.1395
@@ -28,90 +32,11 @@ def run_simulation():
     
     print(f"Merged Data: {len(df)} rows.")
     
-    # 2. Vectorized Simulation
-    n_rows = len(df)
-    
-    # --- Step A: SOG (Negative Binomial) ---
-    # Scipy nbinom args: n, p
-    # n = 1/alpha
-    # p = n / (n + mu)
-    
-    n_sog_param = 1.0 / ALPHA_SOG
-    p_sog_param = n_sog_param / (n_sog_param + df['mu_sog'].values)
-    
-    # Generate (Rows x Sims) matrix
-    # Note: numpy random negative_binomial uses (n, p).
-    # "successes" -> output. 
-    # Definition check: Scipy/Numpy 'n' is number of successes, 'p' is probability of success.
-    # Result is number of failures? 
-    # Validating Scipy/Numpy defs vs NB2.
-    # NB2: Var = mu + alpha*mu^2.
-    # Scipy: nbinom.rvs(n, p) mean is n(1-p)/p.
-    # Our formula: mu. n(1-p)/p = mu -> n(1 - n/(n+mu)) / (n/(n+mu)) = mu. Correct.
-    
-    print("  Simulating SOG...")
-    # Reshape for broadcasting
-    n_sog_mat = np.full((n_rows, 1), n_sog_param)
-    p_sog_mat = p_sog_param.reshape(-1, 1)
-    
-    # Sim:
-    # np.random.negative_binomial(n, p)
-    # We broadcast: (Rows, 1) input -> (Rows, N_SIMS) output?
-    # Numpy nbinom supports array_like inputs.
-    # We create (Rows,) array and request size=(Rows, Sims)? No, size must act weird.
-    # Easiest: Loop or Batched?
-    # Or just pass (Rows,) arrays and size=(N_SIMS, Rows).T?
-    # Can np.random.negative_binomial take arrays for n and p? YES.
-    # So we simply do:
-    # sim_sog = np.random.negative_binomial(n_sog_param, p_sog_param, size=(N_SIMS, n_rows)).T
-    # Wait, n_sog_param is scalar. p_sog_param is array (n_rows,).
-    # size=(N_SIMS, n_rows)? The args must broadcast to size.
-    # If p_sog_param is (n_rows,), broadcasting to (N_SIMS, n_rows) requires p to be (1, n_rows)?
-    
-    # Let's align dimensions.
-    # p_sog_broad = df['mu_sog'].values # Placeholder name
-    # Actually, simpler:
-    sim_sog = np.empty((n_rows, N_SIMS), dtype=int)
-    # Numpy's generator might be finicky with broadcasting large arrays.
-    # Let's use `scipy.stats.nbinom.rvs`.
-    
-    # Optimized:
-    # p_sog_param is shape (n_rows,).
-    # We want (n_rows, N_SIMS).
-    # nbinom.rvs(n, p, size=(N_SIMS, n_rows))?
-    # If n and p are arrays, size must match?
-    # Actually, iterate? 10,000 rows is small. 10,000 sims is large.
-    # 10k x 10k = 100M elements. 800MB RAM. Feasible.
-    
-    # Let's generate in chunks if needed, but 100M ints is fine.
-    
-    sim_sog = stats.nbinom.rvs(n_sog_param, p_sog_param.reshape(-1, 1), size=(n_rows, N_SIMS))
-    
-    # --- Step B: Goals | SOG (Binomial) ---
-    print("  Simulating Goals...")
-    # Binomial(n=SOG, p=p_goal)
-    p_goal = df['p_goal'].values.reshape(-1, 1)
-    sim_goals = np.random.binomial(sim_sog, p_goal)
-    
-    # --- Step C: Assists (Negative Binomial) ---
-    print("  Simulating Assists...")
-    n_ast_param = 1.0 / ALPHA_AST
-    p_ast_param = n_ast_param / (n_ast_param + df['mu_ast'].values)
-    
-    sim_assists = stats.nbinom.rvs(n_ast_param, p_ast_param.reshape(-1, 1), size=(n_rows, N_SIMS))
-    
-    # --- Step D: Points ---
-    print("  Calculating Points...")
-    sim_points = sim_goals + sim_assists
-    
-    # --- Step E: Aggregation ---
-    print("  Aggregating...")
-    # Mean
-    df['proj_points_mean'] = sim_points.mean(axis=1)
-    
-    # Probs (Vectorized)
-    df['prob_points_1plus'] = (sim_points >= 1).mean(axis=1)
-    df['prob_points_2plus'] = (sim_points >= 2).mean(axis=1)
+    # 2. Chunked Simulation (bounded memory, per-player RNG streams)
+    print("  Simulating SOG -> Goals | SOG, Assists -> Points...")
+    sim = PointsSimulator(ALPHA_SOG, ALPHA_AST, n_sims=N_SIMS)
+    summary, _ = sim.simulate_frame(df)
+    df[summary.columns] = summary
     
     # --- Step F: Validation ---
     print("\n📊 Validation (Points):")
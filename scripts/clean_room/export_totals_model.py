@@ -6,6 +6,10 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import json
 import os
+import sys
+
+sys.path.append(os.getcwd())
+from scripts.export_compiled_models import export_artifact
 
 # --- LOCKED CONFIG ---
 BIAS_CORRECTION = -0.1433
@@ -62,6 +66,8 @@ def export():
     # Save Artifacts
     joblib.dump(model, MODEL_PATH)
     joblib.dump(scaler, SCALER_PATH)
+    export_artifact(MODEL_PATH)
+    export_artifact(SCALER_PATH)
     print(f"Saved Model and Scaler to models/")
     
     # Create Feature Lookup (Latest per team)
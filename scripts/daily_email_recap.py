@@ -11,6 +11,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from db.connection import get_db
+from db.rollups import fetch_performance
 from config.settings import Config
 from utils.logging import log
 
@@ -43,58 +44,76 @@ def categorize_market(selection, market_col=None):
     if '+' in sel or '-' in sel: return "Spread" # Crude but likely sufficient for now
     return "Prop/Other"
 
-def fetch_data(start_utc, end_utc):
+def fetch_data(settle_day):
+    """
+    Recap set aggregated per sport/market/odds bucket from the perf_daily rollup.
+    Contract Section 2.C & 4.A: settled (ET) yesterday, accepted, positive edge.
+    """
     conn = get_db()
     if not conn:
         log("ERROR", "Could not connect to DB")
         return pd.DataFrame() 
     
     try:
-        # Contract Section 2.C & 4.A: Filter by settled_at
-        query = """
-            SELECT 
-                sport, 
-                selection, 
-                odds, 
-                edge, 
-                outcome, 
-                stake,
-                net_units,
-                settled_at,
-                accepted
-            FROM intelligence_log
-            WHERE outcome IN ('WON', 'LOST', 'PUSH')
-            AND settled_at >= %s AND settled_at < %s
-            AND accepted = TRUE
-            AND edge > 0
-        """
-        df = pd.read_sql(query, conn, params=(start_utc, end_utc))
-        return df
+        return fetch_performance(
+            conn, by=('sport', 'market_type', 'odds_bucket', 'accepted'),
+            settle_day=settle_day, accepted=True, positive_edge=True
+        )
     except Exception as e:
         log("ERROR", f"Query failed: {e}")
         return pd.DataFrame()
     finally:
         conn.close()
 
+def fetch_flags(start_utc, end_utc):
+    """Settlement window bounds plus best win / worst loss rows (LIMIT 1 each)."""
+    conn = get_db()
+    if not conn: return {}
+    
+    window = """
+        FROM intelligence_log_all
+        WHERE outcome IN ('WON', 'LOST', 'PUSH')
+        AND settled_at >= %(start)s AND settled_at < %(end)s
+        AND accepted = TRUE
+        AND edge > 0
+    """
+    params = {'start': start_utc, 'end': end_utc}
+    try:
+        bounds = pd.read_sql(f"SELECT MIN(settled_at) AS min_settle, MAX(settled_at) AS max_settle {window}", conn, params=params)
+        best = pd.read_sql(f"SELECT sport, selection, odds, edge, stake {window} AND outcome = 'WON' ORDER BY edge DESC LIMIT 1", conn, params=params)
+        worst = pd.read_sql(f"SELECT sport, selection, odds, edge, COALESCE(stake, 1.0) AS stake {window} AND outcome = 'LOST' ORDER BY COALESCE(stake, 1.0) DESC LIMIT 1", conn, params=params)
+        return {
+            'min_settle': bounds['min_settle'].iloc[0],
+            'max_settle': bounds['max_settle'].iloc[0],
+            'best': best,
+            'worst': worst,
+        }
+    except Exception as e:
+        log("ERROR", f"Flag query failed: {e}")
+        return {}
+    finally:
+        conn.close()
+
 def validate_contract_states(df):
     """
     Contract Section 5: Forbidden States (Auto-Fail).
+    Operates on the perf_daily aggregates from fetch_data.
     Returns (bool, str): (Passed, Reason)
     """
     if df.empty: return True, "Empty"
 
     # 1. Average Edge < 0 (Data Integrity Fail)
-    if 'edge' in df.columns and df['edge'].mean() < 0:
-        return False, f"Average Edge is Negative ({df['edge'].mean()})"
+    edge_n = df['edge_n'].sum()
+    avg_edge = df['edge_sum'].sum() / edge_n if edge_n > 0 else 0.0
+    if avg_edge < 0:
+        return False, f"Average Edge is Negative ({avg_edge})"
         
     # 2. Accepted = False (Leakage)
     if 'accepted' in df.columns and not df['accepted'].all():
         return False, "Found unaccepted bets in recap set."
 
-    # 3. Null Attributes
-    if df['outcome'].isnull().any(): return False, "Null Outcome found."
-    if df['settled_at'].isnull().any(): return False, "Null Settled Timestamp found."
-    if df['net_units'].isnull().any(): return False, "Null Net Units found."
+    # 3. Null Attributes (outcome/settled_at are rollup dimensions; NULLs never match)
+    if df['null_net_units'].sum() > 0: return False, "Null Net Units found."
 
     # 4. Net Units Sum Check (floating point tolerance)
     calc_sum = df['net_units'].sum()
@@ -144,20 +163,19 @@ def generate_report():
     
     log("INFO", f"Generating Recap for {yesterday_str} (Settlement Window: {start_et} to {end_et} ET)")
     
-    df = fetch_data(start_utc, end_utc)
+    df = fetch_data(yesterday_str)
+    flags = fetch_flags(start_utc, end_utc) if not df.empty else {}
     
     # Contract Section 6: Recap Self-Audit
     if not df.empty:
-        total_bets = len(df)
+        total_bets = int(df['bets'].sum())
         sum_net = df['net_units'].sum()
-        avg_edge = df['edge'].mean() if 'edge' in df else 0
-        min_settle = df['settled_at'].min()
-        max_settle = df['settled_at'].max()
+        avg_edge = df['edge_sum'].sum() / df['edge_n'].sum() if df['edge_n'].sum() > 0 else 0
         
         log("AUDIT", f"Total Bets: {total_bets}")
         log("AUDIT", f"Net Units Sum: {sum_net:.2f}")
         log("AUDIT", f"Avg Edge: {avg_edge:.4f}")
-        log("AUDIT", f"Settlement Window: {min_settle} - {max_settle}")
+        log("AUDIT", f"Settlement Window: {flags.get('min_settle')} - {flags.get('max_settle')}")
         
     # Contract Section 5: Forbidden State Check
     passed, reason = validate_contract_states(df)
@@ -167,7 +185,7 @@ def generate_report():
         send_email(f"⚠️ Recap Failure: {yesterday_str}", f"<h3>Contract Violation</h3><p>{reason}</p>")
         return
 
-    if df.empty:
+    if df.empty or df['bets'].sum() == 0:
         log("INFO", "No settled bets found in window.")
         send_email(
             f"Daily Performance Recap - {yesterday_str}",
@@ -175,69 +193,43 @@ def generate_report():
         )
         return
 
-    # --- Feature Engineering ---
     # Profit Calculation: TRUST THE DB (Contract Section 4.B)
     # We DO NOT recompute pnl from odds here. We use 'net_units'.
-    df['stake'] = df['stake'].fillna(1.0)
-    df['result'] = df['outcome'].apply(lambda x: 1 if x == 'WON' else 0)
-    df['market_type'] = df.apply(lambda x: categorize_market(x['selection']), axis=1)
-    df['odds_bucket'] = df['odds'].apply(categorize_odds)
+    # stake_sum already treats a missing stake as 1.0.
 
     # --- High Level Summary ---
-    total_bets = len(df)
-    total_won = len(df[df['outcome'] == 'WON'])
+    total_bets = int(df['bets'].sum())
+    total_won = int(df['wins'].sum())
     win_rate = (total_won / total_bets) * 100
-    total_staked = df['stake'].sum()
+    total_staked = df['stake_sum'].sum()
     net_units = df['net_units'].sum() # Using DB value
     roi = (net_units / total_staked * 100) if total_staked > 0 else 0.0
 
     # --- Breakdowns ---
-    
-    # By Sport
-    sport_grp = df.groupby('sport').agg({
-        'selection': 'count',
-        'net_units': 'sum',
-        'stake': 'sum'
-    }).rename(columns={'selection': 'Bets', 'net_units': 'Net Units', 'stake': 'Staked'})
-    sport_grp['ROI'] = (sport_grp['Net Units'] / sport_grp['Staked'] * 100).round(2)
-    sport_grp['Net Units'] = sport_grp['Net Units'].round(2)
-    
-    # By Market
-    market_grp = df.groupby('market_type').agg({
-        'selection': 'count',
-        'net_units': 'sum',
-        'stake': 'sum'
-    }).rename(columns={'selection': 'Bets', 'net_units': 'Net Units', 'stake': 'Staked'})
-    
-    market_grp['ROI'] = (market_grp['Net Units'] / market_grp['Staked'] * 100).round(2)
-    market_grp['Net Units'] = market_grp['Net Units'].round(2)
-    
-    # By Odds Bucket
-    odds_grp = df.groupby('odds_bucket').agg({
-        'selection': 'count',
-        'net_units': 'sum',
-        'stake': 'sum',
-        'result': 'mean' # Win rate
-    }).rename(columns={'selection': 'Bets', 'net_units': 'Net Units', 'stake': 'Staked', 'result': 'Win Rate'})
-    
-    odds_grp['ROI'] = (odds_grp['Net Units'] / odds_grp['Staked'] * 100).round(2)
-    odds_grp['Win Rate'] = (odds_grp['Win Rate'] * 100).round(1)
-    odds_grp['Net Units'] = odds_grp['Net Units'].round(2)
+    def breakdown(dim):
+        grp = df.groupby(dim).agg(
+            {'bets': 'sum', 'net_units': 'sum', 'stake_sum': 'sum', 'wins': 'sum'}
+        ).rename(columns={'bets': 'Bets', 'net_units': 'Net Units', 'stake_sum': 'Staked'})
+        grp['Bets'] = grp['Bets'].astype(int)
+        grp['ROI'] = (grp['Net Units'] / grp['Staked'] * 100).round(2)
+        grp['Win Rate'] = (grp['wins'] / grp['Bets'] * 100).round(1)
+        grp['Net Units'] = grp['Net Units'].round(2)
+        return grp
+
+    sport_grp = breakdown('sport')
+    market_grp = breakdown('market_type')
+    odds_grp = breakdown('odds_bucket')
     
     # --- Diagnostics ---
-    avg_edge = df['edge'].mean() * 100 # Assuming edge is 0.05 for 5%
-    if avg_edge < 1: avg_edge *= 100 # Handle if it was already decimal 0.0005? Usually 0.05
     # Check if edge is stored as percentage or decimal in DB.
     # Usually stored as decimal (0.05).
-    # Safety clamp: if mean > 10, assumes it's percentage already.
-    if df['edge'].mean() > 1.0: # Likely percentage
-         avg_edge = df['edge'].mean()
-    else:
-         avg_edge = df['edge'].mean() * 100
+    # Safety clamp: if mean > 1, assumes it's percentage already.
+    mean_edge = df['edge_sum'].sum() / df['edge_n'].sum() if df['edge_n'].sum() > 0 else 0.0
+    avg_edge = mean_edge if mean_edge > 1.0 else mean_edge * 100
 
     # --- Flags ---
-    best_bet_row = df[df['outcome'] == 'WON'].sort_values('edge', ascending=False).head(1)
-    worst_loss_row = df[df['outcome'] == 'LOST'].sort_values('stake', ascending=False).head(1)
+    best_bet_row = flags.get('best', pd.DataFrame())
+    worst_loss_row = flags.get('worst', pd.DataFrame())
     
     best_bet_str = "None"
     if not best_bet_row.empty:
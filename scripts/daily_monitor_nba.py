@@ -8,10 +8,13 @@ def run_daily_monitor():
     conn = get_db()
     
     # 1. Fetch recent recommendations (Last 24h)
+    # Metadata lives in opportunity_metadata (db/metadata.py)
     query = """
-        SELECT * FROM intelligence_log 
-        WHERE sport = 'NBA' 
-        AND timestamp > NOW() - INTERVAL '24 HOURS'
+        SELECT i.event_id, i.selection, i.odds, m.metadata
+        FROM intelligence_log i
+        LEFT JOIN opportunity_metadata m ON m.event_id = i.event_id
+        WHERE i.sport = 'NBA' 
+        AND i.timestamp > NOW() - INTERVAL '24 HOURS'
     """
     df = pd.read_sql(query, conn)
     
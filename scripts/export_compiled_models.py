@@ -0,0 +1,104 @@
+"""
+Export Compiled Models
+
+Compiles every production joblib/pickle artifact to a NumPy-only sibling
+(`<name>.compiled.npz`) that models/compiled.py loads at runtime. Each export is
+checked for parity against the original estimator on random inputs before it is
+written; a failing artifact is skipped and keeps using joblib.
+
+Usage:
+    python scripts/export_compiled_models.py              # all registered artifacts
+    python scripts/export_compiled_models.py models/x.joblib
+"""
+
+import sys
+import os
+import json
+import warnings
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+
+from models.compiled import export_model, build_runtime, save_compiled, compiled_path_for
+from utils.logging import log
+
+REGISTRY_PATH = "models/registry.json"
+PARITY_TOL = 1e-5
+
+STATIC_ARTIFACTS = [
+    "models/nhl_v2.pkl",
+    "models/nhl_totals_v2.joblib",
+    "models/nhl_totals_scaler_v2.joblib",
+]
+
+
+def _registry_artifacts():
+    paths = []
+    if os.path.exists(REGISTRY_PATH):
+        with open(REGISTRY_PATH) as f:
+            registry = json.load(f)
+        for key in ('nba_ml', 'nba_total'):
+            path = registry.get(key, {}).get('active_path')
+            if path:
+                paths.append(path)
+    return paths
+
+
+def _n_features(model):
+    n = getattr(model, 'n_features_in_', None)
+    if n is None and hasattr(model, 'get_booster'):
+        n = model.get_booster().num_features()
+    return int(n)
+
+
+def check_parity(model, compiled, n_rows=256, seed=0):
+    """Max abs difference between original and compiled outputs on random rows."""
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n_rows, _n_features(model)))
+    if hasattr(model, 'predict_proba'):
+        ref, out = model.predict_proba(X)[:, 1], compiled.predict_proba(X)[:, 1]
+    elif hasattr(model, 'transform'):
+        ref, out = model.transform(X), compiled.transform(X)
+    else:
+        ref, out = model.predict(X), compiled.predict(X)
+    return float(np.max(np.abs(np.asarray(ref, dtype=np.float64) - out)))
+
+
+def export_artifact(model_path):
+    """Compile one artifact. Returns True when a verified export was written."""
+    import joblib
+
+    if not os.path.exists(model_path):
+        log("COMPILED", f"⏭️ Skipping missing artifact: {model_path}")
+        return False
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(model_path)
+
+    try:
+        spec = export_model(model)
+    except ValueError as e:
+        log("COMPILED", f"⚠️ {model_path}: {e}")
+        return False
+
+    diff = check_parity(model, build_runtime(spec))
+    if diff > PARITY_TOL:
+        log("COMPILED", f"❌ {model_path}: parity check failed (max diff {diff:.2e})")
+        return False
+
+    out_path = compiled_path_for(model_path)
+    save_compiled(spec, out_path, source_path=model_path)
+    log("COMPILED", f"✅ {model_path} -> {out_path} (max diff {diff:.2e})")
+    return True
+
+
+def main(paths=None):
+    paths = paths or (STATIC_ARTIFACTS + _registry_artifacts())
+    ok = sum(export_artifact(p) for p in paths)
+    log("COMPILED", f"Exported {ok}/{len(paths)} artifacts")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
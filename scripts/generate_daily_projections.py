@@ -5,13 +5,14 @@ import numpy as np
 from datetime import datetime
 from db.connection import get_db
 import statsmodels.api as sm
-from scipy.stats import nbinom
+from core.simulation import PointsSimulator
 
 import argparse
 
 # Constants
 ALPHA_SOG = 0.1393  # Updated 2026-01-28
 ALPHA_AST = 0.1677  # Updated 2026-01-28
+N_SIMS = 10000
 
 def generate_daily(target_date=None):
     if not target_date:
@@ -201,40 +202,20 @@ def generate_daily(target_date=None):
     # Result:
     # We calculate 'proj_points_mean', 'prob_1plus'.
     
-    # SIMULATION (Mini)
-    # n_sims = 1000.
+    # SIMULATION
     # SOG ~ NB(mu=sog_L10, alpha=0.14)
     # Goals ~ Binom(SOG, p=0.10)
     # Ast ~ NB(mu=ast_L10, alpha=0.17)
     # Points = G + A
     
-    # Vectorized Sim
-    n_rows = len(player_stats)
-    n_sims = 1000
+    # Chunked Sim (shared engine; the rec engine re-prices other lines from the same streams)
+    player_stats['p_goal'] = 0.10
+    player_stats['mu_ast'] = player_stats['ast_l10'].fillna(0)
+    player_stats['mu_sog'] = player_stats['mu_sog'].fillna(0)
     
-    mu_sog_vals = player_stats['mu_sog'].fillna(0).values
-    mu_ast_vals = player_stats['ast_l10'].fillna(0).values
-    p_goal = 0.10
-    
-    # SOG
-    n_s = 1/ALPHA_SOG
-    p_s = n_s / (n_s + mu_sog_vals)
-    sim_s = nbinom.rvs(n_s, p_s.reshape(-1,1), size=(n_rows, n_sims))
-    
-    # Goals
-    sim_g = np.random.binomial(sim_s, p_goal)
-    
-    # Ast
-    n_a = 1/ALPHA_AST
-    p_a = n_a / (n_a + mu_ast_vals)
-    sim_a = nbinom.rvs(n_a, p_a.reshape(-1,1), size=(n_rows, n_sims))
-    
-    sim_pts = sim_g + sim_a
-    
-    # Agg
-    player_stats['proj_points_mean'] = sim_pts.mean(axis=1)
-    player_stats['prob_points_1plus'] = (sim_pts >= 1).mean(axis=1)
-    player_stats['prob_points_2plus'] = (sim_pts >= 2).mean(axis=1)
+    sim = PointsSimulator(ALPHA_SOG, ALPHA_AST, n_sims=N_SIMS)
+    summary, _ = sim.simulate_frame(player_stats)
+    player_stats[summary.columns] = summary
     
     # Tiers logic (Reused)
     player_stats['is_priceable'] = (player_stats['proj_points_mean'] >= 0.6) | (player_stats['prob_points_1plus'] >= 0.25)
@@ -256,9 +237,7 @@ def generate_daily(target_date=None):
         'ast_l10': 'ast_L10'
     })
     
-    # Need 'mu_sog', 'mu_ast', 'p_goal' for edge calc
-    out['p_goal'] = 0.10
-    out['mu_ast'] = out['ast_L10']
+    # 'mu_sog', 'mu_ast', 'p_goal' (set above) are the edge-calc / re-pricing inputs
     
     out.to_csv(outfile, index=False)
     print(f"✅ Daily Projections Generated: {len(out)} players.")
@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-from scipy.stats import nbinom
+from core.pricing import nbinom_over, poisson_over
 
 # Frozen Parameters
 ALPHA_SOG = 0.1395
@@ -112,67 +112,58 @@ class NHLEdgeModel:
         Calculates Edge against a specific line/price.
         Market Types: 'SOG', 'Goals', 'Assists', 'Points'.
         """
-        row = self.get_projections(player_name)
-        if not row: return None
-        if not row['priceable']: return None
-        
-        # 1. Calculate Model Probability for Line
-        model_prob = 0.0
-        
+        return self.calc_edges([(player_name, market_type, line, odds_price)])[0]
+
+    def calc_edges(self, offers):
+        """
+        calc_edge for a whole slate: offers = [(player_name, market_type, line, odds_price), ...].
+        Model probabilities are priced with one vectorized call per market.
+        Returns a list aligned with `offers` (None where a single calc_edge would be None).
+        """
+        results = [None] * len(offers)
+        by_market = {}
+        for i, (player_name, market_type, line, odds_price) in enumerate(offers):
+            row = self.get_projections(player_name)
+            if not row: continue
+            if not row['priceable']: continue
+            by_market.setdefault(market_type, []).append((i, row, float(line)))
+
+        for market_type, items in by_market.items():
+            rows = [row for _, row, _ in items]
+            lines = np.array([line for _, _, line in items])
+            probs = self._model_probs(market_type, rows, lines)
+            for (i, row, line), model_prob in zip(items, probs):
+                if np.isnan(model_prob):
+                    continue
+                results[i] = self._edge_result(offers[i][0], market_type, line, offers[i][3], float(model_prob), row)
+        return results
+
+    def _model_probs(self, market_type, rows, lines):
+        """Model P(over line) for many projections of one market (NaN = not modelled)."""
+        col = lambda key: np.array([row[key] for row in rows], dtype=float)
+
         if market_type == 'SOG':
-            mu = row['mu_sog']
-            # P(SOG > Line) = 1 - CDF(Line)
-            # Line is typically X.5, so we want P(SOG >= ceil(Line)) 
-            # e.g. Over 2.5 -> SOG >= 3.
-            # CDF(k) is P(X <= k).
-            # P(X > 2.5) = P(X >= 3) = 1 - P(X <= 2).
-            # If line is 2.5, threshold k = 2.
-            # If line is integer 3 (Over 3), pushes? NB usually handles discrete.
-            # Books use .5 lines.
-            
-            threshold = int(line) # Over 2.5 -> threshold 2.
-            # nbinom args: n, p.   n=1/alpha. p=n/(n+mu).
-            n_p = 1.0 / ALPHA_SOG
-            p_p = n_p / (n_p + mu)
-            model_prob = 1.0 - nbinom.cdf(threshold, n_p, p_p)
-            
+            # P(SOG > Line) = 1 - CDF(floor(Line)); books use .5 lines (Over 2.5 -> SOG >= 3)
+            return np.atleast_1d(nbinom_over(col('mu_sog'), ALPHA_SOG, lines))
+
         elif market_type == 'Goals':
-            # Binomial / Composition
-            # Simplified: Use Poisson/NB approx or just the stored P(1+)?
-            # If line is 0.5 (Anytime Goal), use row['p_goal']? Assumes p_goal is P(Goal>=1)?
-            # Check Phase 2 CSV. 'pred_prob_goal' is Conversion Rate per Shot.
-            # 'prob_goal_1plus' is P(Goal>=1).
-            # Points CSV doesn't have 'prob_goal_1plus' explicitly?
-            # It has 'p_goal' (Conversion Rate). 
-            # We need to re-calc P(Goal>=1) roughly: 
-            # P(G>=1) ~= 1 - exp(-mu_sog * p_goal). (Poisson Approx).
-            # Or use NB Mixture.
-            # Better: Load Phase 2 CSV if strict accuracy needed.
-            # For MVP, assume Poisson Approx is okay (slightly conservative).
-            mu_g = row['mu_sog'] * row['p_goal']
-            if line == 0.5:
-                model_prob = 1.0 - np.exp(-mu_g)
-            elif line == 1.5:
-                # 1 - (P0 + P1)
-                model_prob = 1.0 - np.exp(-mu_g) * (1 + mu_g)
-                
+            # P(G>=1) ~= 1 - exp(-mu_sog * p_goal) (Poisson approx, slightly conservative).
+            # Load Phase 2 CSV if strict accuracy needed.
+            mu_g = col('mu_sog') * col('p_goal')
+            return np.atleast_1d(poisson_over(mu_g, lines))
+
         elif market_type == 'Assists':
             # Assist NB
-            mu = row['mu_ast']
-            threshold = int(line) # Over 0.5 -> 0.
-            n_p = 1.0 / ALPHA_AST
-            p_p = n_p / (n_p + mu)
-            model_prob = 1.0 - nbinom.cdf(threshold, n_p, p_p)
-            
+            return np.atleast_1d(nbinom_over(col('mu_ast'), ALPHA_AST, lines))
+
         elif market_type == 'Points':
-            if line == 0.5:
-                model_prob = row['prob_pts_1+']
-            elif line == 1.5:
-                model_prob = row['prob_pts_2+']
-            else:
-                return None # Only modeling 0.5/1.5 in Sim results currently
-        
-        # 2. Convert Price to Implied Prob
+            # Only modeling 0.5/1.5 in Sim results currently
+            return np.where(lines == 0.5, col('prob_pts_1+'), np.where(lines == 1.5, col('prob_pts_2+'), np.nan))
+
+        return np.zeros(len(lines))
+
+    def _edge_result(self, player_name, market_type, line, odds_price, model_prob, row):
+        # Convert Price to Implied Prob
         if odds_price > 0:
             implied = 100 / (odds_price + 100)
             dec = 1 + (odds_price / 100)
@@ -3,7 +3,7 @@ import sys
 import os
 from datetime import datetime
 from db.connection import get_db
-from data.clients.odds_api import fetch_prop_odds
+from data.clients.odds_api import fetch_prop_offers
 from scripts.nhl_edge_model import NHLEdgeModel
 from unidecode import unidecode
 
@@ -16,25 +16,29 @@ class NHLEdgeRunner:
         print("🏒 Init NHL Edge Runner...")
         self.model = NHLEdgeModel() 
         self.found = 0
+        self.pending = []  # (player, m_type, line, price, book, matchup, kickoff) for the slate
         
     def run(self):
         print("📡 Fetching Odds...")
         # Markets: Points, Assists, Shots, Goals (Anytime + O/U)
         markets = "player_points,player_assists,player_shots_on_goal,player_goal_scorer_anytime,player_goals"
-        odds_data = fetch_prop_odds(SPORT_KEY, markets=markets)
+        odds = fetch_prop_offers(SPORT_KEY, markets=markets)
         
-        if not odds_data:
+        if not len(odds):
             print("⚠️ No odds found.")
             return
 
-        print(f"🔎 Analyzing {len(odds_data)} players...")
+        players = odds.players()
+        print(f"🔎 Analyzing {len(players)} players...")
         
-        for player_name, market_dict in odds_data.items():
-            self.analyze_player(player_name, market_dict)
+        for player_name in players:
+            self.analyze_player(player_name, odds)
+
+        self.price_pending()
             
         print(f"✅ Run Complete. Found {self.found} +EV plays.")
         
-    def analyze_player(self, player_name, market_dict):
+    def analyze_player(self, player_name, odds):
         # 1. Check Model
         # We pass to calc_edge which handles lookup/Tier C checks
         # But efficiently, we should check projection first once.
@@ -47,26 +51,21 @@ class NHLEdgeRunner:
             # Tier C Logic - Skip silently
             return 
             
-        # 2. Iter Markets
+        # 2. Iter Markets (offer table lookups; empty when the book has no market)
         # Goals (Anytime)
-        if 'player_goal_scorer_anytime' in market_dict:
-            self.check_market(player_name, 'Goals', 0.5, market_dict['player_goal_scorer_anytime'])
+        self.check_market(player_name, 'Goals', 0.5, odds.offers(player_name, 'player_goal_scorer_anytime'))
 
         # Goals (O/U)
-        if 'player_goals' in market_dict:
-            self.check_lines(player_name, 'Goals', market_dict['player_goals'])
+        self.check_lines(player_name, 'Goals', odds.offers(player_name, 'player_goals'))
             
         # Shots (O/U)
-        if 'player_shots_on_goal' in market_dict:
-            self.check_lines(player_name, 'SOG', market_dict['player_shots_on_goal'])
+        self.check_lines(player_name, 'SOG', odds.offers(player_name, 'player_shots_on_goal'))
             
         # Assists (O/U)
-        if 'player_assists' in market_dict:
-             self.check_lines(player_name, 'Assists', market_dict['player_assists'])
+        self.check_lines(player_name, 'Assists', odds.offers(player_name, 'player_assists'))
              
         # Points (O/U) - Note: OddsAPI might call it player_points
-        if 'player_points' in market_dict:
-             self.check_lines(player_name, 'Points', market_dict['player_points'])
+        self.check_lines(player_name, 'Points', odds.offers(player_name, 'player_points'))
 
     def check_lines(self, player, m_type, offers):
         # Offers is list of books/outcomes. We want 'Over'.
@@ -96,15 +95,21 @@ class NHLEdgeRunner:
             self.evaluate(player, m_type, line, price, book, matchup, kickoff)
 
     def evaluate(self, player, m_type, line, price, book, matchup, kickoff):
-        # Calc Edge
-        result = self.model.calc_edge(player, m_type, line, price)
-        if not result: return
-        
-        edge = result['edge']
-        
-        if edge >= MIN_EDGE:
-            self.log_bet(player, m_type, line, price, edge, result['model_prob'], book, matchup, kickoff, result['tier'])
-            self.found += 1
+        # Queue the offer; the whole slate is priced at once in price_pending()
+        self.pending.append((player, m_type, line, price, book, matchup, kickoff))
+
+    def price_pending(self):
+        # Calc Edge (one vectorized pass per market)
+        results = self.model.calc_edges([(p, m, l, price) for p, m, l, price, _, _, _ in self.pending])
+        for (player, m_type, line, price, book, matchup, kickoff), result in zip(self.pending, results):
+            if not result: continue
+
+            edge = result['edge']
+
+            if edge >= MIN_EDGE:
+                self.log_bet(player, m_type, line, price, edge, result['model_prob'], book, matchup, kickoff, result['tier'])
+                self.found += 1
+        self.pending = []
             
     def log_bet(self, player, m_type, line, price, edge, true_prob, book, matchup, kickoff, tier):
         conn = get_db()
@@ -3,9 +3,11 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-from scipy.stats import nbinom
+from core.pricing import nbinom_over, poisson_over
+from core.simulation import PointsSimulator
 import scripts.nhl_recs_config as cfg
-from data.clients.odds_api import fetch_prop_odds
+from data.clients.odds_api import fetch_prop_offers
+from db.writers import OpportunityWriter
 from unidecode import unidecode
 import sys
 
@@ -17,8 +19,13 @@ class NHLRecEngine:
     def __init__(self):
         self.projections = None
         self.candidates = []
+        self.pending = []  # (row, m_type, line, price, book) offers awaiting pricing
         self.recs = []
         self.audit_log = []
+        self.sim = PointsSimulator(
+            cfg.MODEL_PARAMS['alpha_sog'], cfg.MODEL_PARAMS['alpha_ast'],
+            n_sims=cfg.MODEL_PARAMS['n_sims']
+        )
         
     def load_projections(self):
         print("📥 Loading Projections...")
@@ -34,22 +41,22 @@ class NHLRecEngine:
         
     def fetch_market_odds(self):
         print("📡 Fetching Odds...")
-        return fetch_prop_odds(SPORT_KEY, markets=ODDS_MARKETS)
+        return fetch_prop_offers(SPORT_KEY, markets=ODDS_MARKETS)
         
     def run(self):
         # 1. Load
         self.load_projections()
-        odds_data = self.fetch_market_odds()
-        if not odds_data:
+        odds = self.fetch_market_odds()
+        if not len(odds):
             print("❌ No odds found.")
             return
 
         print("⚙️ Evaluating Candidates...")
         
         # 2. Iterate Odds -> Match Proj -> Eval
-        # Structure: odds_data[player_name][market_key] = [ {book, price, line, side} ]
+        # Structure: PropOfferTable, queried by (player, market) -> [ {book, price, line, side} ]
         
-        for p_name_odds, markets in odds_data.items():
+        for p_name_odds in odds.players():
             # Match
             p_norm = self._norm(p_name_odds)
             
@@ -68,7 +75,10 @@ class NHLRecEngine:
             row = match.iloc[0]
             
             # Eval Markets
-            self.eval_player_markets(row, markets, p_name_odds)
+            self.eval_player_markets(row, odds, p_name_odds)
+
+        # Price the whole slate (one vectorized call per market)
+        self.price_pending()
             
         # 3. Portfolio Controls
         self.apply_portfolio_controls()
@@ -90,80 +100,68 @@ class NHLRecEngine:
             raise ConnectionError("Database Connection Failed")
         
         # Filter for Recommended
-        if not self.recs: return
+        if not self.recs:
+            conn.close()
+            return
         
         print(f"💾 Logging {len(self.recs)} recommendations to DB...")
         
+        # Re-runs refresh price/edge on existing rows (ON CONFLICT DO UPDATE)
+        writer = OpportunityWriter(update_cols=('edge', 'true_prob', 'odds'), conn=conn, tag="NHL")
         try:
-            with conn.cursor() as cur:
-                for rec in self.recs:
-                    # Unique ID
-                    # NHL_{Player}_{Market}_{Line}_{Date}
-                    date_str = datetime.now().strftime('%Y%m%d')
-                    clean_market = rec['market_type'].replace(" ", "")
-                    line_str = str(rec['line']).replace(".", "p")
-                    slug = f"NHL_{rec['player_name']}_{clean_market}_{line_str}_{date_str}"
-                    
-                    sel_text = f"{rec['player_name']} {rec['market_type']} {rec['line']}"
-                    if rec['market_type'] == 'GOALS' and rec['line'] == 0.5:
-                        sel_text = f"{rec['player_name']} Anytime Goal"
-                    elif rec['market_type'] == 'GOALS':
-                        sel_text = f"{rec['player_name']} Over {rec['line']} Goals"
-                    else:
-                        sel_text = f"{rec['player_name']} Over {rec['line']} {rec['market_type']}"
-                        
-                    sel_text += f" [{rec['tier']}]"
-                    
-                    # Insert
-                    sql = """
-                        INSERT INTO intelligence_log 
-                        (event_id, timestamp, kickoff, sport, teams, selection, odds, true_prob, edge, book, outcome, user_bet)
-                        VALUES 
-                        (%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, 'PENDING', FALSE)
-                        ON CONFLICT (event_id) DO UPDATE SET
-                        edge = EXCLUDED.edge, true_prob = EXCLUDED.true_prob, odds = EXCLUDED.odds
-                    """
+            date_str = datetime.now().strftime('%Y%m%d')
+            for rec in self.recs:
+                # Unique ID
+                # NHL_{Player}_{Market}_{Line}_{Date}
+                clean_market = rec['market_type'].replace(" ", "")
+                line_str = str(rec['line']).replace(".", "p")
+                slug = f"NHL_{rec['player_name']}_{clean_market}_{line_str}_{date_str}"
+                
+                sel_text = f"{rec['player_name']} {rec['market_type']} {rec['line']}"
+                if rec['market_type'] == 'GOALS' and rec['line'] == 0.5:
+                    sel_text = f"{rec['player_name']} Anytime Goal"
+                elif rec['market_type'] == 'GOALS':
+                    sel_text = f"{rec['player_name']} Over {rec['line']} Goals"
+                else:
+                    sel_text = f"{rec['player_name']} Over {rec['line']} {rec['market_type']}"
                     
-                    cur.execute(sql, (
-                        slug,
-                        rec['game_time_est'],
-                        "icehockey_nhl",
-                        f"{rec['team']} vs {rec['opponent']}",
-                        sel_text,
-                        float(rec['dec_odds']),
-                        float(rec['p_model'] * 100),
-                        float(rec['edge']),
-                        rec['book']
-                    ))
-                conn.commit()
-                print("✅ DB Sync Complete.")
+                sel_text += f" [{rec['tier']}]"
+                
+                writer.add(
+                    slug,
+                    rec['game_time_est'],
+                    "icehockey_nhl",
+                    f"{rec['team']} vs {rec['opponent']}",
+                    sel_text,
+                    float(rec['dec_odds']),
+                    float(rec['p_model'] * 100),
+                    float(rec['edge']),
+                    rec['book']
+                )
+            inserted, updated = writer.close()
+            print(f"✅ DB Sync Complete. {inserted} new, {updated} updated.")
         except Exception as e:
             print(f"❌ DB Error: {e}")
         finally:
             conn.close()
         
-    def eval_player_markets(self, row, markets, p_name_book):
-        # row: Series from daily_projections
+    def eval_player_markets(self, row, odds, p_name_book):
+        # row: Series from daily_projections; odds: PropOfferTable
         
         # -- GOALS (Anytime) --
-        if 'player_goal_scorer_anytime' in markets:
-            self.eval_candidate(row, markets['player_goal_scorer_anytime'], 'GOALS', 0.5, 'Over')
+        self.eval_candidate(row, odds.offers(p_name_book, 'player_goal_scorer_anytime'), 'GOALS', 0.5, 'Over')
             
         # -- GOALS (Line) --
-        if 'player_goals' in markets:
-             self.eval_candidate(row, markets['player_goals'], 'GOALS', None, 'Over') # Line dynamic
+        self.eval_candidate(row, odds.offers(p_name_book, 'player_goals'), 'GOALS', None, 'Over') # Line dynamic
              
         # -- SOG --
-        if 'player_shots_on_goal' in markets:
-            self.eval_candidate(row, markets['player_shots_on_goal'], 'SOG', None, 'Over')
+        self.eval_candidate(row, odds.offers(p_name_book, 'player_shots_on_goal'), 'SOG', None, 'Over')
             
         # -- ASSISTS --
-        if 'player_assists' in markets:
-            self.eval_candidate(row, markets['player_assists'], 'ASSISTS', None, 'Over')
+        self.eval_candidate(row, odds.offers(p_name_book, 'player_assists'), 'ASSISTS', None, 'Over')
             
         # -- POINTS --
-        if 'player_points' in markets:
-            self.eval_candidate(row, markets['player_points'], 'POINTS', None, 'Over')
+        self.eval_candidate(row, odds.offers(p_name_book, 'player_points'), 'POINTS', None, 'Over')
 
     def eval_candidate(self, row, offers, m_type, force_line, side_filter):
         if not isinstance(offers, list): return
@@ -184,130 +182,137 @@ class NHLRecEngine:
                 
             price = float(offer.get('price'))
             book = offer.get('book')
+
+            self.pending.append((row, m_type, line, price, book))
+
+    def price_pending(self):
+        # 1. Calc Model Prob (p_model) for every queued offer of a market at once
+        by_market = {}
+        for item in self.pending:
+            by_market.setdefault(item[1], []).append(item)
+        for m_type, items in by_market.items():
+            p_models = self.calc_p_models(m_type, [i[0] for i in items], np.array([i[2] for i in items]))
+            for (row, _, line, price, book), p_model in zip(items, p_models):
+                self.score_candidate(row, m_type, line, price, book, float(p_model))
+        self.pending = []
+
+    def score_candidate(self, row, m_type, line, price, book, p_model):
+        # 2. Calc Implied Prob (p_implied)
+        p_implied = self.calc_implied(price)
+        
+        # 3. Edge/EV
+        edge = p_model - p_implied
+        dec_odds = self.to_decimal(price)
+        ev = (p_model * (dec_odds - 1)) - (1 - p_model)
+        
+        # 4. Confidence Tier
+        tier = self.get_tier(row, m_type, line, p_model)
+        
+        # 5. Gates (Reject Reasons)
+        reasons = []
+        
+        # TOI Check
+        toi = row.get('toi_minutes_l10', 0)
+        if toi < cfg.ELIGIBILITY['min_toi']:
+            reasons.append("FAIL_TOI")
             
-            # 1. Calc Model Prob (p_model)
-            p_model = self.calc_p_model(row, m_type, line)
-            
-            # 2. Calc Implied Prob (p_implied)
-            p_implied = self.calc_implied(price)
-            
-            # 3. Edge/EV
-            edge = p_model - p_implied
-            dec_odds = self.to_decimal(price)
-            ev = (p_model * (dec_odds - 1)) - (1 - p_model)
+        # Market Specifics
+        if m_type == 'POINTS':
+            if p_model < cfg.ELIGIBILITY['points_min_prob']: reasons.append("FAIL_MIN_PROB")
+            if row.get('proj_points_mean', 0) < cfg.ELIGIBILITY['points_min_mean']: reasons.append("FAIL_MIN_MEAN")
             
-            # 4. Confidence Tier
-            tier = self.get_tier(row, m_type, line, p_model)
+        elif m_type == 'ASSISTS':
+            if p_model < cfg.ELIGIBILITY['assists_min_prob']: reasons.append("FAIL_MIN_PROB")
             
-            # 5. Gates (Reject Reasons)
-            reasons = []
+        elif m_type == 'GOALS':
+            if p_model < cfg.ELIGIBILITY['goals_min_prob']: reasons.append("FAIL_MIN_PROB")
+            if row.get('mu_sog', 0) < cfg.ELIGIBILITY['avg_goals_min_sog']: reasons.append("FAIL_MIN_MEAN_SOG")
             
-            # TOI Check
-            toi = row.get('toi_minutes_l10', 0)
-            if toi < cfg.ELIGIBILITY['min_toi']:
-                reasons.append("FAIL_TOI")
-                
-            # Market Specifics
-            if m_type == 'POINTS':
-                if p_model < cfg.ELIGIBILITY['points_min_prob']: reasons.append("FAIL_MIN_PROB")
-                if row.get('proj_points_mean', 0) < cfg.ELIGIBILITY['points_min_mean']: reasons.append("FAIL_MIN_MEAN")
-                
-            elif m_type == 'ASSISTS':
-                if p_model < cfg.ELIGIBILITY['assists_min_prob']: reasons.append("FAIL_MIN_PROB")
-                
-            elif m_type == 'GOALS':
-                if p_model < cfg.ELIGIBILITY['goals_min_prob']: reasons.append("FAIL_MIN_PROB")
-                if row.get('mu_sog', 0) < cfg.ELIGIBILITY['avg_goals_min_sog']: reasons.append("FAIL_MIN_MEAN_SOG")
-                
-            elif m_type == 'SOG':
-                min_mean = line + cfg.ELIGIBILITY['sog_min_buffer']
-                if row.get('mu_sog', 0) < min_mean: reasons.append("FAIL_Sanity_Buffer")
+        elif m_type == 'SOG':
+            min_mean = line + cfg.ELIGIBILITY['sog_min_buffer']
+            if row.get('mu_sog', 0) < min_mean: reasons.append("FAIL_Sanity_Buffer")
 
-            # EV/Edge Trigger
-            # Check Thresholds for Tier
-            thresh = cfg.TRIGGERS.get(tier, cfg.TRIGGERS['C'])
+        # EV/Edge Trigger
+        # Check Thresholds for Tier
+        thresh = cfg.TRIGGERS.get(tier, cfg.TRIGGERS['C'])
+        
+        # Tier C Logic
+        if tier == 'C':
+            # Exception check
+            allowed = False
+            if ev >= cfg.TIER_C_EXCEPTION['min_ev'] and toi >= cfg.TIER_C_EXCEPTION['min_toi']:
+                # Check bottom 6? (pp_share < 0.3?)
+                if row.get('pp_share_l10', 0) > 0.3: # Not bottom 6
+                    allowed = True
+                    reasons.append("TIER_C_EXCEPTION") # Info tag
             
-            # Tier C Logic
-            if tier == 'C':
-                # Exception check
-                allowed = False
-                if ev >= cfg.TIER_C_EXCEPTION['min_ev'] and toi >= cfg.TIER_C_EXCEPTION['min_toi']:
-                    # Check bottom 6? (pp_share < 0.3?)
-                    if row.get('pp_share_l10', 0) > 0.3: # Not bottom 6
-                        allowed = True
-                        reasons.append("TIER_C_EXCEPTION") # Info tag
-                
-                if not allowed:
-                    reasons.append("FAIL_TIER_C")
-            else:
-                # A/B Logic
-                if ev < thresh['min_ev'] and edge < thresh['min_edge']:
-                    reasons.append("FAIL_LOW_EDGE")
+            if not allowed:
+                reasons.append("FAIL_TIER_C")
+        else:
+            # A/B Logic
+            if ev < thresh['min_ev'] and edge < thresh['min_edge']:
+                reasons.append("FAIL_LOW_EDGE")
 
-            # 6. Recommendation Decision
-            is_rec = (len(reasons) == 0) or (len(reasons) == 1 and reasons[0] == "TIER_C_EXCEPTION")
-            
-            # Audit Record
-            cand = {
-                'player_id': row.get('player_id'),
-                'player_name': row['player_name'],
-                'team': row['team'],
-                'opponent': row['opponent'],
-                'market_type': m_type,
-                'line': line,
-                'book': book,
-                'book_odds': price,
-                'dec_odds': dec_odds,
-                'p_model': p_model,
-                'p_implied': p_implied,
-                'edge': edge,
-                'ev': ev,
-                'tier': tier,
-                'gate_version': cfg.GATE_VERSION,
-                'is_recommended': is_rec,
-                'reject_reasons': "|".join(reasons) if reasons else "PASS",
-                'game_time_est': row.get('game_time_est', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-            }
-            
-            self.candidates.append(cand)
+        # 6. Recommendation Decision
+        is_rec = (len(reasons) == 0) or (len(reasons) == 1 and reasons[0] == "TIER_C_EXCEPTION")
+        
+        # Audit Record
+        cand = {
+            'player_id': row.get('player_id'),
+            'player_name': row['player_name'],
+            'team': row['team'],
+            'opponent': row['opponent'],
+            'market_type': m_type,
+            'line': line,
+            'book': book,
+            'book_odds': price,
+            'dec_odds': dec_odds,
+            'p_model': p_model,
+            'p_implied': p_implied,
+            'edge': edge,
+            'ev': ev,
+            'tier': tier,
+            'gate_version': cfg.GATE_VERSION,
+            'is_recommended': is_rec,
+            'reject_reasons': "|".join(reasons) if reasons else "PASS",
+            'game_time_est': row.get('game_time_est', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        }
+        
+        self.candidates.append(cand)
+
+    def calc_p_models(self, m_type, rows, lines):
+        # Uses Frozen Alphas; rows/lines are aligned (one entry per queued offer)
+        col = lambda key, default=0.0: np.array([row.get(key, default) for row in rows], dtype=float)
 
-    def calc_p_model(self, row, m_type, line):
-        # Uses Frozen Alphas and Scipy
         if m_type == 'SOG':
-            mu = row['mu_sog']
-            alpha = cfg.MODEL_PARAMS['alpha_sog']
-            # P(X > line) = 1 - CDF(floor(line)) if line is X.5
-            # line 2.5 -> >2 -> P(X>=3) -> 1 - CDF(2). 
-            k = int(line)
-            n_p = 1.0 / alpha
-            p_p = n_p / (n_p + mu)
-            return 1.0 - nbinom.cdf(k, n_p, p_p)
+            # P(X > line): line 2.5 -> P(X>=3)
+            return np.atleast_1d(nbinom_over(col('mu_sog'), cfg.MODEL_PARAMS['alpha_sog'], lines))
             
         elif m_type == 'POINTS':
             # Use pre-calced if line matches 0.5/1.5
-            if line == 0.5: return row.get('prob_points_1plus', 0.0)
-            if line == 1.5: return row.get('prob_points_2plus', 0.0)
-            return 0.0
+            probs = np.where(lines == 0.5, col('prob_points_1plus'), col('prob_points_2plus'))
+            for i in np.flatnonzero((lines != 0.5) & (lines != 1.5)):
+                # Any other posted line: re-simulate the player's stream on demand
+                row = rows[i]
+                res = self.sim.simulate(
+                    PointsSimulator.row_key(row),
+                    row.get('mu_sog', 0.0), row.get('p_goal', cfg.MODEL_PARAMS['p_goal_default']), row.get('mu_ast', 0.0)
+                )
+                probs[i] = res.prob_over('points', lines[i])
+            return probs
             
         elif m_type == 'ASSISTS':
             # Use NB
-            mu = row['mu_ast']
-            alpha = cfg.MODEL_PARAMS['alpha_ast']
-            k = int(line)
-            n_p = 1.0 / alpha
-            p_p = n_p / (n_p + mu)
-            return 1.0 - nbinom.cdf(k, n_p, p_p)
+            return np.atleast_1d(nbinom_over(col('mu_ast'), cfg.MODEL_PARAMS['alpha_ast'], lines))
 
         elif m_type == 'GOALS':
             # Approx P(G>=1) = 1 - exp(-mu_sog * p_goal) OR use NB?
             # Phase 2 used Binomial/NB approx.
             # Simplified: Poisson(mu_sog * p_goal).
-            mu_g = row['mu_sog'] * row.get('p_goal', cfg.MODEL_PARAMS['p_goal_default'])
-            if line == 0.5:
-                return 1.0 - np.exp(-mu_g)
-            return 0.0
+            mu_g = col('mu_sog') * col('p_goal', cfg.MODEL_PARAMS['p_goal_default'])
+            return np.atleast_1d(poisson_over(mu_g, lines))
             
-        return 0.0
+        return np.zeros(len(lines))
 
     def get_tier(self, row, m_type, line, prob):
         t = cfg.TIER_THRESHOLDS
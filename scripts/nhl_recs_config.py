@@ -8,7 +8,8 @@ GATE_VERSION = "1.0"
 MODEL_PARAMS = {
     'alpha_sog': 0.1393, # Updated 2026-01-28
     'alpha_ast': 0.1677, # Updated 2026-01-28
-    'p_goal_default': 0.10 # Fallback if col missing
+    'p_goal_default': 0.10, # Fallback if col missing
+    'n_sims': 10000 # Points MC (matches generate_daily_projections)
 }
 
 # 1. Eligibility Gates (Hard Filters)
@@ -1,5 +1,4 @@
 import pandas as pd
-import requests
 import os
 import sys
 import time
@@ -9,6 +8,7 @@ from datetime import datetime, timedelta, timezone
 # Ensure project root is in path
 sys.path.append(os.getcwd())
 
+from data.clients.base import http_get
 from data.sources.nhl_goalies_lwl import fetch_lwl_goalies
 from utils.team_names import normalize_team_name
 
@@ -48,7 +48,7 @@ def fetch_nhl_odds():
         "oddsFormat": ODDS_FORMAT
     }
     
-    resp = requests.get(url, params=params)
+    resp = http_get(url, params=params, timeout=10)
     if resp.status_code != 200:
         log(f"❌ API Error: {resp.status_code} {resp.text}")
         sys.exit(1)
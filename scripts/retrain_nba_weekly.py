@@ -9,6 +9,7 @@ from db.connection import get_db
 import logging
 from xgboost import XGBClassifier, XGBRegressor
 from sklearn.metrics import log_loss, mean_absolute_error
+from scripts.export_compiled_models import export_artifact
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -194,6 +195,7 @@ def run_retrain():
         ts = datetime.now().strftime('%Y%m%d')
         path_ml = f"models/nba_ml_{ts}.joblib"
         joblib.dump(res['model_ml'], path_ml)
+        export_artifact(path_ml)  # NumPy runtime sibling for NBAModel
         
         # Update Registry
         update_registry({
@@ -1,6 +1,8 @@
 
 import pandas as pd
 from db.connection import get_db
+from db.queries import NET_UNITS_SQL
+from db.rollups import refresh_performance_views
 from datetime import datetime
 
 class BetSettler:
@@ -24,6 +26,8 @@ class BetSettler:
         for row in obs:
             self.process_bet(row)
             
+        if self.settled_count:
+            refresh_performance_views(self.conn)
         print(f"✅ Run Complete. Settled {self.settled_count} bets.")
         
     def fetch_pending(self):
@@ -92,10 +96,10 @@ class BetSettler:
             profit = 0.0
             
             if actual > line:
-                outcome = 'WIN'
+                outcome = 'WON'
                 profit = (row['odds'] - 1.0) # Decimal Odds - 1
             elif actual < line:
-                outcome = 'LOSS'
+                outcome = 'LOST'
                 profit = -1.0
             else:
                 # Push
@@ -147,14 +151,17 @@ class BetSettler:
         return None
 
     def update_db(self, event_id, outcome, profit, actual_val):
-        sql = """
+        # profit stays flat 1u; net_units is staked like every other settler
+        sql = f"""
         UPDATE intelligence_log
-        SET outcome = %s, profit = %s
-        WHERE event_id = %s
+        SET outcome = %(outcome)s, profit = %(profit)s,
+            net_units = {NET_UNITS_SQL.format(outcome='%(outcome)s', t='')},
+            settled_at = NOW()
+        WHERE event_id = %(event_id)s
         """
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (outcome, profit, event_id))
+                cur.execute(sql, {'outcome': outcome, 'profit': profit, 'event_id': event_id})
             self.conn.commit()
         except:
             pass
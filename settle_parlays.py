@@ -1,5 +1,7 @@
 import re
 from db.connection import get_db
+from db.queries import SETTLE_OUTCOME
+from db.rollups import refresh_performance_views
 
 def settle_parlays():
     print("🧩 Starting Parlay Settlement...")
@@ -16,6 +18,7 @@ def settle_parlays():
         print("✅ No pending parlays.")
         return
         
+    graded = 0
     for pid, text in parlays:
         print(f"\nProcessing {pid}...")
         # Extract Legs: "Parlay (3 Legs): Leg 1 (Odds) + Leg 2 (Odds) + ..."
@@ -66,14 +69,17 @@ def settle_parlays():
             print(f"  📝 Final Decision: {final}")
             
             if final != "PENDING":
-                cur.execute("UPDATE intelligence_log SET outcome = %s WHERE event_id = %s", (final, pid))
+                cur.execute(SETTLE_OUTCOME, {'outcome': final, 'event_id': pid})
                 cur.execute("UPDATE calibration_log SET outcome = %s WHERE event_id = %s", (final, pid))
                 conn.commit()
+                graded += 1
                 print("  ✅ Updated DB")
                 
         except Exception as e:
             print(f"  ❌ Error parsing parlay: {e}")
 
+    if graded:
+        refresh_performance_views(conn)
     conn.close()
 
 if __name__ == "__main__":
@@ -1,20 +1,25 @@
-import requests
 import difflib
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pytz
+from data.cache import cache_get, cache_set
+from data.clients.base import http_get
 from db.connection import get_db, safe_execute
+from db.queries import SETTLE_OUTCOME
+from db.rollups import refresh_performance_views
 from utils import log
 
 # Configuration
 ESPN_SCOREBOARD = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
 ESPN_SUMMARY = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary"
+MAX_WORKERS = 6
+BOX_CACHE_PREFIX = "nhl_box_sog_"  # data.cache key per ESPN game id (final games only)
 
 def get_espn_games(date_str):
     """Fetch completed games for a specific date (YYYY-MM-DD)."""
     try:
         url = f"{ESPN_SCOREBOARD}?dates={date_str.replace('-', '')}"
-        res = requests.get(url, timeout=10).json()
+        res = http_get(url, timeout=10).json()
         games = []
         for ev in res.get('events', []):
             status = ev['status']['type']['state']
@@ -31,53 +36,103 @@ def get_espn_games(date_str):
         log("ERROR", f"ESPN Fetch failed: {e}")
         return []
 
-def get_player_stats(http_calls, game_id):
-    """Fetch SOG stats for all players in a game."""
-    # Rate limit guard
-    if http_calls > 0: time.sleep(0.5)
-    
+def parse_skater_sog(summary):
+    """{player display name: SOG} from an ESPN NHL summary payload."""
+    stats = {}
+    box = summary.get('boxscore', {})
+
+    # Correct parsing for ESPN NHL Boxscore
+    # boxscore -> players -> [ { team, statistics: [ { name: "skaters", athletes: [...] } ] } ]
+    for team_group in box.get('players', []):
+        for stat_group in team_group.get('statistics', []):
+            if stat_group.get('name') != 'skaters':
+                continue
+            # We need to find the index of "S" or "SOG" once per group
+            keys = stat_group.get('keys', []) # e.g. ["G", "A", "Pts", "+/-", "PIM", "SOG", "HITS", "BLKS", "TOI"]
+            sog_idx = next((keys.index(k) for k in ('S', 'Sh') if k in keys), None) # ESPN often uses 'S' or 'Sh'
+            if sog_idx is None:
+                continue
+            for athlete in stat_group.get('athletes', []):
+                if sog_idx < len(athlete.get('stats', [])):
+                    stats[athlete['athlete']['displayName']] = int(athlete['stats'][sog_idx])
+    return stats
+
+def get_player_stats(game_id):
+    """
+    SOG index for a completed game. Final boxscores never change, so a parsed
+    index is cached on disk per ESPN game id and never refetched.
+    """
+    key = f"{BOX_CACHE_PREFIX}{game_id}"
+    cached = cache_get(key, ttl_seconds=float('inf'))
+    if cached is not None:
+        return cached
+
     stats = {}
     try:
         url = f"{ESPN_SUMMARY}?event={game_id}"
-        res = requests.get(url, timeout=10).json()
-        
-        box = res.get('boxscore', {})
-        for team in box.get('teams', []):
-            for player in team.get('statistics', []):
-                # NHL stats usually in 'statistics' array
-                # But ESPN structure determines if this is 'skaters' or 'goalies'
-                # Usually: team['players'] -> list of players -> stats
-                pass 
-                
-        # Correct parsing for ESPN NHL Boxscore
-        # boxscore -> players -> [ { team, statistics: [ { name: "skaters", athletes: [...] } ] } ]
-        if 'players' in box:
-            for team_group in box['players']:
-                for stat_group in team_group.get('statistics', []):
-                    if stat_group['name'] == 'skaters':
-                        for athlete in stat_group.get('athletes', []):
-                            name = athlete['athlete']['displayName']
-                            # Find SOG in stats (format varies, usually "shots")
-                            # stats array corresponds to labels.
-                            # We need to find the index of "S" or "SOG"
-                            keys = stat_group.get('keys', []) # e.g. ["G", "A", "Pts", "+/-", "PIM", "SOG", "HITS", "BLKS", "TOI"]
-                            try:
-                                sog_idx = keys.index('S') # ESPN often uses 'S' or 'Sh'
-                            except ValueError:
-                                try:
-                                    sog_idx = keys.index('Sh')
-                                except ValueError:
-                                    continue
-                                    
-                            if sog_idx < len(athlete['stats']):
-                                sog = int(athlete['stats'][sog_idx])
-                                stats[name] = sog
-                                
+        stats = parse_skater_sog(http_get(url, timeout=10).json())
     except Exception as e:
         print(f"Error parsing stats for {game_id}: {e}")
-        
+
+    if stats:  # Empty = not posted yet / failed; retry next run
+        cache_set(key, stats)
     return stats
 
+def get_games_player_stats(game_ids):
+    """{game_id: SOG index} for the given games (cache hits free, misses fetched concurrently)."""
+    game_ids = list(dict.fromkeys(game_ids))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return dict(zip(game_ids, pool.map(get_player_stats, game_ids)))
+
+def match_game(teams_str, games):
+    """ESPN game for an "Away @ Home" bet string (fuzzy), or None."""
+    try:
+        away_b, home_b = teams_str.split(' @ ')
+    except ValueError:
+        return None
+    for g in games:
+        # Fuzzy match names
+        h_rat = difflib.SequenceMatcher(None, home_b, g['home']).ratio()
+        a_rat = difflib.SequenceMatcher(None, away_b, g['away']).ratio()
+        if h_rat > 0.6 and a_rat > 0.6:
+            return g
+    return None
+
+def grade_sog_prop(sel, stats):
+    """'WON'/'LOST' for "Player Name Over/Under X.5 SOG" against a SOG index, or None."""
+    parts = sel.split(' ')
+    # structure: [First, Last, ..., Over/Under, Line, SOG]
+    # Find "Over" or "Under" index
+    if "Over" in parts:
+        type_idx = parts.index("Over")
+        bet_type = "Over"
+    elif "Under" in parts:
+        type_idx = parts.index("Under")
+        bet_type = "Under"
+    else:
+        return None
+
+    player_name_bet = " ".join(parts[:type_idx])
+    line = float(parts[type_idx+1])
+
+    if player_name_bet in stats:
+        actual_sog = stats[player_name_bet]
+    else:
+        # Fuzzy match player name
+        best_match = difflib.get_close_matches(player_name_bet, stats.keys(), n=1, cutoff=0.7)
+        if not best_match:
+            print(f"❌ Player mismatch: {player_name_bet}")
+            return None
+        actual_sog = stats[best_match[0]]
+
+    # Grade
+    if bet_type == "Over":
+        outcome = 'WON' if actual_sog > line else 'LOST'
+    else:
+        outcome = 'WON' if actual_sog < line else 'LOST'
+    print(f"✅ Grading {sel}: Actual {actual_sog} -> {outcome}")
+    return outcome
+
 def settle_props():
     print("🏒 Starting NHL Prop Settlement...")
     conn = get_db()
@@ -111,86 +166,45 @@ def settle_props():
         if date_str not in grouped_by_date: grouped_by_date[date_str] = []
         grouped_by_date[date_str].append(p)
         
+    # Match every bet to its game, then load all needed boxscores at once
+    matched = []
     for date_str, bets in grouped_by_date.items():
         print(f"📅 Processing {date_str}...")
         games = get_espn_games(date_str)
         
-        # Match matches
-        game_stats_cache = {} # game_id -> player_stats
-        
         for bet in bets:
             eid, sel, teams_str, _ = bet
-            
-            # Match game
             # teams_str e.g. "Flyers @ Penguins"
-            try:
-                away_b, home_b = teams_str.split(' @ ')
-            except:
-                continue
-                
-            matched_game = None
-            for g in games:
-                # Fuzzy match names
-                h_rat = difflib.SequenceMatcher(None, home_b, g['home']).ratio()
-                a_rat = difflib.SequenceMatcher(None, away_b, g['away']).ratio()
-                if h_rat > 0.6 and a_rat > 0.6:
-                    matched_game = g
-                    break
-            
-            if not matched_game:
+            game = match_game(teams_str, games)
+            if not game:
                 print(f"⚠️ Could not match game: {teams_str} on {date_str}")
                 continue
-                
-            gid = matched_game['id']
-            if gid not in game_stats_cache:
-                game_stats_cache[gid] = get_player_stats(1, gid)
-                
-            stats = game_stats_cache[gid]
-            if not stats:
+            matched.append((eid, sel, game['id']))
+
+    game_stats = get_games_player_stats(gid for _, _, gid in matched)
+
+    graded = 0
+    for eid, sel, gid in matched:
+        stats = game_stats.get(gid)
+        if not stats:
+            continue
+        try:
+            outcome = grade_sog_prop(sel, stats)
+            if not outcome:
                 continue
                 
-            # Parse Selection: "Player Name Over/Under X.5 SOG"
-            try:
-                parts = sel.split(' ')
-                # structure: [First, Last, ..., Over/Under, Line, SOG]
-                # Find "Over" or "Under" index
-                if "Over" in parts:
-                    type_idx = parts.index("Over")
-                    bet_type = "Over"
-                elif "Under" in parts:
-                    type_idx = parts.index("Under")
-                    bet_type = "Under"
-                else:
-                    continue
-                    
-                player_name_bet = " ".join(parts[:type_idx])
-                line = float(parts[type_idx+1])
-                
-                # Fuzzy match player name
-                best_match = difflib.get_close_matches(player_name_bet, stats.keys(), n=1, cutoff=0.7)
-                if not best_match:
-                    print(f"❌ Player mismatch: {player_name_bet}")
-                    continue
-                    
-                actual_sog = stats[best_match[0]]
-                
-                # Grade
-                outcome = None
-                if bet_type == "Over":
-                    outcome = 'WON' if actual_sog > line else 'LOST'
-                else:
-                    outcome = 'WON' if actual_sog < line else 'LOST'
-                    
-                # Update DB
-                print(f"✅ Grading {sel}: Actual {actual_sog} -> {outcome}")
-                cur.execute("UPDATE intelligence_log SET outcome = %s WHERE event_id = %s", (outcome, eid))
-                cur.execute("UPDATE calibration_log SET outcome = %s WHERE event_id = %s", (outcome, eid))
-                
-            except Exception as e:
-                print(f"Error grading {sel}: {e}")
+            # Update DB
+            cur.execute(SETTLE_OUTCOME, {'outcome': outcome, 'event_id': eid})
+            cur.execute("UPDATE calibration_log SET outcome = %s WHERE event_id = %s", (outcome, eid))
+            graded += 1
+            
+        except Exception as e:
+            print(f"Error grading {sel}: {e}")
                 
     conn.commit()
     cur.close()
+    if graded:
+        refresh_performance_views(conn)
     conn.close()
     print("🏁 Settlement Complete.")
 
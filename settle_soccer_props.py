@@ -1,21 +1,67 @@
 
 import os
-import requests
 import pandas as pd
 import difflib
 import re
+import unicodedata
 from datetime import datetime, timedelta
+from psycopg2.extras import execute_values
+from data.cache import cache_get, cache_set
 from db.connection import get_db
+from db.queries import NET_UNITS_SQL
+from db.rollups import refresh_performance_views
 from config import Config
 from utils import log
+from data.clients.base import http_get
 
 # Set up logging context
 CONTEXT = "SoccerPropSettlement"
 
-def get_fixtures_for_date(league_id, date_str):
+# Local persistence so each finished fixture costs API-Football quota at most once
+FIXTURES_KEY = "apif_fixtures_{league_id}_{date}"
+FIXTURE_PLAYERS_KEY = "apif_fixture_players_{fixture_id}"
+RECENT_FIXTURES_TTL = 1800  # Lists fetched < 2 days after the fixture date can still gain finished games
+
+UPDATE_INTEL_OUTCOMES = f"""
+    UPDATE intelligence_log AS t SET outcome = v.outcome, logic = v.logic,
+        net_units = {NET_UNITS_SQL.format(outcome='v.outcome', t='t.')}, settled_at = NOW()
+    FROM (VALUES %s) AS v(event_id, outcome, logic)
+    WHERE t.event_id = v.event_id
+"""
+UPDATE_CALIBRATION_OUTCOMES = """
+    UPDATE calibration_log AS t SET outcome = v.outcome
+    FROM (VALUES %s) AS v(event_id, outcome)
+    WHERE t.event_id = v.event_id
+"""
+
+def get_fixtures_for_date(league_id, date_str, now=None):
+    """
+    Finished fixtures for a league and date, from the local cache when possible.
+
+    The cached payload records when it was fetched. A non-empty list fetched two
+    or more days after the fixture date is final and kept indefinitely; anything
+    fetched earlier (late finishes, corrections) and any empty list are
+    revalidated once older than RECENT_FIXTURES_TTL.
+    """
+    now = now or datetime.now()
+    key = FIXTURES_KEY.format(league_id=league_id, date=date_str)
+    cached = cache_get(key, ttl_seconds=float('inf'))
+    if isinstance(cached, dict):
+        fetched_at = datetime.fromisoformat(cached['fetched_at'])
+        final = bool(cached['fixtures']) and \
+            (fetched_at.date() - datetime.strptime(date_str, '%Y-%m-%d').date()).days >= 2
+        if final or (now - fetched_at).total_seconds() < RECENT_FIXTURES_TTL:
+            return cached['fixtures']
+
+    fixtures = _fetch_fixtures_for_date(league_id, date_str)
+    if fixtures is not None:
+        cache_set(key, {'fixtures': fixtures, 'fetched_at': now.isoformat()})
+    return fixtures or []
+
+def _fetch_fixtures_for_date(league_id, date_str):
     """
     Fetch finished fixtures for a specific league and date.
-    Returns list of dicts: {fixture_id, home, away, score}
+    Returns list of dicts: {fixture_id, home, away, score}, or None on failure.
     """
     url = f"https://v3.football.api-sports.io/fixtures"
     params = {
@@ -27,9 +73,12 @@ def get_fixtures_for_date(league_id, date_str):
     headers = {'x-apisports-key': Config.FOOTBALL_API_KEY}
     
     try:
-        res = requests.get(url, headers=headers, params=params, timeout=10)
+        res = http_get(url, headers=headers, params=params, timeout=10)
         res.raise_for_status()
         data = res.json()
+        if data.get('errors'):  # Quota / bad key: HTTP 200 with an empty response
+            log(CONTEXT, f"[ERROR] API-Football fixtures error: {data['errors']}")
+            return None
         
         fixtures = []
         for f in data.get('response', []):
@@ -43,13 +92,25 @@ def get_fixtures_for_date(league_id, date_str):
         return fixtures
     except Exception as e:
         log(CONTEXT, f"[ERROR] Error fetching fixtures: {e}")
-        return []
+        return None
 
 def get_fixture_player_stats(fixture_id):
     """
-    Fetch player statistics for a specific fixture.
+    Player statistics for a finished fixture (fetched once, then read from disk).
     Returns a dict keyed by Normalized Player Name logic.
     """
+    key = FIXTURE_PLAYERS_KEY.format(fixture_id=fixture_id)
+    cached = cache_get(key, ttl_seconds=float('inf'))
+    if cached is not None:
+        return cached
+
+    player_stats = _fetch_fixture_player_stats(fixture_id)
+    if player_stats:  # Empty = not published yet; retry next run
+        cache_set(key, player_stats)
+    return player_stats
+
+def _fetch_fixture_player_stats(fixture_id):
+    """Fetch player statistics for a specific fixture from API-Football."""
     url = f"https://v3.football.api-sports.io/fixtures/players"
     params = {'fixture': fixture_id}
     headers = {'x-apisports-key': Config.FOOTBALL_API_KEY}
@@ -57,9 +118,12 @@ def get_fixture_player_stats(fixture_id):
     player_stats = {}
     
     try:
-        res = requests.get(url, headers=headers, params=params, timeout=10)
+        res = http_get(url, headers=headers, params=params, timeout=10)
         res.raise_for_status()
         data = res.json()
+        if data.get('errors'):
+            log(CONTEXT, f"[ERROR] API-Football stats error for fixture {fixture_id}: {data['errors']}")
+            return {}
         
         # API returns data per team
         for team_data in data.get('response', []):
@@ -94,25 +158,90 @@ def normalize_name(name):
     """Simple normalization for fuzzy matching."""
     return name.lower().strip()
 
+def _strip_accents(name):
+    return ''.join(c for c in unicodedata.normalize('NFKD', name) if not unicodedata.combining(c))
+
+def _name_variants(name):
+    """Lookup keys for a player name: normalized, accent-free, and "f. surname" forms."""
+    norm = normalize_name(name)
+    plain = _strip_accents(norm)
+    variants = {norm, plain}
+    parts = plain.replace('.', ' ').split()
+    if len(parts) >= 2:
+        variants.add(f"{parts[0][0]}. {' '.join(parts[1:])}")
+    return variants
+
+class FixturePlayers:
+    """
+    Per-fixture player resolver. Name variants are indexed once when the
+    fixture loads; fuzzy fallbacks are memoised per target name.
+    """
+
+    def __init__(self, player_stats):
+        self.stats = player_stats
+        self.index = {}
+        for key in player_stats:
+            for variant in _name_variants(key):
+                self.index.setdefault(variant, key)
+        self.memo = {}
+
+    def resolve(self, target_name):
+        """(stats_dict, score) for a bet's player name; (None, 0) if unmatched."""
+        if target_name not in self.memo:
+            self.memo[target_name] = self._resolve(target_name)
+        key, score = self.memo[target_name]
+        return (self.stats[key], score) if key else (None, 0)
+
+    def _resolve(self, target_name):
+        target_norm = normalize_name(target_name)
+        # Direct match check
+        if target_norm in self.stats:
+            return target_norm, 100
+        for variant in _name_variants(target_name):
+            if variant in self.index:
+                return self.index[variant], 95
+
+        # Fuzzy match
+        matches = difflib.get_close_matches(_strip_accents(target_norm), list(self.index), n=1, cutoff=0.7)
+        if matches:
+            return self.index[matches[0]], 90 # Arbitrary high confidence for fuzzy
+        return None, 0
+
 def match_player(target_name, player_stats_db):
     """
     Find best match for target_name in player_stats_db keys.
     Returns (stats_dict, score)
     """
-    target_norm = normalize_name(target_name)
+    return FixturePlayers(player_stats_db).resolve(target_name)
+
+def match_fixture(event_str, fixtures):
+    """Best fuzzy fixture for a bet's "Home vs Away" / "Home @ Away" string, or None."""
+    matched_fixture = None
+    best_score = 0
     
-    # Direct match check
-    if target_norm in player_stats_db:
-        return player_stats_db[target_norm], 100
+    for f in fixtures:
+        # Construct comparable strings
+        api_str_1 = f"{f['home']} vs {f['away']}"
+        api_str_2 = f"{f['away']} vs {f['home']}"
         
-    # Fuzzy match
-    keys = list(player_stats_db.keys())
-    matches = difflib.get_close_matches(target_norm, keys, n=1, cutoff=0.7)
-    
-    if matches:
-        return player_stats_db[matches[0]], 90 # Arbitrary high confidence for fuzzy
+        score_1 = difflib.SequenceMatcher(None, event_str, api_str_1).ratio()
+        score_2 = difflib.SequenceMatcher(None, event_str, api_str_2).ratio()
         
-    return None, 0
+        max_score = max(score_1, score_2)
+        if max_score > 0.6 and max_score > best_score:
+            best_score = max_score
+            matched_fixture = f
+    return matched_fixture
+
+def bet_player_name(selection):
+    """Player Name is everything before "Over" or "Anytime"."""
+    # Example: "Mohamed Salah Over 0.5 Shots on Target" -> "Mohamed Salah"
+    if "Over" in selection:
+        return selection.split(" Over ")[0].strip()
+    elif "Anytime" in selection:
+        return selection.split(" Anytime")[0].strip()
+    # Fallback
+    return selection.split(" ")[0] # Very risky
 
 def grade_prop_bet(selection, stats):
     """
@@ -199,12 +328,12 @@ def settle_soccer_props():
         log(CONTEXT, "[INFO] No pending soccer props to settle.")
         return
 
-    # 2. Group by League & Date to minimize API Calls
-    # Map: (league_id, date) -> fixtures_list
-    fixtures_cache = {}
-    stats_cache = {} # fixture_id -> stats_dict
-    
-    processed_count = 0
+    # 2. Grade everything in one pass. Fixture lists and player stats come from
+    # the local cache (one API call per finished fixture, ever); name
+    # resolution is indexed once per fixture.
+    fixtures_by_day = {}
+    players_by_fixture = {}
+    graded = []
     
     for bet in bets:
         event_id, sport, event_str, selection, kickoff, stake = bet
@@ -212,98 +341,57 @@ def settle_soccer_props():
         # Parse essentials
         lid = Config.SOCCER_LEAGUE_IDS.get(sport)
         if not lid:
-            log(CONTEXT, f"[WARNING] Skipping bet {db_id}: Unknown league {sport}")
+            log(CONTEXT, f"[WARNING] Skipping bet {event_id}: Unknown league {sport}")
             continue
             
         date_str = kickoff.strftime('%Y-%m-%d')
-        cache_key = (lid, date_str)
-        
-        # Fetch fixtures if not cached
-        if cache_key not in fixtures_cache:
-            fixtures_cache[cache_key] = get_fixtures_for_date(lid, date_str)
-            
-        fixtures = fixtures_cache[cache_key]
-        
-        # Find Fixture
-        # Event string format: "Home vs Away" or "Home @ Away"
-        # We need to fuzzy match these team names against fixture names
-        target_teams = event_str.replace(' vs ', ' ').replace(' @ ', ' ').split(' ')
-        # That logic is weak. Better: use the full string similarity against "Home vs Away"
-        
-        matched_fixture = None
-        best_score = 0
-        
-        for f in fixtures:
-            # Construct comparable strings
-            api_str_1 = f"{f['home']} vs {f['away']}"
-            api_str_2 = f"{f['away']} vs {f['home']}"
-            
-            score_1 = difflib.SequenceMatcher(None, event_str, api_str_1).ratio()
-            score_2 = difflib.SequenceMatcher(None, event_str, api_str_2).ratio()
-            
-            max_score = max(score_1, score_2)
-            if max_score > 0.6 and max_score > best_score:
-                best_score = max_score
-                matched_fixture = f
+        if (lid, date_str) not in fixtures_by_day:
+            fixtures_by_day[(lid, date_str)] = get_fixtures_for_date(lid, date_str)
         
+        matched_fixture = match_fixture(event_str, fixtures_by_day[(lid, date_str)])
         if not matched_fixture:
-            log(CONTEXT, f"[WARNING] Could not find match for bet {db_id}: {event_str} ({date_str})")
+            log(CONTEXT, f"[WARNING] Could not find match for bet {event_id}: {event_str} ({date_str})")
             continue
             
-        # Found Match -> Fetch Stats
+        # Found Match -> Stats
         fid = matched_fixture['id']
+        if fid not in players_by_fixture:
+            players_by_fixture[fid] = FixturePlayers(get_fixture_player_stats(fid))
+        players = players_by_fixture[fid]
         
-        if fid not in stats_cache:
-            stats_cache[fid] = get_fixture_player_stats(fid)
-            
-        game_stats = stats_cache[fid]
-        
-        if not game_stats:
+        if not players.stats:
             log(CONTEXT, f"[WARNING] No stats available for fixture {fid}")
             continue
             
-        # Extract Player Name from Selection
-        # Heuristic: Player Name is everything before "Over" or "Anytime"
-        # Example: "Mohamed Salah Over 0.5 Shots on Target" -> "Mohamed Salah"
-        
-        player_name_target = ""
-        if "Over" in selection:
-            player_name_target = selection.split(" Over ")[0].strip()
-        elif "Anytime" in selection:
-            player_name_target = selection.split(" Anytime")[0].strip()
-        else:
-            # Fallback
-            player_name_target = selection.split(" ")[0] # Very risky
-            
-        p_stats, score = match_player(player_name_target, game_stats)
+        player_name_target = bet_player_name(selection)
+        p_stats, score = players.resolve(player_name_target)
         
         if not p_stats:
-             log(CONTEXT, f"[WARNING] Player not found in stats: {player_name_target} (Bet {db_id})")
+             log(CONTEXT, f"[WARNING] Player not found in stats: {player_name_target} (Bet {event_id})")
              continue
              
         # Grade It
         outcome, logic = grade_prop_bet(selection, p_stats)
         
         if outcome in ['WON', 'LOST']:
-            pnl = 0.0
-            # Get odds if needed for PnL, but DB update usually just needs Outcome
-            # We can calculate PnL in the Update
-            
-            # Update DB
-            cursor.execute("""
-                UPDATE intelligence_log
-                SET outcome = %s, logic = %s 
-                WHERE event_id = %s
-            """, (outcome, logic, event_id))
-            
-            cursor.execute("UPDATE calibration_log SET outcome = %s WHERE event_id = %s", (outcome, event_id))
-            
-            conn.commit()
+            graded.append((event_id, outcome, logic))
             log(CONTEXT, f"[INFO] Settled Bet {event_id}: {selection} -> {outcome} ({logic})")
-            processed_count += 1
-            
+
+    # 3. Batched DB updates
+    if graded:
+        try:
+            execute_values(cursor, UPDATE_INTEL_OUTCOMES, graded)
+            execute_values(cursor, UPDATE_CALIBRATION_OUTCOMES, [(eid, outcome) for eid, outcome, _ in graded])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            log(CONTEXT, f"[ERROR] Batch settlement update failed: {e}")
+            graded = []
+
+    if graded:
+        refresh_performance_views(conn)
     conn.close()
-    log(CONTEXT, f"[INFO] Completed Cycle. Settled {processed_count} props.")
+    log(CONTEXT, f"[INFO] Completed Cycle. Settled {len(graded)} props.")
 
 if __name__ == "__main__":
     settle_soccer_props()
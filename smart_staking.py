@@ -53,7 +53,7 @@ def get_performance_multipliers(days_back=60, min_bets=10):
 
         query = """
             SELECT sport, edge, odds, stake, outcome
-            FROM intelligence_log
+            FROM intelligence_log_all
             WHERE outcome IN ('WON', 'LOST', 'PUSH')
             AND kickoff >= %s
             AND edge IS NOT NULL
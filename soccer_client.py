@@ -1,7 +1,7 @@
-import requests
 from config import Config
 from key_soccer_players import KEY_SOCCER_PLAYERS
 import difflib
+from data.clients.base import http_get
 
 class SoccerClient:
     """
@@ -26,7 +26,7 @@ class SoccerClient:
         params = {'fixture': fixture_id}
         
         try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=5)
+            resp = http_get(url, headers=self.headers, params=params, timeout=5)
             data = resp.json()
             
             if not data.get('response'):
@@ -81,7 +81,7 @@ class SoccerClient:
         
         params = {'date': start_date_str}
         try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=10)
+            resp = http_get(url, headers=self.headers, params=params, timeout=10)
             data = resp.json()
             
             if not data.get('response'):
@@ -189,7 +189,7 @@ class SoccerClient:
         games_found = 0
         
         try:
-            resp = requests.get(url_fixtures, headers=self.headers, params=params, timeout=8)
+            resp = http_get(url_fixtures, headers=self.headers, params=params, timeout=8)
             data = resp.json()
             
             fixtures = data.get('response', [])
@@ -202,7 +202,7 @@ class SoccerClient:
                 # Try-catch to not break loop
                 try:
                     stats_url = f"{self.BASE_URL}/fixtures/statistics?fixture={fix_id}"
-                    s_resp = requests.get(stats_url, headers=self.headers, timeout=5)
+                    s_resp = http_get(stats_url, headers=self.headers, timeout=5)
                     s_data = s_resp.json()
                     
                     if not s_data.get('response'):
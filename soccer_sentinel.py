@@ -1,8 +1,8 @@
 import time
 import subprocess
-import requests
 from datetime import datetime, timedelta, timezone
 from config import Config
+from data.clients.base import http_get
 
 # Sentinel Logic (Hourly Watchman)
 # 1. Get Schedule
@@ -49,7 +49,7 @@ def get_upcoming_soccer_games():
                  'commenceTimeTo': iso_limit
              }
              
-             resp = requests.get(f"https://api.the-odds-api.com/v4/sports/{league}/odds", params=params)
+             resp = http_get(f"https://api.the-odds-api.com/v4/sports/{league}/odds", params=params)
              if resp.status_code == 200:
                  data = resp.json()
                  print(f"   📋 {league}: Found {len(data)} games.")
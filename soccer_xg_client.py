@@ -1,8 +1,8 @@
 
 import pandas as pd
-import requests
 import time
 from datetime import datetime
+from data.clients.base import http_get
 
 class SoccerXGClient:
     """
@@ -42,7 +42,7 @@ class SoccerXGClient:
             # Random sleep to avoid aggressive rate limiting
             time.sleep(1)
             
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = http_get(url, headers=self.headers, timeout=10)
             if resp.status_code != 200:
                 print(f"❌ Failed to fetch FBRef: {resp.status_code}")
                 return None
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import archive
+
+
+class TestArchive(unittest.TestCase):
+
+    def test_cutoff_and_month_bounds(self):
+        self.assertEqual(archive.archive_cutoff(date(2026, 2, 17), months=3), date(2025, 11, 1))
+        self.assertEqual(archive.archive_cutoff(date(2026, 3, 1), months=0), date(2026, 3, 1))
+        self.assertEqual(archive.month_bounds(date(2025, 12, 9)), (date(2025, 12, 1), date(2026, 1, 1)))
+        self.assertEqual(archive.partition_name(date(2025, 7, 1)), "intelligence_log_history_y2025m07")
+
+    def test_export_month_writes_compressed_parquet(self):
+        rows = pd.DataFrame({
+            'event_id': ['A', 'B'],
+            'kickoff': pd.to_datetime(['2025-01-03 19:00', '2025-01-20 01:30']),
+            'outcome': ['WON', 'LOST'],
+            'odds': [2.1, 1.8],
+            'metadata': [{'model': 'v2', 'inputs': [1, 2]}, None],
+        })
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch.object(archive.pd, 'read_sql', return_value=rows) as read_sql:
+            path = archive.export_month(object(), date(2025, 1, 1), archive_dir=tmp)
+            self.assertEqual(os.path.basename(path), "2025-01.parquet")
+            self.assertEqual(read_sql.call_args[1]['params'], (date(2025, 1, 1), date(2025, 2, 1)))
+
+            back = pd.read_parquet(path)
+            import pyarrow.parquet as pq
+            codec = pq.ParquetFile(path).metadata.row_group(0).column(0).compression
+
+        self.assertEqual(codec, 'ZSTD')
+        self.assertEqual(list(back['event_id']), ['A', 'B'])
+        self.assertEqual(back.loc[0, 'metadata'], '{"model": "v2", "inputs": [1, 2]}')
+        self.assertIsNone(back.loc[1, 'metadata'])
+
+    def test_export_month_skips_empty(self):
+        with mock.patch.object(archive.pd, 'read_sql', return_value=pd.DataFrame()):
+            self.assertIsNone(archive.export_month(object(), date(2025, 1, 1), archive_dir="unused"))
+
+    def test_move_is_one_statement(self):
+        conn = mock.MagicMock()
+        cur = conn.cursor.return_value
+        cur.fetchall.return_value = [(date(2025, 1, 1), 3)]
+        cur.rowcount = 3
+        with mock.patch.object(archive, 'ensure_archive_schema'), \
+             mock.patch.object(archive, '_ensure_month_partition'), \
+             mock.patch.object(archive, '_columns', return_value=[('event_id', 'text'), ('outcome', 'text')]):
+            moved = archive.archive_settled(conn, export=False, today=date(2025, 6, 1))
+
+        self.assertEqual(moved, {date(2025, 1, 1): 3})
+        writes = [c.args[0] for c in cur.execute.call_args_list if 'DELETE' in c.args[0] or 'INSERT' in c.args[0]]
+        self.assertEqual(len(writes), 1)  # Copy and delete share one snapshot
+        self.assertIn('RETURNING "event_id", "outcome"', writes[0])
+        self.assertIn('SELECT "event_id", "outcome" FROM moved', writes[0])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compiled import (
+    compile_model, export_model, export_ensemble, build_runtime,
+    save_compiled, load_compiled, load_model, compiled_path_for,
+)
+
+
+def _binary_data(n=400, d=6, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n, d))
+    y = (X[:, 0] + 0.5 * X[:, 1] - X[:, 2] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+
+class TestCompiledModels(unittest.TestCase):
+
+    def assertParity(self, ref, out, tol=1e-6):
+        self.assertLess(float(np.max(np.abs(np.asarray(ref) - np.asarray(out)))), tol)
+
+    def test_linear_and_scaler(self):
+        from sklearn.linear_model import ElasticNet, LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+
+        X, y = _binary_data()
+        scaler = StandardScaler().fit(X)
+        Xs = scaler.transform(X)
+        enet = ElasticNet(alpha=0.1, l1_ratio=0.5).fit(Xs, X[:, 0] * 2 + 1)
+        logit = LogisticRegression().fit(Xs, y)
+
+        self.assertParity(scaler.transform(X), compile_model(scaler).transform(X))
+        self.assertParity(enet.predict(Xs), compile_model(enet).predict(Xs))
+        self.assertParity(logit.predict_proba(Xs), compile_model(logit).predict_proba(Xs))
+
+    def test_sklearn_tree_ensembles(self):
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+
+        X, y = _binary_data()
+        rf = RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0).fit(X, y)
+        gb = GradientBoostingClassifier(n_estimators=30, max_depth=3, random_state=0).fit(X, y)
+
+        self.assertParity(rf.predict_proba(X), compile_model(rf).predict_proba(X))
+        self.assertParity(gb.predict_proba(X), compile_model(gb).predict_proba(X))
+
+        ens = build_runtime(export_ensemble([rf, gb]))
+        expected = np.mean([rf.predict_proba(X), gb.predict_proba(X)], axis=0)
+        self.assertParity(expected, ens.predict_proba(X))
+
+    def test_xgboost_with_missing_values(self):
+        try:
+            from xgboost import XGBClassifier, XGBRegressor
+        except ImportError:
+            self.skipTest("xgboost not installed")
+
+        X, y = _binary_data()
+        X[::9, 1] = np.nan
+        clf = XGBClassifier(n_estimators=40, max_depth=3, learning_rate=0.1).fit(X, y)
+        reg = XGBRegressor(n_estimators=40, max_depth=4).fit(X, X[:, 0] * 3.0)
+
+        self.assertParity(clf.predict_proba(X), compile_model(clf).predict_proba(X), tol=1e-5)
+        self.assertParity(reg.predict(X), compile_model(reg).predict(X), tol=1e-4)
+
+        # Log-link objectives would need exp(); refuse rather than export an identity link
+        gamma = XGBRegressor(n_estimators=5, objective='reg:gamma').fit(X, np.abs(X[:, 0]) + 1.0)
+        with self.assertRaises(ValueError):
+            export_model(gamma)
+
+    def test_roundtrip_and_staleness(self):
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        import joblib
+
+        X, y = _binary_data()
+        pipe = make_pipeline(StandardScaler(), LogisticRegression()).fit(X, y)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = os.path.join(tmp, "pipe.joblib")
+            joblib.dump(pipe, model_path)
+            save_compiled(export_model(pipe), compiled_path_for(model_path), source_path=model_path)
+
+            loaded = load_compiled(compiled_path_for(model_path))
+            self.assertParity(pipe.predict_proba(X), loaded.predict_proba(X))
+            self.assertNotIn('sklearn', type(load_model(model_path)).__module__)
+
+            # Source artifact retrained after export -> fall back to joblib
+            joblib.dump(make_pipeline(StandardScaler(), LogisticRegression(C=0.1)).fit(X, y), model_path)
+            self.assertIsNone(load_compiled(compiled_path_for(model_path), source_path=model_path))
+            self.assertIn('sklearn', type(load_model(model_path)).__module__)
+
+
+if __name__ == '__main__':
+    unittest.main()
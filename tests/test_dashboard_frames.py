@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.bench_dashboard_clean import make_ledger, assert_parity
+from processing.dashboard_frames import clean_dashboard_frame, match_live_score
+
+
+class TestDashboardFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.now = pd.Timestamp('2026-03-01 12:00', tz='US/Eastern')
+
+    def test_parity_with_row_wise_clean_df(self):
+        out = assert_parity(make_ledger(5000, seed=1, now=self.now), self.now)
+        self.assertGreater(len(out), 0)
+
+    def test_user_values_and_stake_floor(self):
+        df = pd.DataFrame([{
+            'event_id': 'X', 'kickoff': pd.Timestamp('2026-03-01 20:00'), 'sport': 'icehockey_nhl',
+            'teams': 'A @ B', 'selection': 'B ML', 'odds': 2.1, 'edge': 0.051,
+            'stake': 0.4, 'user_bet': False, 'user_odds': None, 'user_stake': None,
+        }])
+        row = clean_dashboard_frame(df, now=self.now).iloc[0]
+        self.assertEqual((row['Sport'], row['Stake'], row['Edge'], row['Dec_Odds']), ('NHL', '$1.00', '5.1%', 2.1))
+        self.assertEqual((row['Date'], row['Kickoff']), ('2026-03-01', '03-01 15:00'))
+
+
+    def test_match_live_score(self):
+        games = [{'home': 'Philadelphia 76ers', 'away': 'Boston Celtics', 'score': 'Q3: Boston Celtics 71 - Philadelphia 76ers 68'},
+                 {'home': 'Los Angeles Dodgers', 'away': 'San Diego Padres', 'score': 'Top 5th: San Diego Padres 2 - Los Angeles Dodgers 1'}]
+        self.assertEqual(match_live_score('Boston Celtics @ Philadelphia 76ers', games), games[0]['score'])
+        self.assertEqual(match_live_score('Dodgers vs Padres', games), games[1]['score'])
+        self.assertIsNone(match_live_score('Boston Celtics @ New York Knicks', games))
+        self.assertIsNone(match_live_score('Parlay (3 Legs)', games))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player_props_model import PlayerPropsPredictor, compute_team_defense_ratings
+
+
+def _loop_reference(data):
+    """Original per-match mask loop."""
+    match_teams = data.groupby('match_id')['team_name'].unique()
+    match_xg = data.groupby(['match_id', 'team_name'])['xg'].sum().reset_index()
+    team_xga, team_mins = {}, {}
+    for mid, teams in match_teams.items():
+        if len(teams) != 2: continue
+        t1, t2 = teams[0], teams[1]
+        t1_xg = match_xg[(match_xg['match_id'] == mid) & (match_xg['team_name'] == t1)]['xg'].sum()
+        t2_xg = match_xg[(match_xg['match_id'] == mid) & (match_xg['team_name'] == t2)]['xg'].sum()
+        team_xga[t1] = team_xga.get(t1, 0) + t2_xg
+        team_xga[t2] = team_xga.get(t2, 0) + t1_xg
+        team_mins[t1] = team_mins.get(t1, 0) + 90
+        team_mins[t2] = team_mins.get(t2, 0) + 90
+    return {t: (x / team_mins[t]) * 90 for t, x in team_xga.items()}
+
+
+class TestDefenseRatings(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        teams = ['Arsenal', 'Chelsea', 'Everton', 'Fulham', 'Wolves', 'Brentford']
+        rows = []
+        for mid in range(120):
+            home, away = rng.choice(teams, 2, replace=False)
+            for team in (home, away):
+                for _ in range(rng.randint(9, 15)):
+                    rows.append({'match_id': str(1000 + mid), 'team_name': team, 'xg': rng.exponential(0.1)})
+        # Incomplete match (one side only) is ignored
+        rows.append({'match_id': '9999', 'team_name': 'Arsenal', 'xg': 2.0})
+        self.data = pd.DataFrame(rows)
+
+    def test_matches_loop_reference(self):
+        got = compute_team_defense_ratings(self.data)
+        expected = _loop_reference(self.data)
+        self.assertEqual(set(got), set(expected))
+        for team, val in expected.items():
+            self.assertAlmostEqual(got[team], val, places=10)
+
+    def test_predictor_sets_league_average(self):
+        predictor = PlayerPropsPredictor.__new__(PlayerPropsPredictor)
+        predictor.data = self.data
+        ratings = predictor.get_team_defense_ratings()
+        self.assertAlmostEqual(predictor.avg_league_xga, np.mean(list(ratings.values())), places=12)
+        self.assertEqual(compute_team_defense_ratings(self.data.iloc[0:0]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
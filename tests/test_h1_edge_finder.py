@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+# Add parent directory (and the H1 model's sibling-import dir) to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'ncaab_h1_model'))
+
+from data import cache
+import discover_markets
+import ncaab_h1_edge_finder
+from ncaab_h1_edge_finder import H1_EdgeFinder
+
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+def _odds(*keys):
+    return {'bookmakers': [{'title': 'Book', 'markets': [{'key': k} for k in keys]}]}
+
+
+class _CacheDirTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        patcher = mock.patch.object(cache, 'CACHE_DIR', tmp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestMarketMap(_CacheDirTest):
+
+    def test_built_from_odds_responses(self):
+        self.assertEqual(discover_markets.get_market_map(['e1', 'e2'], 'totals_h1'), {'e1': True, 'e2': True})
+
+        discover_markets.record_markets(['e1', 'e2', 'e3'], {'e1': _odds('totals_h1'), 'e2': _odds(), 'e3': None}, now=1000)
+        self.assertEqual(discover_markets.get_market_map(['e1', 'e2', 'e3'], 'totals_h1', ttl=60, now=1030),
+                         {'e1': True, 'e2': False, 'e3': True})  # Failed fetch never skips
+        # Misses expire (H1 lines post late)
+        self.assertEqual(discover_markets.get_market_map(['e2'], 'totals_h1', ttl=60, now=1061), {'e2': True})
+
+    def test_only_current_slate_kept(self):
+        discover_markets.record_markets(['e1', 'e2'], {'e1': _odds(), 'e2': _odds()}, now=1000)
+        discover_markets.record_markets(['e2'], {}, now=1010)
+        self.assertEqual(set(cache.cache_get(discover_markets.MARKET_MAP_CACHE_KEY, float('inf'))), {'e2'})
+
+
+class TestFindEdges(_CacheDirTest):
+
+    def _finder(self):
+        finder = H1_EdgeFinder.__new__(H1_EdgeFinder)
+        finder.api_key = 'key'
+        finder.http = mock.MagicMock()
+        finder.predictor = mock.MagicMock()
+        finder.log_opportunity = mock.MagicMock()
+        return finder
+
+    def test_scan_skips_unposted_and_scores_in_one_batch(self):
+        finder = self._finder()
+        finder.fetch_upcoming_events = lambda: [{'id': 'e1'}, {'id': 'e2'}, {'id': 'e3'}]
+        games = {
+            'e1': {'home_team': 'Duke', 'away_team': 'UNC', 'commence_time': 'T1', 'bookmakers': [
+                {'title': 'Book', 'markets': [{'key': 'totals_h1', 'outcomes': [
+                    {'name': 'Over', 'price': -110, 'point': 70.5},
+                    {'name': 'Under', 'price': -110, 'point': 70.5}]}]}]},
+            'e3': {'home_team': 'Kansas', 'away_team': 'Baylor', 'commence_time': 'T3', 'bookmakers': []},
+        }
+        finder.fetch_event_odds = mock.MagicMock(side_effect=games.get)
+
+        breakdown = {'combined_std': 9.0, 'tempo_diff': 2.0, 'min_games_played': 12}
+        finder.predictor.predict_batch.return_value = [
+            {'predicted_h1_total': 76.0, 'confidence': 90, 'expected_std': 9.0, 'breakdown': breakdown},
+            {'predicted_h1_total': 66.0, 'confidence': 90, 'expected_std': 9.0, 'breakdown': breakdown},
+        ]
+        finder.predictor.calculate_edge.return_value = {
+            'over': {'edge': 0.12, 'ev': 0.2}, 'under': {'edge': -0.12, 'ev': -0.2}}
+
+        discover_markets.record_markets(['e2'], {'e2': _odds()})  # e2 came back without H1 last scan
+        opps = finder.find_edges(min_edge=0.07, min_confidence=75)
+
+        self.assertEqual(sorted(c.args[0] for c in finder.fetch_event_odds.call_args_list), ['e1', 'e3'])
+        finder.predictor.predict_batch.assert_called_once_with([('Duke', 'UNC'), ('Kansas', 'Baylor')])
+        self.assertEqual([(o['game'], o['bet_type']) for o in opps], [('Duke vs UNC', 'OVER')])
+        self.assertEqual(finder.stats['scanned'], 3)
+        self.assertEqual(finder.stats['no_market'], 2)  # e2 by the map, e3 by its odds payload
+        finder.http.get.assert_not_called()  # No discovery calls
+        # e3's empty payload is remembered, so the next scan skips its odds call
+        self.assertEqual(discover_markets.get_market_map(['e1', 'e2', 'e3'], 'totals_h1'),
+                         {'e1': True, 'e2': False, 'e3': False})
+
+
+if __name__ == '__main__':
+    unittest.main()
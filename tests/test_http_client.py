@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.clients.base import BaseAPIClient, HttpClient
+
+HOST = 'api.example.com'
+URL = f"https://{HOST}/v1/items"
+
+
+def _response(status=200, payload=None, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'{}' if payload is None else payload
+    return response
+
+
+def _client(*outcomes):
+    """HttpClient whose session for HOST yields the given responses/exceptions in order."""
+    client = HttpClient(rate_limits={})
+    session = mock.MagicMock()
+    session.request.side_effect = list(outcomes)
+    client.sessions[HOST] = session
+    client._backoff = lambda attempt, response=None: 0
+    return client, session
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def test_retries_transient_statuses(self):
+        client, session = _client(_response(503), _response(200, b'{"ok": true}'))
+        self.assertEqual(client.get(URL).json(), {'ok': True})
+        self.assertEqual(session.request.call_count, 2)
+        stats = client.metrics()[HOST]
+        self.assertEqual((stats['requests'], stats['retries'], stats['errors']), (2, 1, 0))
+
+    def test_gives_up_with_last_response_or_exception(self):
+        client, _ = _client(_response(502), _response(502))
+        self.assertEqual(client.get(URL, retries=1).status_code, 502)
+
+        client, session = _client(requests.exceptions.Timeout(), requests.exceptions.Timeout())
+        with self.assertRaises(requests.exceptions.Timeout):
+            client.get(URL, retries=1)
+        self.assertEqual(client.metrics()[HOST]['errors'], 2)
+
+        client, session = _client(_response(404))
+        self.assertEqual(client.get(URL).status_code, 404)  # Not retried
+        session.request.assert_called_once()
+
+    def test_conditional_get(self):
+        first = _response(200, b'[1, 2]', {'ETag': '"v1"', 'Last-Modified': 'Mon, 19 Oct 2026 10:00:00 GMT'})
+        client, session = _client(first, _response(304))
+        client.get(URL, params={'b': 2, 'a': 1})
+        again = client.get(URL, params={'a': 1, 'b': 2})
+
+        self.assertIs(again, first)
+        sent = session.request.call_args_list[1].kwargs['headers']
+        self.assertEqual(sent['If-None-Match'], '"v1"')
+        self.assertEqual(sent['If-Modified-Since'], 'Mon, 19 Oct 2026 10:00:00 GMT')
+        self.assertEqual(client.metrics()[HOST]['not_modified'], 1)
+
+    def test_conditional_cache_per_credentials(self):
+        etag = {'ETag': '"v1"'}
+        alice = _response(200, b'{"user": "alice"}', etag)
+        client, session = _client(alice, _response(200, b'{"user": "bob"}', etag), _response(304))
+        client.get(URL, headers={'x-apisports-key': 'alice'})
+        bob = client.get(URL, headers={'x-apisports-key': 'bob'})
+
+        self.assertEqual(bob.json(), {'user': 'bob'})
+        self.assertNotIn('If-None-Match', session.request.call_args_list[1].kwargs['headers'])
+        self.assertIs(client.get(URL, headers={'X-APISPORTS-KEY': 'alice'}), alice)
+
+    def test_cookie_requests_not_cached(self):
+        client, session = _client(_response(200, b'[1]', {'ETag': '"v1"'}), _response(200, b'[2]', {'ETag': '"v1"'}))
+        client.get(URL, cookies={'sid': 'a'})
+        self.assertEqual(client.get(URL, cookies={'sid': 'a'}).json(), [2])
+        self.assertNotIn('If-None-Match', session.request.call_args_list[1].kwargs['headers'])
+        self.assertEqual(len(client.validators), 0)
+
+    def test_sessions_store_no_cookies(self):
+        session, _, _ = HttpClient()._host_state(HOST)
+        raw = mock.MagicMock()  # urllib3 response carrying a Set-Cookie header
+        raw._original_response.msg.get_all.return_value = ['sid=secret; Path=/']
+        requests.cookies.extract_cookies_to_jar(session.cookies, requests.Request('GET', URL).prepare(), raw)
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_backoff_uses_retry_after_only_when_sent(self):
+        client = HttpClient()
+        self.assertEqual(client._backoff(0, _response(429, headers={'Retry-After': '7'})), 7)
+        self.assertEqual(client._backoff(0, _response(429, headers={'Retry-After': '3600'})), 60)
+        self.assertLessEqual(client._backoff(0, _response(429)), 0.75)  # No header: 0.5s base x1.5 jitter max
+
+    def test_session_per_host_reused(self):
+        client = HttpClient()
+        a, _, _ = client._host_state('a.example.com')
+        b, _, _ = client._host_state('b.example.com')
+        self.assertIsNot(a, b)
+        self.assertIs(client._host_state('a.example.com')[0], a)
+
+
+class TestBaseAPIClient(unittest.TestCase):
+
+    def test_json_or_none(self):
+        http, _ = _client(_response(200, b'{"events": []}'), _response(401))
+        api = BaseAPIClient(f"https://{HOST}/v1/", http=http)
+        self.assertEqual(api.get('/items'), {'events': []})
+        self.assertIsNone(api.get('items'))
+        self.assertEqual(http.sessions[HOST].request.call_args_list[0].args[1], URL)
+
+
+if __name__ == '__main__':
+    unittest.main()
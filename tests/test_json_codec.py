@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import json
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import json_codec
+from utils.json_codec import dumps
+from db import metadata
+
+
+PAYLOAD = {
+    'adj_em': np.float64(12.5),
+    'rest': np.int64(2),
+    'missing': float('nan'),
+    'pace': np.float32('inf'),
+    'probs': np.array([0.25, np.nan, 0.75]),
+    'nested': {'elo': [np.float64(1510.0), float('-inf')], 'flag': np.bool_(True)},
+    'kickoff': datetime(2026, 3, 1, 19, 30),
+    7: 'non-string key',
+}
+
+EXPECTED = {
+    'adj_em': 12.5, 'rest': 2, 'missing': None, 'pace': None,
+    'probs': [0.25, None, 0.75],
+    'nested': {'elo': [1510.0, None], 'flag': True},
+    'kickoff': '2026-03-01T19:30:00',
+    '7': 'non-string key',
+}
+
+
+class TestJsonCodec(unittest.TestCase):
+
+    def test_numpy_and_non_finite_values(self):
+        self.assertEqual(json.loads(dumps(PAYLOAD)), EXPECTED)
+
+    def test_stdlib_fallback_matches(self):
+        with mock.patch.object(json_codec, 'orjson', None):
+            text = dumps(PAYLOAD)
+        self.assertNotIn('NaN', text)
+        self.assertEqual(json.loads(text), EXPECTED)
+
+
+class TestMetadataUpsert(unittest.TestCase):
+
+    def test_bulk_upsert_dedupes_and_encodes(self):
+        with mock.patch.object(metadata, 'execute_values') as ev:
+            n = metadata.upsert_metadata(object(), [('A', {'x': np.float64(1.0)}), ('B', None),
+                                                     ('A', {'x': float('nan')})])
+        self.assertEqual(n, 2)
+        rows = ev.call_args[0][2]
+        self.assertEqual(rows, [('A', '{"x":null}' if json_codec.orjson else '{"x": null}'), ('B', '{}')])
+        self.assertEqual(ev.call_args[1]['template'], "(%s, %s::jsonb, NOW())")
+
+    def test_empty_upsert_skips_query(self):
+        with mock.patch.object(metadata, 'execute_values') as ev:
+            self.assertEqual(metadata.upsert_metadata(object(), []), 0)
+        ev.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
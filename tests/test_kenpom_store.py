@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import cache
+from data.sources import kenpom_store
+from data.sources.kenpom_store import KenPomStore
+
+RATINGS = pd.DataFrame([
+    {'Team': 'Duke', 'AdjEM': 30.1, 'AdjO': 125.0, 'AdjD': 94.9, 'AdjT': 70.2},
+    {'Team': 'Kansas', 'AdjEM': 22.4, 'AdjO': 118.3, 'AdjD': 95.9, 'AdjT': 68.1},
+    {'Team': 'UMKC', 'AdjEM': -8.0, 'AdjO': 100.2, 'AdjD': 108.2, 'AdjT': 66.0},
+])
+
+
+class TestKenPomStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        patcher = mock.patch.object(cache, 'CACHE_DIR', tmp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = mock.MagicMock()
+        self.client.get_efficiency_stats.return_value = RATINGS
+
+    def test_exact_and_memoised_fuzzy_lookup(self):
+        store = KenPomStore(client=self.client)
+        self.assertEqual(store.get('Duke')['AdjEM'], 30.1)
+
+        with mock.patch.object(kenpom_store, 'robust_match_team', return_value='Kansas') as match:
+            self.assertEqual(store.get('Kansas Jayhawks')['AdjT'], 68.1)
+            self.assertEqual(store.get('Kansas Jayhawks')['AdjT'], 68.1)
+            match.assert_called_once()
+
+    def test_snapshot_and_aliases_persist_across_processes(self):
+        store = KenPomStore(client=self.client)
+        self.assertEqual(store.resolve_aliases(['Duke', 'Duke Blue Devils', 'Nowhere State', None]), 2)
+        self.assertEqual(store.resolve('Duke Blue Devils'), 'Duke')
+        self.assertIsNone(store.resolve('Nowhere State'))
+
+        fresh = KenPomStore(client=self.client)
+        with mock.patch.object(kenpom_store, 'robust_match_team') as match:
+            self.assertEqual(fresh.get('Duke Blue Devils')['Team'], 'Duke')
+            self.assertIsNone(fresh.get('Nowhere State'))
+            match.assert_not_called()
+        self.client.get_efficiency_stats.assert_called_once()  # Second store read from disk
+
+    def test_stale_snapshot_used_when_refresh_fails(self):
+        KenPomStore(client=self.client).ensure_loaded()
+        self.client.get_efficiency_stats.return_value = pd.DataFrame()
+
+        stale = KenPomStore(client=self.client, ttl=0)
+        self.assertEqual(stale.get('UMKC')['AdjO'], 100.2)
+        self.assertEqual(self.client.get_efficiency_stats.call_count, 2)
+
+    def test_no_data_returns_none(self):
+        self.client.get_efficiency_stats.return_value = pd.DataFrame()
+        store = KenPomStore(client=self.client)
+        self.assertIsNone(store.get('Duke'))
+        self.assertEqual(store.resolve_aliases(['Duke']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import live_scores
+from data.live_scores import LiveScoresPoller
+
+DATES = ['20260302', '20260301', '20260228']
+
+
+def _game(path, sport_key, home):
+    return {'espn_path': path, 'sport_key': sport_key, 'home': home, 'away': 'Away',
+            'score_text': f"Final: Away 1 - {home} 2"}
+
+
+GAMES = [_game('basketball/nba', 'NBA', 'Celtics'), _game('hockey/nhl', 'NHL', 'Flyers'),
+         _game('soccer/eng.1', 'SOCCER', 'Arsenal'), _game('soccer/esp.1', 'SOCCER', 'Betis')]
+
+
+class TestLiveScoresPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.fetch = mock.MagicMock(return_value=GAMES)
+        self.store = {}
+        for target, value in (('fetch_espn_scores', self.fetch),
+                              ('cache_set', self.store.__setitem__),
+                              ('recent_dates', lambda days_back=None: DATES)):
+            patcher = mock.patch.object(live_scores, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_today_polls_every_interval_history_less_often(self):
+        poller = LiveScoresPoller(interval=45, history_interval=600, days_back=2)
+        self.assertEqual(poller.poll_once(now=1000), 3)
+        self.assertEqual(poller.poll_once(now=1050), 1)   # Only today is due
+        self.assertEqual(poller.poll_once(now=1700), 3)
+        fetched_dates = [c.kwargs['specific_date'] for c in self.fetch.call_args_list]
+        self.assertEqual(fetched_dates.count('20260302'), 3)
+        self.assertEqual(fetched_dates.count('20260228'), 2)
+        self.assertEqual(set(self.store), {f"live_scores_{d}" for d in DATES})
+
+    def test_snapshot_filters_by_sport_key_or_path(self):
+        poller = LiveScoresPoller()
+        poller.poll_once(now=1000)
+        self.assertEqual([g['home'] for g in poller.games(['basketball_nba'])], ['Celtics'])
+        self.assertEqual([g['home'] for g in poller.games(['soccer_epl'])], ['Arsenal'])
+        self.assertEqual(len(poller.games(['SOCCER'], date_str='20260301')), 2)
+        self.assertEqual(len(poller.games()), 4)
+
+    def test_get_scores_reads_store_then_falls_back(self):
+        with mock.patch.object(live_scores, 'cache_get', return_value=GAMES):
+            self.assertEqual([g['home'] for g in live_scores.get_scores(['NHL'], '20260301')], ['Flyers'])
+        self.fetch.assert_not_called()
+
+        with mock.patch.object(live_scores, 'cache_get', return_value=None):
+            live_scores.get_scores(['NHL'], '20260301')
+        self.fetch.assert_called_once_with(['NHL'], specific_date='20260301')
+
+
+if __name__ == '__main__':
+    unittest.main()
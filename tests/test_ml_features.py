@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ml_features
+from ml_features import build_history_features, prepare_training_data, HISTORY_FEATURE_DEFAULTS
+
+
+def _brute_force(match, history, h2h_days=365, form_days=30, num_games=5):
+    """Row-at-a-time reference mirroring get_head_to_head_features / get_recent_form."""
+    k = match['kickoff']
+    same_sport = history[history['sport'] == match['sport']]
+    prior = same_sport[same_sport['kickoff'] < k]
+
+    pair = {match['home_team'], match['away_team']}
+    h2h = prior[
+        (prior['kickoff'] > k - pd.Timedelta(days=h2h_days)) &
+        prior.apply(lambda r: {r['home_team'], r['away_team']} == pair, axis=1)
+    ]
+    out = {
+        'h2h_games': len(h2h),
+        'h2h_home_wins': int((h2h['outcome'] == 'WON').sum()),
+        'h2h_avg_total': 0,
+    }
+    for side in ('home', 'away'):
+        team = match[f'{side}_team']
+        rows = prior[
+            (prior['kickoff'] > k - pd.Timedelta(days=form_days)) &
+            ((prior['home_team'] == team) | (prior['away_team'] == team))
+        ].sort_values('kickoff', ascending=False).head(num_games)
+        pct = (rows['outcome'] == 'WON').mean() if len(rows) else 0.5
+        out[f'{side}_recent_win_pct'] = pct
+        out[f'{side}_recent_cover_pct'] = pct
+    return out
+
+
+class TestHistoryFeatures(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        teams = ['Bruins', 'Flyers', 'Rangers', 'Devils']
+        base = pd.Timestamp('2026-01-01')
+        # Unique kickoffs so "last N games" has no ties
+        hours = rng.choice(24 * 90, 300, replace=False)
+        rows = []
+        for i in range(300):
+            home, away = rng.choice(teams, 2, replace=False)
+            rows.append({
+                'sport': rng.choice(['NHL', 'NBA']),
+                'home_team': home, 'away_team': away,
+                'kickoff': base + pd.Timedelta(hours=int(hours[i])),
+                'outcome': rng.choice(['WON', 'LOST', 'PUSH']),
+            })
+        self.history = pd.DataFrame(rows)
+
+    def test_matches_row_at_a_time_reference(self):
+        matches = self.history.sample(40, random_state=1)
+        got = build_history_features(matches, self.history)
+
+        for idx, match in matches.iterrows():
+            expected = _brute_force(match, self.history)
+            for col, val in expected.items():
+                self.assertAlmostEqual(got.loc[idx, col], val, places=9, msg=f"{idx} {col}")
+
+    def test_defaults_without_history(self):
+        matches = self.history.head(3)
+        got = build_history_features(matches, self.history.iloc[0:0])
+        for col, default in HISTORY_FEATURE_DEFAULTS.items():
+            self.assertTrue((got[col] == default).all())
+
+
+# Feature order of the baseline (pre-vectorization) training matrix
+BASELINE_FEATURES = [
+    'odds', 'edge', 'true_prob', 'sharp_score', 'ticket_pct', 'money_pct',
+    'market_type_ml', 'market_type_spread', 'market_type_total', 'line', 'abs_line',
+    'sport_nba', 'sport_ncaab', 'sport_nfl', 'sport_nhl', 'clv', 'sharp_indicator',
+]
+
+
+class TestTrainingSchema(unittest.TestCase):
+
+    def _prepare(self, **kwargs):
+        kickoff = datetime(2026, 1, 10, 19, 0)
+        rows = [
+            ('Celtics @ Knicks', 'NBA', 'Knicks ML', 'WON', 1.9, 0.04, 0.55, None, 40, 60, 1.85, 'Knicks', 'Celtics', kickoff),
+            ('Duke @ UNC', 'NCAAB', 'Over 150.5', 'LOST', 1.91, 0.03, 0.54, 70, None, None, None, None, None, kickoff),
+        ]
+        conn = mock.MagicMock()
+        conn.cursor.return_value.fetchall.side_effect = [rows, []]
+        with mock.patch.object(ml_features, 'get_db', return_value=conn):
+            return prepare_training_data(datetime(2026, 1, 1), datetime(2026, 1, 31), **kwargs)
+
+    def test_default_schema_matches_baseline(self):
+        X, y, names = self._prepare()
+        self.assertEqual(names, BASELINE_FEATURES)
+        self.assertEqual(X.shape, (2, len(BASELINE_FEATURES)))
+        self.assertEqual(list(y), [1, 0])
+
+    def test_history_features_opt_in(self):
+        _, _, names = self._prepare(include_history=True)
+        self.assertEqual(names, BASELINE_FEATURES + list(HISTORY_FEATURE_DEFAULTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.clients.base import TokenBucket
+from ncaab_h1_model.ncaab_h1_scraper import GameCache, NCAAB_H1_Scraper
+
+
+def _game(game_id, home, away, home_h1, away_h1, date='20251201'):
+    return {'game_id': game_id, 'date': date, 'home_team': home, 'away_team': away,
+            'home_h1': home_h1, 'home_h2': home_h1 + 4, 'away_h1': away_h1, 'away_h2': away_h1 + 2}
+
+
+GAMES = [
+    _game('1', 'Duke', 'UNC', 40, 35),
+    _game('2', 'UNC', 'Duke', 38, 33),
+    _game('3', 'Duke', 'Kansas', 36, 30),
+    _game('4', 'Kansas', 'UNC', 31, 37),
+    _game('5', 'Duke', 'UNC', 42, 29),
+    _game('6', 'Kansas', 'Duke', 34, 39),
+    _game('7', 'Kansas', 'Baylor', 30, 28),
+]
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.02)
+        bucket.acquire()  # Bucket empty: waits ~one token's worth (50ms)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+
+class TestGameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, 'game_cache.jsonl')
+
+    def test_round_trip_and_torn_line(self):
+        cache = GameCache(self.path)
+        cache.put(GAMES[0])
+        cache.put({'game_id': '99', 'skip': True})
+        with open(self.path, 'a') as f:
+            f.write('{"game_id": "100", "ho')  # Interrupted write
+
+        reloaded = GameCache(self.path)
+        self.assertIn('1', reloaded)
+        self.assertIn(99, reloaded)
+        self.assertNotIn('100', reloaded)
+        self.assertEqual(reloaded.get('1')['home_h1'], 40)
+
+    def test_seed_skips_known_games(self):
+        cache = GameCache(self.path)
+        cache.put(GAMES[0])
+        self.assertEqual(cache.seed(GAMES[:3] + [None]), 2)
+
+
+class TestIncrementalProfiles(unittest.TestCase):
+
+    def test_incremental_matches_full_rebuild(self):
+        full = NCAAB_H1_Scraper().build_team_profiles(GAMES)
+
+        scraper = NCAAB_H1_Scraper()
+        profiles = scraper.build_team_profiles(GAMES[:4])
+        profiles = scraper.build_team_profiles(GAMES, profiles)  # Re-fed games are skipped
+        self.assertEqual(profiles, full)
+        self.assertEqual(full['Duke']['games_played'], 5)
+        self.assertNotIn('Baylor', full)
+
+    def test_state_round_trip(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'state.json')
+
+        scraper = NCAAB_H1_Scraper()
+        profiles = scraper.build_team_profiles(GAMES[:5])
+        scraper.save_state(path, '20251101')
+
+        resumed = NCAAB_H1_Scraper()
+        self.assertTrue(resumed.load_state(path, '20251101'))
+        self.assertEqual(resumed.build_team_profiles(GAMES, profiles),
+                         NCAAB_H1_Scraper().build_team_profiles(GAMES))
+        self.assertFalse(NCAAB_H1_Scraper().load_state(path, '20261101'))
+
+
+class TestScheduleCheckpoint(unittest.TestCase):
+
+    def test_finished_days_are_not_refetched(self):
+        scraper = NCAAB_H1_Scraper(max_workers=2)
+        today = datetime.now().strftime('%Y%m%d')
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
+
+        def fake_day(date_str):
+            state = 'in' if date_str == today else 'post'
+            return [{'id': f'g{date_str}', 'date': date_str, 'status': state}]
+
+        checkpoint = {}
+        with mock.patch.object(scraper, '_fetch_day', side_effect=fake_day) as fetch:
+            games = scraper.fetch_schedule(date_range_days=1, checkpoint=checkpoint)
+            self.assertEqual([g['date'] for g in games], [yesterday, today])
+            self.assertEqual(set(checkpoint), {yesterday})
+
+            fetch.reset_mock()
+            scraper.fetch_schedule(date_range_days=1, checkpoint=checkpoint)
+            self.assertEqual([c.args[0] for c in fetch.call_args_list], [today])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import writers
+from db.writers import OpportunityWriter
+from utils.errors import PersistenceError
+
+
+class FakeConn:
+    """Stands in for a pooled connection; the table is a set of event_ids."""
+
+    def __init__(self, existing=()):
+        self.table = set(existing)
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return mock.MagicMock()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _row(i):
+    return (f"PROP_{i}", None, "soccer_epl", "A vs B", f"Player {i} Anytime Goalscorer", 3.2, 35.0, 0.04, "draftkings")
+
+
+class TestOpportunityWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = FakeConn(existing={"PROP_1"})
+        self.statements = []
+
+        def fake_execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+            self.statements.append((sql, len(rows)))
+            out = []
+            for row in rows:
+                new = row[0] not in self.conn.table
+                self.conn.table.add(row[0])
+                if "DO NOTHING" in sql:
+                    if new: out.append((row[0],))
+                else:
+                    out.append((row[0], new))
+            return out
+
+        patcher = mock.patch.object(writers, 'execute_values', fake_execute_values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_flushes_every_n_and_counts_duplicates(self):
+        writer = OpportunityWriter(flush_every=3, conn=self.conn)
+        for i in range(5):
+            writer.add(*_row(i))
+        writer.add(*_row(4))  # Same event twice in one run
+
+        self.assertEqual(len(self.statements), 1)  # One flush at 3 rows
+        inserted, duplicates = writer.close()
+
+        self.assertEqual([n for _, n in self.statements], [3, 2])
+        self.assertEqual(self.conn.commits, 2)
+        self.assertEqual((inserted, duplicates), (4, 2))
+        self.assertNotIn("PROP_1", writer.inserted_ids)
+        self.assertFalse(self.conn.closed)  # Caller-owned connection stays open
+
+    def test_update_mode_counts_refreshed_rows(self):
+        writer = OpportunityWriter(update_cols=('edge', 'odds'), conn=self.conn)
+        writer.add(*_row(1))
+        writer.add(*_row(2))
+        self.assertEqual(writer.close(), (1, 1))
+        sql = self.statements[0][0]
+        self.assertIn("DO UPDATE SET edge = EXCLUDED.edge, odds = EXCLUDED.odds", sql)
+
+    def test_pooled_connection_closed_after_flush(self):
+        with mock.patch.object(writers, 'get_db', return_value=self.conn):
+            with OpportunityWriter() as writer:
+                writer.add(*_row(7))
+        self.assertTrue(self.conn.closed)
+        self.assertEqual(writer.inserted, 1)
+
+    def test_failed_final_flush_raises(self):
+        writer = OpportunityWriter(conn=self.conn)
+        writer.add(*_row(8))
+        with mock.patch.object(writers, 'execute_values', side_effect=RuntimeError("connection reset")):
+            with self.assertRaises(PersistenceError):
+                writer.close()
+        self.assertEqual(len(writer), 1)  # Rows kept for a retry
+        self.assertEqual(writer.close(), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import player_stats
+from db.player_stats import bulk_save_matches, match_row, stage_matches
+
+
+def _player(pid, team='Arsenal', xg='0.4'):
+    return {'id': pid, 'team_id': '83', 'team_name': team, 'player': f"P{pid}", 'position': 'F',
+            'time': '90', 'shots': '3', 'goals': '1', 'assists': '0',
+            'xG': xg, 'xA': '0.1', 'xGChain': '0.5', 'xGBuildup': '0.2'}
+
+
+FLAT = {'match_id': '100', 'players': [_player('1'), _player('2')],
+        'match_info': {'team_h': 'Arsenal', 'team_a': 'Chelsea', 'h_goals': '2', 'a_goals': '1',
+                       'h_xg': '1.8', 'a_xg': '0.9', 'h_w': '0.6', 'h_d': '0.2', 'h_l': '0.2',
+                       'date': '2025-09-01 15:00:00'}}
+NESTED = {'match_id': 101, 'players': [_player('3', xg='0.7')],
+          'h': {'title': 'Spurs', 'goals': '0', 'xG': '1.1'}, 'a': {'title': 'Fulham', 'goals': '0', 'xG': '0.4'},
+          'forecast': {'w': '0.5', 'd': '0.3', 'l': '0.2'}, 'date': '2025-09-02 15:00:00'}
+EMPTY = {'match_id': '102', 'players': [_player('4')],
+         'match_info': {'team_h': 'A', 'team_a': 'B', 'h_goals': '0', 'a_goals': '0', 'h_xg': '0', 'a_xg': '0'}}
+
+
+class TestStaging(unittest.TestCase):
+
+    def test_both_payload_shapes(self):
+        self.assertEqual(match_row(FLAT, 'EPL', 2025)[:8],
+                         ('100', 'EPL', '2025', '2025-09-01 15:00:00', 'Arsenal', 'Chelsea', 2, 1))
+        self.assertEqual(match_row(NESTED, 'EPL', 2025)[4:10], ('Spurs', 'Fulham', 0, 0, 1.1, 0.4))
+        self.assertIsNone(match_row(EMPTY, 'EPL', 2025))
+
+    def test_stage_skips_empty_and_dedupes_players(self):
+        replay = dict(FLAT, players=[_player('1', team='Arsenal FC')])
+        players, matches, saved, skipped = stage_matches([FLAT, NESTED, EMPTY, replay], 'EPL', '2025')
+
+        self.assertEqual(saved, ['100', '101'])
+        self.assertEqual(skipped, ['102'])
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(sorted((p[0], p[1]) for p in players), [('100', '1'), ('100', '2'), ('101', '3')])
+        self.assertIn(('100', '1', '83', 'Arsenal FC'), [p[:4] for p in players])  # Later copy wins
+
+
+class TestBulkSave(unittest.TestCase):
+
+    def test_one_statement_per_table_single_commit(self):
+        conn = mock.MagicMock()
+        with mock.patch.object(player_stats, 'execute_values') as ev:
+            saved, skipped = bulk_save_matches(conn, [FLAT, NESTED, EMPTY], 'EPL', '2025')
+
+        self.assertEqual((saved, skipped), (['100', '101'], ['102']))
+        self.assertEqual([c.args[1] for c in ev.call_args_list],
+                         [player_stats.UPSERT_PLAYER_STATS, player_stats.UPSERT_MATCHES, player_stats.MARK_SCRAPED])
+        self.assertEqual(len(ev.call_args_list[0].args[2]), 3)
+        self.assertEqual(ev.call_args_list[2].args[2], [('100', 'EPL', '2025'), ('101', 'EPL', '2025')])
+        conn.commit.assert_called_once()
+
+    def test_db_error_rolls_back(self):
+        conn = mock.MagicMock()
+        with mock.patch.object(player_stats, 'execute_values', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                bulk_save_matches(conn, [FLAT], 'EPL', '2025')
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_nothing_to_save_skips_db(self):
+        conn = mock.MagicMock()
+        self.assertEqual(bulk_save_matches(conn, [EMPTY], 'EPL', '2025'), ([], ['102']))
+        conn.cursor.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import nbinom
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.simulation import PointsSimulator
+
+ALPHA_SOG = 0.1393
+ALPHA_AST = 0.1677
+
+
+class TestPointsSimulator(unittest.TestCase):
+
+    def test_sog_marginal_matches_nb2(self):
+        sim = PointsSimulator(ALPHA_SOG, ALPHA_AST, n_sims=40000, chunk_size=3000)
+        res = sim.simulate("Test Skater|2026-01-28", mu_sog=2.8, p_goal=0.1, mu_ast=0.4)
+
+        n = 1.0 / ALPHA_SOG
+        for line in (1.5, 2.5, 3.5):
+            exact = 1.0 - nbinom.cdf(int(line), n, n / (n + 2.8))
+            self.assertAlmostEqual(res.prob_over('sog', line), exact, delta=0.01)
+        self.assertAlmostEqual(res.mean('sog'), 2.8, delta=0.05)
+        self.assertAlmostEqual(res.mean('goals'), 0.28, delta=0.02)
+
+    def test_streams_are_reproducible_per_player(self):
+        df = pd.DataFrame({
+            'player_name': ['A', 'B', 'C'],
+            'game_date': ['2026-01-28'] * 3,
+            'mu_sog': [3.1, 1.2, 2.0],
+            'p_goal': [0.12, 0.08, 0.10],
+            'mu_ast': [0.7, 0.2, 0.4],
+        })
+        batch, _ = PointsSimulator(ALPHA_SOG, ALPHA_AST).simulate_frame(df)
+
+        # On-demand re-pricing of a single player reproduces the batch numbers
+        single = PointsSimulator(ALPHA_SOG, ALPHA_AST).simulate("B|2026-01-28", 1.2, 0.08, 0.2)
+        self.assertEqual(batch.loc[1, 'prob_points_1plus'], single.prob_over('points', 0.5))
+
+        # Chunking does not change the distribution's total mass
+        res = PointsSimulator(ALPHA_SOG, ALPHA_AST, n_sims=1001, chunk_size=100).simulate("A", 3.1, 0.12, 0.7)
+        self.assertEqual(int(res.hists['points'].sum()), 1001)
+        self.assertAlmostEqual(res.prob_over('points', 2.5) + res.prob_under('points', 2.5), 1.0)
+
+    def test_missing_inputs_count_as_zero(self):
+        sim = PointsSimulator(ALPHA_SOG, ALPHA_AST, n_sims=1000)
+        nan = float('nan')
+        res = sim.simulate('x', nan, nan, 0.5)
+        self.assertEqual(res.prob_over('goals', 0.5), 0.0)
+        self.assertIs(sim.simulate('x', None, 0.0, 0.5), res)  # Same sanitised inputs, same cache entry
+
+
+if __name__ == '__main__':
+    unittest.main()
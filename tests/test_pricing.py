@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+from scipy import stats
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pricing import (
+    poisson_over, poisson_under, nbinom_over, nbinom_under,
+    normal_over, normal_under, skellam_over, skellam_under,
+    poisson_over_cached, nbinom_over_cached, price,
+)
+from scripts.nhl_edge_model import NHLEdgeModel, ALPHA_SOG, ALPHA_AST
+
+
+class TestPricing(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.mu = rng.uniform(0.05, 6.0, 500)
+        self.line = rng.choice([0.5, 1.5, 2.5, 3.5, 4.5, 7.5], 500)
+
+    def test_poisson_matches_scipy(self):
+        k = np.floor(self.line)
+        np.testing.assert_allclose(poisson_over(self.mu, self.line), stats.poisson.sf(k, self.mu), atol=1e-12)
+        np.testing.assert_allclose(poisson_under(self.mu, self.line), stats.poisson.cdf(k, self.mu), atol=1e-12)
+        self.assertAlmostEqual(poisson_over_cached(2.3, 1.5), stats.poisson.sf(1, 2.3), places=6)
+
+    def test_nbinom_matches_scipy(self):
+        alpha = 0.1393
+        n = 1.0 / alpha
+        p = n / (n + self.mu)
+        k = np.floor(self.line)
+        np.testing.assert_allclose(nbinom_over(self.mu, alpha, self.line), stats.nbinom.sf(k, n, p), atol=1e-12)
+        np.testing.assert_allclose(nbinom_under(self.mu, alpha, self.line), stats.nbinom.cdf(k, n, p), atol=1e-12)
+        self.assertAlmostEqual(nbinom_over_cached(2.8, alpha, 2.5), stats.nbinom.sf(2, n, n / (n + 2.8)), places=6)
+
+    def test_normal_and_skellam(self):
+        self.assertAlmostEqual(normal_over(6.2, 2.242, 6.5), stats.norm.sf(6.5, 6.2, 2.242), places=12)
+        self.assertAlmostEqual(normal_under(6.2, 2.242, 6.5), stats.norm.cdf(6.5, 6.2, 2.242), places=12)
+        # Home -1.5 covers when diff >= 2
+        self.assertAlmostEqual(skellam_over(1.6, 1.1, 1.5), stats.skellam.sf(1, 1.6, 1.1), places=12)
+        self.assertAlmostEqual(skellam_under(1.6, 1.1, -1.5), stats.skellam.cdf(-2, 1.6, 1.1), places=12)
+
+    def test_integer_lines_exclude_push(self):
+        over, under = poisson_over(2.0, 2), poisson_under(2.0, 2)
+        self.assertAlmostEqual(over + under + stats.poisson.pmf(2, 2.0), 1.0, places=12)
+        self.assertEqual(price('poisson', 'Over', 2.0, 2), over)
+
+
+class TestSlatePricing(unittest.TestCase):
+
+    def test_calc_edges_matches_scalar(self):
+        projections = {
+            'A': {'priceable': True, 'mu_sog': 3.1, 'p_goal': 0.11, 'mu_ast': 0.55,
+                  'prob_pts_1+': 0.61, 'prob_pts_2+': 0.24, 'tier': 'A'},
+            'B': {'priceable': True, 'mu_sog': 1.7, 'p_goal': 0.08, 'mu_ast': 0.31,
+                  'prob_pts_1+': 0.42, 'prob_pts_2+': 0.12, 'tier': 'B'},
+            'C': {'priceable': False, 'mu_sog': 2.0, 'p_goal': 0.1, 'mu_ast': 0.4, 'tier': 'C'},
+        }
+        model = NHLEdgeModel.__new__(NHLEdgeModel)
+        model.get_projections = projections.get
+        offers = [('A', 'SOG', 2.5, -120), ('B', 'SOG', 1.5, 150), ('A', 'Goals', 0.5, 260),
+                  ('B', 'Assists', 0.5, 180), ('A', 'Points', 0.5, -140), ('B', 'Points', 2.5, 400),
+                  ('C', 'SOG', 1.5, -110), ('Nobody', 'SOG', 1.5, -110)]
+
+        results = model.calc_edges(offers)
+
+        self.assertEqual([r is None for r in results], [False] * 5 + [True] * 3)
+        expected = [nbinom_over_cached(3.1, ALPHA_SOG, 2.5), nbinom_over_cached(1.7, ALPHA_SOG, 1.5),
+                    poisson_over_cached(3.1 * 0.11, 0.5), nbinom_over_cached(0.31, ALPHA_AST, 0.5), 0.61]
+        for result, p in zip(results, expected):
+            self.assertAlmostEqual(result['model_prob'], p, places=6)
+        self.assertAlmostEqual(results[0]['implied_prob'], 120 / 220)
+        self.assertEqual(results[1]['market'], 'SOG o1.5')
+
+
+if __name__ == '__main__':
+    unittest.main()
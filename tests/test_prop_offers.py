@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import threading
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.clients import odds_api
+from data.clients.odds_api import PropOfferTable, fetch_prop_offers
+
+
+def _event(i):
+    return {'id': f"ev{i}", 'home_team': f"Home{i}", 'away_team': f"Away{i}",
+            'commence_time': "2099-01-01T00:00:00Z"}
+
+
+def _event_odds(event_id):
+    return {
+        'id': event_id,
+        'bookmakers': [
+            {'key': 'draftkings', 'markets': [
+                {'key': 'player_shots_on_goal', 'outcomes': [
+                    {'name': 'Over', 'description': f"Skater {event_id}", 'point': 2.5, 'price': -120},
+                    {'name': 'Under', 'description': f"Skater {event_id}", 'point': 2.5, 'price': 100},
+                ]},
+                {'key': 'player_goal_scorer_anytime', 'outcomes': [
+                    {'name': 'Yes', 'description': f"Skater {event_id}", 'price': 250},
+                ]},
+            ]},
+            {'key': 'pinnacle', 'markets': [
+                {'key': 'player_shots_on_goal', 'outcomes': [
+                    {'name': 'Over', 'description': f"Skater {event_id}", 'point': 2.5, 'price': -110},
+                ]},
+            ]},
+        ],
+    }
+
+
+class TestPropOfferTable(unittest.TestCase):
+
+    def test_query_by_player_and_market(self):
+        table = PropOfferTable()
+        table.add_event('ev1', "Home1 vs Away1", "2099-01-01T00:00:00Z")
+        table.add_event_odds(_event_odds('ev1'))
+
+        # Non-main books are dropped
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.players(), ["Skater ev1"])
+        self.assertEqual(table.markets("Skater ev1"), ['player_shots_on_goal', 'player_goal_scorer_anytime'])
+
+        overs = table.offers("Skater ev1", 'player_shots_on_goal', side='Over')
+        self.assertEqual(len(overs), 1)
+        self.assertEqual(overs[0]['price'], -120)
+        self.assertEqual(overs[0]['line'], 2.5)
+        self.assertEqual(overs[0]['matchup'], "Home1 vs Away1")
+        self.assertEqual(table.offers("Skater ev1", 'player_points'), [])
+
+        # Cache round trip keeps the index
+        clone = PropOfferTable.from_dict(table.to_dict())
+        self.assertEqual(clone.to_nested(), table.to_nested())
+
+    def test_concurrent_fetch_keeps_slate_order(self):
+        events = [_event(i) for i in range(12)]
+        threads = set()
+
+        def fake_event_odds(self, sport_key, event_id, markets):
+            threads.add(threading.get_ident())
+            return _event_odds(event_id)
+
+        with mock.patch.object(odds_api.Config, 'ODDS_API_KEY', 'test'), \
+             mock.patch.object(odds_api, 'cache_get', return_value=None), \
+             mock.patch.object(odds_api, 'cache_set'), \
+             mock.patch.object(odds_api.OddsAPIClient, 'get_events', return_value=events), \
+             mock.patch.object(odds_api.OddsAPIClient, 'get_event_odds', fake_event_odds):
+            table = fetch_prop_offers("icehockey_nhl", markets="player_shots_on_goal", max_workers=4)
+
+        self.assertEqual(table.players(), [f"Skater ev{i}" for i in range(12)])
+        self.assertEqual(len(table), 36)
+        self.assertLessEqual(len(threads), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player_props_model import PlayerPropsPredictor
+
+
+def _season(seed=5):
+    rng = np.random.RandomState(seed)
+    rows = []
+    for mid in range(30):
+        for team in ('Arsenal', 'Chelsea'):
+            for p in range(4):
+                rows.append({
+                    'player_id': f"{team}{p}", 'player_name': f"{team} Player {p}", 'team_name': team,
+                    'team_id': 1, 'position': 'F', 'minutes': int(rng.choice([20, 60, 90])),
+                    'shots': int(rng.poisson(1.5)), 'goals': 0, 'assists': 0,
+                    'xg': rng.exponential(0.2), 'xa': rng.exponential(0.1),
+                    'xg_chain': rng.exponential(0.3), 'xg_buildup': 0.0, 'match_id': str(1000 + mid),
+                })
+    return pd.DataFrame(rows)
+
+
+class TestRollingStatsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.data = _season()
+        with mock.patch.object(PlayerPropsPredictor, '_load_data', return_value=self.data):
+            self.predictor = PlayerPropsPredictor(league="EPL", season="2025")
+
+    def test_latest_window_matches_full_rolling(self):
+        stats = self.predictor.get_player_rolling_stats("Arsenal Player 1", span=5)
+        player = self.data[self.data['player_name'] == "Arsenal Player 1"]
+        mins = player['minutes'].rolling(5, min_periods=1).sum().iloc[-1]
+        shots = player['shots'].rolling(5, min_periods=1).sum().iloc[-1]
+        self.assertEqual(stats['proj_shots_p90'], round(shots / mins * 90, 2))
+        self.assertEqual(stats['sample_matches'], len(player))
+
+    def test_memoized_per_player_span_opponent(self):
+        with mock.patch.object(self.predictor, '_compute_rolling_stats',
+                               wraps=self.predictor._compute_rolling_stats) as compute:
+            for _ in range(4):  # e.g. one call per bookmaker offer
+                self.predictor.get_player_rolling_stats("Chelsea Player 2")
+            self.predictor.get_player_rolling_stats("Chelsea Player 2", upcoming_opponent="Arsenal")
+            self.assertEqual(compute.call_count, 1 + 1)
+
+            # New ratings invalidate matchup-adjusted results
+            self.predictor.defense_ratings = {'Arsenal': 5.0}
+            self.predictor.avg_league_xga = 1.0
+            adj = self.predictor.get_player_rolling_stats("Chelsea Player 2", upcoming_opponent="Arsenal")
+            self.assertEqual(compute.call_count, 3)
+            self.assertEqual(adj['matchup_factor'], 1.4)
+
+    def test_cross_league_lookup_is_cached(self):
+        with mock.patch.object(PlayerPropsPredictor, '_load_data', return_value=pd.DataFrame()):
+            ucl = PlayerPropsPredictor(league="Champions_League", season="2025")
+        frame = self.data[self.data['player_name'] == "Arsenal Player 0"]
+        with mock.patch.object(ucl, 'get_player_stats_any_league', return_value=frame) as lookup:
+            ucl.get_player_rolling_stats("Arsenal Player 0")
+            ucl.get_player_rolling_stats("Arsenal Player 0", span=3)
+            self.assertEqual(lookup.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
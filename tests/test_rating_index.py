@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.clients.ratings import build_rating_index
+from processing import markets
+from processing.markets import calculate_match_stats
+
+
+def _bb(sport, tempo, off, deff):
+    return {'sport': sport, 'tempo': tempo, 'offensive_eff': off, 'defensive_eff': deff}
+
+
+RATINGS = {
+    'Duke': _bb('NCAAB', 68.0, 120.0, 95.0),
+    'North Carolina St.': _bb('NCAAB', 71.0, 115.0, 99.0),
+    'Boston Celtics': _bb('NBA', 98.0, 120.0, 110.0),
+    'Boston College': _bb('NCAAB', 66.0, 104.0, 104.0),
+    'Carolina Hurricanes': {'sport': 'NHL'},
+}
+
+
+class TestRatingIndex(unittest.TestCase):
+
+    def test_scoped_per_sport(self):
+        index = build_rating_index(RATINGS, {'NCAAB': {'North Carolina State', 'Boston Celtic', None},
+                                             'NBA': {'Boston Celtics'}})
+        self.assertEqual(set(index), {'NCAAB', 'NBA', 'NHL'})
+        self.assertIs(index['NCAAB']['North Carolina State'], RATINGS['North Carolina St.'])
+        # NCAAB names never resolve to another sport's teams
+        self.assertIn(index['NCAAB']['Boston Celtic'], (None, RATINGS['Boston College']))
+        self.assertIsNot(index['NCAAB']['Boston Celtic'], RATINGS['Boston Celtics'])
+        self.assertNotIn('Carolina Hurricanes', index['NCAAB'])
+
+    def test_indexed_stats_match_legacy(self):
+        index = build_rating_index(RATINGS, {'NCAAB': {'Duke', 'North Carolina State'}})
+        with mock.patch.object(markets.difflib, 'get_close_matches', wraps=markets.difflib.get_close_matches) as fuzzy:
+            indexed = calculate_match_stats('Duke', 'North Carolina State', RATINGS, 'NCAAB', rating_index=index)
+        fuzzy.assert_not_called()
+        legacy = calculate_match_stats('Duke', 'North Carolina State', RATINGS, 'NCAAB')
+        self.assertIsNotNone(indexed[0])
+        self.assertEqual(indexed, legacy)
+
+    def test_unmatched_and_late_names(self):
+        index = build_rating_index(RATINGS, {'NCAAB': {'Gonzaga'}})
+        self.assertEqual(calculate_match_stats('Gonzaga', 'Duke', RATINGS, 'NCAAB', rating_index=index),
+                         (None, None, None, None))
+        # Names missing from the slate index are resolved once and remembered
+        calculate_match_stats('Duke', 'North Carolina State', RATINGS, 'NCAAB', rating_index=index)
+        self.assertIs(index['NCAAB']['North Carolina State'], RATINGS['North Carolina St.'])
+
+
+if __name__ == '__main__':
+    unittest.main()
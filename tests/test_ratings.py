@@ -1,12 +1,19 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+import threading
+import time
 from datetime import datetime
+from unittest import mock
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data.clients.ratings import get_current_seasons
+from data import cache
+from data.clients import ratings as ratings_client
+from data.clients.ratings import get_current_seasons, get_team_ratings
 
 class TestRatings(unittest.TestCase):
     
@@ -29,5 +36,64 @@ class TestRatings(unittest.TestCase):
         
         print(f"Calculated Seasons -> NFL: {nfl}, KenPom: {kenpom}")
 
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        for patcher in (mock.patch.object(cache, 'CACHE_DIR', tmp),
+                        mock.patch.dict(ratings_client._inflight, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _sources(self, failing=()):
+        def fetcher(sport):
+            def fetch(year, headers):
+                self.calls.append(sport)
+                self.release.wait(5)
+                return {} if sport in failing else {f"{sport} Team": {'sport': sport}}
+            return fetch
+        return {sport: (fetcher(sport), season) for sport, (_, season) in ratings_client._SOURCES.items()}
+
+    def _seed(self, sport, age):
+        cache.cache_set(ratings_client.RATINGS_KEY.format(sport=sport),
+                        {'fetched_at': time.time() - age, 'ratings': {f"Old {sport}": {'sport': sport}}})
+
+    def test_cold_start_caches_per_source(self):
+        with mock.patch.object(ratings_client, '_SOURCES', self._sources(failing={'NBA'})):
+            freshness = {}
+            merged = get_team_ratings(freshness=freshness)
+            self.assertEqual(set(merged), {'NFL Team', 'NHL Team', 'NCAAB Team'})
+            self.assertEqual(freshness['NBA']['status'], 'failed')
+            self.assertEqual(freshness['NFL']['status'], 'fetched')
+
+            # One flaky source no longer forces the others to be re-scraped
+            self.calls.clear()
+            freshness = {}
+            get_team_ratings(freshness=freshness)
+            ratings_client._inflight['NBA'].result(5)
+            self.assertEqual(self.calls, ['NBA'])
+            self.assertEqual(freshness['NHL']['status'], 'fresh')
+
+    def test_stale_served_immediately(self):
+        for sport, ttl in ratings_client.SOURCE_TTLS.items():
+            self._seed(sport, age=ttl + 10 if sport == 'NHL' else 0)
+        self.release.clear()
+        with mock.patch.object(ratings_client, '_SOURCES', self._sources()):
+            freshness = {}
+            merged = get_team_ratings(freshness=freshness)
+            self.assertIn('Old NHL', merged)  # Returned while the refresh is still blocked
+            self.assertEqual(freshness['NHL']['status'], 'stale')
+            self.assertGreater(freshness['NHL']['age_s'], ratings_client.SOURCE_TTLS['NHL'])
+
+            self.release.set()
+            ratings_client._inflight['NHL'].result(5)
+            self.assertEqual(self.calls, ['NHL'])
+            self.assertIn('NHL Team', get_team_ratings())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import rollups
+from processing.backtesting import analyze_by_edge_bucket, analyze_clv, calculate_bet_result
+
+
+def _ledger(n=400, seed=36):
+    rng = np.random.RandomState(seed)
+    odds = rng.uniform(1.4, 4.0, n).round(2)
+    closing = np.where(rng.rand(n) < 0.6, (odds * rng.uniform(0.9, 1.1, n)).round(2), np.nan)
+    closing[::25] = odds[::25]  # Unchanged lines carry no CLV
+    return pd.DataFrame({
+        'edge': rng.uniform(-0.04, 0.15, n),
+        'outcome': rng.choice(['WON', 'LOST', 'PUSH'], n, p=[0.45, 0.5, 0.05]),
+        'stake': rng.uniform(0.5, 3.0, n).round(2),
+        'odds': odds,
+        'closing_odds': closing,
+    })
+
+
+def _perf_daily(df):
+    """What perf_daily + fetch_performance(by=('edge_bucket',)) returns for a raw ledger."""
+    df = df.copy()
+    df['edge_bucket'] = pd.cut(df['edge'], bins=[-1, 0, 0.03, 0.06, 0.10, 1.0],
+                               labels=rollups.EDGE_BUCKET_ORDER).astype(str)
+    df['profit'] = df.apply(calculate_bet_result, axis=1)
+    return df.groupby('edge_bucket').agg(
+        bets=('edge', 'size'), edge_sum=('edge', 'sum'), edge_n=('edge', 'count'),
+        model_stake=('stake', 'sum'), model_profit=('profit', 'sum'),
+        wins=('outcome', lambda s: (s == 'WON').sum()),
+        losses=('outcome', lambda s: (s == 'LOST').sum()),
+    ).reset_index()
+
+
+def _perf_clv(df):
+    """What perf_clv_daily summed over days returns for a raw ledger."""
+    df = df[df['closing_odds'].notna() & (df['closing_odds'] != df['odds'])].copy()
+    df['clv'] = (df['odds'] - df['closing_odds']) / df['odds'] * 100
+    df['clv_sign'] = np.select([df['clv'] > 0, df['clv'] < 0], ['positive', 'negative'], 'zero')
+    df['profit'] = df.apply(calculate_bet_result, axis=1)
+    return df.groupby('clv_sign').agg(
+        bets=('clv', 'size'), clv_sum=('clv', 'sum'),
+        model_stake=('stake', 'sum'), model_profit=('profit', 'sum'),
+    ).reset_index()
+
+
+class TestRollupReaders(unittest.TestCase):
+
+    def test_edge_bucket_summary_matches_backtesting(self):
+        raw = _ledger()
+        with mock.patch.object(rollups, 'fetch_performance', return_value=_perf_daily(raw)):
+            summary = rollups.fetch_edge_bucket_summary(object())
+        self.assertEqual(summary, analyze_by_edge_bucket(raw.copy()))
+
+    def test_clv_summary_matches_backtesting(self):
+        raw = _ledger()
+        with mock.patch.object(rollups.pd, 'read_sql', return_value=_perf_clv(raw)):
+            summary = rollups.fetch_clv_summary(object())
+        expected = analyze_clv(raw.copy())
+        self.assertEqual(summary.keys(), expected.keys())
+        for key, value in expected.items():
+            self.assertAlmostEqual(summary[key], value, places=6, msg=key)
+
+    def test_fetch_performance_builds_filters(self):
+        with mock.patch.object(rollups.pd, 'read_sql', return_value=pd.DataFrame()) as read_sql:
+            rollups.fetch_performance(object(), by=('sport',), settle_day='2026-01-02',
+                                      accepted=True, positive_edge=True)
+        sql, _conn = read_sql.call_args[0]
+        params = read_sql.call_args[1]['params']
+        self.assertIn("settle_day = %(settle_day)s", sql)
+        self.assertIn("edge_bucket NOT IN ('<0%%', 'Unknown')", sql)
+        self.assertTrue(sql.rstrip().endswith("GROUP BY sport"))
+        self.assertEqual(params, {'outcomes': ['WON', 'LOST', 'PUSH'],
+                                  'settle_day': '2026-01-02', 'accepted': True})
+
+
+class TestViewVersions(unittest.TestCase):
+
+    def test_only_changed_definitions_rebuilt(self):
+        stored = {'perf_daily': rollups.view_signature(rollups.CREATE_PERF_DAILY),
+                  'perf_clv_daily': 'rollup:stale', 'perf_calibration': None}
+        cur = mock.MagicMock()
+        cur.fetchone.side_effect = [(stored[v],) for v in rollups.PERFORMANCE_VIEWS]
+        rollups.create_performance_views(cur)
+
+        sql = [c.args[0] for c in cur.execute.call_args_list]
+        self.assertNotIn("DROP MATERIALIZED VIEW IF EXISTS perf_daily CASCADE", sql)
+        self.assertNotIn(rollups.CREATE_PERF_DAILY, sql)
+        for view in ('perf_clv_daily', 'perf_calibration'):
+            self.assertIn(f"DROP MATERIALIZED VIEW IF EXISTS {view} CASCADE", sql)
+            cur.execute.assert_any_call(f"COMMENT ON MATERIALIZED VIEW {view} IS %s",
+                                        (rollups.view_signature(rollups.VIEW_DEFINITIONS[view]),))
+        self.assertTrue(set(rollups.VIEW_INDEXES) <= set(sql))
+
+    def test_signature_ignores_whitespace_only(self):
+        ddl = rollups.CREATE_PERF_CALIBRATION
+        self.assertEqual(rollups.view_signature(ddl), rollups.view_signature(" ".join(ddl.split())))
+        self.assertNotEqual(rollups.view_signature(ddl), rollups.view_signature(ddl.replace("'WON'", "'WIN'")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import settle_bets
+
+
+class TestBetSettler(unittest.TestCase):
+
+    def test_net_units_are_staked(self):
+        with mock.patch.object(settle_bets, 'get_db', return_value=mock.MagicMock()):
+            settler = settle_bets.BetSettler()
+        settler.get_player_stat = lambda player, date_str, market: 2.0
+        settler.process_bet({'event_id': 'NHL_ConnorMcDavid_POINTS_1p5_20260128', 'odds': 2.5})
+
+        cur = settler.conn.cursor.return_value.__enter__.return_value
+        sql, params = cur.execute.call_args.args
+        self.assertEqual(params, {'outcome': 'WON', 'profit': 1.5, 'event_id': 'NHL_ConnorMcDavid_POINTS_1p5_20260128'})
+        self.assertIn("COALESCE(NULLIF(stake, 0), 1.0) * (COALESCE(NULLIF(odds, 0), 2.0) - 1.0)", sql)
+        self.assertIn('settled_at = NOW()', sql)
+        self.assertEqual(settler.settled_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
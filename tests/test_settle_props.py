@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import cache
+import settle_props
+from settle_props import get_games_player_stats, grade_sog_prop, match_game, parse_skater_sog
+
+
+def _group(name, keys, athletes):
+    return {'name': name, 'keys': keys,
+            'athletes': [{'athlete': {'displayName': n}, 'stats': s} for n, s in athletes]}
+
+
+SUMMARY = {'boxscore': {'players': [
+    {'statistics': [
+        _group('skaters', ['G', 'A', 'S', 'TOI'], [('Travis Konecny', ['1', '0', '4', '18:02']),
+                                                   ('Sean Couturier', ['0', '1', '2', '19:40'])]),
+        _group('goalies', ['SA', 'SV'], [('Samuel Ersson', ['30', '28'])]),
+    ]},
+    {'statistics': [
+        _group('skaters', ['G', 'A', 'Sh'], [('Sidney Crosby', ['0', '0', '5'])]),
+    ]},
+]}}
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class TestBoxscoreIndex(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        patcher = mock.patch.object(cache, 'CACHE_DIR', tmp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_skaters_only(self):
+        self.assertEqual(parse_skater_sog(SUMMARY),
+                         {'Travis Konecny': 4, 'Sean Couturier': 2, 'Sidney Crosby': 5})
+        self.assertEqual(parse_skater_sog({}), {})
+
+    def test_final_boxscores_fetched_once(self):
+        payloads = {'401': SUMMARY, '402': {'boxscore': {}}}
+        with mock.patch.object(settle_props, 'http_get') as http_get:
+            http_get.side_effect = lambda url, **kw: _Response(payloads[url.rsplit('=', 1)[1]])
+            first = get_games_player_stats(['401', '402', '401'])
+            self.assertEqual(first['401']['Sidney Crosby'], 5)
+            self.assertEqual(first['402'], {})
+            self.assertEqual(http_get.call_count, 2)
+
+            http_get.reset_mock()
+            again = get_games_player_stats(['401', '402'])
+            self.assertEqual(again['401'], first['401'])
+            # Empty (not yet posted) indexes are retried; final ones come from disk
+            self.assertEqual([c.args[0].rsplit('=', 1)[1] for c in http_get.call_args_list], ['402'])
+
+
+class TestGrading(unittest.TestCase):
+
+    def test_match_and_grade(self):
+        games = [{'id': '401', 'home': 'Pittsburgh Penguins', 'away': 'Philadelphia Flyers'}]
+        self.assertEqual(match_game('Philadelphia Flyers @ Pittsburgh Penguins', games)['id'], '401')
+        self.assertIsNone(match_game('Flyers vs Penguins', games))
+
+        stats = parse_skater_sog(SUMMARY)
+        self.assertEqual(grade_sog_prop('Travis Konecny Over 3.5 SOG', stats), 'WON')
+        self.assertEqual(grade_sog_prop('Sidney Crosby Under 4.5 SOG', stats), 'LOST')
+        self.assertEqual(grade_sog_prop('Sean Couterier Under 2.5 SOG', stats), 'WON')  # Fuzzy name
+        self.assertIsNone(grade_sog_prop('Connor McDavid Over 3.5 SOG', stats))
+        self.assertIsNone(grade_sog_prop('Travis Konecny 3.5 SOG', stats))
+
+
+class TestSettlement(unittest.TestCase):
+
+    def test_sets_net_units_and_settled_at(self):
+        kickoff = datetime(2026, 3, 1, 0, 30, tzinfo=timezone.utc)
+        conn = mock.MagicMock()
+        cur = conn.cursor.return_value
+        cur.fetchall.return_value = [('P1', 'Travis Konecny Over 3.5 SOG', 'Philadelphia Flyers @ Pittsburgh Penguins', kickoff)]
+        games = [{'id': '401', 'home': 'Pittsburgh Penguins', 'away': 'Philadelphia Flyers'}]
+
+        with mock.patch.object(settle_props, 'get_db', return_value=conn), \
+             mock.patch.object(settle_props, 'get_espn_games', return_value=games), \
+             mock.patch.object(settle_props, 'get_games_player_stats', return_value={'401': parse_skater_sog(SUMMARY)}), \
+             mock.patch.object(settle_props, 'refresh_performance_views') as refresh:
+            settle_props.settle_props()
+
+        cur.execute.assert_any_call(settle_props.SETTLE_OUTCOME, {'outcome': 'WON', 'event_id': 'P1'})
+        self.assertIn('settled_at = NOW()', settle_props.SETTLE_OUTCOME)
+        self.assertIn('net_units', settle_props.SETTLE_OUTCOME)
+        conn.commit.assert_called_once()
+        refresh.assert_called_once_with(conn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import cache
+import settle_soccer_props
+from settle_soccer_props import FixturePlayers, get_fixture_player_stats, get_fixtures_for_date, match_fixture
+
+
+def _stats(name, goals=0, shots=0, sot=0):
+    return {'name_display': name, 'goals': goals, 'shots': shots, 'shots_on_target': sot, 'assists': 0}
+
+
+PLAYERS = {'m. salah': _stats('M. Salah', goals=1, shots=4, sot=2),
+           'kylian mbappé': _stats('Kylian Mbappé', shots=3, sot=1),
+           'virgil van dijk': _stats('Virgil van Dijk', shots=1)}
+FIXTURES = [{'id': 11, 'home': 'Liverpool', 'away': 'Real Madrid', 'home_goals': 2, 'away_goals': 0}]
+
+
+class TestFixtureCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        patcher = mock.patch.object(cache, 'CACHE_DIR', tmp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_player_stats_fetched_once(self):
+        with mock.patch.object(settle_soccer_props, '_fetch_fixture_player_stats', return_value=PLAYERS) as fetch:
+            self.assertEqual(get_fixture_player_stats(11), PLAYERS)
+            self.assertEqual(get_fixture_player_stats(11), PLAYERS)
+        fetch.assert_called_once_with(11)
+
+    def test_empty_player_stats_retried(self):
+        with mock.patch.object(settle_soccer_props, '_fetch_fixture_player_stats', return_value={}) as fetch:
+            get_fixture_player_stats(12)
+            get_fixture_player_stats(12)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_fixture_lists(self):
+        march_10 = datetime(2026, 3, 10, 12, 0)
+        with mock.patch.object(settle_soccer_props, '_fetch_fixtures_for_date', return_value=FIXTURES) as fetch:
+            get_fixtures_for_date(39, '2026-03-01', now=march_10)
+            # Fetched 9 days after the fixtures: final, never refetched
+            self.assertEqual(get_fixtures_for_date(39, '2026-03-01', now=datetime(2026, 6, 1)), FIXTURES)
+            self.assertEqual(fetch.call_count, 1)
+
+        with mock.patch.object(settle_soccer_props, '_fetch_fixtures_for_date', return_value=None) as fetch:
+            self.assertEqual(get_fixtures_for_date(39, '2026-03-09', now=march_10), [])
+            get_fixtures_for_date(39, '2026-03-09', now=march_10)
+            self.assertEqual(fetch.call_count, 2)  # Failures are not cached
+
+    def test_early_fetch_revalidated(self):
+        # Listed the day after the fixtures: cached briefly, then revalidated even once the date is old
+        with mock.patch.object(settle_soccer_props, '_fetch_fixtures_for_date', return_value=FIXTURES[:0]) as fetch:
+            get_fixtures_for_date(39, '2026-03-09', now=datetime(2026, 3, 10, 12, 0))
+            get_fixtures_for_date(39, '2026-03-09', now=datetime(2026, 3, 10, 12, 10))
+            self.assertEqual(fetch.call_count, 1)
+
+        with mock.patch.object(settle_soccer_props, '_fetch_fixtures_for_date', return_value=FIXTURES) as fetch:
+            self.assertEqual(get_fixtures_for_date(39, '2026-03-09', now=datetime(2026, 3, 20)), FIXTURES)
+            get_fixtures_for_date(39, '2026-03-09', now=datetime(2026, 4, 20))
+            self.assertEqual(fetch.call_count, 1)  # Refetched on 03-20, which is final
+
+    def test_empty_list_never_final(self):
+        with mock.patch.object(settle_soccer_props, '_fetch_fixtures_for_date', return_value=[]) as fetch:
+            get_fixtures_for_date(39, '2026-03-01', now=datetime(2026, 3, 10, 12, 0))
+            get_fixtures_for_date(39, '2026-03-01', now=datetime(2026, 3, 11, 12, 0))
+            self.assertEqual(fetch.call_count, 2)
+
+    def test_api_errors_not_cached(self):
+        quota = mock.Mock(status_code=200)
+        quota.json.return_value = {'errors': {'requests': 'You have reached the request limit for the day'},
+                                   'response': []}
+        with mock.patch.object(settle_soccer_props, 'http_get', return_value=quota) as http_get:
+            self.assertEqual(get_fixtures_for_date(39, '2026-03-01', now=datetime(2026, 3, 10, 12, 0)), [])
+            get_fixtures_for_date(39, '2026-03-01', now=datetime(2026, 3, 10, 12, 0))
+        self.assertEqual(http_get.call_count, 2)
+
+
+class TestResolution(unittest.TestCase):
+
+    def test_name_variants(self):
+        players = FixturePlayers(PLAYERS)
+        self.assertEqual(players.resolve('M. Salah'), (PLAYERS['m. salah'], 100))
+        self.assertEqual(players.resolve('Mohamed Salah')[0], PLAYERS['m. salah'])
+        self.assertEqual(players.resolve('Kylian Mbappe')[0], PLAYERS['kylian mbappé'])
+        self.assertEqual(players.resolve('Virgil Van Dyk')[0], PLAYERS['virgil van dijk'])
+        self.assertEqual(players.resolve('Trent Alexander-Arnold'), (None, 0))
+
+    def test_match_fixture(self):
+        self.assertEqual(match_fixture('Liverpool vs Real Madrid', FIXTURES)['id'], 11)
+        self.assertEqual(match_fixture('Real Madrid @ Liverpool', FIXTURES)['id'], 11)
+        self.assertIsNone(match_fixture('Arsenal vs Chelsea', FIXTURES))
+
+
+class TestBatchedSettlement(unittest.TestCase):
+
+    def test_single_pass_one_commit(self):
+        kickoff = datetime(2026, 3, 1, 15, 0)
+        bets = [('PROP_1', 'soccer_epl', 'Liverpool vs Real Madrid', 'Mohamed Salah Anytime Goalscorer', kickoff, 1),
+                ('PROP_2', 'soccer_epl', 'Liverpool vs Real Madrid', 'Kylian Mbappe Over 1.5 Shots on Target', kickoff, 1),
+                ('PROP_3', 'soccer_epl', 'Liverpool vs Real Madrid', 'Nobody Known Over 0.5 Shots', kickoff, 1),
+                ('PROP_4', 'soccer_xyz', 'A vs B', 'X Over 0.5 Shots', kickoff, 1)]
+        conn = mock.MagicMock()
+        conn.cursor.return_value.fetchall.return_value = bets
+
+        with mock.patch.object(settle_soccer_props, 'get_db', return_value=conn), \
+             mock.patch.dict(settle_soccer_props.Config.SOCCER_LEAGUE_IDS, {'soccer_epl': 39}, clear=True), \
+             mock.patch.object(settle_soccer_props, 'get_fixtures_for_date', return_value=FIXTURES) as fixtures, \
+             mock.patch.object(settle_soccer_props, 'get_fixture_player_stats', return_value=PLAYERS) as stats, \
+             mock.patch.object(settle_soccer_props, 'execute_values') as ev, \
+             mock.patch.object(settle_soccer_props, 'refresh_performance_views') as refresh:
+            settle_soccer_props.settle_soccer_props()
+
+        fixtures.assert_called_once_with(39, '2026-03-01')
+        stats.assert_called_once_with(11)
+        self.assertEqual([c.args[1] for c in ev.call_args_list],
+                         [settle_soccer_props.UPDATE_INTEL_OUTCOMES, settle_soccer_props.UPDATE_CALIBRATION_OUTCOMES])
+        self.assertEqual(ev.call_args_list[1].args[2], [('PROP_1', 'WON'), ('PROP_2', 'LOST')])
+        conn.commit.assert_called_once()
+        refresh.assert_called_once_with(conn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import queries
+from db.queries import SettledLedger
+
+
+def _rows(*specs):
+    return pd.DataFrame([
+        {'event_id': eid, 'kickoff': pd.Timestamp(k), 'outcome': out, 'settled_at': pd.Timestamp(s)}
+        for eid, k, out, s in specs
+    ])
+
+
+class TestSettledLedger(unittest.TestCase):
+
+    def test_incremental_refresh_upserts_by_event(self):
+        full = _rows(('a', '2026-01-02', 'WON', '2026-01-02 05:00'),
+                     ('b', '2026-01-01', 'LOST', '2026-01-01 05:00'))
+        delta = _rows(('b', '2026-01-01', 'WON', '2026-01-03 09:00'),   # regraded
+                      ('c', '2026-01-03', 'PUSH', '2026-01-03 09:00'))
+        conn = object()
+        ledger = SettledLedger()
+
+        with mock.patch.object(queries, 'fetch_settled_bets', return_value=full) as full_fetch, \
+             mock.patch.object(queries, 'fetch_settled_since', return_value=delta) as since_fetch:
+            ledger.refresh(conn)
+            self.assertEqual(ledger.watermark, pd.Timestamp('2026-01-02 05:00'))
+
+            frame = ledger.refresh(conn)
+            since_fetch.assert_called_once_with(conn, pd.Timestamp('2026-01-02 04:55'))  # 5 min overlap
+            self.assertEqual(full_fetch.call_count, 1)
+
+        self.assertEqual(list(frame['event_id']), ['c', 'a', 'b'])  # kickoff DESC
+        self.assertEqual(frame.set_index('event_id').loc['b', 'outcome'], 'WON')
+        self.assertEqual(ledger.watermark, pd.Timestamp('2026-01-03 09:00'))
+
+    def test_periodic_full_reload(self):
+        full = _rows(('a', '2026-01-02', 'WON', '2026-01-02 05:00'))
+        ledger = SettledLedger(full_reload_seconds=0)
+        with mock.patch.object(queries, 'fetch_settled_bets', return_value=full) as full_fetch, \
+             mock.patch.object(queries, 'fetch_settled_since') as since_fetch:
+            ledger.refresh(object())
+            ledger.refresh(object())
+        self.assertEqual(full_fetch.call_count, 2)
+        since_fetch.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from understat_client import UnderstatClient, parse_json_blobs
+
+# Saved Understat match page (match 28989): embeds match_info only; rosters load via XHR
+MATCH_FIXTURE = os.path.join(ROOT, 'scripts', 'probes', 'understat_debug.html')
+
+ROSTERS = {
+    'h': {'101': {'player': "Danny Welbeck", 'position': 'FW', 'time': '90', 'shots': '3', 'goals': '1',
+                  'assists': '0', 'xG': '0.61', 'xA': '0.05', 'xGChain': '0.7', 'xGBuildup': '0.1'}},
+    'a': {'202': {'player': "Évanilson", 'position': 'FW', 'time': '84', 'shots': '4', 'goals': '1',
+                  'assists': '0', 'xG': '0.93', 'xA': '0', 'xGChain': '1.1', 'xGBuildup': '0.2'}},
+}
+DATES = [{'id': '28989', 'isResult': True, 'datetime': '2026-01-19 20:00:00',
+          'h': {'title': 'Brighton'}, 'a': {'title': 'Bournemouth'},
+          'goals': {'h': '1', 'a': '1'}, 'xG': {'h': '0.99', 'a': '1.69'}}]
+
+
+def _understat_blob(name, value):
+    """Embed a value the way Understat does: JSON, then \\xHH-escape everything but [A-Za-z0-9]."""
+    text = json.dumps(value)
+    escaped = ''.join(c if c.isalnum() and c.isascii() else f"\\x{ord(c):02X}" for c in text)
+    return f"<script>var {name} = JSON.parse('{escaped}');</script>"
+
+
+class _Response:
+    def __init__(self, text='', payload=None):
+        self.text = text
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+def _client(pages):
+    client = UnderstatClient(http=mock.MagicMock())
+    client.http.get.side_effect = lambda url, **kw: pages[url.rsplit('understat.com/', 1)[1]]
+    return client
+
+
+class TestBlobParsing(unittest.TestCase):
+
+    def test_fixture_match_info(self):
+        with open(MATCH_FIXTURE) as f:
+            blobs = parse_json_blobs(f.read())
+        self.assertEqual(blobs['match_info']['team_h'], 'Brighton')
+        self.assertEqual(blobs['match_info']['a_xg'], '1.69737')
+        self.assertNotIn('rostersData', blobs)
+
+    def test_escaped_roundtrip(self):
+        value = {'name': "N'Golo Kanté", 'path': 'a\\b', 'n': [1, 2.5]}
+        self.assertEqual(parse_json_blobs(_understat_blob('x', value)), {'x': value})
+
+
+class TestHttpFirst(unittest.TestCase):
+
+    def setUp(self):
+        with open(MATCH_FIXTURE) as f:
+            self.match_html = f.read()
+        self.match_info = parse_json_blobs(self.match_html)['match_info']
+
+    def test_http_matches_selenium_output(self):
+        client = _client({
+            'match/28989': _Response(self.match_html),
+            'getMatchData/28989': _Response(payload={'rosters': ROSTERS, 'shots': {}}),
+        })
+        http = client.get_match_data('28989')
+
+        browser = UnderstatClient()
+        browser.driver = mock.MagicMock()
+        browser.driver.execute_script.return_value = {'match_info': self.match_info, 'rosters': ROSTERS, 'shots': {}}
+        with mock.patch.object(browser, '_http_match_data', return_value=None), \
+             mock.patch('understat_client.time.sleep'):
+            selenium = browser.get_match_data('28989')
+
+        self.assertEqual(http, selenium)
+        self.assertEqual({p['team_name'] for p in http['players']}, {'Brighton', 'Bournemouth'})
+        self.assertEqual(ROSTERS['h']['101']['xG'], '0.61')  # Raw rosters are not mutated
+
+    def test_embedded_rosters_skip_xhr(self):
+        html = self.match_html + _understat_blob('rostersData', ROSTERS)
+        client = _client({'match/28989': _Response(html)})
+        data = client.get_match_data('28989')
+        self.assertEqual(len(data['players']), 2)
+        client.http.get.assert_called_once()
+        self.assertIn('Mozilla', client.http.get.call_args.kwargs['headers']['User-Agent'])
+
+    def test_selenium_only_when_http_fails(self):
+        client = UnderstatClient(http=mock.MagicMock())
+        client.http.get.side_effect = RuntimeError("blocked")
+        with mock.patch.object(client, '_selenium_match_data', return_value=(self.match_info, ROSTERS)) as browser:
+            data = client.get_match_data('28989')
+        browser.assert_called_once_with('28989')
+        self.assertEqual(data['match_info']['team_a'], 'Bournemouth')
+
+    def test_league_matches_from_xhr(self):
+        client = _client({
+            'league/EPL/2025': _Response('<html></html>'),
+            'getLeagueData/EPL/2025': _Response(payload={'dates': DATES, 'teams': {}, 'players': []}),
+        })
+        matches = client.get_league_matches('EPL', '2025')
+        self.assertEqual(matches[0]['home_team'], 'Brighton')
+        self.assertTrue(matches[0]['is_result'])
+        self.assertIsNone(client.driver)
+
+    def test_concurrent_batch(self):
+        client = UnderstatClient(max_workers=3)
+        with mock.patch.object(client, 'get_match_data', side_effect=lambda mid: {'match_id': mid} if mid != '3' else None):
+            self.assertEqual(client.get_matches_data(['1', '2', '3']),
+                             {'1': {'match_id': '1'}, '2': {'match_id': '2'}, '3': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,7 +17,7 @@ def generate_recap_tweet(dry_run=False):
     # Query settled bets from yesterday that were actually tweeted
     query = """
         SELECT il.sport, il.outcome, il.user_stake, il.user_odds 
-        FROM intelligence_log il
+        FROM intelligence_log_all il
         JOIN posted_tweets pt ON il.event_id = pt.event_id
         WHERE date(il.kickoff) = %s 
         AND il.outcome IN ('WON', 'LOST', 'PUSH')
@@ -1,30 +1,140 @@
 import json
+import re
+import threading
 import time
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor
+
 from config import Config
+from data.clients.base import get_http_client
 
 # Configure Logger
 logger = logging.getLogger("UnderstatClient")
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO)
 
+BASE_URL = "https://understat.com"
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+MAX_WORKERS = 4  # Request pacing: understat.com in data.clients.base.HOST_RATE_LIMITS
+
+# var rostersData = JSON.parse('\x7B\x22h\x22...');
+_JSON_BLOB = re.compile(r"var\s+(\w+)\s*=\s*JSON\.parse\('([^']*)'\)")
+_HEX_ESCAPE = re.compile(r"\\x([0-9A-Fa-f]{2})")
+
+
+def parse_json_blobs(html):
+    """{var_name: value} for every `var x = JSON.parse('...')` blob in a page."""
+    blobs = {}
+    for name, raw in _JSON_BLOB.findall(html):
+        try:
+            blobs[name] = json.loads(_HEX_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), raw))
+        except ValueError:
+            logger.warning(f"Could not decode {name} blob")
+    return blobs
+
+
+def clean_league_matches(dates_data):
+    """Flatten Understat datesData into the match dicts the sync uses."""
+    matches = []
+    for match in dates_data:
+        matches.append({
+            "id": match.get("id"),
+            "home_team": match.get("h", {}).get("title"),
+            "away_team": match.get("a", {}).get("title"),
+            "datetime": match.get("datetime"),
+            "is_result": match.get("isResult", False),
+            "goals_h": match.get("goals", {}).get("h"),
+            "goals_a": match.get("goals", {}).get("a"),
+            "xg_h": match.get("xG", {}).get("h"),
+            "xg_a": match.get("xG", {}).get("a"),
+        })
+    return matches
+
+
+def clean_match_data(match_id, match_info, rosters):
+    """Match payload ({match_id, match_info, players}) from raw match_info + rostersData."""
+    cleaned_players = []
+    
+    match_info = match_info or {}
+    team_h = match_info.get('team_h', 'Home')
+    team_a = match_info.get('team_a', 'Away')
+    
+    for team_id, players in rosters.items():
+        real_team_name = team_h if team_id == 'h' else team_a
+        
+        for pid, stats in players.items():
+            stats = dict(stats)
+            stats['team_id'] = team_id
+            stats['team_name'] = real_team_name 
+            stats['id'] = pid 
+            stats['xG'] = float(stats.get('xG', 0))
+            stats['xA'] = float(stats.get('xA', 0))
+            stats['xGChain'] = float(stats.get('xGChain', 0))
+            stats['xGBuildup'] = float(stats.get('xGBuildup', 0))
+            cleaned_players.append(stats)
+    
+    return {
+        'match_id': match_id,
+        'match_info': match_info or None,
+        'players': cleaned_players
+    }
+
+
 class UnderstatClient:
     """
-    Selenium-based scraper for Understat.com.
-    Extracts deep player metrics (xG, xGChain, xGBuildup) by reading
-    JavaScript objects directly from browser memory.
+    Scraper for Understat.com.
+    Extracts deep player metrics (xG, xGChain, xGBuildup) from the JSON the
+    pages embed (or load via their XHR endpoints) over the shared HTTP client.
+    Headless Chrome (Selenium) is started only when the direct parse fails.
     """
     
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, max_workers=MAX_WORKERS, http=None):
         self.headless = headless
         self.driver = None
+        self.max_workers = max_workers
+        self.http = http or get_http_client()
+        self._driver_lock = threading.Lock()
+
+    def _get(self, path, xhr=False):
+        headers = {'User-Agent': USER_AGENT}
+        if xhr:
+            headers['X-Requested-With'] = 'XMLHttpRequest'
+        response = self.http.get(f"{BASE_URL}/{path}", headers=headers, timeout=15)
+        response.raise_for_status()
+        return response
+
+    def _http_league_matches(self, league, season):
+        """datesData via HTTP: embedded blob, else the getLeagueData endpoint. None on failure."""
+        try:
+            dates_data = parse_json_blobs(self._get(f"league/{league}/{season}").text).get('datesData')
+            if dates_data is None:
+                dates_data = self._get(f"getLeagueData/{league}/{season}", xhr=True).json().get('dates')
+            return dates_data
+        except Exception as e:
+            logger.warning(f"HTTP league fetch failed for {league} {season}: {e}")
+            return None
+
+    def _http_match_data(self, match_id):
+        """(match_info, rosters) via HTTP: embedded blobs, else the getMatchData endpoint. None on failure."""
+        try:
+            blobs = parse_json_blobs(self._get(f"match/{match_id}").text)
+            rosters = blobs.get('rostersData')
+            if not rosters:
+                rosters = self._get(f"getMatchData/{match_id}", xhr=True).json().get('rosters')
+            if not rosters:
+                return None
+            return blobs.get('match_info'), rosters
+        except Exception as e:
+            logger.warning(f"HTTP match fetch failed for {match_id}: {e}")
+            return None
 
     def _init_driver(self):
         """Initialize Chrome Driver with stealth options."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument("--headless=new")
@@ -57,102 +167,88 @@ class UnderstatClient:
         Get all matches for a given league and season.
         Returns a list of match dictionaries (id, h/a teams, datetime, isResult).
         """
-        if not self.driver:
-            self._init_driver()
-            
-        url = f"https://understat.com/league/{league}/{season}"
-        try:
-            logger.info(f"Fetching matches for {league} {season}...")
-            self.driver.get(url)
-            time.sleep(2) # Allow for redirect/load
-            
-            # Extract datesData
-            dates_data = self.driver.execute_script("return window.datesData;")
-            
-            if not dates_data:
-                logger.warning(f"No datesData found for {league} {season}")
-                return []
+        logger.info(f"Fetching matches for {league} {season}...")
+        dates_data = self._http_league_matches(league, season)
+        if dates_data is None:
+            dates_data = self._selenium_league_matches(league, season)
+        if not dates_data:
+            logger.warning(f"No datesData found for {league} {season}")
+            return []
+
+        matches = clean_league_matches(dates_data)
+        logger.info(f"Found {len(matches)} matches for {league} {season} ({len([m for m in matches if m['is_result']])} completed)")
+        return matches
+
+    def _selenium_league_matches(self, league, season):
+        """datesData read from browser memory (fallback)."""
+        with self._driver_lock:
+            if not self.driver:
+                self._init_driver()
                 
-            matches = []
-            for match in dates_data:
-                matches.append({
-                    "id": match.get("id"),
-                    "home_team": match.get("h", {}).get("title"),
-                    "away_team": match.get("a", {}).get("title"),
-                    "datetime": match.get("datetime"),
-                    "is_result": match.get("isResult", False),
-                    "goals_h": match.get("goals", {}).get("h"),
-                    "goals_a": match.get("goals", {}).get("a"),
-                    "xg_h": match.get("xG", {}).get("h"),
-                    "xg_a": match.get("xG", {}).get("a"),
-                })
+            url = f"{BASE_URL}/league/{league}/{season}"
+            try:
+                self.driver.get(url)
+                time.sleep(2) # Allow for redirect/load
                 
-            logger.info(f"Found {len(matches)} matches for {league} {season} ({len([m for m in matches if m['is_result']])} completed)")
-            return matches
-            
-        except Exception as e:
-            logger.error(f"Error fetching league matches: {e}")
-            return []
+                # Extract datesData
+                return self.driver.execute_script("return window.datesData;")
+                
+            except Exception as e:
+                logger.error(f"Error fetching league matches: {e}")
+                return None
 
     def get_match_data(self, match_id):
         """
-        Fetch full match data including lineups, player xG, and shot data.
+        Fetch full match data including lineups and player xG.
         """
-        if not self.driver:
-            self._init_driver()
-            
-        url = f"https://understat.com/match/{match_id}"
-        logger.info(f"Navigating to {url}...")
-        
-        try:
-            self.driver.get(url)
-            time.sleep(1.5) 
-            
-            # Extract JS Variables directly
-            data = self.driver.execute_script("""
-                return {
-                    match_info: typeof match_info !== 'undefined' ? match_info : null,
-                    rosters: typeof rostersData !== 'undefined' ? rostersData : null,
-                    shots: typeof shotsData !== 'undefined' ? shotsData : null
-                };
-            """)
-            
-            if not data['rosters']:
-                logger.warning("rostersData not found in page.")
-                return None
+        raw = self._http_match_data(match_id)
+        if raw is None:
+            logger.info(f"Falling back to browser for match {match_id}")
+            raw = self._selenium_match_data(match_id)
+        if raw is None:
+            return None
+
+        data = clean_match_data(match_id, *raw)
+        logger.info(f"Extracted stats for {len(data['players'])} players.")
+        return data
+
+    def get_matches_data(self, match_ids):
+        """{match_id: payload or None}, fetched concurrently under the shared rate limit."""
+        match_ids = list(match_ids)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(match_ids, pool.map(self.get_match_data, match_ids)))
+
+    def _selenium_match_data(self, match_id):
+        """(match_info, rosters) read from browser memory (fallback)."""
+        with self._driver_lock:
+            if not self.driver:
+                self._init_driver()
                 
-            # Process/Clean Data
-            cleaned_players = []
-            
-            match_info = data.get('match_info', {})
-            team_h = match_info.get('team_h', 'Home')
-            team_a = match_info.get('team_a', 'Away')
+            url = f"{BASE_URL}/match/{match_id}"
+            logger.info(f"Navigating to {url}...")
             
-            rosters = data.get('rosters', {})
-            for team_id, players in rosters.items():
-                real_team_name = team_h if team_id == 'h' else team_a
+            try:
+                self.driver.get(url)
+                time.sleep(1.5) 
                 
-                for pid, stats in players.items():
-                    stats['team_id'] = team_id
-                    stats['team_name'] = real_team_name 
-                    stats['id'] = pid 
-                    stats['xG'] = float(stats.get('xG', 0))
-                    stats['xA'] = float(stats.get('xA', 0))
-                    stats['xGChain'] = float(stats.get('xGChain', 0))
-                    stats['xGBuildup'] = float(stats.get('xGBuildup', 0))
-                    cleaned_players.append(stats)
-            
-            logger.info(f"Extracted stats for {len(cleaned_players)} players.")
-            
-            return {
-                'match_id': match_id,
-                'match_info': data.get('match_info'),
-                'players': cleaned_players
-            }
-            
-        except Exception as e:
-            logger.error(f"Scrape failed: {e}")
-            return None
+                # Extract JS Variables directly
+                data = self.driver.execute_script("""
+                    return {
+                        match_info: typeof match_info !== 'undefined' ? match_info : null,
+                        rosters: typeof rostersData !== 'undefined' ? rostersData : null,
+                        shots: typeof shotsData !== 'undefined' ? shotsData : null
+                    };
+                """)
+                
+                if not data['rosters']:
+                    logger.warning("rostersData not found in page.")
+                    return None
+                    
+                return data.get('match_info'), data['rosters']
+                
+            except Exception as e:
+                logger.error(f"Scrape failed: {e}")
+                return None
 
     def quit(self):
         if self.driver:
@@ -0,0 +1,52 @@
+"""
+JSON encoding for model payloads (opportunity metadata, feature snapshots).
+
+Uses orjson when installed: numpy scalars/arrays are encoded natively and
+NaN/inf become null. The stdlib fallback cleans values in one pass instead of
+string-replacing 'NaN' after the fact.
+"""
+
+import json
+import math
+from datetime import date, datetime
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ORJSON_OPTS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _clean(obj):
+    """Recursively convert to JSON-native types; non-finite floats become None."""
+    if isinstance(obj, dict):
+        return {str(k) if not isinstance(k, str) else k: _clean(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_clean(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _clean(obj.tolist())
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return obj
+
+
+def _default(obj):
+    """orjson fallback hook for types it does not know (e.g. np.float128, Decimal)."""
+    cleaned = _clean(obj)
+    if cleaned is obj:
+        return str(obj)
+    return cleaned
+
+
+def dumps(obj):
+    """Serialize to a JSON string. numpy types are unwrapped; NaN/inf are null."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS).decode()
+    return json.dumps(_clean(obj), allow_nan=False, default=str)
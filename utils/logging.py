@@ -1,13 +1,18 @@
 import logging
+import os
 import sys
 
+# Anchored at the repo root so scripts run from subdirectories (ncaab_h1_model/) still log
+LOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "app.log")
+os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+
 # Configure Global Logger
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler("logs/app.log")
+        logging.FileHandler(LOG_FILE)
     ]
 )
 
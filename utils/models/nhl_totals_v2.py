@@ -1,12 +1,12 @@
-import joblib
 import pandas as pd
 import numpy as np
 import json
 import os
-import scipy.stats as stats
 from datetime import datetime
 from utils.logging import log
 from utils.team_names import normalize_team_name
+from models.compiled import load_model
+from core.pricing import normal_over, normal_under
 
 class NHLTotalsV2:
     def __init__(self):
@@ -30,10 +30,9 @@ class NHLTotalsV2:
         
     def load_artifacts(self):
         try:
-            if os.path.exists(self.model_path):
-                self.model = joblib.load(self.model_path)
-            if os.path.exists(self.scaler_path):
-                self.scaler = joblib.load(self.scaler_path)
+            # Compiled NumPy exports are preferred (see scripts/export_compiled_models.py)
+            self.model = load_model(self.model_path)
+            self.scaler = load_model(self.scaler_path)
             if os.path.exists(self.lookup_path):
                 with open(self.lookup_path) as f:
                     self.lookup = json.load(f)
@@ -228,8 +227,8 @@ class NHLTotalsV2:
             trace['expected_total'] = round(expected_total, 4)
             
             # 7. Probability Derivation
-            prob_over = 1 - stats.norm.cdf(line, loc=expected_total, scale=self.SIGMA)
-            prob_under = stats.norm.cdf(line, loc=expected_total, scale=self.SIGMA)
+            prob_over = normal_over(expected_total, self.SIGMA, line)
+            prob_under = normal_under(expected_total, self.SIGMA, line)
             
             trace['prob_over'] = round(prob_over, 4)
             trace['prob_under'] = round(prob_under, 4)